@@ -11,6 +11,7 @@ try:
 except ImportError:
     import Queue as queue
 import traceback
+import math
 
 import core
 
@@ -38,6 +39,7 @@ _PROC_ADD = 7
 _REC_START = 8
 _REC_STOP = 9
 _ERR_DEL = 10
+_STAT_RST = 11
 
 _errorIcon = [
     0b00000000000000000000000000000000, 0b00000000000000000000000000000000,
@@ -125,6 +127,18 @@ SEQUENTIAL = 1
 """ Value to use when the process uses only the last image from the video device"""
 INSTANT = 0
 
+""" Pipelined mode: when a buffer is full, the oldest waiting frame is dropped"""
+DROP_OLDEST = 0
+
+""" Pipelined mode: when a buffer is full, the newest frame is dropped"""
+DROP_NEWEST = 1
+
+""" Pipelined mode: when a buffer is full, the producing stage waits"""
+BLOCK = 2
+
+# Names of the stages for which statistics are computed
+_STAGES = ["acquisition", "process", "display"]
+
 
 ################################################################################
 # Classes
@@ -150,16 +164,168 @@ class _MBRT_Item:
         self.value = value
         self.options = options
 
+def _processArgs(procType, index, colorOn, redSeq, greenSeq, blueSeq,
+                 seqIndex, red, green, blue):
+    # Returns the image arguments given to the process at position index in
+    # the chain of processes
+    if procType==SEQUENTIAL and index==0:
+        if colorOn:
+            return (redSeq, greenSeq, blueSeq, seqIndex, red, green, blue)
+        else:
+            return (redSeq, seqIndex, red)
+    elif index==0:
+        if colorOn:
+            return (redSeq[seqIndex], greenSeq[seqIndex], blueSeq[seqIndex],
+                    red, green, blue)
+        else:
+            return (redSeq[seqIndex], red)
+    else:
+        if colorOn:
+            return (red, green, blue, red, green, blue)
+        else:
+            return (red, red)
+
+def _percentiles(values):
+    # Returns a dictionary holding the 50th, 90th and 99th percentiles (nearest
+    # rank), the minimum and the maximum of the values
+    if not values:
+        return {}
+    values = sorted(values)
+    n = len(values)
+    result = {"min": values[0], "max": values[-1]}
+    for p in [50, 90, 99]:
+        rank = max(int(math.ceil(p*n/100.0))-1, 0)
+        result[p] = values[rank]
+    return result
+
+class _MBRT_Frame:
+    # Preallocated frame slot circulating inside the pipeline ring buffers
+
+    def __init__(self, w, h):
+        self.red = mamba.imageMb(w,h)
+        self.green = mamba.imageMb(w,h)
+        self.blue = mamba.imageMb(w,h)
+        self.color = False
+        self.stamp = 0.0
+
+class _MBRT_RingBuffer:
+    # Bounded ring of preallocated frames connecting two pipeline stages.
+    # The producer reserves a free frame, fills it and publishes it, the
+    # consumer fetches the oldest published frame and releases it once done.
+
+    def __init__(self, w, h, length, policy):
+        self.frames = [_MBRT_Frame(w,h) for i in range(length)]
+        # Frame used to absorb the production when the newest frame is dropped
+        self.spare = _MBRT_Frame(w,h)
+        self.free = list(self.frames)
+        self.ready = []
+        self.policy = policy
+        self.dropped = 0
+        self.cond = threading.Condition()
+
+    def reserve(self, stopper):
+        # Returns a frame the producer can write into. With the DROP_NEWEST
+        # policy the spare frame is returned when the buffer is full, it will
+        # be discarded on publication
+        self.cond.acquire()
+        try:
+            while not self.free:
+                if self.policy==DROP_OLDEST and self.ready:
+                    self.dropped += 1
+                    return self.ready.pop(0)
+                if self.policy==DROP_NEWEST:
+                    return self.spare
+                if stopper():
+                    return self.spare
+                self.cond.wait(0.1)
+            return self.free.pop(0)
+        finally:
+            self.cond.release()
+
+    def publish(self, frame):
+        # Makes the frame available to the consumer
+        self.cond.acquire()
+        if frame is self.spare:
+            self.dropped += 1
+        else:
+            self.ready.append(frame)
+            self.cond.notify_all()
+        self.cond.release()
+
+    def fetch(self, timeout):
+        # Returns the oldest published frame or None if none was published
+        # before the timeout expired
+        self.cond.acquire()
+        try:
+            if not self.ready:
+                self.cond.wait(timeout)
+            if not self.ready:
+                return None
+            return self.ready.pop(0)
+        finally:
+            self.cond.release()
+
+    def release(self, frame):
+        # Gives the frame back to the producer
+        self.cond.acquire()
+        self.free.append(frame)
+        self.cond.notify_all()
+        self.cond.release()
+
+class _MBRT_StageStats:
+    # Latency and rate measurement of a stage (exponential moving averages)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.latency = 0.0
+        self.period = 0.0
+        self.count = 0
+        self.last = None
+
+    def update(self, start, end):
+        # Registers a frame handled by the stage between times start and end
+        if self.count==0:
+            self.latency = end-start
+        else:
+            self.latency = 0.9*self.latency + 0.1*(end-start)
+        if self.last!=None:
+            if self.count==1:
+                self.period = end-self.last
+            else:
+                self.period = 0.9*self.period + 0.1*(end-self.last)
+        self.last = end
+        self.count += 1
+
+    def get(self):
+        # Returns the latency (in seconds) and frame rate of the stage
+        if self.period>0:
+            fps = 1.0/self.period
+        else:
+            fps = 0.0
+        return (self.latency, fps)
+
 class _MBRT_Thread(threading.Thread):
     # Thread for the acquisition, process and display of the video
-    
-    def __init__(self, queue, seqdepth=10):
+
+    def __init__(self, queue, seqdepth=10, pipelined=False, buflength=3,
+                 droppolicy=DROP_OLDEST):
         threading.Thread.__init__(self)
         self.daemon = True
         self.q = queue
         self.seqDepth = seqdepth
         self.mustStop = False
-        
+        self.pipelined = pipelined
+        self.bufLength = max(buflength, 1)
+        self.dropPolicy = droppolicy
+        self.stats = {}
+        for stage in _STAGES:
+            self.stats[stage] = _MBRT_StageStats()
+        self.endToEnd = _MBRT_StageStats()
+        self.inRing = None
+        self.outRing = None
+
     def run(self):
         # The main loop for the realtime module is in a separated thread
         # so as to let the user keep the control of the console
@@ -176,7 +342,9 @@ class _MBRT_Thread(threading.Thread):
         self.procList = []
         self.procType = None
         self.procOn = False
-        
+        self.seqReset = False
+        self.workers = []
+
         # First acquisition device init
         (w,h) = self.initAcquisition()
         # Then display init
@@ -185,39 +353,169 @@ class _MBRT_Thread(threading.Thread):
         # internal time reference (for frequency handling)
         self.timeIndex = time.time()
 
+        if self.pipelined:
+            self.runPipeline(w,h)
+        else:
+            self.runSequential()
+
+        # Destroying created structures and memory freeing
+        self.closeAll()
+
+    def runSequential(self):
         # Loop as long as the main thread is alive
         while not self.mustStop:
-            
+
             # Screen events handling
             self.handleScreenEvents()
             # Console commands queue handling
             self.handleQueueCommands()
-            
+
             # If the acquisition is not on pause
             if not self.pauseOn:
                 # gets the image from the device
+                t0 = time.time()
                 self.acquireImageFromDevice()
+                t1 = time.time()
+                self.stats["acquisition"].update(t0, t1)
                 # Then process it
                 self.handleProcess()
-            
+                self.stats["process"].update(t1, time.time())
+            else:
+                t0 = time.time()
+
             # Display the results into the screen
+            t1 = time.time()
             self.displayResult()
             # Then eventually display info on it
             self.displayInfo()
-            
+
             # records the picture if activated
             if self.recOn:
                 self.recordResult()
-                
+            t2 = time.time()
+            self.stats["display"].update(t1, t2)
+            self.endToEnd.update(t0, t2)
+
             # sequence index update
             self.seqIndex = (self.seqIndex+1)%self.seqDepth
-            
+
             # framerate control
             self.waitFrame()
-            
-        # Destroying created structures and memory freeing
-        self.closeAll()
-        
+
+    def runPipeline(self, w, h):
+        # The acquisition and the process are executed in their own threads,
+        # this thread handles the events, commands and the output stage (display
+        # and recording). Stages exchange frames through ring buffers.
+        if self.mustStop:
+            return
+        self.inRing = _MBRT_RingBuffer(w, h, self.bufLength, self.dropPolicy)
+        self.outRing = _MBRT_RingBuffer(w, h, self.bufLength, self.dropPolicy)
+        for target in [self.acquisitionStage, self.processStage]:
+            worker = threading.Thread(target=target)
+            worker.daemon = True
+            self.workers.append(worker)
+            worker.start()
+
+        while not self.mustStop:
+
+            # Screen events handling
+            self.handleScreenEvents()
+            # Console commands queue handling
+            self.handleQueueCommands()
+
+            # Waiting for a processed frame (at most one period)
+            frame = self.outRing.fetch(self.period)
+            if frame==None:
+                continue
+            t0 = time.time()
+            mamba.copy(frame.red, self.red)
+            if frame.color:
+                mamba.copy(frame.green, self.green)
+                mamba.copy(frame.blue, self.blue)
+            stamp = frame.stamp
+            self.outRing.release(frame)
+
+            # Display the results into the screen
+            self.displayResult()
+            # Then eventually display info on it
+            self.displayInfo()
+
+            # records the picture if activated
+            if self.recOn:
+                self.recordResult()
+            t1 = time.time()
+            self.stats["display"].update(t0, t1)
+            self.endToEnd.update(stamp, t1)
+
+    def acquisitionStage(self):
+        # Acquisition stage of the pipelined mode. The stage keeps the
+        # acquisition framerate whatever the time spent in the next stages.
+        timeIndex = time.time()
+        while not self.mustStop:
+            if not self.pauseOn:
+                frame = self.inRing.reserve(self.isStopping)
+                t0 = time.time()
+                frame.color = self.colorOn
+                if frame.color:
+                    err = core.MBRT_GetColorImageFromAcq(frame.red.mbIm,
+                                                         frame.green.mbIm,
+                                                         frame.blue.mbIm)
+                else:
+                    err = core.MBRT_GetImageFromAcq(frame.red.mbIm)
+                if err!=core.MBRT_NO_ERR:
+                    self.error = core.MBRT_StrErr(err)
+                    self.mustStop = True
+                    break
+                frame.stamp = t0
+                self.inRing.publish(frame)
+                self.stats["acquisition"].update(t0, time.time())
+
+            # framerate control
+            t = time.time()
+            timeIndex = timeIndex+self.period
+            dt = timeIndex-t
+            if dt>0:
+                time.sleep(dt)
+            else:
+                timeIndex = t
+                time.sleep(0.001)
+
+    def processStage(self):
+        # Process stage of the pipelined mode. The acquired frame is stored
+        # inside the sequences before the process chain is applied on it.
+        while not self.mustStop:
+            frame = self.inRing.fetch(0.1)
+            if frame==None:
+                continue
+            t0 = time.time()
+            if self.seqReset or frame.color!=self.colorOn:
+                self.redSeq.reset()
+                self.greenSeq.reset()
+                self.blueSeq.reset()
+                self.seqIndex = 0
+                self.seqReset = False
+            mamba.copy(frame.red, self.redSeq[self.seqIndex])
+            if frame.color:
+                mamba.copy(frame.green, self.greenSeq[self.seqIndex])
+                mamba.copy(frame.blue, self.blueSeq[self.seqIndex])
+            color = frame.color
+            stamp = frame.stamp
+            self.inRing.release(frame)
+
+            out = self.outRing.reserve(self.isStopping)
+            out.color = color
+            out.stamp = stamp
+            self.handleProcess(out.red, out.green, out.blue, color)
+            self.outRing.publish(out)
+            self.stats["process"].update(t0, time.time())
+
+            # sequence index update
+            self.seqIndex = (self.seqIndex+1)%self.seqDepth
+
+    def isStopping(self):
+        # Returns True when the thread is asked to stop
+        return self.mustStop
+
     # INIT and END #############################################################
 
     def initAcquisition(self):
@@ -262,6 +560,9 @@ class _MBRT_Thread(threading.Thread):
             
     def closeAll(self):
         # Closes all the created strcutures and components
+        self.mustStop = True
+        for worker in self.workers:
+            worker.join()
         if self.displayCreated:
             core.MBRT_DestroyDisplay()
         core.MBRT_StopAcq()
@@ -345,12 +646,7 @@ class _MBRT_Thread(threading.Thread):
                 elif item.value=="pause":
                     self.pauseOn = not self.pauseOn
                 elif item.value=="color":
-                    if not self.pauseOn:
-                        self.colorOn = not self.colorOn
-                        self.redSeq.reset()
-                        self.greenSeq.reset()
-                        self.blueSeq.reset()
-                        self.seqIndex = 0
+                    self.switchColor()
             elif item.type == _PICTURE:
                 # Takes a snapshot
                 try:
@@ -364,6 +660,9 @@ class _MBRT_Thread(threading.Thread):
             elif item.type == _ERR_DEL:
                 # Erases the error stored
                 self.error = ""
+            elif item.type == _STAT_RST:
+                # Resets the stages measures
+                self.resetStatistics()
             else:
                 # Error
                 self.error = "Unknown command sent to the display thread"
@@ -387,13 +686,21 @@ class _MBRT_Thread(threading.Thread):
         elif event_code == core.EVENT_PALETTE:
             self.setPaletteDisplay()
         elif event_code == core.EVENT_COLOR:
-            if not self.pauseOn:
-                self.colorOn = not self.colorOn
+            self.switchColor()
+
+    def switchColor(self):
+        # Toggles the color mode, the sequences are reset
+        if not self.pauseOn:
+            self.colorOn = not self.colorOn
+            if self.pipelined:
+                # The sequences belong to the process stage which resets them
+                self.seqReset = True
+            else:
                 self.redSeq.reset()
                 self.greenSeq.reset()
                 self.blueSeq.reset()
                 self.seqIndex = 0
-            
+
     def waitFrame(self):
         # Waits the required amount of time to ensure the framerate
             
@@ -410,38 +717,21 @@ class _MBRT_Thread(threading.Thread):
     
     # PROCESS and ERRORS #######################################################
     
-    def handleProcess(self):
+    def handleProcess(self, red=None, green=None, blue=None, colorOn=None):
         # Manages the process applied to the acquired images.
+        # The results are put into the given images (by default the images
+        # displayed).
+        if red==None:
+            red, green, blue = self.red, self.green, self.blue
+        if colorOn==None:
+            colorOn = self.colorOn
         if self.procOn and self.procList!=[]:
             for index, procCtx in enumerate(self.procList):
                 try:
-                    if self.procType==SEQUENTIAL and index==0:
-                        if self.colorOn:
-                            args = (self.redSeq, self.greenSeq, self.blueSeq,
-                                    self.seqIndex,
-                                    self.red, self.green, self.blue) + procCtx[1]
-                        else:
-                            args = (self.redSeq, self.seqIndex, self.red) + procCtx[1]
-                    elif index==0:
-                        if self.colorOn:
-                            args = (self.redSeq[self.seqIndex],
-                                    self.greenSeq[self.seqIndex],
-                                    self.blueSeq[self.seqIndex],
-                                    self.red,
-                                    self.green,
-                                    self.blue) + procCtx[1]
-                        else:
-                            args = (self.redSeq[self.seqIndex], self.red) + procCtx[1]
-                    else:
-                        if self.colorOn:
-                            args = (self.red,
-                                    self.green,
-                                    self.blue,
-                                    self.red,
-                                    self.green,
-                                    self.blue) + procCtx[1]
-                        else:
-                            args = (self.red, self.red) + procCtx[1]
+                    args = _processArgs(self.procType, index, colorOn,
+                                        self.redSeq, self.greenSeq,
+                                        self.blueSeq, self.seqIndex,
+                                        red, green, blue) + procCtx[1]
                     procCtx[0](*args, **procCtx[2])
                 except TclError:
                     self.error = "exception in realtime 'process' - Please check for any activated display and remove it"
@@ -458,12 +748,12 @@ class _MBRT_Thread(threading.Thread):
                     self.procOn = False
                     break
         else:
-            if self.colorOn:
-                mamba.copy(self.redSeq[self.seqIndex], self.red)
-                mamba.copy(self.greenSeq[self.seqIndex], self.green)
-                mamba.copy(self.blueSeq[self.seqIndex], self.blue)
+            if colorOn:
+                mamba.copy(self.redSeq[self.seqIndex], red)
+                mamba.copy(self.greenSeq[self.seqIndex], green)
+                mamba.copy(self.blueSeq[self.seqIndex], blue)
             else:
-                mamba.copy(self.redSeq[self.seqIndex], self.red)
+                mamba.copy(self.redSeq[self.seqIndex], red)
     
     # DISPLAY and ACQUISITION ##################################################
 
@@ -533,14 +823,39 @@ class _MBRT_Thread(threading.Thread):
         # Returns the error value
         return self.error[:]
 
+    def getStatistics(self):
+        # Returns the latency and framerate of each stage
+        stats = {}
+        for stage in _STAGES:
+            stats[stage] = self.stats[stage].get()
+        stats["total"] = self.endToEnd.get()
+        if self.pipelined and self.inRing!=None:
+            stats["dropped"] = self.inRing.dropped + self.outRing.dropped
+        else:
+            stats["dropped"] = 0
+        return stats
+
+    def resetStatistics(self):
+        # Resets the measures of the stages
+        for stage in _STAGES:
+            self.stats[stage].reset()
+        self.endToEnd.reset()
+        if self.pipelined and self.inRing!=None:
+            self.inRing.dropped = 0
+            self.outRing.dropped = 0
+
 _com_queue = queue.Queue()
 _display_thread = None
+# Chain of processes registered by setProcess/addProcess (used by benchmark)
+_proc_type = None
+_proc_list = []
 
 ################################################################################
 # Functions
 ################################################################################
 
-def launch(device, devType, seqlength=10):
+def launch(device, devType, seqlength=10, pipelined=False, buflength=3,
+           droppolicy=DROP_OLDEST):
     """
     Initializes and activates the realtime module using 'device' for the 
     acquisition.
@@ -550,10 +865,11 @@ def launch(device, devType, seqlength=10):
     This function is similar to calling successively initialize and
     activate.
     """
-    initialize(device, devType, seqlength)
+    initialize(device, devType, seqlength, pipelined, buflength, droppolicy)
     activate()
 
-def initialize(device, devType, seqlength=10):
+def initialize(device, devType, seqlength=10, pipelined=False, buflength=3,
+               droppolicy=DROP_OLDEST):
     """
     Initializes the realtime module using 'device' for the acquisition.
     'devType' indicates the type of the device (either V4L2(linux), DSHOW(windows) or AVC).
@@ -562,6 +878,15 @@ def initialize(device, devType, seqlength=10):
     'seqlength' controls the length of the image sequence the thread is
     filling with the acquisition image. This sequence can be used in computation
     as an input.
+    
+    When 'pipelined' is True, the acquisition, the process and the display
+    are performed by separate stages running concurrently. The stages are
+    connected by ring buffers holding 'buflength' preallocated images. Thus
+    the acquisition keeps its framerate even when a frame takes longer to
+    process. 'droppolicy' tells what happens when a buffer is full: the oldest
+    waiting frame is dropped (DROP_OLDEST), the newest frame is dropped
+    (DROP_NEWEST) or the producing stage waits (BLOCK). See getStatistics
+    to monitor the stages.
     """
     global _display_thread
 
@@ -589,7 +914,8 @@ def initialize(device, devType, seqlength=10):
     if err!=core.MBRT_NO_ERR:
         raise MambaRealtimeError(core.MBRT_StrErr(err))
 
-    _display_thread = _MBRT_Thread(_com_queue,seqlength)
+    _display_thread = _MBRT_Thread(_com_queue, seqlength, pipelined, buflength,
+                                   droppolicy)
 
 def activate():
     """
@@ -654,6 +980,32 @@ def getError():
             _com_queue.put(item)
         return err
 
+def getStatistics():
+    """
+    Returns a dictionary holding the measures made on the stages of the 
+    realtime thread. Keys "acquisition", "process" and "display" give for
+    each stage a tuple holding its latency (average time in seconds spent on
+    a frame) and its framerate. Key "total" gives the same tuple for the
+    whole chain (from the acquisition of a frame to its display). Key 
+    "dropped" gives the number of frames dropped by the pipelined mode.
+    
+    The function returns None if the realtime module is not initialized.
+    """
+    global _display_thread
+    if not _display_thread:
+        return None
+    return _display_thread.getStatistics()
+
+def resetStatistics():
+    """
+    Resets the measures made on the stages of the realtime thread (see
+    getStatistics).
+    """
+    global _display_thread, _com_queue
+    if _display_thread and _display_thread.isAlive():
+        item = _MBRT_Item(_STAT_RST, None)
+        _com_queue.put(item)
+
 def getSize():
     """
     Returns a tuple containing the size of the images acquired and displayed
@@ -703,8 +1055,14 @@ def setProcess(process, type, *args, **kwargs):
     is color (or the reverse) is not allowed.
     
     Take also care to remove any display activation (show method).
+    
+    The process is registered even when the realtime is not activated so that
+    it can be used by the benchmark function.
     """
-    global _display_thread, _com_queue
+    global _display_thread, _com_queue, _proc_type, _proc_list
+    if type==INSTANT or type==SEQUENTIAL:
+        _proc_list = [[process, args, kwargs]]
+        _proc_type = type
     if _display_thread and _display_thread.isAlive():
         item = _MBRT_Item(_PROC_SET, process, [type, args, kwargs])
         _com_queue.put(item)
@@ -731,7 +1089,10 @@ def addProcess(process, *args, **kwargs):
     
     Take also care to remove any display activation (show method).
     """
-    global _display_thread, _com_queue
+    global _display_thread, _com_queue, _proc_type, _proc_list
+    if _proc_list==[]:
+        _proc_type = INSTANT
+    _proc_list.append([process, args, kwargs])
     if _display_thread and _display_thread.isAlive():
         item = _MBRT_Item(_PROC_ADD, process, [INSTANT, args, kwargs])
         _com_queue.put(item)
@@ -741,7 +1102,9 @@ def resetProcess():
     Resets the realtime thread so that no process (treatment) is applied to the 
     images acquired and displayed.
     """
-    global _display_thread, _com_queue
+    global _display_thread, _com_queue, _proc_type, _proc_list
+    _proc_list = []
+    _proc_type = None
     if _display_thread and _display_thread.isAlive():
         item = _MBRT_Item(_PROC_RST, None)
         _com_queue.put(item)
@@ -808,3 +1171,107 @@ def togglePause():
     if _display_thread and _display_thread.isAlive():
         item = _MBRT_Item(_ORDER, "pause")
         _com_queue.put(item)
+
+def benchmark(path, frames=100, color=False, seqlength=10, warmup=5):
+    """
+    Runs the chain of processes registered with setProcess and addProcess on
+    the video file 'path' without any display and without framerate control
+    (each frame is processed as soon as the previous one is finished). This
+    mode does not require a screen or a camera and can be used to evaluate
+    the hardware needed by a process or to check its performances.
+    
+    'frames' is the number of frames processed and measured (the video is
+    rewound when its end is reached). The first 'warmup' frames are processed
+    but not measured. Color processes are used when 'color' is True.
+    'seqlength' is the length of the image sequence given to SEQUENTIAL
+    processes.
+    
+    The function returns a dictionary holding the measures in seconds. Keys
+    "acquisition", "process" and "frame" (acquisition and process) give
+    the latency percentiles of each frame, key "processes" gives a list
+    holding, for each process of the chain, its name and its latency
+    percentiles. Percentiles are dictionaries with keys 50, 90, 99, "min"
+    and "max". Key "fps" gives the framerate that was obtained.
+    
+    The realtime module must not be activated when calling this function.
+    """
+    global _display_thread, _proc_type, _proc_list
+
+    if _display_thread and _display_thread.isAlive():
+        raise MambaRealtimeError("Realtime is already initialized and running")
+
+    core.MBRT_DestroyContext()
+    err = core.MBRT_CreateContext()
+    if err!=core.MBRT_NO_ERR:
+        raise MambaRealtimeError(core.MBRT_StrErr(err))
+    try:
+        err = core.MBRT_CreateVideoAcq(path, AVC)
+        if err!=core.MBRT_NO_ERR:
+            raise MambaRealtimeError(core.MBRT_StrErr(err))
+        err,w,h = core.MBRT_GetAcqSize()
+        if err!=core.MBRT_NO_ERR:
+            raise MambaRealtimeError(core.MBRT_StrErr(err))
+        core.MBRT_StartAcq()
+
+        red = mamba.imageMb(w,h)
+        green = mamba.imageMb(w,h)
+        blue = mamba.imageMb(w,h)
+        redSeq = mamba3D.sequenceMb(w,h,seqlength)
+        greenSeq = mamba3D.sequenceMb(w,h,seqlength)
+        blueSeq = mamba3D.sequenceMb(w,h,seqlength)
+        seqIndex = 0
+        procList = list(_proc_list)
+        acqTimes = []
+        procTimes = []
+        frameTimes = []
+        chainTimes = [[] for procCtx in procList]
+
+        start = time.time()
+        for n in range(warmup+frames):
+            if n==warmup:
+                start = time.time()
+            t0 = time.time()
+            if color:
+                err = core.MBRT_GetColorImageFromAcq(redSeq[seqIndex].mbIm,
+                                                     greenSeq[seqIndex].mbIm,
+                                                     blueSeq[seqIndex].mbIm)
+            else:
+                err = core.MBRT_GetImageFromAcq(redSeq[seqIndex].mbIm)
+            if err!=core.MBRT_NO_ERR:
+                raise MambaRealtimeError(core.MBRT_StrErr(err))
+            t1 = time.time()
+            steps = []
+            for index, procCtx in enumerate(procList):
+                args = _processArgs(_proc_type, index, color,
+                                    redSeq, greenSeq, blueSeq, seqIndex,
+                                    red, green, blue) + procCtx[1]
+                ts = time.time()
+                procCtx[0](*args, **procCtx[2])
+                steps.append(time.time()-ts)
+            t2 = time.time()
+            if n>=warmup:
+                acqTimes.append(t1-t0)
+                procTimes.append(t2-t1)
+                frameTimes.append(t2-t0)
+                for i, dt in enumerate(steps):
+                    chainTimes[i].append(dt)
+            seqIndex = (seqIndex+1)%seqlength
+        duration = time.time()-start
+    finally:
+        core.MBRT_StopAcq()
+        core.MBRT_DestroyVideoAcq()
+        core.MBRT_DestroyContext()
+
+    results = {}
+    results["acquisition"] = _percentiles(acqTimes)
+    results["process"] = _percentiles(procTimes)
+    results["frame"] = _percentiles(frameTimes)
+    results["processes"] = []
+    for procCtx, times in zip(procList, chainTimes):
+        name = getattr(procCtx[0], "__name__", str(procCtx[0]))
+        results["processes"].append((name, _percentiles(times)))
+    if duration>0:
+        results["fps"] = frames/duration
+    else:
+        results["fps"] = 0.0
+    return results
@@ -40,6 +40,7 @@ if platform.system()=='Linux':
     MBRT_SRC_EXT = ".c"
     MBRT_SWIG_OPTS = ['-I./include',
                       '-I/usr/include/ffmpeg',
+                      '-threads',
                       '-outdir','python/mambaRealtime']
     MBRT_INC_DIRS = ['./include',
                      '/usr/include/ffmpeg']
@@ -66,6 +67,7 @@ elif platform.system()=='Windows':
     MBRT_SWIG_OPTS = ['-I./include',
                       '-DMBRT_WIN',
                       '-c++',
+                      '-threads',
                       '-outdir','python/mambaRealtime/']
     MBRT_INC_DIRS = ['./include',
                      '../../include',
@@ -0,0 +1,139 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+#include "MB3D_Lines.h"
+
+/*
+ * Reads the value of a pixel of an image.
+ * \param src the image
+ * \param x position in x of the pixel
+ * \param y position in y of the pixel
+ * \return the value of the pixel
+ */
+static INLINE PIX32 READ_PIXEL(MB_Image *src, Uint32 x, Uint32 y)
+{
+    switch(src->depth) {
+    case 1:
+        return (PIX32) ((((MB_Vector1 *) (src->plines[y]))[x/MB_vec1_size]>>(x%MB_vec1_size))&1);
+    case 8:
+        return (PIX32) ((PIX8 *) (src->plines[y]))[x];
+    default:
+        return ((PIX32 *) (src->plines[y]))[x];
+    }
+}
+
+
+/*
+ * Extracts an orthogonal slice of a 3D image into a 2D image.
+ * The slice is written in the upper left corner of the destination image
+ * which can be larger than the slice (the other pixels are not modified).
+ * The slice size is (length,height) for axis 0 (X), (width,length) for
+ * axis 1 (Y) and (width,height) for axis 2 (Z). In the X slice, the
+ * horizontal position is the position in the 3D image sequence.
+ * The destination image must have the same depth than the 3D image or be
+ * an 8-bit image when the 3D image is binary (values 0 and 255) or 32-bit.
+ * \param src the 3D source image
+ * \param axis the axis orthogonal to the slice (0 for X, 1 for Y, 2 for Z)
+ * \param index the position of the slice along the axis
+ * \param dest the 2D destination image
+ * \param plane the byte plane extracted when converting 32-bit values into
+ * 8-bit values (0 to 3) or 4 to downscale the values using maxval
+ * \param maxval the maximum value used to downscale 32-bit values (when
+ * lower than 256 the values are not scaled)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_ExtractSlice(MB3D_Image *src, Uint32 axis, Uint32 index,
+                             MB_Image *dest, Uint32 plane, Uint32 maxval)
+{
+    Uint32 depth, sw, sh, r, z;
+    MB_Image *si;
+    PIX32 *values;
+
+    if (src->length==0) {
+        return MB_ERR_BAD_SIZE;
+    }
+    si = src->seq[0];
+    depth = si->depth;
+
+    /* Size of the slice */
+    switch(axis) {
+    case 0:
+        if (index>=si->width) return MB_ERR_BAD_VALUE;
+        sw = src->length;
+        sh = si->height;
+        break;
+    case 1:
+        if (index>=si->height) return MB_ERR_BAD_VALUE;
+        sw = si->width;
+        sh = src->length;
+        break;
+    case 2:
+        if (index>=src->length) return MB_ERR_BAD_VALUE;
+        sw = si->width;
+        sh = si->height;
+        break;
+    default:
+        return MB_ERR_BAD_PARAMETER;
+    }
+    if (dest->width<sw || dest->height<sh) {
+        return MB_ERR_BAD_SIZE;
+    }
+
+    /* Verification over the conversion */
+    if (dest->depth!=depth && !(dest->depth==8 && (depth==1 || depth==32))) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if (plane>4) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+
+    values = MB_malloc(sw*sizeof(PIX32));
+    if (values==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    for(r=0; r<sh; r++) {
+        switch(axis) {
+        case 0:
+            for(z=0; z<sw; z++) {
+                values[z] = READ_PIXEL(src->seq[z], index, r);
+            }
+            break;
+        case 1:
+            READ_LINE(src->seq[r], index, values, sw);
+            break;
+        default:
+            READ_LINE(src->seq[index], r, values, sw);
+            break;
+        }
+        WRITE_LINE(dest, r, values, sw, depth, plane, maxval);
+    }
+
+    MB_free(values);
+
+    return MB_NO_ERR;
+}
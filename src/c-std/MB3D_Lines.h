@@ -0,0 +1,127 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+
+/* This file holds the line access helpers shared by the 3D operators
+ * converting between 3D sequences and 2D images.
+ * It is used by the following files :
+ *    MB3D_ExtractSlice.c
+ *    MB3D_Project.c
+ */
+#ifndef MB3D_LINES_H
+#define MB3D_LINES_H
+
+/*
+ * Reads the values of the pixels of a line of an image.
+ * \param src the image
+ * \param y the line read
+ * \param values the array receiving the values
+ * \param nb the number of values read
+ */
+static INLINE void READ_LINE(MB_Image *src, Uint32 y, PIX32 *values, Uint32 nb)
+{
+    Uint32 i;
+    MB_Vector1 *pin1;
+    PIX8 *pin8;
+
+    switch(src->depth) {
+    case 1:
+        pin1 = (MB_Vector1 *) (src->plines[y]);
+        for(i=0; i<nb; i++) {
+            values[i] = (PIX32) ((pin1[i/MB_vec1_size]>>(i%MB_vec1_size))&1);
+        }
+        break;
+    case 8:
+        pin8 = (PIX8 *) (src->plines[y]);
+        for(i=0; i<nb; i++) {
+            values[i] = (PIX32) pin8[i];
+        }
+        break;
+    default:
+        MB_memcpy(values, src->plines[y], nb*sizeof(PIX32));
+        break;
+    }
+}
+
+/*
+ * Writes the values inside a line of the destination image, converting
+ * them if needed.
+ * \param dest the image
+ * \param y the line written
+ * \param values the values written
+ * \param nb the number of values written
+ * \param depth the depth of the source 3D image
+ * \param plane the byte plane extracted when converting 32-bit values (4 for all)
+ * \param maxval the value used for downscaling 32-bit values
+ */
+static INLINE void WRITE_LINE(MB_Image *dest, Uint32 y, PIX32 *values, Uint32 nb,
+                              Uint32 depth, Uint32 plane, Uint32 maxval)
+{
+    Uint32 i;
+    MB_Vector1 *pout1;
+    PIX8 *pout8;
+    double multiplicator, value;
+
+    switch(dest->depth) {
+    case 1:
+        pout1 = (MB_Vector1 *) (dest->plines[y]);
+        for(i=0; i<nb; i++) {
+            if (values[i]) {
+                pout1[i/MB_vec1_size] |= ((MB_Vector1) 1L)<<(i%MB_vec1_size);
+            } else {
+                pout1[i/MB_vec1_size] &= ~(((MB_Vector1) 1L)<<(i%MB_vec1_size));
+            }
+        }
+        break;
+    case 8:
+        pout8 = (PIX8 *) (dest->plines[y]);
+        if (depth==1) {
+            for(i=0; i<nb; i++) {
+                pout8[i] = values[i] ? 255 : 0;
+            }
+        } else if (depth==8 || plane==0 || (plane==4 && maxval<256)) {
+            for(i=0; i<nb; i++) {
+                pout8[i] = (PIX8) values[i];
+            }
+        } else if (plane<4) {
+            for(i=0; i<nb; i++) {
+                pout8[i] = (PIX8) (values[i]>>(8*plane));
+            }
+        } else {
+            /* Downscaling as done in the conversion functions */
+            multiplicator = ((double) 255.0)/maxval;
+            for(i=0; i<nb; i++) {
+                value = values[i] * multiplicator;
+                pout8[i] = (PIX8) value;
+            }
+        }
+        break;
+    default:
+        MB_memcpy(dest->plines[y], values, nb*sizeof(PIX32));
+        break;
+    }
+}
+
+#endif /* MB3D_LINES_H */
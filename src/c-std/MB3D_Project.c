@@ -0,0 +1,265 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+#include "MB3D_Lines.h"
+
+/*
+ * Combines the values of a line into the accumulated values.
+ * \param acc the accumulated values
+ * \param values the values of the line
+ * \param nb the number of values
+ * \param op the reduction
+ */
+static INLINE void COMBINE_LINE(PIX32 *acc, PIX32 *values, Uint32 nb,
+                                enum MB3D_projection_t op)
+{
+    Uint32 i;
+
+    switch(op) {
+    case MB3D_PROJ_MAX:
+        for(i=0; i<nb; i++) {
+            acc[i] = values[i]>acc[i] ? values[i] : acc[i];
+        }
+        break;
+    case MB3D_PROJ_MIN:
+        for(i=0; i<nb; i++) {
+            acc[i] = values[i]<acc[i] ? values[i] : acc[i];
+        }
+        break;
+    case MB3D_PROJ_SUM:
+        for(i=0; i<nb; i++) {
+            acc[i] += values[i];
+        }
+        break;
+    default:
+        for(i=0; i<nb; i++) {
+            acc[i] += (values[i]!=0);
+        }
+        break;
+    }
+}
+
+/*
+ * Reduces the values of a line into a single value.
+ * \param values the values of the line
+ * \param nb the number of values
+ * \param op the reduction
+ * \return the reduced value
+ */
+static INLINE PIX32 REDUCE_LINE(PIX32 *values, Uint32 nb, enum MB3D_projection_t op)
+{
+    Uint32 i;
+    PIX32 acc;
+
+    acc = values[0];
+    switch(op) {
+    case MB3D_PROJ_MAX:
+        for(i=1; i<nb; i++) {
+            acc = values[i]>acc ? values[i] : acc;
+        }
+        break;
+    case MB3D_PROJ_MIN:
+        for(i=1; i<nb; i++) {
+            acc = values[i]<acc ? values[i] : acc;
+        }
+        break;
+    case MB3D_PROJ_SUM:
+        for(i=1; i<nb; i++) {
+            acc += values[i];
+        }
+        break;
+    default:
+        acc = 0;
+        for(i=0; i<nb; i++) {
+            acc += (values[i]!=0);
+        }
+        break;
+    }
+    return acc;
+}
+
+/*
+ * Projects a 3D image along an axis into a 2D image by reducing the values
+ * met along the axis (maximum, minimum, sum or count of non-zero values).
+ * The projection is written in the upper left corner of the destination
+ * image which can be larger (the other pixels are not modified).
+ * The projection size is (length,height) for axis 0 (X), (width,length)
+ * for axis 1 (Y) and (width,height) for axis 2 (Z). In the X projection, the
+ * horizontal position is the position in the 3D image sequence.
+ * The sum is computed modulo 2^32 as in the 32-bit addition.
+ * \param src the 3D source image
+ * \param axis the projection axis (0 for X, 1 for Y, 2 for Z)
+ * \param op the reduction
+ * \param dest the 2D destination image (same depth as src for the maximum
+ * and minimum, 32-bit for the sum and the count)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Project(MB3D_Image *src, Uint32 axis, enum MB3D_projection_t op, MB_Image *dest)
+{
+    Uint32 W, H, L, sw, sh, r, i;
+    PIX32 *values, *acc;
+
+    if (src->length==0) {
+        return MB_ERR_BAD_SIZE;
+    }
+    W = src->seq[0]->width;
+    H = src->seq[0]->height;
+    L = src->length;
+
+    /* Size of the projection */
+    switch(axis) {
+    case 0:
+        sw = L;
+        sh = H;
+        break;
+    case 1:
+        sw = W;
+        sh = L;
+        break;
+    case 2:
+        sw = W;
+        sh = H;
+        break;
+    default:
+        return MB_ERR_BAD_PARAMETER;
+    }
+    if (dest->width<sw || dest->height<sh) {
+        return MB_ERR_BAD_SIZE;
+    }
+
+    /* Verification over the depth */
+    switch(op) {
+    case MB3D_PROJ_MAX:
+    case MB3D_PROJ_MIN:
+        if (dest->depth!=src->seq[0]->depth) return MB_ERR_BAD_DEPTH;
+        break;
+    case MB3D_PROJ_SUM:
+    case MB3D_PROJ_COUNT:
+        if (dest->depth!=32) return MB_ERR_BAD_DEPTH;
+        break;
+    default:
+        return MB_ERR_BAD_PARAMETER;
+    }
+
+    values = MB_malloc(W*sizeof(PIX32));
+    acc = MB_malloc(((W>L) ? W : L)*sizeof(PIX32));
+    if (values==NULL || acc==NULL) {
+        MB_free(values);
+        MB_free(acc);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    for(r=0; r<sh; r++) {
+        switch(axis) {
+        case 0:
+            /* Each line y of each plane is reduced to a single value */
+            for(i=0; i<L; i++) {
+                READ_LINE(src->seq[i], r, values, W);
+                acc[i] = REDUCE_LINE(values, W, op);
+            }
+            break;
+        case 1:
+            /* All the lines of plane r are combined */
+            READ_LINE(src->seq[r], 0, acc, W);
+            if (op==MB3D_PROJ_COUNT) {
+                for(i=0; i<W; i++) acc[i] = (acc[i]!=0);
+            }
+            for(i=1; i<H; i++) {
+                READ_LINE(src->seq[r], i, values, W);
+                COMBINE_LINE(acc, values, W, op);
+            }
+            break;
+        default:
+            /* Line r of all the planes are combined */
+            READ_LINE(src->seq[0], r, acc, W);
+            if (op==MB3D_PROJ_COUNT) {
+                for(i=0; i<W; i++) acc[i] = (acc[i]!=0);
+            }
+            for(i=1; i<L; i++) {
+                READ_LINE(src->seq[i], r, values, W);
+                COMBINE_LINE(acc, values, W, op);
+            }
+            break;
+        }
+        WRITE_LINE(dest, r, acc, sw, dest->depth, 0, 0);
+    }
+
+    MB_free(values);
+    MB_free(acc);
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Computes the volume (sum of all the pixel values) of a 3D image.
+ * \param src the 3D image
+ * \param pVolume the computed volume
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Volume(MB3D_Image *src, Uint64 *pVolume)
+{
+    MB_errcode err;
+    Uint64 volume;
+    Uint32 i;
+
+    *pVolume = 0;
+    for(i=0; i<src->length; i++) {
+        err = MB_Volume(src->seq[i], &volume);
+        if (err!=MB_NO_ERR) {
+            return err;
+        }
+        *pVolume += volume;
+    }
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Computes the range (minimum and maximum pixel values) of a 3D image.
+ * \param src the 3D image
+ * \param min the minimum value
+ * \param max the maximum value
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_Range(MB3D_Image *src, Uint32 *min, Uint32 *max)
+{
+    MB_errcode err;
+    Uint32 mi, ma, i;
+
+    if (src->length==0) {
+        return MB_ERR_BAD_SIZE;
+    }
+
+    err = MB_Range(src->seq[0], min, max);
+    for(i=1; i<src->length && err==MB_NO_ERR; i++) {
+        err = MB_Range(src->seq[i], &mi, &ma);
+        *min = mi<*min ? mi : *min;
+        *max = ma>*max ? ma : *max;
+    }
+
+    return err;
+}
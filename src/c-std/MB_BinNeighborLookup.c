@@ -0,0 +1,287 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+
+/*
+ * Computes the configuration codes of a line and maps them through the
+ * table (8-bit and 32-bit results).
+ * \param lines the line above, the line and the line below (or a line filled
+ * with the edge value outside the image)
+ * \param nbw the number of words inside a line
+ * \param dir the offsets (x and y) of the neighbors
+ * \param nbdir the number of neighbors
+ * \param ptable the table
+ * \param center 1 if the table takes the center pixel into account, 0 if it
+ * is only used for the pixels set to true
+ * \param edge the edge value
+ * \param pout the output line
+ * \param depth the depth of the output line
+ */
+static INLINE void LOOKUP_LINE(MB_Vector1 **lines, int nbw,
+                               const int (*dir)[2], Uint32 nbdir, Uint32 *ptable,
+                               int center, MB_Vector1 edge, PLINE pout,
+                               Uint32 depth)
+{
+    MB_Vector1 shifted[9], neighbors[9], left, cur, right, any, mask;
+    Uint32 d, b, code, value;
+    int i, w;
+
+    for(w=0; w<nbw; w++) {
+        /* Values of the 3x3 neighborhood of each pixel of the word */
+        any = 0;
+        for(i=0; i<3; i++) {
+            left = (w>0) ? lines[i][w-1] : edge;
+            cur = lines[i][w];
+            right = (w<nbw-1) ? lines[i][w+1] : edge;
+            shifted[3*i] = (cur<<1) | (left>>(MB_vec1_size-1));
+            shifted[3*i+1] = cur;
+            shifted[3*i+2] = (cur>>1) | (right<<(MB_vec1_size-1));
+            any |= shifted[3*i] | cur | shifted[3*i+2];
+        }
+        for(d=0; d<nbdir; d++) {
+            neighbors[d] = shifted[3*(dir[d][1]+1) + dir[d][0]+1];
+        }
+
+        /* Pixels whose code must be computed, the others take the value */
+        /* of code 0 when the center is used, 0 otherwise */
+        value = center ? ptable[0] : 0;
+        mask = center ? (any ? ~((MB_Vector1) 0) : 0) : neighbors[0];
+        if (depth==8) {
+            MB_memset(pout+w*MB_vec1_size, (PIX8) value, MB_vec1_size);
+        } else {
+            for(b=0; b<MB_vec1_size; b++) {
+                ((PIX32 *) pout)[w*MB_vec1_size+b] = value;
+            }
+        }
+
+        for(b=0; mask!=0; b++, mask>>=1) {
+            if ((mask&0xff)==0) {
+                /* skipping the bytes without pixels to compute */
+                b += 7;
+                mask >>= 7;
+                continue;
+            }
+            if ((mask&1)==0) continue;
+            code = 0;
+            for(d=1; d<nbdir; d++) {
+                code |= (Uint32) ((neighbors[d]>>b)&1) << (d-1);
+            }
+            if (center) {
+                code |= (Uint32) ((neighbors[0]>>b)&1) << (nbdir-1);
+            }
+            code = ptable[code];
+            if (depth==8) {
+                pout[w*MB_vec1_size+b] = (PIX8) code;
+            } else {
+                ((PIX32 *) pout)[w*MB_vec1_size+b] = code;
+            }
+        }
+    }
+}
+
+/*
+ * Builds the node of the decision diagram corresponding to a part of the
+ * table (binary results). The part is split according to its highest code
+ * bit. Nodes 0 and 1 are the constant results false and true, the other
+ * nodes are created after their children.
+ * \param ptable the table
+ * \param start the first code of the part
+ * \param size the number of codes in the part (a power of 2)
+ * \param nodes the nodes (variable, child for false, child for true)
+ * \param pnb_nodes pointer to the number of nodes
+ * \return the index of the node
+ */
+static int BUILD_NODE(Uint32 *ptable, Uint32 start, Uint32 size,
+                      int *nodes, int *pnb_nodes)
+{
+    Uint32 i, var;
+    int lo, hi, n;
+
+    for(i=1; i<size; i++) {
+        if ((ptable[start+i]!=0)!=(ptable[start]!=0)) break;
+    }
+    if (i==size) {
+        return (ptable[start]!=0);
+    }
+    lo = BUILD_NODE(ptable, start, size/2, nodes, pnb_nodes);
+    hi = BUILD_NODE(ptable, start+size/2, size/2, nodes, pnb_nodes);
+    if (lo==hi) {
+        return lo;
+    }
+    for(var=0; (1u<<(var+1))<size; var++);
+    for(n=2; n<*pnb_nodes; n++) {
+        if (nodes[3*n]==(int) var && nodes[3*n+1]==lo && nodes[3*n+2]==hi) {
+            return n;
+        }
+    }
+    nodes[3*n] = (int) var;
+    nodes[3*n+1] = lo;
+    nodes[3*n+2] = hi;
+    (*pnb_nodes)++;
+    return n;
+}
+
+/*
+ * Computes the binary results of the table for a line using its decision
+ * diagram (64 pixels at a time).
+ * \param lines the line above, the line and the line below (or a line filled
+ * with the edge value outside the image)
+ * \param nbw the number of words inside a line
+ * \param dir the offsets (x and y) of the neighbors
+ * \param nbdir the number of neighbors
+ * \param nodes the nodes of the decision diagram
+ * \param nb_nodes the number of nodes (the last one is the root)
+ * \param center 1 if the table takes the center pixel into account, 0 if it
+ * is only used for the pixels set to true
+ * \param edge the edge value
+ * \param values the values of the nodes
+ * \param pout the output line
+ */
+static INLINE void LOOKUP_LINE1(MB_Vector1 **lines, int nbw,
+                                const int (*dir)[2], Uint32 nbdir, int *nodes,
+                                int nb_nodes, int center, MB_Vector1 edge,
+                                MB_Vector1 *values, MB_Vector1 *pout)
+{
+    MB_Vector1 shifted[9], vars[9], left, cur, right;
+    Uint32 d;
+    int i, w, n;
+
+    for(w=0; w<nbw; w++) {
+        /* Values of the 3x3 neighborhood of each pixel of the word */
+        for(i=0; i<3; i++) {
+            left = (w>0) ? lines[i][w-1] : edge;
+            cur = lines[i][w];
+            right = (w<nbw-1) ? lines[i][w+1] : edge;
+            shifted[3*i] = (cur<<1) | (left>>(MB_vec1_size-1));
+            shifted[3*i+1] = cur;
+            shifted[3*i+2] = (cur>>1) | (right<<(MB_vec1_size-1));
+        }
+        /* bit d-1 of the code is the neighbor in direction d, the */
+        /* following one is the center */
+        for(d=1; d<nbdir; d++) {
+            vars[d-1] = shifted[3*(dir[d][1]+1) + dir[d][0]+1];
+        }
+        vars[nbdir-1] = shifted[4];
+
+        for(n=2; n<nb_nodes; n++) {
+            values[n] = (vars[nodes[3*n]] & values[nodes[3*n+2]]) |
+                        (~vars[nodes[3*n]] & values[nodes[3*n+1]]);
+        }
+        pout[w] = values[nb_nodes-1];
+        if (!center) {
+            pout[w] &= shifted[4];
+        }
+    }
+}
+
+/*
+ * Computes, for each pixel of a binary image, the configuration code of its
+ * neighbors and maps it through a lookup table. The code is the sum of
+ * 2^(d-1) for each direction d where the neighbor is set to true. With a
+ * table of 64 (hexagonal grid) or 256 (square grid) values, the pixels set to
+ * false are set to 0 in the destination. With a table of 128 or 512 values,
+ * the center pixel is taken into account and adds 64 or 256 to the code.
+ * \param src the binary source image
+ * \param dest the destination image (binary, 8-bit or 32-bit)
+ * \param ptable the table
+ * \param nb_values the number of values inside ptable
+ * \param grid the grid used
+ * \param edge the kind of edge
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_BinNeighborLookup(MB_Image *src, MB_Image *dest,
+                                Uint32 *ptable, Uint32 nb_values,
+                                enum MB_grid_t grid, enum MB_edgemode_t edge)
+{
+    MB_Vector1 *edge_line, *lines[3], edge_val, values[513];
+    const int (*dir)[2];
+    Uint32 nbdir;
+    int nodes[3*513];
+    int center, height, nbw, x, y, nb_nodes, root;
+
+    if (!MB_CHECK_SIZE_2(src, dest)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (src==dest) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    if (src->depth!=1 || (dest->depth!=1 && dest->depth!=8 && dest->depth!=32)) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    nbdir = (grid==MB_SQUARE_GRID) ? 9 : 7;
+    if (nb_values==(1u<<(nbdir-1))) {
+        center = 0;
+    } else if (nb_values==(1u<<nbdir)) {
+        center = 1;
+    } else {
+        return MB_ERR_BAD_PARAMETER;
+    }
+
+    height = (int) src->height;
+    nbw = (int) (src->width/MB_vec1_size);
+    edge_val = BIN_FILL_VALUE(edge);
+    edge_line = MB_malloc(nbw*sizeof(MB_Vector1));
+    if (edge_line==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    for(x=0; x<nbw; x++) {
+        edge_line[x] = edge_val;
+    }
+
+    if (dest->depth==1) {
+        /* The binary results are computed with a decision diagram */
+        nb_nodes = 2;
+        root = BUILD_NODE(ptable, 0, nb_values, nodes, &nb_nodes);
+        if (root!=nb_nodes-1) {
+            /* constant result */
+            nodes[3*nb_nodes] = 0;
+            nodes[3*nb_nodes+1] = root;
+            nodes[3*nb_nodes+2] = root;
+            nb_nodes++;
+        }
+        values[0] = 0;
+        values[1] = ~((MB_Vector1) 0);
+    }
+
+    for(y=0; y<height; y++) {
+        dir = (grid==MB_SQUARE_GRID) ? sqNbDir : hxNbDir[y%2];
+        lines[0] = (y>0) ? (MB_Vector1 *) src->plines[y-1] : edge_line;
+        lines[1] = (MB_Vector1 *) src->plines[y];
+        lines[2] = (y<height-1) ? (MB_Vector1 *) src->plines[y+1] : edge_line;
+        if (dest->depth==1) {
+            LOOKUP_LINE1(lines, nbw, dir, nbdir, nodes, nb_nodes, center,
+                         edge_val, values, (MB_Vector1 *) dest->plines[y]);
+        } else {
+            LOOKUP_LINE(lines, nbw, dir, nbdir, ptable, center, edge_val,
+                        dest->plines[y], dest->depth);
+        }
+    }
+
+    MB_free(edge_line);
+
+    return MB_NO_ERR;
+}
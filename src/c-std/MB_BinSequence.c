@@ -0,0 +1,384 @@
+/*
+ * Copyright (c) <2009>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+
+/*
+ * Computes the hit-or-miss result of a span of words of a binary image line.
+ * \param lines the line above, the line and the line below (or a line filled
+ * with the edge value outside the image)
+ * \param first the position of the first word of the span
+ * \param last the position of the last word of the span
+ * \param nbw the number of words inside a line
+ * \param cidx the positions inside the 3x3 neighborhood of the conditions
+ * \param cinv the conditions values (0 when the pixel must be true, all ones
+ * when it must be false)
+ * \param nbc the number of conditions
+ * \param edge the edge value
+ * \param hits the pixels of the line matching the structuring elements
+ */
+static INLINE void HIT_SPAN(MB_Vector1 **lines, int first, int last, int nbw,
+                            const int *cidx, const MB_Vector1 *cinv,
+                            Uint32 nbc, MB_Vector1 edge, MB_Vector1 *hits)
+{
+    MB_Vector1 *line, prev, next, inv;
+    Uint32 i;
+    int w;
+
+    for(w=first; w<=last; w++) {
+        hits[w] = ~((MB_Vector1) 0);
+    }
+    for(i=0; i<nbc; i++) {
+        line = lines[cidx[i]/3];
+        inv = cinv[i];
+        switch(cidx[i]%3) {
+        case 0:
+            /* left neighbor */
+            prev = (first>0) ? line[first-1] : edge;
+            for(w=first; w<=last; w++) {
+                hits[w] &= ((line[w]<<1) | (prev>>(MB_vec1_size-1))) ^ inv;
+                prev = line[w];
+            }
+            break;
+        case 1:
+            for(w=first; w<=last; w++) {
+                hits[w] &= line[w] ^ inv;
+            }
+            break;
+        default:
+            /* right neighbor */
+            for(w=first; w<last; w++) {
+                hits[w] &= ((line[w]>>1) | (line[w+1]<<(MB_vec1_size-1))) ^ inv;
+            }
+            next = (last<nbw-1) ? line[last+1] : edge;
+            hits[last] &= ((line[last]>>1) | (next<<(MB_vec1_size-1))) ^ inv;
+            break;
+        }
+    }
+}
+
+/*
+ * Converts a double structuring element into a list of conditions on the 3x3
+ * neighborhood of a pixel.
+ * \param es0 the directions which must be false
+ * \param es1 the directions which must be true
+ * \param grid the grid used
+ * \param odd 1 for the odd lines, 0 for the even lines
+ * \param cidx the positions inside the 3x3 neighborhood of the conditions
+ * \param cinv the conditions values
+ * \return the number of conditions
+ */
+static Uint32 MAKE_CONDITIONS(Uint32 es0, Uint32 es1, enum MB_grid_t grid,
+                              int odd, int *cidx, MB_Vector1 *cinv)
+{
+    const int (*dir)[2];
+    Uint32 d, nbdir, nbc = 0;
+
+    if (grid==MB_SQUARE_GRID) {
+        dir = sqNbDir;
+        nbdir = 9;
+    } else {
+        dir = hxNbDir[odd];
+        nbdir = 7;
+    }
+
+    for(d=0; d<nbdir; d++) {
+        if ((es0|es1)&(1<<d)) {
+            cidx[nbc] = 3*(dir[d][1]+1) + dir[d][0]+1;
+            cinv[nbc] = (es1&(1<<d)) ? 0 : ~((MB_Vector1) 0);
+            nbc++;
+        }
+    }
+    return nbc;
+}
+
+/*
+ * Appends a word index to the log of the changed words, enlarging it if
+ * needed.
+ * \param plog pointer to the log
+ * \param plen pointer to the number of entries inside the log
+ * \param pcap pointer to the capacity of the log
+ * \param index the index of the changed word
+ * \return 0 if the log could not be enlarged, 1 otherwise
+ */
+static INLINE int LOG_WORD(Uint32 **plog, Uint32 *plen, Uint32 *pcap, Uint32 index)
+{
+    Uint32 *log;
+
+    if (*plen==*pcap) {
+        log = MB_malloc(2*(*pcap)*sizeof(Uint32));
+        if (log==NULL) {
+            return 0;
+        }
+        MB_memcpy(log, *plog, (*plen)*sizeof(Uint32));
+        MB_free(*plog);
+        *plog = log;
+        *pcap = 2*(*pcap);
+    }
+    (*plog)[(*plen)++] = index;
+    return 1;
+}
+
+/*
+ * Applies a sequence of thinnings or thickenings to a binary image.
+ * The first application of each step examines the whole image. Afterwards,
+ * a step only examines, on each line, the span of words around the words
+ * changed (logged) since its previous application.
+ * \param srcdest the binary image
+ * \param pses the structuring elements (es0, es1 for each step)
+ * \param nb_ses the number of values inside pses
+ * \param nb_cycles the number of times the sequence is applied (0 until
+ * idempotence)
+ * \param grid the grid used
+ * \param edge the kind of edge
+ * \param thick 1 for thickenings, 0 for thinnings
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB_BinSequence(MB_Image *srcdest, Uint32 *pses, Uint32 nb_ses,
+                                 Uint32 nb_cycles, enum MB_grid_t grid,
+                                 enum MB_edgemode_t edge, int thick)
+{
+    Uint32 *log, *logpos, *rows, *stamp, *nbc;
+    Uint32 log_len, log_cap, minpos, nb_rows, nb_words, step, cycle, k, nb_dse, i;
+    int *first, *last, *cidx;
+    MB_Vector1 *hits, *line, *cinv, *edge_line, *lines[3], changed, edge_val;
+    MB_errcode err = MB_NO_ERR;
+    int height, nbw, x, y, ny, odd;
+    int cycle_changed;
+
+    if (srcdest->depth!=1) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if (nb_ses==0 || nb_ses%2!=0) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    nb_dse = nb_ses/2;
+    for(k=0; k<nb_dse; k++) {
+        if ((pses[2*k]&pses[2*k+1])!=0) {
+            return MB_ERR_BAD_PARAMETER;
+        }
+    }
+
+    height = (int) srcdest->height;
+    nbw = (int) (srcdest->width/MB_vec1_size);
+    nb_words = height*nbw;
+    edge_val = BIN_FILL_VALUE(edge);
+
+    /* log of the changed words and position in the log at the previous */
+    /* application of each step (0xffffffff before the first one) */
+    log_cap = nb_words;
+    log = MB_malloc(log_cap*sizeof(Uint32));
+    logpos = MB_malloc(nb_dse*sizeof(Uint32));
+    /* lines to examine with their span of words, stamp of the last step */
+    /* where a line was selected and hits of the selected spans */
+    rows = MB_malloc(height*sizeof(Uint32));
+    stamp = MB_malloc(height*sizeof(Uint32));
+    first = MB_malloc(height*sizeof(int));
+    last = MB_malloc(height*sizeof(int));
+    hits = MB_malloc(nb_words*sizeof(MB_Vector1));
+    /* conditions of each step for the even and odd lines and line used */
+    /* outside the image */
+    nbc = MB_malloc(2*nb_dse*sizeof(Uint32));
+    cidx = MB_malloc(18*nb_dse*sizeof(int));
+    cinv = MB_malloc(18*nb_dse*sizeof(MB_Vector1));
+    edge_line = MB_malloc(nbw*sizeof(MB_Vector1));
+    if (log==NULL || logpos==NULL || rows==NULL || stamp==NULL ||
+        first==NULL || last==NULL || hits==NULL || nbc==NULL ||
+        cidx==NULL || cinv==NULL || edge_line==NULL) {
+        MB_free(log);
+        MB_free(logpos);
+        MB_free(rows);
+        MB_free(stamp);
+        MB_free(first);
+        MB_free(last);
+        MB_free(hits);
+        MB_free(nbc);
+        MB_free(cidx);
+        MB_free(cinv);
+        MB_free(edge_line);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    for(k=0; k<nb_dse; k++) {
+        for(odd=0; odd<2; odd++) {
+            nbc[2*k+odd] = MAKE_CONDITIONS(pses[2*k], pses[2*k+1], grid, odd,
+                                           cidx+9*(2*k+odd), cinv+9*(2*k+odd));
+        }
+        logpos[k] = 0xffffffff;
+    }
+    for(x=0; x<nbw; x++) {
+        edge_line[x] = edge_val;
+    }
+    MB_memset(stamp, 0, height*sizeof(Uint32));
+    log_len = 0;
+
+    step = 0;
+    cycle = 0;
+    do {
+        cycle_changed = 0;
+        for(k=0; k<nb_dse && err==MB_NO_ERR; k++) {
+            step++;
+            /* Selection of the spans to examine */
+            nb_rows = 0;
+            if (logpos[k]>log_len) {
+                for(y=0; y<height; y++) {
+                    rows[nb_rows++] = y;
+                    first[y] = 0;
+                    last[y] = nbw-1;
+                }
+            } else {
+                for(i=logpos[k]; i<log_len; i++) {
+                    y = log[i]/nbw;
+                    x = log[i]%nbw;
+                    for(ny=y-1; ny<=y+1; ny++) {
+                        if (ny<0 || ny>=height) continue;
+                        if (stamp[ny]!=step) {
+                            stamp[ny] = step;
+                            rows[nb_rows++] = ny;
+                            first[ny] = (x>0) ? x-1 : 0;
+                            last[ny] = (x<nbw-1) ? x+1 : nbw-1;
+                        } else {
+                            if (x-1<first[ny]) first[ny] = (x>0) ? x-1 : 0;
+                            if (x+1>last[ny]) last[ny] = (x<nbw-1) ? x+1 : nbw-1;
+                        }
+                    }
+                }
+            }
+
+            /* All the hits are computed on the image before modification */
+            for(i=0; i<nb_rows; i++) {
+                y = rows[i];
+                odd = (grid==MB_SQUARE_GRID) ? 0 : y%2;
+                lines[0] = (y>0) ? (MB_Vector1 *) srcdest->plines[y-1] : edge_line;
+                lines[1] = (MB_Vector1 *) srcdest->plines[y];
+                lines[2] = (y<height-1) ? (MB_Vector1 *) srcdest->plines[y+1] : edge_line;
+                HIT_SPAN(lines, first[y], last[y], nbw,
+                         cidx+9*(2*k+odd), cinv+9*(2*k+odd), nbc[2*k+odd],
+                         edge_val, hits+y*nbw);
+            }
+
+            /* Modification of the image */
+            logpos[k] = log_len;
+            for(i=0; i<nb_rows && err==MB_NO_ERR; i++) {
+                y = rows[i];
+                line = (MB_Vector1 *) srcdest->plines[y];
+                for(x=first[y]; x<=last[y]; x++) {
+                    if (thick) {
+                        changed = hits[y*nbw+x] & ~line[x];
+                        line[x] |= changed;
+                    } else {
+                        changed = hits[y*nbw+x] & line[x];
+                        line[x] &= ~changed;
+                    }
+                    if (changed) {
+                        cycle_changed = 1;
+                        if (!LOG_WORD(&log, &log_len, &log_cap, y*nbw+x)) {
+                            err = MB_ERR_CANT_ALLOCATE_MEMORY;
+                            break;
+                        }
+                    }
+                }
+            }
+
+            /* Entries already seen by all the steps are removed */
+            minpos = log_len;
+            for(i=0; i<nb_dse; i++) {
+                if (logpos[i]<minpos) minpos = logpos[i];
+            }
+            if (minpos>0 && minpos>=log_len/2) {
+                for(i=minpos; i<log_len; i++) {
+                    log[i-minpos] = log[i];
+                }
+                log_len -= minpos;
+                for(i=0; i<nb_dse; i++) {
+                    if (logpos[i]!=0xffffffff) logpos[i] -= minpos;
+                }
+            }
+        }
+        cycle++;
+    } while (err==MB_NO_ERR && cycle!=nb_cycles && cycle_changed);
+
+    MB_free(log);
+    MB_free(logpos);
+    MB_free(rows);
+    MB_free(stamp);
+    MB_free(first);
+    MB_free(last);
+    MB_free(hits);
+    MB_free(nbc);
+    MB_free(cidx);
+    MB_free(cinv);
+    MB_free(edge_line);
+
+    return err;
+}
+
+/*
+ * Performs a sequence of thinnings of a binary image. Each step of the
+ * sequence is a thinning (the pixels matching the hit-or-miss pattern are
+ * removed) by a pair of structuring elements coded as in MB_BinHitOrMiss.
+ * The sequence is repeated nb_cycles times or until idempotence when
+ * nb_cycles is 0. Only the pixels whose neighborhood changed since the
+ * previous application of a step are examined again.
+ * \param srcdest the binary image
+ * \param pses the structuring elements (es0, es1 for each step)
+ * \param nb_ses the number of values inside pses
+ * \param nb_cycles the number of times the sequence is applied (0 until
+ * idempotence)
+ * \param grid the grid used
+ * \param edge the kind of edge
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_BinThinSequence(MB_Image *srcdest, Uint32 *pses, Uint32 nb_ses,
+                              Uint32 nb_cycles, enum MB_grid_t grid,
+                              enum MB_edgemode_t edge)
+{
+    return MB_BinSequence(srcdest, pses, nb_ses, nb_cycles, grid, edge, 0);
+}
+
+/*
+ * Performs a sequence of thickenings of a binary image. Each step of the
+ * sequence is a thickening (the pixels matching the hit-or-miss pattern are
+ * added) by a pair of structuring elements coded as in MB_BinHitOrMiss.
+ * The sequence is repeated nb_cycles times or until idempotence when
+ * nb_cycles is 0. Only the pixels whose neighborhood changed since the
+ * previous application of a step are examined again.
+ * \param srcdest the binary image
+ * \param pses the structuring elements (es0, es1 for each step)
+ * \param nb_ses the number of values inside pses
+ * \param nb_cycles the number of times the sequence is applied (0 until
+ * idempotence)
+ * \param grid the grid used
+ * \param edge the kind of edge
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_BinThickSequence(MB_Image *srcdest, Uint32 *pses, Uint32 nb_ses,
+                               Uint32 nb_cycles, enum MB_grid_t grid,
+                               enum MB_edgemode_t edge)
+{
+    return MB_BinSequence(srcdest, pses, nb_ses, nb_cycles, grid, edge, 1);
+}
@@ -0,0 +1,353 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/* Value of the pixels not yet assigned to a cell */
+#define CELLS_NONE 0xffffffff
+
+/*
+ * Reads the pixels of a greyscale or 32-bit image into a buffer.
+ * \param im the image
+ * \param vals the buffer (width*height values)
+ */
+static void CELLS_READ(MB_Image *im, PIX32 *vals)
+{
+    Uint32 x, y;
+    PIX8 *p8;
+
+    for(y=0; y<im->height; y++, vals+=im->width) {
+        if (im->depth==8) {
+            p8 = (PIX8 *) (im->plines[y]);
+            for(x=0; x<im->width; x++) {
+                vals[x] = (PIX32) p8[x];
+            }
+        } else {
+            MB_memcpy(vals, im->plines[y], im->width*sizeof(PIX32));
+        }
+    }
+}
+
+/*
+ * Writes a buffer into the pixels of a greyscale or 32-bit image.
+ * \param im the image
+ * \param vals the buffer (width*height values)
+ */
+static void CELLS_WRITE(MB_Image *im, PIX32 *vals)
+{
+    Uint32 x, y;
+    PIX8 *p8;
+
+    for(y=0; y<im->height; y++, vals+=im->width) {
+        if (im->depth==8) {
+            p8 = (PIX8 *) (im->plines[y]);
+            for(x=0; x<im->width; x++) {
+                p8[x] = (PIX8) vals[x];
+            }
+        } else {
+            MB_memcpy(im->plines[y], vals, im->width*sizeof(PIX32));
+        }
+    }
+}
+
+/*
+ * Gives the position of the neighbor of a pixel in a direction.
+ * \param x the position of the pixel
+ * \param y the line of the pixel
+ * \param dir the direction
+ * \param grid the grid used (either square or hexagonal)
+ * \param W the width of the image
+ * \param H the height of the image
+ * \param pos pointer receiving the index of the neighbor
+ * \return 1 if the neighbor is inside the image, 0 otherwise
+ */
+static INLINE int CELLS_NEIGHBOR(Uint32 x, Uint32 y, Uint32 dir,
+                                 enum MB_grid_t grid, Uint32 W, Uint32 H,
+                                 Uint32 *pos)
+{
+    Sint64 nx, ny;
+
+    if (grid==MB_SQUARE_GRID) {
+        nx = ((Sint64) x) + sqNbDir[dir][0];
+        ny = ((Sint64) y) + sqNbDir[dir][1];
+    } else {
+        nx = ((Sint64) x) + hxNbDir[y&1][dir][0];
+        ny = ((Sint64) y) + hxNbDir[y&1][dir][1];
+    }
+    if (nx<0 || ny<0 || nx>=(Sint64) W || ny>=(Sint64) H) {
+        return 0;
+    }
+    *pos = ((Uint32) ny)*W + (Uint32) nx;
+    return 1;
+}
+
+/*
+ * Numbers the cells of a partition (connected sets of pixels with the same
+ * value) by flooding each of them from its first pixel.
+ * \param part the values of the partition
+ * \param W the width of the image
+ * \param H the height of the image
+ * \param grid the grid used (either square or hexagonal)
+ * \param cell receives the number of the cell of each pixel
+ * \param queue work buffer (width*height values)
+ * \return the number of cells
+ */
+static Uint32 CELLS_LABEL(PIX32 *part, Uint32 W, Uint32 H, enum MB_grid_t grid,
+                          Uint32 *cell, Uint32 *queue)
+{
+    Uint32 i, p, q, dir, head, tail, ncells = 0;
+    Uint32 nbdirs = (grid==MB_SQUARE_GRID) ? 8 : 6;
+    Uint32 size = W*H;
+
+    for(i=0; i<size; i++) {
+        cell[i] = CELLS_NONE;
+    }
+    for(i=0; i<size; i++) {
+        if (cell[i]!=CELLS_NONE) {
+            continue;
+        }
+        cell[i] = ncells;
+        queue[0] = i;
+        head = 0;
+        tail = 1;
+        while (head<tail) {
+            p = queue[head++];
+            for(dir=1; dir<=nbdirs; dir++) {
+                if (CELLS_NEIGHBOR(p%W, p/W, dir, grid, W, H, &q) &&
+                    cell[q]==CELLS_NONE && part[q]==part[p]) {
+                    cell[q] = ncells;
+                    queue[tail++] = q;
+                }
+            }
+        }
+        ncells++;
+    }
+    return ncells;
+}
+
+/*
+ * Geodesic reconstruction of the cells of a partition by markers: each cell
+ * takes the maximum value of the markers inside it.
+ * \param src the partition image
+ * \param srcdest the markers image, receiving the result
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_CellsBuild(MB_Image *src, MB_Image *srcdest, enum MB_grid_t grid)
+{
+    Uint32 i, ncells, size;
+    PIX32 *part, *mark, *cellmax;
+    Uint32 *cell, *queue;
+
+    if (!MB_CHECK_SIZE_2(src, srcdest)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (src->depth!=srcdest->depth || (src->depth!=8 && src->depth!=32)) {
+        return MB_ERR_BAD_DEPTH;
+    }
+
+    size = src->width*src->height;
+    part = (PIX32 *) MB_malloc(size*sizeof(PIX32));
+    mark = (PIX32 *) MB_malloc(size*sizeof(PIX32));
+    cell = (Uint32 *) MB_malloc(size*sizeof(Uint32));
+    queue = (Uint32 *) MB_malloc(size*sizeof(Uint32));
+    if (part==NULL || mark==NULL || cell==NULL || queue==NULL) {
+        MB_free(part);
+        MB_free(mark);
+        MB_free(cell);
+        MB_free(queue);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    CELLS_READ(src, part);
+    CELLS_READ(srcdest, mark);
+    ncells = CELLS_LABEL(part, src->width, src->height, grid, cell, queue);
+
+    /* The queue is no longer needed and holds the maxima of the cells */
+    cellmax = queue;
+    for(i=0; i<ncells; i++) {
+        cellmax[i] = 0;
+    }
+    for(i=0; i<size; i++) {
+        if (mark[i]>cellmax[cell[i]]) {
+            cellmax[cell[i]] = mark[i];
+        }
+    }
+    for(i=0; i<size; i++) {
+        mark[i] = cellmax[cell[i]];
+    }
+    CELLS_WRITE(srcdest, mark);
+
+    MB_free(part);
+    MB_free(mark);
+    MB_free(cell);
+    MB_free(queue);
+    return MB_NO_ERR;
+}
+
+/*
+ * Graph dilation (or erosion) of a partition: the cells are the nodes of
+ * a graph whose edges link the adjacent cells. At each step, each cell takes
+ * the maximum (or minimum) of its value and of the values of its adjacent
+ * cells.
+ * \param src the partition image
+ * \param dest the resulting partition image
+ * \param n the size of the operation
+ * \param grid the grid used (either square or hexagonal)
+ * \param domin if not zero, an erosion is performed
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB_PartitionFilter(MB_Image *src, MB_Image *dest, Uint32 n,
+                                     enum MB_grid_t grid, int domin)
+{
+    Uint32 W = src->width, H = src->height;
+    Uint32 i, j, a, b, p, q, x, y, dir, ncells, npairs, size;
+    Uint32 nbdirs = (grid==MB_SQUARE_GRID) ? 8 : 6;
+    PIX32 *part, *val, *newval, *tmp;
+    Uint32 *cell, *queue, *pairs;
+    int changed;
+
+    if (!MB_CHECK_SIZE_2(src, dest)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (src->depth!=dest->depth || (src->depth!=8 && src->depth!=32)) {
+        return MB_ERR_BAD_DEPTH;
+    }
+
+    size = W*H;
+    part = (PIX32 *) MB_malloc(size*sizeof(PIX32));
+    cell = (Uint32 *) MB_malloc(size*sizeof(Uint32));
+    queue = (Uint32 *) MB_malloc(size*sizeof(Uint32));
+    if (part==NULL || cell==NULL || queue==NULL) {
+        MB_free(part);
+        MB_free(cell);
+        MB_free(queue);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    CELLS_READ(src, part);
+    ncells = CELLS_LABEL(part, W, H, grid, cell, queue);
+    MB_free(queue);
+
+    /* Pairs of adjacent pixels in different cells (each pair is found */
+    /* once by looking at half of the directions) */
+    npairs = 0;
+    for(p=0, y=0; y<H; y++) {
+        for(x=0; x<W; x++, p++) {
+            for(dir=1; dir<=nbdirs/2; dir++) {
+                if (CELLS_NEIGHBOR(x, y, dir, grid, W, H, &q) && cell[q]!=cell[p]) {
+                    npairs++;
+                }
+            }
+        }
+    }
+    pairs = (Uint32 *) MB_malloc((2*((Uint64) npairs)+1)*sizeof(Uint32));
+    val = (PIX32 *) MB_malloc(ncells*sizeof(PIX32));
+    newval = (PIX32 *) MB_malloc(ncells*sizeof(PIX32));
+    if (pairs==NULL || val==NULL || newval==NULL) {
+        MB_free(part);
+        MB_free(cell);
+        MB_free(pairs);
+        MB_free(val);
+        MB_free(newval);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    for(j=0, p=0, y=0; y<H; y++) {
+        for(x=0; x<W; x++, p++) {
+            val[cell[p]] = part[p];
+            for(dir=1; dir<=nbdirs/2; dir++) {
+                if (CELLS_NEIGHBOR(x, y, dir, grid, W, H, &q) && cell[q]!=cell[p]) {
+                    pairs[j++] = cell[p];
+                    pairs[j++] = cell[q];
+                }
+            }
+        }
+    }
+
+    /* Propagation of the values along the edges of the graph */
+    for(i=0; i<n; i++) {
+        MB_memcpy(newval, val, ncells*sizeof(PIX32));
+        for(j=0; j<2*npairs; j+=2) {
+            a = pairs[j];
+            b = pairs[j+1];
+            if (domin) {
+                if (val[b]<newval[a]) newval[a] = val[b];
+                if (val[a]<newval[b]) newval[b] = val[a];
+            } else {
+                if (val[b]>newval[a]) newval[a] = val[b];
+                if (val[a]>newval[b]) newval[b] = val[a];
+            }
+        }
+        changed = 0;
+        for(j=0; j<ncells && !changed; j++) {
+            changed = (newval[j]!=val[j]);
+        }
+        tmp = val;
+        val = newval;
+        newval = tmp;
+        if (!changed) {
+            /* Idempotence is reached */
+            break;
+        }
+    }
+
+    for(p=0; p<size; p++) {
+        part[p] = val[cell[p]];
+    }
+    CELLS_WRITE(dest, part);
+
+    MB_free(part);
+    MB_free(cell);
+    MB_free(pairs);
+    MB_free(val);
+    MB_free(newval);
+    return MB_NO_ERR;
+}
+
+/*
+ * Graph dilation of size n of a partition (see MB_PartitionFilter).
+ * \param src the partition image
+ * \param dest the resulting partition image
+ * \param n the size of the dilation
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_PartitionDilate(MB_Image *src, MB_Image *dest, Uint32 n,
+                              enum MB_grid_t grid)
+{
+    return MB_PartitionFilter(src, dest, n, grid, 0);
+}
+
+/*
+ * Graph erosion of size n of a partition (see MB_PartitionFilter).
+ * \param src the partition image
+ * \param dest the resulting partition image
+ * \param n the size of the erosion
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_PartitionErode(MB_Image *src, MB_Image *dest, Uint32 n,
+                             enum MB_grid_t grid)
+{
+    return MB_PartitionFilter(src, dest, n, grid, 1);
+}
@@ -0,0 +1,192 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/* Limits of the coefficients ensuring that the computation of the affine
+ * function of a 32-bit value fits inside a 64-bit integer */
+#define AFFINE_MAX_NUM    ((Sint64) 1<<30)
+#define AFFINE_MAX_OFFSET ((Sint64) 1<<61)
+#define AFFINE_MAX_DEN    ((Uint32) 1<<30)
+
+/*
+ * Computes the saturated affine function of a value.
+ * \param value the value
+ * \param num the numerator of the multiplier
+ * \param offset the numerator of the offset (rounding included)
+ * \param den the common denominator
+ * \param maxval the saturation value
+ * \return the result
+ */
+static INLINE PIX32 AFFINE_VALUE(PIX32 value, Sint64 num, Sint64 offset,
+                                 Sint64 den, Sint64 maxval)
+{
+    Sint64 n, q;
+
+    n = ((Sint64) value)*num + offset;
+    /* Division rounded towards minus infinity */
+    q = n/den;
+    if (n%den<0) {
+        q--;
+    }
+    if (q<0) {
+        return 0;
+    }
+    return (PIX32) (q>maxval ? maxval : q);
+}
+
+/*
+ * Computes the affine function of the pixels of an 8-bit image line using
+ * the precomputed values of the 256 possible pixel values.
+ * \param plines_out pointer on the destination image pixel line
+ * \param plines_in pointer on the source image pixel line
+ * \param bytes_in number of bytes inside the source line
+ * \param depth the depth of the destination image
+ * \param lut the precomputed values
+ */
+static INLINE void AFFINE_LINE_8(PLINE *plines_out, PLINE *plines_in,
+                                 Uint32 bytes_in, Uint32 depth, PIX32 *lut)
+{
+    Uint32 i;
+    PIX8 *pin = (PIX8 *) (*plines_in);
+    PIX8 *pout8;
+    PIX32 *pout32;
+
+    if (depth==8) {
+        pout8 = (PIX8 *) (*plines_out);
+        for(i=0;i<bytes_in;i++){
+            pout8[i] = (PIX8) lut[pin[i]];
+        }
+    } else {
+        pout32 = (PIX32 *) (*plines_out);
+        for(i=0;i<bytes_in;i++){
+            pout32[i] = lut[pin[i]];
+        }
+    }
+}
+
+/*
+ * Computes the affine function of the pixels of a 32-bit image line.
+ * \param plines_out pointer on the destination image pixel line
+ * \param plines_in pointer on the source image pixel line
+ * \param bytes_in number of bytes inside the source line
+ * \param depth the depth of the destination image
+ * \param num the numerator of the multiplier
+ * \param offset the numerator of the offset (rounding included)
+ * \param den the common denominator
+ */
+static INLINE void AFFINE_LINE_32(PLINE *plines_out, PLINE *plines_in,
+                                  Uint32 bytes_in, Uint32 depth,
+                                  Sint64 num, Sint64 offset, Sint64 den)
+{
+    Uint32 i;
+    PIX32 *pin = (PIX32 *) (*plines_in);
+    PIX8 *pout8;
+    PIX32 *pout32;
+
+    if (depth==8) {
+        pout8 = (PIX8 *) (*plines_out);
+        for(i=0;i<bytes_in;i+=4,pin++,pout8++){
+            *pout8 = (PIX8) AFFINE_VALUE(*pin, num, offset, den, 255);
+        }
+    } else {
+        pout32 = (PIX32 *) (*plines_out);
+        for(i=0;i<bytes_in;i+=4,pin++,pout32++){
+            *pout32 = AFFINE_VALUE(*pin, num, offset, den, 0xffffffff);
+        }
+    }
+}
+
+/*
+ * Computes the affine function (num*x+offset)/den of the pixels of an image.
+ * The coefficients are given as fractions sharing the denominator 'den' so
+ * that the computation is exact. The result is either truncated (rounded
+ * towards minus infinity) or rounded to the nearest integer, then saturated
+ * between 0 and the maximum value of the destination image.
+ * \param src the source image (8-bit or 32-bit)
+ * \param dest the destination image (8-bit or 32-bit)
+ * \param num the numerator of the multiplier (absolute value below 2^30)
+ * \param offset the numerator of the offset (absolute value below 2^61)
+ * \param den the denominator (between 1 and 2^30)
+ * \param nearest 0 to truncate the result, 1 to round it to the nearest value
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_ConAffine(MB_Image *src, MB_Image *dest, Sint64 num,
+                        Sint64 offset, Uint32 den, Uint32 nearest)
+{
+    Uint32 i;
+    PLINE *plines_in, *plines_out;
+    Uint32 bytes_in;
+    PIX32 lut[256];
+
+    /* Verification over image size compatibility */
+    if (!MB_CHECK_SIZE_2(src, dest)) {
+        return MB_ERR_BAD_SIZE;
+    }
+
+    /* Verification over the coefficients */
+    if (num<=-AFFINE_MAX_NUM || num>=AFFINE_MAX_NUM ||
+        offset<=-AFFINE_MAX_OFFSET || offset>=AFFINE_MAX_OFFSET ||
+        den==0 || den>AFFINE_MAX_DEN) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    if (nearest) {
+        offset += den/2;
+    }
+
+    /* Setting up line pointers */
+    plines_in = src->plines;
+    plines_out = dest->plines;
+    bytes_in = MB_LINE_COUNT(src);
+
+    switch(MB_PROBE_PAIR(src,dest)) {
+
+    case MB_PAIR_8_8:
+    case MB_PAIR_8_32:
+        /* The 256 possible results are computed once */
+        for(i=0; i<256; i++) {
+            lut[i] = AFFINE_VALUE(i, num, offset, den,
+                                  dest->depth==8 ? 255 : 0xffffffff);
+        }
+        for (i = 0;i < src->height;i++, plines_in++, plines_out++) {
+            AFFINE_LINE_8(plines_out, plines_in, bytes_in, dest->depth, lut);
+        }
+        break;
+
+    case MB_PAIR_32_8:
+    case MB_PAIR_32_32:
+        for (i = 0;i < src->height;i++, plines_in++, plines_out++) {
+            AFFINE_LINE_32(plines_out, plines_in, bytes_in, dest->depth,
+                           num, offset, den);
+        }
+        break;
+
+    default:
+        return MB_ERR_BAD_DEPTH;
+        break;
+    }
+
+    return MB_NO_ERR;
+}
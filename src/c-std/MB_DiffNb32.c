@@ -67,6 +67,7 @@
 MB_errcode MB_DiffNb32(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge)
 {
     Uint32 bytes_in;
+    Uint32 first, last;
     MB_Image *temp;
     PLINE *plines_in, *plines_inout;
     MB_errcode err;
@@ -116,14 +117,14 @@ MB_errcode MB_DiffNb32(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum
             return MB_NO_ERR;
         }
         MB_comp_neighbors_square(plines_inout, plines_in, bytes_in, temp->height,
-                                 neighbors, edge_val);
+                                 neighbors, edge_val, &first, &last);
     } else {
         if ((neighbors&MB_NEIGHBOR_ALL_HEXAGONAL)==0) {
             /* No neighbors to take into account */
             return MB_NO_ERR;
         }
         MB_comp_neighbors_hexagonal(plines_inout, plines_in, bytes_in, temp->height,
-                                    neighbors, edge_val);
+                                    neighbors, edge_val, &first, &last);
     }
 
     /* Destroying the temporary image if one was created */
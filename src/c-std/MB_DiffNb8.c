@@ -39,6 +39,7 @@
 #define VEC_TYPE MB_Vector8
 #define VEC_LOAD(pointer) MB_vec8_load(pointer)
 #define VEC_STORE(pointer, value) MB_vec8_store(pointer,value)
+#define VEC_DIFFER(vec1, vec2) MB_vec8_differ(vec1,vec2)
 
 #define COMP_NO_SHIFT(cond,inout,in)                                        \
 {                                                                           \
@@ -84,6 +85,7 @@
 #undef VEC_TYPE
 #undef VEC_LOAD
 #undef VEC_STORE
+#undef VEC_DIFFER
 #undef COMP_NO_SHIFT
 #undef COMP_SHIFT_LEFT
 #undef COMP_SHIFT_RIGHT
@@ -129,6 +131,7 @@
 MB_errcode MB_DiffNb8(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge)
 {
     Uint32 bytes_in;
+    Uint32 first, last;
     MB_Image *temp;
     PLINE *plines_in, *plines_inout;
     MB_errcode err;
@@ -183,14 +186,14 @@ MB_errcode MB_DiffNb8(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum M
             return MB_NO_ERR;
         }
         MB_comp_neighbors_square(plines_inout, plines_in, bytes_in, temp->height,
-                                 neighbors, edge_val);
+                                 neighbors, edge_val, &first, &last);
     } else {
         if ((neighbors&MB_NEIGHBOR_ALL_HEXAGONAL)==0) {
             /* No neighbors to take into account */
             return MB_NO_ERR;
         }
         MB_comp_neighbors_hexagonal(plines_inout, plines_in, bytes_in, temp->height,
-                                    neighbors, edge_val);
+                                    neighbors, edge_val, &first, &last);
     }
 
     /* Destroying the temporary image if one was created */
@@ -35,6 +35,7 @@
 #define VEC_TYPE MB_Vector1
 #define VEC_LOAD(pointer) MB_vec1_load(pointer)
 #define VEC_STORE(pointer, value) MB_vec1_store(pointer, value)
+#define VEC_DIFFER(vec1, vec2) MB_vec1_differ(vec1,vec2)
 
 #define COMP_NO_SHIFT(cond,inout,in)                                        \
 {                                                                           \
@@ -70,6 +71,7 @@
 #undef VEC_TYPE
 #undef VEC_LOAD
 #undef VEC_STORE
+#undef VEC_DIFFER
 #undef COMP_NO_SHIFT
 #undef COMP_SHIFT_LEFT
 #undef COMP_SHIFT_RIGHT
@@ -96,6 +98,7 @@
 MB_errcode MB_DiffNbb(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge)
 {
     Uint32 bytes_in;
+    Uint32 first, last;
     MB_Image *temp;
     PLINE *plines_in, *plines_inout;
     MB_errcode err;
@@ -145,14 +148,14 @@ MB_errcode MB_DiffNbb(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum M
             return MB_NO_ERR;
         }
         MB_comp_neighbors_square(plines_inout, plines_in, bytes_in, temp->height,
-                                 neighbors, edge_val);
+                                 neighbors, edge_val, &first, &last);
     } else {
         if ((neighbors&MB_NEIGHBOR_ALL_HEXAGONAL)==0) {
             /* No neighbors to take into account */
             return MB_NO_ERR;
         }
         MB_comp_neighbors_hexagonal(plines_inout, plines_in, bytes_in, temp->height,
-                                    neighbors, edge_val);
+                                    neighbors, edge_val, &first, &last);
     }
 
     /* Destroying the temporary image if one was created */
@@ -0,0 +1,707 @@
+/*
+ * Copyright (c) <2009>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+
+/* Value of the shape i given a values array holding either a single value */
+/* for all the shapes or a value for each of them */
+#define SHAPE_VALUE(pvalues, nb_values, i) \
+    ((nb_values)==1 ? (pvalues)[0] : (pvalues)[i])
+
+/****************************************
+ * Pixel functions                      *
+ ****************************************/
+
+/*
+ * Puts the pixel value inside the image at the given position. Pixels
+ * outside the image are ignored.
+ * \param dest the image
+ * \param x position in x of the pixel
+ * \param y position in y of the pixel
+ * \param value the value of the pixel
+ */
+static INLINE void PUT_PIXEL(MB_Image *dest, Sint32 x, Sint32 y, Uint32 value)
+{
+    MB_Vector1 *px;
+    MB_Vector1 offset;
+
+    if (x<0 || y<0 || x>=(Sint32) dest->width || y>=(Sint32) dest->height) {
+        return;
+    }
+
+    switch(dest->depth) {
+    case 1:
+        px = ((MB_Vector1 *) (dest->plines[y])) + (x/MB_vec1_size);
+        offset = (MB_Vector1) (x%MB_vec1_size);
+        if (value) {
+            *px = (*px) | (((MB_Vector1) 1L)<<offset);
+        } else {
+            *px = (*px) & (~(((MB_Vector1) 1L)<<offset));
+        }
+        break;
+    case 8:
+        ((PIX8 *) (dest->plines[y]))[x] = (PIX8) value;
+        break;
+    default:
+        ((PIX32 *) (dest->plines[y]))[x] = (PIX32) value;
+        break;
+    }
+}
+
+/*
+ * Puts the value inside the pixels of an horizontal span (from xa to xb
+ * included). Pixels outside the image are ignored.
+ * \param dest the image
+ * \param xa position in x of the first pixel of the span
+ * \param xb position in x of the last pixel of the span
+ * \param y position in y of the span
+ * \param value the value of the pixels
+ */
+static INLINE void PUT_SPAN(MB_Image *dest, Sint32 xa, Sint32 xb, Sint32 y, Uint32 value)
+{
+    Sint32 x;
+    PIX32 *p32;
+
+    if (y<0 || y>=(Sint32) dest->height) {
+        return;
+    }
+    if (xa<0) xa = 0;
+    if (xb>=(Sint32) dest->width) xb = dest->width-1;
+    if (xa>xb) {
+        return;
+    }
+
+    switch(dest->depth) {
+    case 1:
+        for(x=xa; x<=xb; x++) {
+            PUT_PIXEL(dest, x, y, value);
+        }
+        break;
+    case 8:
+        MB_memset(((PIX8 *) (dest->plines[y]))+xa, (PIX8) value, xb-xa+1);
+        break;
+    default:
+        p32 = ((PIX32 *) (dest->plines[y]))+xa;
+        for(x=xa; x<=xb; x++, p32++) {
+            *p32 = (PIX32) value;
+        }
+        break;
+    }
+}
+
+/*
+ * Gets the pixel value inside the image at the given position (which
+ * must be inside the image).
+ * \param src the image
+ * \param x position in x of the pixel
+ * \param y position in y of the pixel
+ * \return the value of the pixel
+ */
+static INLINE Uint32 GET_PIXEL(MB_Image *src, Sint32 x, Sint32 y)
+{
+    MB_Vector1 *px;
+
+    switch(src->depth) {
+    case 1:
+        px = ((MB_Vector1 *) (src->plines[y])) + (x/MB_vec1_size);
+        return (Uint32) (((*px)>>(x%MB_vec1_size))&1);
+    case 8:
+        return (Uint32) ((PIX8 *) (src->plines[y]))[x];
+    default:
+        return (Uint32) ((PIX32 *) (src->plines[y]))[x];
+    }
+}
+
+/*
+ * Puts the pixels values inside the image.
+ * \param dest the image
+ * \param pcoords the positions of the pixels (x0,y0,x1,y1,...)
+ * \param nb_coords the number of values inside pcoords
+ * \param pvalues the values of the pixels (a single value or one per pixel)
+ * \param nb_values the number of values inside pvalues
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_PutPixels(MB_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+                        Uint32 *pvalues, Uint32 nb_values)
+{
+    Uint32 i;
+
+    if (dest->depth!=1 && dest->depth!=8 && dest->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if ((nb_coords%2)!=0) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    if (nb_values!=1 && nb_values!=nb_coords/2) {
+        return MB_ERR_BAD_VALUE;
+    }
+
+    /* Verification over the positions before any modification */
+    for(i=0; i<nb_coords; i+=2) {
+        if (pcoords[i]<0 || pcoords[i+1]<0 ||
+            pcoords[i]>=(Sint32) dest->width || pcoords[i+1]>=(Sint32) dest->height) {
+            return MB_ERR_BAD_SIZE;
+        }
+    }
+
+    for(i=0; i<nb_coords; i+=2) {
+        PUT_PIXEL(dest, pcoords[i], pcoords[i+1], SHAPE_VALUE(pvalues, nb_values, i/2));
+    }
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Gets the pixels values inside the image.
+ * \param src the image
+ * \param ppoints the positions of the pixels (x0,y0,x1,y1,...)
+ * \param nb_points the number of values inside ppoints
+ * \param ppixels the returned values of the pixels (nb_points/2 values)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_GetPixels(MB_Image *src, Sint32 *ppoints, Uint32 nb_points, Uint32 *ppixels)
+{
+    Uint32 i;
+
+    if (src->depth!=1 && src->depth!=8 && src->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if ((nb_points%2)!=0) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+
+    for(i=0; i<nb_points; i+=2) {
+        if (ppoints[i]<0 || ppoints[i+1]<0 ||
+            ppoints[i]>=(Sint32) src->width || ppoints[i+1]>=(Sint32) src->height) {
+            return MB_ERR_BAD_SIZE;
+        }
+        ppixels[i/2] = GET_PIXEL(src, ppoints[i], ppoints[i+1]);
+    }
+
+    return MB_NO_ERR;
+}
+
+/****************************************
+ * Rasterisation functions              *
+ ****************************************/
+
+/* Rounding of a double toward -infinity and +infinity */
+static INLINE Sint32 FLOOR(double v)
+{
+    Sint32 i = (Sint32) v;
+    return (((double) i)>v) ? i-1 : i;
+}
+static INLINE Sint32 CEIL(double v)
+{
+    Sint32 i = (Sint32) v;
+    return (((double) i)<v) ? i+1 : i;
+}
+
+/*
+ * Draws a line using the Bresenham algorithm.
+ * \param dest the image
+ * \param x1 position in x of the starting point
+ * \param y1 position in y of the starting point
+ * \param x2 position in x of the ending point
+ * \param y2 position in y of the ending point
+ * \param value the value of the pixels
+ */
+static void DRAW_LINE(MB_Image *dest, Sint32 x1, Sint32 y1, Sint32 x2, Sint32 y2, Uint32 value)
+{
+    Sint32 prov, deltax, deltay, error, x, y, ystep;
+    int steep;
+
+    steep = (abs(y2-y1) > abs(x2-x1));
+    if (steep) {
+        prov = x1; x1 = y1; y1 = prov;
+        prov = x2; x2 = y2; y2 = prov;
+    }
+    if (x1>x2) {
+        prov = x1; x1 = x2; x2 = prov;
+        prov = y1; y1 = y2; y2 = prov;
+    }
+    deltax = x2-x1;
+    deltay = abs(y2-y1);
+    error = deltax/2;
+    y = y1;
+    ystep = (y1<y2) ? 1 : -1;
+    for(x=x1; x<=x2; x++) {
+        if (steep) {
+            PUT_PIXEL(dest, y, x, value);
+        } else {
+            PUT_PIXEL(dest, x, y, value);
+        }
+        error -= deltay;
+        if (error<0) {
+            y += ystep;
+            error += deltax;
+        }
+    }
+}
+
+/*
+ * Draws a circle (empty or filled) using the midpoint algorithm.
+ * \param dest the image
+ * \param x0 position in x of the center
+ * \param y0 position in y of the center
+ * \param radius the radius of the circle
+ * \param value the value of the pixels
+ * \param filled 1 if the circle must be filled
+ */
+static void DRAW_CIRCLE(MB_Image *dest, Sint32 x0, Sint32 y0, Sint32 radius,
+                        Uint32 value, Uint32 filled)
+{
+    Sint32 f, ddF_x, ddF_y, x, y;
+
+    f = 1-radius;
+    ddF_x = 1;
+    ddF_y = -2*radius;
+    x = 0;
+    y = radius;
+    if (filled) {
+        PUT_SPAN(dest, x0-radius, x0+radius, y0, value);
+    } else {
+        PUT_PIXEL(dest, x0, y0+radius, value);
+        PUT_PIXEL(dest, x0, y0-radius, value);
+        PUT_PIXEL(dest, x0+radius, y0, value);
+        PUT_PIXEL(dest, x0-radius, y0, value);
+    }
+    while (x<y) {
+        if (f>=0) {
+            y--;
+            ddF_y += 2;
+            f += ddF_y;
+        }
+        x++;
+        ddF_x += 2;
+        f += ddF_x;
+        if (filled) {
+            PUT_SPAN(dest, x0-x, x0+x, y0+y, value);
+            PUT_SPAN(dest, x0-x, x0+x, y0-y, value);
+            PUT_SPAN(dest, x0-y, x0+y, y0+x, value);
+            PUT_SPAN(dest, x0-y, x0+y, y0-x, value);
+        } else {
+            PUT_PIXEL(dest, x0+x, y0+y, value);
+            PUT_PIXEL(dest, x0-x, y0+y, value);
+            PUT_PIXEL(dest, x0+x, y0-y, value);
+            PUT_PIXEL(dest, x0-x, y0-y, value);
+            PUT_PIXEL(dest, x0+y, y0+x, value);
+            PUT_PIXEL(dest, x0-y, y0+x, value);
+            PUT_PIXEL(dest, x0+y, y0-x, value);
+            PUT_PIXEL(dest, x0-y, y0-x, value);
+        }
+    }
+}
+
+/*
+ * Draws lines inside the image. Pixels outside the image are ignored.
+ * \param dest the image
+ * \param pcoords the lines (x1,y1,x2,y2 for each line)
+ * \param nb_coords the number of values inside pcoords
+ * \param pvalues the values of the lines (a single value or one per line)
+ * \param nb_values the number of values inside pvalues
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_DrawLines(MB_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+                        Uint32 *pvalues, Uint32 nb_values)
+{
+    Uint32 i;
+
+    if (dest->depth!=1 && dest->depth!=8 && dest->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if ((nb_coords%4)!=0) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    if (nb_values!=1 && nb_values!=nb_coords/4) {
+        return MB_ERR_BAD_VALUE;
+    }
+
+    for(i=0; i<nb_coords; i+=4) {
+        DRAW_LINE(dest, pcoords[i], pcoords[i+1], pcoords[i+2], pcoords[i+3],
+                  SHAPE_VALUE(pvalues, nb_values, i/4));
+    }
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Draws a polyline (successive points linked by lines) inside the image.
+ * Pixels outside the image are ignored.
+ * \param dest the image
+ * \param pcoords the points of the polyline (x0,y0,x1,y1,...)
+ * \param nb_coords the number of values inside pcoords
+ * \param value the value of the pixels
+ * \param closed 1 if the last point must be linked to the first one
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_DrawPolyline(MB_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+                           Uint32 value, Uint32 closed)
+{
+    Uint32 i;
+
+    if (dest->depth!=1 && dest->depth!=8 && dest->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if ((nb_coords%2)!=0 || nb_coords==0) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+
+    PUT_PIXEL(dest, pcoords[0], pcoords[1], value);
+    for(i=2; i<nb_coords; i+=2) {
+        DRAW_LINE(dest, pcoords[i-2], pcoords[i-1], pcoords[i], pcoords[i+1], value);
+    }
+    if (closed && nb_coords>4) {
+        DRAW_LINE(dest, pcoords[nb_coords-2], pcoords[nb_coords-1],
+                  pcoords[0], pcoords[1], value);
+    }
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Draws a filled polygon inside the image. The inside of the polygon is
+ * determined using the even-odd rule on the pixels centers and its outline
+ * is always drawn. Pixels outside the image are ignored.
+ * \param dest the image
+ * \param pcoords the vertices of the polygon (x0,y0,x1,y1,...)
+ * \param nb_coords the number of values inside pcoords
+ * \param value the value of the pixels
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_DrawFillPolygon(MB_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+                              Uint32 value)
+{
+    Uint32 i, j, k, nb_vertices, nb_inter;
+    Sint32 y, ymin, ymax, ya, yb;
+    double *inter, xi;
+    MB_errcode err;
+
+    /* Outline of the polygon (verifies the parameters) */
+    err = MB_DrawPolyline(dest, pcoords, nb_coords, value, 1);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+    nb_vertices = nb_coords/2;
+    if (nb_vertices<3) {
+        return MB_NO_ERR;
+    }
+
+    inter = MB_malloc(nb_vertices*sizeof(double));
+    if (inter==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    ymin = ymax = pcoords[1];
+    for(i=1; i<nb_vertices; i++) {
+        ymin = pcoords[2*i+1]<ymin ? pcoords[2*i+1] : ymin;
+        ymax = pcoords[2*i+1]>ymax ? pcoords[2*i+1] : ymax;
+    }
+    if (ymin<0) ymin = 0;
+    if (ymax>=(Sint32) dest->height) ymax = dest->height-1;
+
+    for(y=ymin; y<=ymax; y++) {
+        /* Intersections of the edges with the line (sorted) */
+        nb_inter = 0;
+        for(i=0; i<nb_vertices; i++) {
+            j = (i+1)%nb_vertices;
+            ya = pcoords[2*i+1];
+            yb = pcoords[2*j+1];
+            if ((ya<=y && y<yb) || (yb<=y && y<ya)) {
+                xi = pcoords[2*i] +
+                     ((double) (y-ya))*(pcoords[2*j]-pcoords[2*i])/((double) (yb-ya));
+                for(k=nb_inter; k>0 && inter[k-1]>xi; k--) {
+                    inter[k] = inter[k-1];
+                }
+                inter[k] = xi;
+                nb_inter++;
+            }
+        }
+        for(i=0; i+1<nb_inter; i+=2) {
+            PUT_SPAN(dest, CEIL(inter[i]), FLOOR(inter[i+1]), y, value);
+        }
+    }
+
+    MB_free(inter);
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Draws boxes (empty or filled rectangles) inside the image. Pixels outside
+ * the image are ignored.
+ * \param dest the image
+ * \param pcoords the opposite corners of the boxes (x1,y1,x2,y2 for each box)
+ * \param nb_coords the number of values inside pcoords
+ * \param pvalues the values of the boxes (a single value or one per box)
+ * \param nb_values the number of values inside pvalues
+ * \param filled 1 if the boxes must be filled
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_DrawBoxes(MB_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+                        Uint32 *pvalues, Uint32 nb_values, Uint32 filled)
+{
+    Uint32 i, value;
+    Sint32 x1, y1, x2, y2, y;
+
+    if (dest->depth!=1 && dest->depth!=8 && dest->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if ((nb_coords%4)!=0) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    if (nb_values!=1 && nb_values!=nb_coords/4) {
+        return MB_ERR_BAD_VALUE;
+    }
+
+    for(i=0; i<nb_coords; i+=4) {
+        value = SHAPE_VALUE(pvalues, nb_values, i/4);
+        x1 = pcoords[i] < pcoords[i+2] ? pcoords[i] : pcoords[i+2];
+        x2 = pcoords[i] < pcoords[i+2] ? pcoords[i+2] : pcoords[i];
+        y1 = pcoords[i+1] < pcoords[i+3] ? pcoords[i+1] : pcoords[i+3];
+        y2 = pcoords[i+1] < pcoords[i+3] ? pcoords[i+3] : pcoords[i+1];
+        if (filled) {
+            for(y=y1; y<=y2; y++) {
+                PUT_SPAN(dest, x1, x2, y, value);
+            }
+        } else {
+            PUT_SPAN(dest, x1, x2, y1, value);
+            PUT_SPAN(dest, x1, x2, y2, value);
+            for(y=y1; y<=y2; y++) {
+                PUT_PIXEL(dest, x1, y, value);
+                PUT_PIXEL(dest, x2, y, value);
+            }
+        }
+    }
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Draws circles (empty or filled) inside the image. Pixels outside the
+ * image are ignored.
+ * \param dest the image
+ * \param pcoords the circles (x,y,radius for each circle)
+ * \param nb_coords the number of values inside pcoords
+ * \param pvalues the values of the circles (a single value or one per circle)
+ * \param nb_values the number of values inside pvalues
+ * \param filled 1 if the circles must be filled
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_DrawCircles(MB_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+                          Uint32 *pvalues, Uint32 nb_values, Uint32 filled)
+{
+    Uint32 i;
+
+    if (dest->depth!=1 && dest->depth!=8 && dest->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if ((nb_coords%3)!=0) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    if (nb_values!=1 && nb_values!=nb_coords/3) {
+        return MB_ERR_BAD_VALUE;
+    }
+
+    for(i=0; i<nb_coords; i+=3) {
+        if (pcoords[i+2]<0) {
+            return MB_ERR_BAD_VALUE;
+        }
+        DRAW_CIRCLE(dest, pcoords[i], pcoords[i+1], pcoords[i+2],
+                    SHAPE_VALUE(pvalues, nb_values, i/3), filled);
+    }
+
+    return MB_NO_ERR;
+}
+
+/****************************************
+ * 3D rasterisation functions           *
+ ****************************************/
+
+/*
+ * Draws a 3D line using the Bresenham algorithm.
+ * \param dest the 3D image
+ * \param pline the line (x1,y1,z1,x2,y2,z2)
+ * \param value the value of the pixels
+ */
+static void DRAW_LINE_3D(MB3D_Image *dest, Sint32 *pline, Uint32 value)
+{
+    Sint32 x, y, z, x_inc, y_inc, z_inc, l, m, n, dx2, dy2, dz2, err_1, err_2, i;
+
+    x = pline[0];
+    y = pline[1];
+    z = pline[2];
+    x_inc = (pline[3]-pline[0]<0) ? -1 : 1;
+    l = abs(pline[3]-pline[0]);
+    y_inc = (pline[4]-pline[1]<0) ? -1 : 1;
+    m = abs(pline[4]-pline[1]);
+    z_inc = (pline[5]-pline[2]<0) ? -1 : 1;
+    n = abs(pline[5]-pline[2]);
+    dx2 = l<<1;
+    dy2 = m<<1;
+    dz2 = n<<1;
+
+    if (l>=m && l>=n) {
+        err_1 = dy2-l;
+        err_2 = dz2-l;
+        for(i=0; i<l; i++) {
+            if (z>=0 && z<(Sint32) dest->length) PUT_PIXEL(dest->seq[z], x, y, value);
+            if (err_1>0) {
+                y += y_inc;
+                err_1 -= dx2;
+            }
+            if (err_2>0) {
+                z += z_inc;
+                err_2 -= dx2;
+            }
+            err_1 += dy2;
+            err_2 += dz2;
+            x += x_inc;
+        }
+    } else if (m>=l && m>=n) {
+        err_1 = dx2-m;
+        err_2 = dz2-m;
+        for(i=0; i<m; i++) {
+            if (z>=0 && z<(Sint32) dest->length) PUT_PIXEL(dest->seq[z], x, y, value);
+            if (err_1>0) {
+                x += x_inc;
+                err_1 -= dy2;
+            }
+            if (err_2>0) {
+                z += z_inc;
+                err_2 -= dy2;
+            }
+            err_1 += dx2;
+            err_2 += dz2;
+            y += y_inc;
+        }
+    } else {
+        err_1 = dy2-n;
+        err_2 = dx2-n;
+        for(i=0; i<n; i++) {
+            if (z>=0 && z<(Sint32) dest->length) PUT_PIXEL(dest->seq[z], x, y, value);
+            if (err_1>0) {
+                y += y_inc;
+                err_1 -= dz2;
+            }
+            if (err_2>0) {
+                x += x_inc;
+                err_2 -= dz2;
+            }
+            err_1 += dy2;
+            err_2 += dx2;
+            z += z_inc;
+        }
+    }
+    if (z>=0 && z<(Sint32) dest->length) PUT_PIXEL(dest->seq[z], x, y, value);
+}
+
+/*
+ * Draws lines inside the 3D image. Pixels outside the image are ignored.
+ * \param dest the 3D image
+ * \param pcoords the lines (x1,y1,z1,x2,y2,z2 for each line)
+ * \param nb_coords the number of values inside pcoords
+ * \param pvalues the values of the lines (a single value or one per line)
+ * \param nb_values the number of values inside pvalues
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_DrawLines(MB3D_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+                          Uint32 *pvalues, Uint32 nb_values)
+{
+    Uint32 i, depth;
+
+    if (dest->length==0) {
+        return MB_ERR_BAD_SIZE;
+    }
+    depth = dest->seq[0]->depth;
+    if (depth!=1 && depth!=8 && depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if ((nb_coords%6)!=0) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    if (nb_values!=1 && nb_values!=nb_coords/6) {
+        return MB_ERR_BAD_VALUE;
+    }
+
+    for(i=0; i<nb_coords; i+=6) {
+        DRAW_LINE_3D(dest, pcoords+i, SHAPE_VALUE(pvalues, nb_values, i/6));
+    }
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Draws filled cubes inside the 3D image. Pixels outside the image are
+ * ignored.
+ * \param dest the 3D image
+ * \param pcoords the opposite corners of the cubes (x1,y1,z1,x2,y2,z2 for each cube)
+ * \param nb_coords the number of values inside pcoords
+ * \param pvalues the values of the cubes (a single value or one per cube)
+ * \param nb_values the number of values inside pvalues
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB3D_DrawCubes(MB3D_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+                          Uint32 *pvalues, Uint32 nb_values)
+{
+    Uint32 i, value, depth;
+    Sint32 x1, y1, z1, x2, y2, z2, y, z;
+
+    if (dest->length==0) {
+        return MB_ERR_BAD_SIZE;
+    }
+    depth = dest->seq[0]->depth;
+    if (depth!=1 && depth!=8 && depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if ((nb_coords%6)!=0) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    if (nb_values!=1 && nb_values!=nb_coords/6) {
+        return MB_ERR_BAD_VALUE;
+    }
+
+    for(i=0; i<nb_coords; i+=6) {
+        value = SHAPE_VALUE(pvalues, nb_values, i/6);
+        x1 = pcoords[i] < pcoords[i+3] ? pcoords[i] : pcoords[i+3];
+        x2 = pcoords[i] < pcoords[i+3] ? pcoords[i+3] : pcoords[i];
+        y1 = pcoords[i+1] < pcoords[i+4] ? pcoords[i+1] : pcoords[i+4];
+        y2 = pcoords[i+1] < pcoords[i+4] ? pcoords[i+4] : pcoords[i+1];
+        z1 = pcoords[i+2] < pcoords[i+5] ? pcoords[i+2] : pcoords[i+5];
+        z2 = pcoords[i+2] < pcoords[i+5] ? pcoords[i+5] : pcoords[i+2];
+        if (z1<0) z1 = 0;
+        if (z2>=(Sint32) dest->length) z2 = dest->length-1;
+        for(z=z1; z<=z2; z++) {
+            for(y=y1; y<=y2; y++) {
+                PUT_SPAN(dest->seq[z], x1, x2, y, value);
+            }
+        }
+    }
+
+    return MB_NO_ERR;
+}
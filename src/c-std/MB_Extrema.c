@@ -0,0 +1,451 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+
+/* Value given to the pixels not yet processed */
+#define NOT_PROCESSED 0xffffffff
+
+/*
+ * Reads the values of the source image (inverted for the maxima so that
+ * only the minima have to be extracted).
+ * \param src the source image
+ * \param values the values of the pixels
+ * \param maxima 1 if the values must be inverted
+ * \param maxval the maximum value of the image depth
+ */
+static void READ_VALUES(MB_Image *src, Uint32 *values, int maxima, Uint32 maxval)
+{
+    Uint32 x, y, inv;
+    MB_Vector1 *pbin;
+    PIX32 *p32;
+    PLINE p8;
+
+    inv = maxima ? maxval : 0;
+    for(y=0; y<src->height; y++, values+=src->width) {
+        switch(src->depth) {
+        case 1:
+            pbin = (MB_Vector1 *) src->plines[y];
+            for(x=0; x<src->width; x++) {
+                values[x] = inv ^ (Uint32) ((pbin[x/MB_vec1_size]>>(x%MB_vec1_size))&1);
+            }
+            break;
+        case 8:
+            p8 = src->plines[y];
+            for(x=0; x<src->width; x++) {
+                values[x] = inv ^ p8[x];
+            }
+            break;
+        default:
+            p32 = (PIX32 *) src->plines[y];
+            for(x=0; x<src->width; x++) {
+                values[x] = inv ^ p32[x];
+            }
+            break;
+        }
+    }
+}
+
+/*
+ * Computes the positions of the neighbors of a pixel inside the image.
+ * \param p the pixel
+ * \param width the width of the image
+ * \param height the height of the image
+ * \param grid the grid used
+ * \param nb the neighbors positions
+ * \return the number of neighbors
+ */
+static INLINE Uint32 GET_NEIGHBORS(Uint32 p, Uint32 width, Uint32 height,
+                                   enum MB_grid_t grid, Uint32 *nb)
+{
+    Uint32 k, nbdir, nbn = 0;
+    int x, y, nx, ny;
+    const int *dir;
+
+    x = p%width;
+    y = p/width;
+    nbdir = (grid==MB_SQUARE_GRID) ? 8 : 6;
+    if (x>0 && x<(int) width-1 && y>0 && y<(int) height-1) {
+        /* All the neighbors are inside the image */
+        for(k=1; k<=nbdir; k++) {
+            dir = (grid==MB_SQUARE_GRID) ? sqNbDir[k] : hxNbDir[y%2][k];
+            nb[k-1] = p + dir[1]*(int) width + dir[0];
+        }
+        return nbdir;
+    }
+    for(k=1; k<=nbdir; k++) {
+        dir = (grid==MB_SQUARE_GRID) ? sqNbDir[k] : hxNbDir[y%2][k];
+        nx = x+dir[0];
+        ny = y+dir[1];
+        if (nx>=0 && nx<(int) width && ny>=0 && ny<(int) height) {
+            nb[nbn++] = ny*width+nx;
+        }
+    }
+    return nbn;
+}
+
+/*
+ * Finds the root of a pixel in the union-find forest (with path halving).
+ * \param parent the forest
+ * \param p the pixel
+ * \return the root
+ */
+static INLINE Uint32 FIND_ROOT(Uint32 *parent, Uint32 p)
+{
+    while (parent[p]!=p) {
+        parent[p] = parent[parent[p]];
+        p = parent[p];
+    }
+    return p;
+}
+
+/*
+ * Labels the minima plateaus of the image (h equal to 1). A plateau is a
+ * minimum when none of its pixels has a lower neighbor. Labels are given in
+ * the order of the first pixel of each minimum.
+ * \param values the values of the pixels
+ * \param width the width of the image
+ * \param height the height of the image
+ * \param grid the grid used
+ * \param maxval the maximum value (plateaus at this value are not minima)
+ * \param labels the labels (0 outside the minima)
+ * \param queue a working array of width*height values
+ * \return the number of minima
+ */
+static Uint32 PLATEAU_MINIMA(Uint32 *values, Uint32 width, Uint32 height,
+                             enum MB_grid_t grid, Uint32 maxval,
+                             Uint32 *labels, Uint32 *queue)
+{
+    Uint32 n, p, q, i, k, nbn, first, last, v, label, nb[8];
+    int is_min;
+
+    n = width*height;
+    for(p=0; p<n; p++) {
+        labels[p] = NOT_PROCESSED;
+    }
+    label = 0;
+    for(p=0; p<n; p++) {
+        if (labels[p]!=NOT_PROCESSED) continue;
+        /* Flooding of the plateau of p */
+        v = values[p];
+        is_min = (v<maxval);
+        first = last = 0;
+        queue[last++] = p;
+        labels[p] = 0;
+        while (first<last) {
+            q = queue[first++];
+            nbn = GET_NEIGHBORS(q, width, height, grid, nb);
+            for(k=0; k<nbn; k++) {
+                if (values[nb[k]]<v) {
+                    is_min = 0;
+                } else if (values[nb[k]]==v && labels[nb[k]]==NOT_PROCESSED) {
+                    labels[nb[k]] = 0;
+                    queue[last++] = nb[k];
+                }
+            }
+        }
+        if (is_min) {
+            label++;
+            for(i=0; i<last; i++) {
+                labels[queue[i]] = label;
+            }
+        }
+    }
+    return label;
+}
+
+/*
+ * Sorts the pixels by increasing values (radix sort on the range of the
+ * values).
+ * \param values the values of the pixels
+ * \param n the number of pixels
+ * \param sorted the sorted pixels
+ * \param tmp a working array of n values
+ * \param count a working array of 65536 values
+ */
+static void SORT_PIXELS(Uint32 *values, Uint32 n, Uint32 *sorted, Uint32 *tmp,
+                        Uint32 *count)
+{
+    Uint32 i, pass, nb_pass, shift, key, sum, c, vmin, vmax, *in, *out;
+
+    vmin = vmax = values[0];
+    for(i=1; i<n; i++) {
+        if (values[i]<vmin) vmin = values[i];
+        if (values[i]>vmax) vmax = values[i];
+    }
+    nb_pass = (vmax-vmin<65536) ? 1 : 2;
+    for(pass=0; pass<nb_pass; pass++) {
+        shift = 16*pass;
+        in = (pass==0) ? NULL : tmp;
+        out = (pass==nb_pass-1) ? sorted : tmp;
+        MB_memset(count, 0, 65536*sizeof(Uint32));
+        for(i=0; i<n; i++) {
+            count[((values[i]-vmin)>>shift)&0xffff]++;
+        }
+        sum = 0;
+        for(key=0; key<65536; key++) {
+            c = count[key];
+            count[key] = sum;
+            sum += c;
+        }
+        for(i=0; i<n; i++) {
+            c = (in==NULL) ? i : in[i];
+            out[count[((values[c]-vmin)>>shift)&0xffff]++] = c;
+        }
+    }
+}
+
+/*
+ * Labels the minima of the image filled by h. A pixel p is selected when
+ * the connected component of the pixels lower or equal to p containing p has
+ * a minimum m such as p<m+h (saturated). The components are computed with a
+ * union-find on the sorted pixels, level by level. Labels are given in the
+ * order of the first pixel of each connected component of the selected
+ * pixels.
+ * \param values the values of the pixels
+ * \param width the width of the image
+ * \param height the height of the image
+ * \param grid the grid used
+ * \param maxval the maximum value
+ * \param h the height of the minima
+ * \param labels the labels (0 outside the minima)
+ * \param parent a working array of width*height values
+ * \param sorted a working array of width*height values
+ * \param count a working array of 65536 values
+ * \return the number of minima
+ */
+static Uint32 FILLED_MINIMA(Uint32 *values, Uint32 width, Uint32 height,
+                            enum MB_grid_t grid, Uint32 maxval, Uint32 h,
+                            Uint32 *labels, Uint32 *parent, Uint32 *sorted,
+                            Uint32 *count)
+{
+    Uint32 n, i, j, k, p, q, r, v, nbn, label, nb[8], *extr;
+    Uint64 bound;
+
+    n = width*height;
+    /* labels is used as a working array for the sort and then holds */
+    /* the minimum of the components (at their root) */
+    SORT_PIXELS(values, n, sorted, labels, count);
+    extr = labels;
+
+    for(p=0; p<n; p++) {
+        parent[p] = NOT_PROCESSED;
+    }
+    for(i=0; i<n; i=j) {
+        /* The pixels of the level are merged with the lower ones */
+        v = values[sorted[i]];
+        for(j=i; j<n && values[sorted[j]]==v; j++) {
+            p = sorted[j];
+            parent[p] = p;
+            extr[p] = v;
+            r = p;
+            nbn = GET_NEIGHBORS(p, width, height, grid, nb);
+            for(k=0; k<nbn; k++) {
+                if (parent[nb[k]]==NOT_PROCESSED) continue;
+                q = FIND_ROOT(parent, nb[k]);
+                if (q!=r) {
+                    if (extr[q]<extr[r]) {
+                        parent[r] = q;
+                        r = q;
+                    } else {
+                        parent[q] = r;
+                    }
+                }
+            }
+        }
+        /* and selected according to the minimum of their component */
+        for(k=i; k<j; k++) {
+            p = sorted[k];
+            bound = (Uint64) extr[FIND_ROOT(parent, p)] + h;
+            if (bound>maxval) bound = maxval;
+            if (v>=bound) sorted[k] = NOT_PROCESSED;
+        }
+    }
+
+    /* Labelling of the connected components of the selected pixels */
+    for(p=0; p<n; p++) {
+        parent[p] = NOT_PROCESSED;
+    }
+    for(i=0; i<n; i++) {
+        if (sorted[i]!=NOT_PROCESSED) parent[sorted[i]] = sorted[i];
+    }
+    for(p=0; p<n; p++) {
+        if (parent[p]==NOT_PROCESSED) continue;
+        /* p is merged with its neighbors already processed (the root of a */
+        /* component is its first pixel) */
+        r = p;
+        nbn = GET_NEIGHBORS(p, width, height, grid, nb);
+        for(k=0; k<nbn; k++) {
+            if (nb[k]>p || parent[nb[k]]==NOT_PROCESSED) continue;
+            q = FIND_ROOT(parent, nb[k]);
+            if (q<r) {
+                parent[r] = q;
+                r = q;
+            } else if (r<q) {
+                parent[q] = r;
+            }
+        }
+    }
+    label = 0;
+    for(p=0; p<n; p++) {
+        if (parent[p]==NOT_PROCESSED) {
+            labels[p] = 0;
+        } else {
+            r = FIND_ROOT(parent, p);
+            labels[p] = (r==p) ? ++label : labels[r];
+        }
+    }
+    return label;
+}
+
+/*
+ * Extracts the regional minima (or maxima) of an image, filled by h.
+ * A pixel p belongs to the result when the connected component of the
+ * pixels lower (resp. greater) or equal to p containing p has a minimum
+ * (resp. maximum) m such as p<m+h (resp. p>m-h), the values being
+ * saturated. This is identical to the threshold of the difference between
+ * the image and its dual reconstruction (resp. reconstruction) by the image
+ * increased (resp. decreased) by h.
+ * \param src the source image (binary, 8-bit or 32-bit)
+ * \param dest the binary result or the 32-bit labelled result
+ * \param h the height of the extrema
+ * \param pNbobj the number of extrema found
+ * \param grid the grid used
+ * \param maxima 1 for the maxima, 0 for the minima
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB_Extrema(MB_Image *src, MB_Image *dest, Uint32 h,
+                             Uint32 *pNbobj, enum MB_grid_t grid, int maxima)
+{
+    Uint32 *values, *labels, *work, *sorted, *count;
+    Uint32 width, height, n, x, y, maxval;
+    MB_Vector1 *pbin;
+
+    if (!MB_CHECK_SIZE_2(src, dest)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (src->depth!=1 && src->depth!=8 && src->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if (dest->depth!=1 && dest->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if (src==dest) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+
+    width = src->width;
+    height = src->height;
+    n = width*height;
+    maxval = (src->depth==1) ? 1 : ((src->depth==8) ? 0xff : 0xffffffff);
+
+    values = MB_malloc(n*sizeof(Uint32));
+    labels = MB_malloc(n*sizeof(Uint32));
+    work = MB_malloc(n*sizeof(Uint32));
+    if (h==1) {
+        sorted = count = NULL;
+    } else {
+        sorted = MB_malloc(n*sizeof(Uint32));
+        count = MB_malloc(65536*sizeof(Uint32));
+    }
+    if (values==NULL || labels==NULL || work==NULL ||
+        (h!=1 && (sorted==NULL || count==NULL))) {
+        MB_free(values);
+        MB_free(labels);
+        MB_free(work);
+        MB_free(sorted);
+        MB_free(count);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    READ_VALUES(src, values, maxima, maxval);
+    if (h==1) {
+        *pNbobj = PLATEAU_MINIMA(values, width, height, grid, maxval,
+                                 labels, work);
+    } else {
+        *pNbobj = FILLED_MINIMA(values, width, height, grid, maxval, h,
+                                labels, work, sorted, count);
+    }
+
+    for(y=0; y<height; y++) {
+        if (dest->depth==1) {
+            pbin = (MB_Vector1 *) dest->plines[y];
+            MB_memset(pbin, 0, width/8);
+            for(x=0; x<width; x++) {
+                if (labels[y*width+x]) {
+                    pbin[x/MB_vec1_size] |= ((MB_Vector1) 1)<<(x%MB_vec1_size);
+                }
+            }
+        } else {
+            MB_memcpy(dest->plines[y], labels+y*width, width*sizeof(PIX32));
+        }
+    }
+
+    MB_free(values);
+    MB_free(labels);
+    MB_free(work);
+    MB_free(sorted);
+    MB_free(count);
+
+    return MB_NO_ERR;
+}
+
+/*
+ * Extracts the minima of an image. With h greater than 1, the pixels whose
+ * value is lower than the minimum of their component plus h are also
+ * extracted (the result is the same as the threshold of the difference
+ * between the dual reconstruction of the image by the image plus h and the
+ * image).
+ * \param src the source image (binary, 8-bit or 32-bit)
+ * \param dest the binary result or the 32-bit labelled result
+ * \param h the height of the minima
+ * \param pNbobj the number of minima found
+ * \param grid the grid used
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_Minima(MB_Image *src, MB_Image *dest, Uint32 h, Uint32 *pNbobj,
+                     enum MB_grid_t grid)
+{
+    return MB_Extrema(src, dest, h, pNbobj, grid, 0);
+}
+
+/*
+ * Extracts the maxima of an image. With h greater than 1, the pixels whose
+ * value is greater than the maximum of their component minus h are also
+ * extracted (the result is the same as the threshold of the difference
+ * between the image and its reconstruction by the image minus h).
+ * \param src the source image (binary, 8-bit or 32-bit)
+ * \param dest the binary result or the 32-bit labelled result
+ * \param h the height of the maxima
+ * \param pNbobj the number of maxima found
+ * \param grid the grid used
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_Maxima(MB_Image *src, MB_Image *dest, Uint32 h, Uint32 *pNbobj,
+                     enum MB_grid_t grid)
+{
+    return MB_Extrema(src, dest, h, pNbobj, grid, 1);
+}
@@ -26,6 +26,12 @@
  * THE SOFTWARE.
  */
 #include "mambaApi_loc.h"
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+/* Minimal number of lines inside a strip when labelling by strips */
+#define MB_LABEL_STRIP_MIN 64
 
 extern MB_errcode MB_Labelb(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh, Uint32 *pNbobj, enum MB_grid_t grid);
 extern MB_errcode MB_Label8(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh, Uint32 *pNbobj, enum MB_grid_t grid);
@@ -66,6 +72,20 @@ PIX32 MB_find_above_label(MB_Label_struct *labels, PIX32 inlabel)
     }
 }
 
+/* Function merging the trees of two provisional labels. The root of */
+/* the merged tree is the lowest of the two roots. */
+void MB_join_labels(MB_Label_struct *labels, PIX32 label1, PIX32 label2)
+{
+    label1 = MB_find_above_label(labels, label1);
+    label2 = MB_find_above_label(labels, label2);
+
+    if (label1<label2) {
+        labels->EQ[label2] = label1;
+    } else if (label2<label1) {
+        labels->EQ[label1] = label2;
+    }
+}
+
 /****************************************
  * Tidying function                     *
  ****************************************
@@ -99,6 +119,151 @@ void MB_TidyLabel(PLINE *plines_out,
     }
 }
 
+/****************************************
+ * Strip labelling                      *
+ ****************************************
+ * The image is cut into horizontal strips which are labelled
+ * independently (in parallel when OpenMP is available). Each strip
+ * draws its provisional labels from its own range of the equivalence
+ * table. The trees of labels lying across the strips borders are then
+ * merged and the final labels are computed by the tidying pass.
+ */
+
+/*
+ * Labels the objects of the src image using horizontal strips.
+ *
+ * The equivalence tables are sized using the number of runs (sequences
+ * of identical non-zero pixels along a line) found in the source image,
+ * which bounds the number of provisional labels the grid function can
+ * create.
+ *
+ * \param src the source image where the object must be labelled
+ * \param dest the 32-bit image where object are labelled
+ * \param lblow the lowest value allowed for label on the low byte (must be inferior to lbhigh)
+ * \param lbhigh the first high value NOT allowed for label on the low byte (maximum allowed is 256)
+ * \param pNbobj the number of object founds
+ * \param grid the grid used (either square or hexagonal)
+ * \param fn the grid function labelling a strip of lines
+ * \param runs the function counting the runs inside a strip of lines
+ * \param join the function merging the labels across a strip border
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_LabelStrips(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh,
+                          Uint32 *pNbobj, enum MB_grid_t grid,
+                          LABELGRIDFUNC *fn, LABELRUNSFUNC *runs, LABELJOINFUNC *join)
+{
+    Uint32 bytes_in, bytes_out, nb_strips, strip_lines;
+    Uint32 *first;
+    PIX32 *base;
+    PLINE *plines_in, *plines_out;
+    MB_Label_struct labels;
+    int s;
+
+    /* Computing the strips. Their height is even so that every strip */
+    /* starts on an even line (needed by the hexagonal grid functions) */
+    nb_strips = 1;
+#ifdef _OPENMP
+    nb_strips = (Uint32) omp_get_max_threads();
+#endif
+    strip_lines = (src->height+nb_strips-1)/nb_strips;
+    strip_lines = (strip_lines+1) & ~1;
+    if (strip_lines<MB_LABEL_STRIP_MIN) strip_lines = MB_LABEL_STRIP_MIN;
+    nb_strips = (src->height+strip_lines-1)/strip_lines;
+
+    first = MB_malloc((nb_strips+1)*sizeof(Uint32));
+    if (first==NULL) {
+        /* In case allocation goes wrong */
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    base = MB_malloc((nb_strips+1)*sizeof(PIX32));
+    if (base==NULL) {
+        /* In case allocation goes wrong */
+        MB_free(first);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    for(s=0; s<(int)nb_strips; s++) {
+        first[s] = s*strip_lines;
+    }
+    first[nb_strips] = src->height;
+
+    /* Setting up pointers */
+    plines_in = src->plines;
+    plines_out = dest->plines;
+    bytes_in = MB_LINE_COUNT(src);
+    bytes_out = MB_LINE_COUNT(dest);
+
+    /* Each strip gets a range of provisional labels as large as */
+    /* its number of runs */
+#ifdef _OPENMP
+    #pragma omp parallel for
+#endif
+    for(s=0; s<(int)nb_strips; s++) {
+        base[s+1] = runs(plines_in+first[s], bytes_in, first[s+1]-first[s]);
+    }
+    base[0] = 1;
+    for(s=0; s<(int)nb_strips; s++) {
+        base[s+1] += base[s];
+    }
+
+    /* Initializing the algorithm parameters */
+    labels.current = 1;
+    labels.ccurrent = 1;
+    labels.nbObjs = 0;
+    labels.maxEQ = base[nb_strips];
+    labels.EQ = MB_malloc(labels.maxEQ*sizeof(PIX32));
+    if(labels.EQ==NULL){
+        /* In case allocation goes wrong */
+        MB_free(first);
+        MB_free(base);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    labels.CEQ = MB_malloc(labels.maxEQ*sizeof(PIX32));
+    if(labels.CEQ==NULL){
+        /* in case allocation goes wrong */
+        MB_free(labels.EQ);
+        MB_free(first);
+        MB_free(base);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    MB_memset(labels.EQ, 0, labels.maxEQ*sizeof(PIX32));
+    MB_memset(labels.CEQ, 0, labels.maxEQ*sizeof(PIX32));
+
+    /* Labelling the strips independently, each one with its own */
+    /* context. The strips only access their own part of the tables */
+#ifdef _OPENMP
+    #pragma omp parallel for
+#endif
+    for(s=0; s<(int)nb_strips; s++) {
+        MB_Label_struct strip;
+        Uint32 i;
+
+        strip = labels;
+        strip.current = base[s];
+        /* The label image is reset */
+        for(i=first[s]; i<first[s+1]; i++) {
+            MB_memset(plines_out[i], 0, bytes_out);
+        }
+        fn(plines_out+first[s], plines_in+first[s], bytes_in, first[s+1]-first[s], &strip);
+    }
+
+    /* Merging the labels across the strips borders */
+    for(s=1; s<(int)nb_strips; s++) {
+        join(plines_out, plines_in, first[s], bytes_in, grid, &labels);
+    }
+
+    MB_TidyLabel(plines_out, bytes_out, src->height, (PIX32) lblow, (PIX32) lbhigh, &labels);
+
+    *pNbobj = (Uint32) (labels.nbObjs);
+
+    /* Freeing the labels arrays */
+    MB_free(labels.EQ);
+    MB_free(labels.CEQ);
+    MB_free(first);
+    MB_free(base);
+
+    return MB_NO_ERR;
+}
+
 /*
  * Labeling the object found in src image.
  *
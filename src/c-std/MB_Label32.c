@@ -334,6 +334,79 @@ static INLINE void QLAB_LINE(PLINE *plines_out, PLINE *plines_in, Uint32 index,
     }
 }
 
+/******************************************
+ * Strip functions                        *
+ ******************************************/
+
+/*
+ * Counts the runs (sequences of identical non-zero pixels) inside the lines.
+ * A new provisional label can only be taken at the start of a run.
+ *
+ * \param plines_in pointer on the lines in the source image
+ * \param bytes_in number of bytes inside the line
+ * \param nb_lines number of lines processed
+ * \return the number of runs found
+ */
+static Uint32 RUNS_COUNT(PLINE *plines_in, Uint32 bytes_in, Uint32 nb_lines)
+{
+    Uint32 i,j;
+    Uint32 count = 0;
+    PIX32 pix, previous_pix;
+    PIX32 *pin;
+
+    for(i=0; i<nb_lines; i++) {
+        pin = (PIX32 *) (plines_in[i]);
+        previous_pix = 0;
+        for(j=0; j<bytes_in; j+=4, pin++) {
+            pix = *pin;
+            if ((pix!=0) && (pix!=previous_pix)) {
+                count++;
+            }
+            previous_pix = pix;
+        }
+    }
+
+    return count;
+}
+
+/*
+ * Merges the labels of the line with the labels of the previous line
+ * (the last line of the strip above).
+ *
+ * \param plines_out pointer on the lines in the destination image
+ * \param plines_in pointer on the lines in the source image
+ * \param index line being processed
+ * \param bytes_in number of bytes inside the line
+ * \param grid the grid used (either square or hexagonal)
+ * \param labels the labels arrays and context
+ */
+static void JOIN_LINE(PLINE *plines_out, PLINE *plines_in, Uint32 index,
+                      Uint32 bytes_in, enum MB_grid_t grid,
+                      MB_Label_struct *labels)
+{
+    Uint32 i,j,left,right;
+    Uint32 nb_pixels = bytes_in/4;
+
+    PIX32 *pin = (PIX32 *) (plines_in[index]);
+    PIX32 *pinpre = (PIX32 *) (plines_in[index-1]);
+    PIX32 *pout = (PIX32 *) (plines_out[index]);
+    PIX32 *poutpre = (PIX32 *) (plines_out[index-1]);
+
+    for(i=0; i<nb_pixels; i++) {
+        if (pin[i]!=0) {
+            /* Neighbors in the previous line (the even lines are shifted */
+            /* to the left in hexagonal grid) */
+            left = (i>0 && (grid==MB_SQUARE_GRID || (index%2)==0)) ? i-1 : i;
+            right = (i<nb_pixels-1 && (grid==MB_SQUARE_GRID || (index%2)==1)) ? i+1 : i;
+            for(j=left; j<=right; j++) {
+                if (pinpre[j]==pin[i]) {
+                    MB_join_labels(labels, pout[i], poutpre[j]);
+                }
+            }
+        }
+    }
+}
+
 /******************************************
  * Grid functions                         *
  ******************************************/
@@ -352,51 +425,6 @@ static INLINE void QLAB_LINE(PLINE *plines_out, PLINE *plines_in, Uint32 index,
  */
 MB_errcode MB_Label32(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh, Uint32 *pNbobj, enum MB_grid_t grid)
 {
-    Uint32 bytes_in, bytes_out;
-    PLINE *plines_in, *plines_out;
-    MB_Label_struct labels;
-    LABELGRIDFUNC *fn;
-    
-    /* Initializing the algorithm parameters */
-    labels.current = 1;
-    labels.ccurrent = 1;
-    labels.nbObjs = 0;
-    labels.maxEQ = (src->width*src->height);
-    labels.EQ = MB_malloc(labels.maxEQ*sizeof(PIX32));
-    if(labels.EQ==NULL){
-        /* In case allocation goes wrong */
-        return MB_ERR_CANT_ALLOCATE_MEMORY;
-    } 
-    labels.CEQ = MB_malloc(labels.maxEQ*sizeof(PIX32));
-    if(labels.CEQ==NULL){
-        /* in case allocation goes wrong */
-        MB_free(labels.EQ);
-        return MB_ERR_CANT_ALLOCATE_MEMORY;
-    } 
-    MB_memset(labels.EQ, 0, labels.maxEQ*sizeof(PIX32));
-    MB_memset(labels.CEQ, 0, labels.maxEQ*sizeof(PIX32));
-    
-    /* The label image is reset */
-    MB_ConSet(dest, 0);
-    
-    /* Setting up pointers */
-    plines_in = src->plines;
-    plines_out = dest->plines;
-    bytes_in = MB_LINE_COUNT(src);
-    bytes_out = MB_LINE_COUNT(dest);
-    
-    /* Calling the corresponding function */
-    fn = SwitchTo[grid];
-    fn(plines_out, plines_in, bytes_in, src->height, &labels);
-
-    MB_TidyLabel(plines_out, bytes_out, src->height, (PIX32) lblow, (PIX32) lbhigh, &labels);
-    
-    *pNbobj = (Uint32) (labels.nbObjs);
-    
-    /* Freeing the labels arrays */
-    MB_free(labels.EQ);
-    MB_free(labels.CEQ);
-
-    return MB_NO_ERR;
+    return MB_LabelStrips(src, dest, lblow, lbhigh, pNbobj, grid,
+                          SwitchTo[grid], RUNS_COUNT, JOIN_LINE);
 }
-
@@ -452,6 +452,85 @@ static INLINE void QLAB_LINE(PLINE *plines_out, PLINE *plines_in, Uint32 index,
     }
 }
 
+/******************************************
+ * Strip functions                        *
+ ******************************************/
+
+/*
+ * Counts the runs (sequences of set pixels) inside the lines. A new
+ * provisional label can only be taken at the start of a run. A run
+ * overlapping two registers is counted twice (the count is only an
+ * upper bound).
+ *
+ * \param plines_in pointer on the lines in the source image
+ * \param bytes_in number of bytes inside the line
+ * \param nb_lines number of lines processed
+ * \return the number of runs found
+ */
+static Uint32 RUNS_COUNT(PLINE *plines_in, Uint32 bytes_in, Uint32 nb_lines)
+{
+    Uint32 i,j;
+    Uint32 count = 0;
+    MB_Vector1 starts;
+    MB_Vector1 *pin;
+
+    for(i=0; i<nb_lines; i++) {
+        pin = (MB_Vector1 *) (plines_in[i]);
+        for(j=0; j<bytes_in; j+=sizeof(MB_Vector1), pin++) {
+            /* Set pixels whose left neighbor is not set */
+            starts = (*pin) & (~((*pin)<<1));
+            while (starts) {
+                starts &= starts-1;
+                count++;
+            }
+        }
+    }
+
+    return count;
+}
+
+/* Value of the pixel at position i in a binary line */
+#define BIT_VAL(line, i) \
+    (((line)[(i)/MB_vec1_size]>>((i)%MB_vec1_size))&1)
+
+/*
+ * Merges the labels of the line with the labels of the previous line
+ * (the last line of the strip above).
+ *
+ * \param plines_out pointer on the lines in the destination image
+ * \param plines_in pointer on the lines in the source image
+ * \param index line being processed
+ * \param bytes_in number of bytes inside the line
+ * \param grid the grid used (either square or hexagonal)
+ * \param labels the labels arrays and context
+ */
+static void JOIN_LINE(PLINE *plines_out, PLINE *plines_in, Uint32 index,
+                      Uint32 bytes_in, enum MB_grid_t grid,
+                      MB_Label_struct *labels)
+{
+    Uint32 i,j,left,right;
+    Uint32 nb_pixels = bytes_in*8;
+
+    MB_Vector1 *pin = (MB_Vector1 *) (plines_in[index]);
+    MB_Vector1 *pinpre = (MB_Vector1 *) (plines_in[index-1]);
+    PIX32 *pout = (PIX32 *) (plines_out[index]);
+    PIX32 *poutpre = (PIX32 *) (plines_out[index-1]);
+
+    for(i=0; i<nb_pixels; i++) {
+        if (BIT_VAL(pin, i)) {
+            /* Neighbors in the previous line (the even lines are shifted */
+            /* to the left in hexagonal grid) */
+            left = (i>0 && (grid==MB_SQUARE_GRID || (index%2)==0)) ? i-1 : i;
+            right = (i<nb_pixels-1 && (grid==MB_SQUARE_GRID || (index%2)==1)) ? i+1 : i;
+            for(j=left; j<=right; j++) {
+                if (BIT_VAL(pinpre, j)) {
+                    MB_join_labels(labels, pout[i], poutpre[j]);
+                }
+            }
+        }
+    }
+}
+
 /******************************************
  * Grid functions                         *
  ******************************************/
@@ -470,51 +549,6 @@ static INLINE void QLAB_LINE(PLINE *plines_out, PLINE *plines_in, Uint32 index,
  */
 MB_errcode MB_Labelb(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh, Uint32 *pNbobj, enum MB_grid_t grid)
 {
-    Uint32 bytes_in, bytes_out;
-    PLINE *plines_in, *plines_out;
-    MB_Label_struct labels;
-    LABELGRIDFUNC *fn;
-    
-    /* Initializing the algorithm parameters */
-    labels.current = 1;
-    labels.ccurrent = 1;
-    labels.nbObjs = 0;
-    labels.maxEQ = (src->width*src->height)/4;
-    labels.EQ = MB_malloc(labels.maxEQ*sizeof(PIX32));
-    if(labels.EQ==NULL){
-        /* In case allocation goes wrong */
-        return MB_ERR_CANT_ALLOCATE_MEMORY;
-    } 
-    labels.CEQ = MB_malloc(labels.maxEQ*sizeof(PIX32));
-    if(labels.CEQ==NULL){
-        /* In case allocation goes wrong */
-        MB_free(labels.EQ);
-        return MB_ERR_CANT_ALLOCATE_MEMORY;
-    } 
-    MB_memset(labels.EQ, 0, labels.maxEQ*sizeof(PIX32));
-    MB_memset(labels.CEQ, 0, labels.maxEQ*sizeof(PIX32));
-    
-    /* The label image is reset */
-    MB_ConSet(dest, 0);
-    
-    /* Setting up pointers */
-    plines_in = src->plines;
-    plines_out = dest->plines;
-    bytes_in = MB_LINE_COUNT(src);
-    bytes_out = MB_LINE_COUNT(dest);
-    
-    /* Calling the corresponding function */
-    fn = SwitchTo[grid];
-    fn(plines_out, plines_in, bytes_in, src->height, &labels);
-
-    MB_TidyLabel(plines_out, bytes_out, src->height, (PIX32) lblow, (PIX32) lbhigh, &labels);
-    
-    *pNbobj = (Uint32) (labels.nbObjs);
-    
-    /* Freeing the labels arrays */
-    MB_free(labels.EQ);
-    MB_free(labels.CEQ);
-
-    return MB_NO_ERR;
+    return MB_LabelStrips(src, dest, lblow, lbhigh, pNbobj, grid,
+                          SwitchTo[grid], RUNS_COUNT, JOIN_LINE);
 }
-
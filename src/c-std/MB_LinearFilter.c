@@ -0,0 +1,461 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+
+/* Work buffers of the line filters */
+typedef struct {
+    /* Extrema from the start (g) and to the end (h) of each block of lines */
+    PIX32 *g;
+    PIX32 *h;
+    /* Values of a horizontal line and its extrema inside blocks */
+    PIX32 *ext;
+    PIX32 *gline;
+    PIX32 *hline;
+} MB_LinearWork;
+
+#define LIN_OP(domax, a, b) \
+    ((domax) ? ((a)>(b) ? (a) : (b)) : ((a)<(b) ? (a) : (b)))
+
+/* Horizontal displacement of the neighbor of a pixel on line t */
+static INLINE Sint32 LIN_DX(enum MB_grid_t grid, Uint32 dir, Sint64 t)
+{
+    if (grid==MB_SQUARE_GRID) {
+        return sqNbDir[dir][0];
+    }
+    return hxNbDir[t&1][dir][0];
+}
+
+/*
+ * Replaces each value of a line by its minimum (or maximum) with the value
+ * of another line at the same position.
+ * \param line the line modified
+ * \param other the other line
+ * \param len the number of values
+ * \param domax if not zero, the maximum is computed instead of the minimum
+ */
+static INLINE void LIN_COMBINE(PIX32 *line, PIX32 *other, Uint32 len, int domax)
+{
+    Uint32 i;
+
+    if (domax) {
+        for(i=0; i<len; i++) {
+            line[i] = (other[i]>line[i]) ? other[i] : line[i];
+        }
+    } else {
+        for(i=0; i<len; i++) {
+            line[i] = (other[i]<line[i]) ? other[i] : line[i];
+        }
+    }
+}
+
+/*
+ * Same as LIN_COMBINE with the other line shifted by 'sh' positions. The
+ * values outside the other line leave the line unchanged.
+ */
+static INLINE void LIN_COMBINE_SHIFTED(PIX32 *line, PIX32 *other, Uint32 len,
+                                       Sint32 sh, int domax)
+{
+    if (sh>=0) {
+        LIN_COMBINE(line, other+sh, len-sh, domax);
+    } else {
+        LIN_COMBINE(line-sh, other, len+sh, domax);
+    }
+}
+
+/*
+ * Computes the minimum (or maximum) of the values inside a sliding window of
+ * n+1 values with a constant number of comparisons per value (van Herk,
+ * Gil and Werman algorithm): out[i] is the extremum of ext[i] to ext[i+n].
+ * \param ext the values (len+n values)
+ * \param len the number of results
+ * \param n the size of the window minus one
+ * \param domax if not zero, the maximum is computed instead of the minimum
+ * \param out the results
+ * \param g work buffer (len+n values)
+ * \param h work buffer (len+n values)
+ */
+static void LIN_WINDOW(PIX32 *ext, Uint32 len, Uint32 n, int domax,
+                       PIX32 *out, PIX32 *g, PIX32 *h)
+{
+    Uint32 i, start, end, k = n+1, total = len+n;
+
+    for(start=0; start<total; start+=k) {
+        end = (start+k<total) ? start+k : total;
+        g[start] = ext[start];
+        for(i=start+1; i<end; i++) {
+            g[i] = LIN_OP(domax, ext[i], g[i-1]);
+        }
+        h[end-1] = ext[end-1];
+        for(i=end-1; i>start; i--) {
+            h[i-1] = LIN_OP(domax, ext[i-1], h[i]);
+        }
+    }
+    MB_memcpy(out, h, len*sizeof(PIX32));
+    LIN_COMBINE(out, g+n, len, domax);
+}
+
+/*
+ * Stores a line of results according to the accumulation mode.
+ * \param out the output line
+ * \param res the results
+ * \param len the number of results
+ * \param mode 0 to store the results, 1 to keep the maximum, 2 the minimum
+ */
+static INLINE void LIN_STORE(PIX32 *out, PIX32 *res, Uint32 len, int mode)
+{
+    if (mode==0) {
+        MB_memcpy(out, res, len*sizeof(PIX32));
+    } else {
+        LIN_COMBINE(out, res, len, mode==1);
+    }
+}
+
+/*
+ * Fills a line of the padded image: the line is extended by n values on
+ * each side and the lines outside the image are entirely padded.
+ * \param in the image values
+ * \param W the width of the image
+ * \param H the height of the image
+ * \param t the line (possibly outside the image)
+ * \param n the size of the padding
+ * \param pad the value of the padding
+ * \param row the padded line (W+2n values)
+ */
+static INLINE void LIN_PADDED_ROW(PIX32 *in, Uint32 W, Uint32 H, Sint64 t,
+                                  Uint32 n, PIX32 pad, PIX32 *row)
+{
+    Uint32 i;
+
+    if (t<0 || t>=(Sint64) H) {
+        for(i=0; i<W+2*n; i++) {
+            row[i] = pad;
+        }
+        return;
+    }
+    for(i=0; i<n; i++) {
+        row[i] = pad;
+        row[W+n+i] = pad;
+    }
+    MB_memcpy(row+n, in+((Uint64) t)*W, W*sizeof(PIX32));
+}
+
+/*
+ * Computes, for each pixel, the minimum (or maximum) of the pixel and of its
+ * n successors in a direction. The pixels outside the image take the value
+ * 'pad'. The lines of pixels along the direction are cut into blocks of n+1
+ * pixels in which the extrema from the start and to the end of the block
+ * are propagated line by line of the image.
+ * \param in the image values
+ * \param out the output values
+ * \param W the width of the image
+ * \param H the height of the image
+ * \param dir the direction
+ * \param grid the grid used (either square or hexagonal)
+ * \param n the number of successors
+ * \param domax if not zero, the maximum is computed instead of the minimum
+ * \param pad the value of the pixels outside the image
+ * \param mode how the results are stored (see LIN_STORE)
+ * \param work the work buffers
+ */
+static void LIN_DIR_WINDOW(PIX32 *in, PIX32 *out, Uint32 W, Uint32 H,
+                           Uint32 dir, enum MB_grid_t grid, Uint32 n,
+                           int domax, PIX32 pad, int mode, MB_LinearWork *work)
+{
+    Uint32 i, b, k = n+1, Wp = W+2*n;
+    Sint32 dy, dx, D, ce;
+    Sint64 s, t;
+    PIX32 *row, *res;
+
+    dy = (grid==MB_SQUARE_GRID) ? sqNbDir[dir][1] : hxNbDir[0][dir][1];
+
+    if (dy==0) {
+        /* Horizontal lines are filtered one at a time */
+        dx = LIN_DX(grid, dir, 0);
+        for(t=0; t<(Sint64) H; t++) {
+            for(i=0; i<n; i++) {
+                work->ext[(dx>0) ? W+i : i] = pad;
+            }
+            MB_memcpy(work->ext+((dx>0) ? 0 : n), in+((Uint64) t)*W,
+                      W*sizeof(PIX32));
+            LIN_WINDOW(work->ext, W, n, domax, work->g, work->gline, work->hline);
+            LIN_STORE(out+((Uint64) t)*W, work->g, W, mode);
+        }
+        return;
+    }
+
+    /* The lines of the image are taken in the order of the direction: s is */
+    /* the rank of line t along the direction */
+    for(b=0; b*k<H; b++) {
+        /* Extrema to the end of the block (from its last line upward) */
+        for(i=k; i>0; i--) {
+            s = ((Sint64) b)*k+i-1;
+            t = (dy>0) ? s : ((Sint64) H)-1-s;
+            row = work->h+(i-1)*Wp;
+            LIN_PADDED_ROW(in, W, H, t, n, pad, row);
+            if (i<k) {
+                LIN_COMBINE_SHIFTED(row, row+Wp, Wp,
+                                    LIN_DX(grid, dir, t), domax);
+            }
+        }
+        /* Extrema from the start of the next block */
+        for(i=0; i<k && n>0; i++) {
+            s = ((Sint64) b+1)*k+i;
+            t = (dy>0) ? s : ((Sint64) H)-1-s;
+            row = work->g+i*Wp;
+            LIN_PADDED_ROW(in, W, H, t, n, pad, row);
+            if (i>0) {
+                LIN_COMBINE_SHIFTED(row, row-Wp, Wp,
+                                    -LIN_DX(grid, dir, (dy>0) ? t-1 : t+1),
+                                    domax);
+            }
+        }
+        /* The window of a pixel covers the end of its block and the start */
+        /* of the next one */
+        for(i=0; i<k && ((Uint64) b)*k+i<H; i++) {
+            s = ((Sint64) b)*k+i;
+            t = (dy>0) ? s : ((Sint64) H)-1-s;
+            res = work->h+i*Wp+n;
+            if (i>0) {
+                /* Horizontal displacement after n steps from line t */
+                ce = (t&1) ? n/2 : (n+1)/2;
+                D = ce*LIN_DX(grid, dir, 0) + (n-ce)*LIN_DX(grid, dir, 1);
+                LIN_COMBINE(res, work->g+(i-1)*Wp+n+D, W, domax);
+            }
+            LIN_STORE(out+((Uint64) t)*W, res, W, mode);
+        }
+    }
+}
+
+/*
+ * Computes the supremum of openings (or the infimum of closings) by
+ * segments of the grid directions.
+ * \param src the source image
+ * \param dest the destination image
+ * \param psegs the segments, given as pairs (direction, size)
+ * \param len_segs the number of values in the segments buffer
+ * \param grid the grid used (either square or hexagonal)
+ * \param edge the kind of edge used by the erosions
+ * \param closing if not zero, closings are computed
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB_LinearFilter(MB_Image *src, MB_Image *dest,
+                                  Uint32 *psegs, Uint32 len_segs,
+                                  enum MB_grid_t grid,
+                                  enum MB_edgemode_t edge, int closing)
+{
+    Uint32 W = src->width, H = src->height;
+    Uint32 s, dir, tdir, n, x, y, nmax, maxlen;
+    Uint32 nbdirs = (grid==MB_SQUARE_GRID) ? 8 : 6;
+    Uint64 i, size = ((Uint64) W)*H;
+    PIX32 maxval, edgeval;
+    PIX32 *in, *tmp, *acc, *line;
+    MB_LinearWork work;
+    MB_Vector1 *pline1;
+    PIX8 *pline8;
+
+    if (!MB_CHECK_SIZE_2(src, dest)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (src->depth!=dest->depth) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if (len_segs==0 || (len_segs%2)!=0) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    /* Segments longer than the lines give the same result */
+    maxlen = (W>H) ? W : H;
+    nmax = 0;
+    for(s=0; s<len_segs; s+=2) {
+        if (psegs[s]>nbdirs) {
+            return MB_ERR_BAD_PARAMETER;
+        }
+        n = (psegs[s+1]<maxlen) ? psegs[s+1] : maxlen;
+        nmax = (n>nmax) ? n : nmax;
+    }
+
+    switch(src->depth) {
+    case 1:
+        maxval = 1;
+        break;
+    case 8:
+        maxval = 0xff;
+        break;
+    case 32:
+        maxval = 0xffffffff;
+        break;
+    default:
+        return MB_ERR_BAD_DEPTH;
+    }
+    edgeval = (edge==MB_FILLED_EDGE) ? maxval : 0;
+
+    in = (PIX32 *) MB_malloc(size*sizeof(PIX32));
+    tmp = (PIX32 *) MB_malloc(size*sizeof(PIX32));
+    acc = (PIX32 *) MB_malloc(size*sizeof(PIX32));
+    work.g = (PIX32 *) MB_malloc(((Uint64) nmax+1)*(W+2*nmax)*sizeof(PIX32));
+    work.h = (PIX32 *) MB_malloc(((Uint64) nmax+1)*(W+2*nmax)*sizeof(PIX32));
+    work.ext = (PIX32 *) MB_malloc((W+nmax)*sizeof(PIX32));
+    work.gline = (PIX32 *) MB_malloc((W+nmax)*sizeof(PIX32));
+    work.hline = (PIX32 *) MB_malloc((W+nmax)*sizeof(PIX32));
+    if (in==NULL || tmp==NULL || acc==NULL || work.g==NULL || work.h==NULL ||
+        work.ext==NULL || work.gline==NULL || work.hline==NULL) {
+        MB_free(in);
+        MB_free(tmp);
+        MB_free(acc);
+        MB_free(work.g);
+        MB_free(work.h);
+        MB_free(work.ext);
+        MB_free(work.gline);
+        MB_free(work.hline);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    /* Reading the source image */
+    for(y=0; y<H; y++) {
+        line = in+((Uint64) y)*W;
+        switch(src->depth) {
+        case 1:
+            pline1 = (MB_Vector1 *) (src->plines[y]);
+            for(x=0; x<W; x++) {
+                line[x] = (PIX32) ((pline1[x/MB_vec1_size]>>(x%MB_vec1_size))&1);
+            }
+            break;
+        case 8:
+            pline8 = (PIX8 *) (src->plines[y]);
+            for(x=0; x<W; x++) {
+                line[x] = (PIX32) pline8[x];
+            }
+            break;
+        default:
+            MB_memcpy(line, src->plines[y], W*sizeof(PIX32));
+            break;
+        }
+    }
+    for(i=0; i<size; i++) {
+        acc[i] = closing ? maxval : 0;
+    }
+
+    for(s=0; s<len_segs; s+=2) {
+        dir = psegs[s];
+        tdir = ((dir+nbdirs/2-1)%nbdirs)+1;
+        n = (psegs[s+1]<maxlen) ? psegs[s+1] : maxlen;
+        if (dir==0) {
+            /* Direction 0 leaves the image unchanged */
+            for(i=0; i<size; i+=W) {
+                LIN_COMBINE(acc+i, in+i, W, !closing);
+            }
+        } else if (closing) {
+            /* Dilation (empty edge) then erosion in the opposite direction */
+            LIN_DIR_WINDOW(in, tmp, W, H, dir, grid, n, 1, 0, 0, &work);
+            LIN_DIR_WINDOW(tmp, acc, W, H, tdir, grid, n, 0, edgeval, 2, &work);
+        } else {
+            /* Erosion then dilation (empty edge) in the opposite direction */
+            LIN_DIR_WINDOW(in, tmp, W, H, dir, grid, n, 0, edgeval, 0, &work);
+            LIN_DIR_WINDOW(tmp, acc, W, H, tdir, grid, n, 1, 0, 1, &work);
+        }
+    }
+
+    /* With an empty edge, the closings are made extensive */
+    if (closing && edge==MB_EMPTY_EDGE) {
+        for(i=0; i<size; i++) {
+            acc[i] = LIN_OP(1, acc[i], in[i]);
+        }
+    }
+
+    /* Writing the destination image */
+    for(y=0; y<H; y++) {
+        line = acc+((Uint64) y)*W;
+        switch(dest->depth) {
+        case 1:
+            pline1 = (MB_Vector1 *) (dest->plines[y]);
+            for(x=0; x<W; x+=MB_vec1_size) {
+                pline1[x/MB_vec1_size] = 0;
+            }
+            for(x=0; x<W; x++) {
+                if (line[x]) {
+                    pline1[x/MB_vec1_size] |= ((MB_Vector1) 1L)<<(x%MB_vec1_size);
+                }
+            }
+            break;
+        case 8:
+            pline8 = (PIX8 *) (dest->plines[y]);
+            for(x=0; x<W; x++) {
+                pline8[x] = (PIX8) line[x];
+            }
+            break;
+        default:
+            MB_memcpy(dest->plines[y], line, W*sizeof(PIX32));
+            break;
+        }
+    }
+
+    MB_free(in);
+    MB_free(tmp);
+    MB_free(acc);
+    MB_free(work.g);
+    MB_free(work.h);
+    MB_free(work.ext);
+    MB_free(work.gline);
+    MB_free(work.hline);
+    return MB_NO_ERR;
+}
+
+/*
+ * Computes the supremum of the openings by segments (the erosions use the
+ * given edge, the dilations an empty edge).
+ * \param src the source image
+ * \param dest the destination image
+ * \param psegs the segments, given as pairs (direction, size)
+ * \param len_segs the number of values in the segments buffer
+ * \param grid the grid used (either square or hexagonal)
+ * \param edge the kind of edge used by the erosions
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_SupLinearOpen(MB_Image *src, MB_Image *dest,
+                            Uint32 *psegs, Uint32 len_segs,
+                            enum MB_grid_t grid, enum MB_edgemode_t edge)
+{
+    return MB_LinearFilter(src, dest, psegs, len_segs, grid, edge, 0);
+}
+
+/*
+ * Computes the infimum of the closings by segments (the dilations use an
+ * empty edge, the erosions the given edge; with an empty edge the closings
+ * are made extensive).
+ * \param src the source image
+ * \param dest the destination image
+ * \param psegs the segments, given as pairs (direction, size)
+ * \param len_segs the number of values in the segments buffer
+ * \param grid the grid used (either square or hexagonal)
+ * \param edge the kind of edge used by the erosions
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_InfLinearClose(MB_Image *src, MB_Image *dest,
+                             Uint32 *psegs, Uint32 len_segs,
+                             enum MB_grid_t grid, enum MB_edgemode_t edge)
+{
+    return MB_LinearFilter(src, dest, psegs, len_segs, grid, edge, 1);
+}
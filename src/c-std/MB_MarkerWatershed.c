@@ -0,0 +1,128 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+
+/*
+ * Splits a line of the watershed result into the label and the watershed
+ * line. The label keeps the three lower bytes of the result.
+ * \param pmark the line of the 32-bit watershed result (modified in place)
+ * \param psrc the line of the segmented image (values of the valued line)
+ * \param pline the line of the watershed line image
+ * \param width the number of pixels in the line
+ * \param depth the depth of the watershed line image
+ */
+static INLINE void SPLIT_LINE(PIX32 *pmark, PLINE psrc, PLINE pline,
+                              Uint32 width, Uint32 depth)
+{
+    Uint32 i,j;
+    MB_Vector1 reg;
+    MB_Vector1 *pout1;
+    PIX8 *pin8, *pout8;
+    PIX32 *pin32, *pout32;
+
+    switch(depth) {
+    case 1:
+        pout1 = (MB_Vector1 *) pline;
+        for(i=0; i<width; i+=MB_vec1_size, pout1++) {
+            reg = 0;
+            for(j=0; j<MB_vec1_size; j++) {
+                if (IS_PIXEL(&pmark[i+j], WTS_LAB)) {
+                    reg |= ((MB_Vector1) 1L)<<j;
+                }
+            }
+            *pout1 = reg;
+        }
+        break;
+    case 8:
+        pin8 = (PIX8 *) psrc;
+        pout8 = (PIX8 *) pline;
+        for(i=0; i<width; i++) {
+            pout8[i] = IS_PIXEL(&pmark[i], WTS_LAB) ? pin8[i] : 0;
+        }
+        break;
+    case 32:
+        pin32 = (PIX32 *) psrc;
+        pout32 = (PIX32 *) pline;
+        for(i=0; i<width; i++) {
+            pout32[i] = IS_PIXEL(&pmark[i], WTS_LAB) ? pin32[i] : 0;
+        }
+        break;
+    default:
+        break;
+    }
+    for(i=0; i<width; i++) {
+        pmark[i] = READ_LABEL(&pmark[i]);
+    }
+}
+
+/*
+ * Performs a watershed segmentation of the image using the labelled marker
+ * image and splits, in the same call, the result into the labels of the
+ * catchment basins and the watershed line.
+ * After the flooding, the marker image only holds the labels (the isLine
+ * byte of MB_Watershed is reset) and the watershed line is written into
+ * the line image. A binary line image receives the watershed line, a
+ * greyscale or 32-bit line image (same depth as the segmented image)
+ * receives the valued watershed (the pixels of the line keep their value
+ * in the segmented image, the others are set to 0).
+ * \param src the image to segment
+ * \param marker the labelled marker image in which the labels are put
+ * \param line the watershed line image (NULL if not needed)
+ * \param max_level the maximum level reach by the water
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_MarkerWatershed(MB_Image *src, MB_Image *marker, MB_Image *line,
+                              Uint32 max_level, enum MB_grid_t grid)
+{
+    Uint32 i;
+    MB_errcode err;
+
+    /* Verification over the line image, the other images are */
+    /* verified by the watershed */
+    if (line!=NULL) {
+        if (!MB_CHECK_SIZE_2(src, line)) {
+            return MB_ERR_BAD_SIZE;
+        }
+        if (line->depth!=1 && line->depth!=src->depth) {
+            return MB_ERR_BAD_DEPTH;
+        }
+    }
+
+    err = MB_Watershed(src, marker, max_level, grid);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+
+    for(i=0; i<marker->height; i++) {
+        SPLIT_LINE((PIX32 *) marker->plines[i], src->plines[i],
+                   line==NULL ? NULL : line->plines[i],
+                   marker->width, line==NULL ? 0 : line->depth);
+    }
+
+    return MB_NO_ERR;
+}
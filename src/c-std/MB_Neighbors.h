@@ -44,8 +44,24 @@
  * You will need to define the following macros :
  * DATA_TYPE
  * COMP(cond,inout,in)
+ *
+ * The functions return the range of the lines which were modified (first
+ * line greater than the last one when the image is unchanged).
  */
 
+/* Records line 'line' in the range of changed lines if one of its pixels
+ * was modified */
+#define LINE_CHANGED(line)                                                  \
+{                                                                           \
+    if (changed) {                                                          \
+        if ((line)<*pfirst) {                                               \
+            *pfirst = (line);                                               \
+        }                                                                   \
+        *plast = (line);                                                    \
+        changed = 0;                                                        \
+    }                                                                       \
+}                                                                           \
+
 /***************
  * SQUARE GRID *
  ***************/
@@ -53,7 +69,7 @@
 static void MB_comp_neighbors_square(
         PLINE *plines_inout, PLINE *plines_in,
         Uint32 bytes_in, Uint32 height, Uint32 neighbors,
-        DATA_TYPE edge)
+        DATA_TYPE edge, Uint32 *pfirst, Uint32 *plast)
 {
     Uint32 x,y;
     DATA_TYPE in8, in1, in2;
@@ -62,6 +78,10 @@ static void MB_comp_neighbors_square(
     DATA_TYPE *pinout;
     DATA_TYPE *pina,*pinb,*pinc;
     DATA_TYPE inout;
+    Uint32 changed = 0;
+
+    *pfirst = height;
+    *plast = 0;
 
     /* FIRST LINE */
     in7 = edge;
@@ -91,12 +111,14 @@ static void MB_comp_neighbors_square(
         COMP(MB_NEIGHBOR_7,inout,in7);
         COMP(MB_NEIGHBOR_8|MB_NEIGHBOR_1|MB_NEIGHBOR_2,inout,edge);
         
+        changed |= (*pinout!=inout);
         *pinout = inout;
         in7 = in0;
         in0 = in3;
         in6 = in5;
         in5 = in4;
     }
+    LINE_CHANGED(0);
 
     /* MIDDLE LINES */
     for(y=1; y<height-1; y++) {
@@ -135,6 +157,7 @@ static void MB_comp_neighbors_square(
             COMP(MB_NEIGHBOR_7,inout,in7);
             COMP(MB_NEIGHBOR_8,inout,in8);
             
+            changed |= (*pinout!=inout);
             *pinout = inout;
             in8 = in1;
             in1 = in2;
@@ -143,6 +166,7 @@ static void MB_comp_neighbors_square(
             in6 = in5;
             in5 = in4;
         }
+        LINE_CHANGED(y);
     }
 
     /* END LINE */
@@ -173,12 +197,14 @@ static void MB_comp_neighbors_square(
         COMP(MB_NEIGHBOR_7,inout,in7);
         COMP(MB_NEIGHBOR_8,inout,in8);
         
+        changed |= (*pinout!=inout);
         *pinout = inout;
         in8 = in1;
         in1 = in2;
         in7 = in0;
         in0 = in3;
     }
+    LINE_CHANGED(y);
 }
 
 /******************
@@ -188,7 +214,7 @@ static void MB_comp_neighbors_square(
 static void MB_comp_neighbors_hexagonal(
         PLINE *plines_inout, PLINE *plines_in,
         Uint32 bytes_in, Uint32 height, Uint32 neighbors,
-        DATA_TYPE edge)
+        DATA_TYPE edge, Uint32 *pfirst, Uint32 *plast)
 {
     Uint32 x,y;
     DATA_TYPE in8, in1, in2;
@@ -197,6 +223,10 @@ static void MB_comp_neighbors_hexagonal(
     DATA_TYPE *pinout;
     DATA_TYPE *pina,*pinb,*pinc;
     DATA_TYPE inout;
+    Uint32 changed = 0;
+
+    *pfirst = height;
+    *plast = 0;
 
     /* FIRST LINE (even) */
     in7 = edge;
@@ -222,11 +252,13 @@ static void MB_comp_neighbors_hexagonal(
         COMP(MB_NEIGHBOR_5,inout,in7);
         COMP(MB_NEIGHBOR_6|MB_NEIGHBOR_1,inout,edge);
         
+        changed |= (*pinout!=inout);
         *pinout = inout;
         in7 = in0;
         in0 = in3;
         in6 = in5;
     }
+    LINE_CHANGED(0);
 
     /* MIDDLE LINES */
     for(y=1; y<height-1; y+=2) {
@@ -262,12 +294,14 @@ static void MB_comp_neighbors_hexagonal(
             COMP(MB_NEIGHBOR_5,inout,in7);
             COMP(MB_NEIGHBOR_6,inout,in1);
             
+            changed |= (*pinout!=inout);
             *pinout = inout;
             in1 = in2;
             in7 = in0;
             in0 = in3;
             in5 = in4;
         }
+        LINE_CHANGED(y);
 
         /* Even line */
         in8 = edge;
@@ -296,12 +330,14 @@ static void MB_comp_neighbors_hexagonal(
             COMP(MB_NEIGHBOR_5,inout,in7);
             COMP(MB_NEIGHBOR_6,inout,in8);
             
+            changed |= (*pinout!=inout);
             *pinout = inout;
             in8 = in1;
             in7 = in0;
             in0 = in3;
             in6 = in5;
         }
+        LINE_CHANGED(y+1);
     }
 
     /* END LINE (odd) */
@@ -331,10 +367,13 @@ static void MB_comp_neighbors_hexagonal(
         COMP(MB_NEIGHBOR_5,inout,in7);
         COMP(MB_NEIGHBOR_6,inout,in1);
         
+        changed |= (*pinout!=inout);
         *pinout = inout;
         in1 = in2;
         in7 = in0;
         in0 = in3;
     }
+    LINE_CHANGED(y);
 }
 
+#undef LINE_CHANGED
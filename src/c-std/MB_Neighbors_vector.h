@@ -48,8 +48,25 @@
  * COMP_NO_SHIFT(cond,inout,in)
  * COMP_SHIFT_LEFT(cond,inout,inl,inr)
  * COMP_SHIFT_RIGHT(cond,inout,inl,inr)
+ * VEC_DIFFER(vec1,vec2) (true if the two vectors differ)
+ *
+ * The functions return the range of the lines which were modified (first
+ * line greater than the last one when the image is unchanged).
  */
 
+/* Records line 'line' in the range of changed lines if one of its pixels
+ * was modified */
+#define LINE_CHANGED(line)                                                  \
+{                                                                           \
+    if (changed) {                                                          \
+        if ((line)<*pfirst) {                                               \
+            *pfirst = (line);                                               \
+        }                                                                   \
+        *plast = (line);                                                    \
+        changed = 0;                                                        \
+    }                                                                       \
+}                                                                           \
+
 /***************
  * SQUARE GRID *
  ***************/
@@ -57,7 +74,7 @@
 static void MB_comp_neighbors_square(
         PLINE *plines_inout, PLINE *plines_in,
         Uint32 bytes_in, Uint32 height, Uint32 neighbors,
-        VEC_TYPE edge)
+        VEC_TYPE edge, Uint32 *pfirst, Uint32 *plast)
 {
     Uint32 x,y;
     VEC_TYPE in8, in1, in2;
@@ -66,6 +83,10 @@ static void MB_comp_neighbors_square(
     VEC_TYPE *pinout;
     VEC_TYPE *pina,*pinb,*pinc;
     VEC_TYPE inout;
+    Uint32 changed = 0;
+
+    *pfirst = height;
+    *plast = 0;
 
     /* FIRST LINE */
     in7 = edge;
@@ -95,12 +116,14 @@ static void MB_comp_neighbors_square(
         COMP_SHIFT_RIGHT(MB_NEIGHBOR_7,inout,in7,in0);
         COMP_NO_SHIFT(MB_NEIGHBOR_8|MB_NEIGHBOR_1|MB_NEIGHBOR_2,inout,edge);
         
+        changed |= VEC_DIFFER(VEC_LOAD(pinout), inout);
         VEC_STORE(pinout, inout);
         in7 = in0;
         in0 = in3;
         in6 = in5;
         in5 = in4;
     }
+    LINE_CHANGED(0);
 
     /* MIDDLE LINES */
     for(y=1; y<height-1; y++) {
@@ -139,6 +162,7 @@ static void MB_comp_neighbors_square(
             COMP_SHIFT_RIGHT(MB_NEIGHBOR_7,inout,in7,in0);
             COMP_SHIFT_RIGHT(MB_NEIGHBOR_8,inout,in8,in1);
             
+            changed |= VEC_DIFFER(VEC_LOAD(pinout), inout);
             VEC_STORE(pinout, inout);
             in8 = in1;
             in1 = in2;
@@ -147,6 +171,7 @@ static void MB_comp_neighbors_square(
             in6 = in5;
             in5 = in4;
         }
+        LINE_CHANGED(y);
     }
 
     /* END LINE */
@@ -177,12 +202,14 @@ static void MB_comp_neighbors_square(
         COMP_SHIFT_RIGHT(MB_NEIGHBOR_7,inout,in7,in0);
         COMP_SHIFT_RIGHT(MB_NEIGHBOR_8,inout,in8,in1);
         
+        changed |= VEC_DIFFER(VEC_LOAD(pinout), inout);
         VEC_STORE(pinout, inout);
         in8 = in1;
         in1 = in2;
         in7 = in0;
         in0 = in3;
     }
+    LINE_CHANGED(y);
 }
 
 /******************
@@ -192,7 +219,7 @@ static void MB_comp_neighbors_square(
 static void MB_comp_neighbors_hexagonal(
         PLINE *plines_inout, PLINE *plines_in,
         Uint32 bytes_in, Uint32 height, Uint32 neighbors,
-        VEC_TYPE edge)
+        VEC_TYPE edge, Uint32 *pfirst, Uint32 *plast)
 {
     Uint32 x,y;
     VEC_TYPE in8, in1, in2;
@@ -201,6 +228,10 @@ static void MB_comp_neighbors_hexagonal(
     VEC_TYPE *pinout;
     VEC_TYPE *pina,*pinb,*pinc;
     VEC_TYPE inout;
+    Uint32 changed = 0;
+
+    *pfirst = height;
+    *plast = 0;
 
     /* FIRST LINE (even) */
     in7 = edge;
@@ -226,11 +257,13 @@ static void MB_comp_neighbors_hexagonal(
         COMP_SHIFT_RIGHT(MB_NEIGHBOR_5,inout,in7,in0);
         COMP_NO_SHIFT(MB_NEIGHBOR_1|MB_NEIGHBOR_6,inout,edge);
         
+        changed |= VEC_DIFFER(VEC_LOAD(pinout), inout);
         VEC_STORE(pinout, inout);
         in7 = in0;
         in0 = in3;
         in6 = in5;
     }
+    LINE_CHANGED(0);
 
     /* MIDDLE LINES */
     for(y=1; y<height-1; y+=2) {
@@ -266,12 +299,14 @@ static void MB_comp_neighbors_hexagonal(
             COMP_SHIFT_RIGHT(MB_NEIGHBOR_5,inout,in7,in0);
             COMP_NO_SHIFT(MB_NEIGHBOR_6,inout,in1);
             
+            changed |= VEC_DIFFER(VEC_LOAD(pinout), inout);
             VEC_STORE(pinout, inout);
             in1 = in2;
             in7 = in0;
             in0 = in3;
             in5 = in4;
         }
+        LINE_CHANGED(y);
         /* Even line */
         in8 = edge;
         in6 = edge;
@@ -299,12 +334,14 @@ static void MB_comp_neighbors_hexagonal(
             COMP_SHIFT_RIGHT(MB_NEIGHBOR_5,inout,in7,in0);
             COMP_SHIFT_RIGHT(MB_NEIGHBOR_6,inout,in8,in1);
             
+            changed |= VEC_DIFFER(VEC_LOAD(pinout), inout);
             VEC_STORE(pinout, inout);
             in8 = in1;
             in7 = in0;
             in0 = in3;
             in6 = in5;
         }
+        LINE_CHANGED(y+1);
     }
 
     /* END LINE (odd) */
@@ -333,10 +370,13 @@ static void MB_comp_neighbors_hexagonal(
         COMP_SHIFT_RIGHT(MB_NEIGHBOR_5,inout,in7,in0);
         COMP_NO_SHIFT(MB_NEIGHBOR_6,inout,in1);
         
+        changed |= VEC_DIFFER(VEC_LOAD(pinout), inout);
         VEC_STORE(pinout, inout);
         in1 = in2;
         in7 = in0;
         in0 = in3;
     }
+    LINE_CHANGED(y);
 }
 
+#undef LINE_CHANGED
@@ -0,0 +1,252 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/*
+ * Creates a work image with the same size and depth as another image.
+ * \param pim pointer receiving the work image
+ * \param like the image giving the size and depth
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode RG_CREATE(MB_Image **pim, MB_Image *like)
+{
+    MB_errcode err;
+
+    *pim = (MB_Image *) MB_malloc(sizeof(MB_Image));
+    if (*pim==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    err = MB_Create(*pim, like->width, like->height, like->depth);
+    if (err!=MB_NO_ERR) {
+        MB_free(*pim);
+        *pim = NULL;
+    }
+    return err;
+}
+
+/*
+ * Erodes (or dilates) an image n times by the elementary hexagon or square.
+ * The iterations stop as soon as the image is no longer modified.
+ * \param im the image modified
+ * \param wrk a work image
+ * \param n the number of iterations
+ * \param grid the grid used (either square or hexagonal)
+ * \param dilation if not zero, the image is dilated with an empty edge,
+ * otherwise it is eroded with a filled edge
+ * \param pChanged pointer receiving 0 if the last iteration did not modify
+ * the image (can be NULL)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode RG_REPEAT(MB_Image *im, MB_Image *wrk, Uint32 n,
+                            enum MB_grid_t grid, int dilation, int *pChanged)
+{
+    Uint32 i, first, last, neighbors;
+    MB_errcode err;
+
+    neighbors = (grid==MB_SQUARE_GRID) ? MB_NEIGHBOR_ALL_SQUARE :
+                                         MB_NEIGHBOR_ALL_HEXAGONAL;
+    neighbors &= ~MB_NEIGHBOR_0;
+    if (pChanged) {
+        *pChanged = 1;
+    }
+    for(i=0; i<n; i++) {
+        err = MB_Copy(im, wrk);
+        if (err!=MB_NO_ERR) {
+            return err;
+        }
+        if (dilation) {
+            err = MB_SupNb(wrk, im, neighbors, grid, MB_EMPTY_EDGE, &first, &last);
+        } else {
+            err = MB_InfNb(wrk, im, neighbors, grid, MB_FILLED_EDGE, &first, &last);
+        }
+        if (err!=MB_NO_ERR) {
+            return err;
+        }
+        if (first>last) {
+            /* Idempotence is reached */
+            if (pChanged) {
+                *pChanged = 0;
+            }
+            break;
+        }
+    }
+    return MB_NO_ERR;
+}
+
+/*
+ * Computes the regularised gradient of size n from the gradient of size n:
+ * the white top-hat of size n of the gradient eroded by n-1.
+ * \param grad the gradient of size n
+ * \param dest the regularised gradient
+ * \param wrk a work image
+ * \param n the size
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode RG_FROM_GRADIENT(MB_Image *grad, MB_Image *dest,
+                                   MB_Image *wrk, Uint32 n,
+                                   enum MB_grid_t grid)
+{
+    MB_errcode err;
+
+    err = MB_Copy(grad, dest);
+    if (err==MB_NO_ERR) {
+        err = RG_REPEAT(dest, wrk, n, grid, 0, NULL);
+    }
+    if (err==MB_NO_ERR) {
+        err = RG_REPEAT(dest, wrk, n, grid, 1, NULL);
+    }
+    if (err==MB_NO_ERR) {
+        err = MB_Sub(grad, dest, dest);
+    }
+    if (err==MB_NO_ERR && n>1) {
+        err = RG_REPEAT(dest, wrk, n-1, grid, 0, NULL);
+    }
+    return err;
+}
+
+/*
+ * Computes the regularised gradients of all sizes from 1 to maxSize in a
+ * single sweep: the erosion and the dilation of size i are obtained from
+ * those of size i-1. For each size, the regularised gradient is either
+ * accumulated as a residue (res and func given) or kept when the size is
+ * maxSize.
+ * \param src the source image
+ * \param dest the regularised gradient of size maxSize (can be NULL)
+ * \param res the residues image (can be NULL)
+ * \param func the associated function (can be NULL)
+ * \param maxSize the largest size
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode RG_SWEEP(MB_Image *src, MB_Image *dest, MB_Image *res,
+                           MB_Image *func, Uint32 maxSize,
+                           enum MB_grid_t grid)
+{
+    MB_Image *ero = NULL, *dil = NULL, *grad = NULL, *cur = NULL, *wrk = NULL;
+    Uint32 i;
+    Uint64 volume;
+    int eroChanged, dilChanged;
+    MB_errcode err;
+
+    err = RG_CREATE(&ero, src);
+    if (err==MB_NO_ERR) err = RG_CREATE(&dil, src);
+    if (err==MB_NO_ERR) err = RG_CREATE(&grad, src);
+    if (err==MB_NO_ERR) err = RG_CREATE(&cur, src);
+    if (err==MB_NO_ERR) err = RG_CREATE(&wrk, src);
+    if (err==MB_NO_ERR) err = MB_Copy(src, ero);
+    if (err==MB_NO_ERR) err = MB_Copy(src, dil);
+    if (dest!=NULL && err==MB_NO_ERR) {
+        /* Size 0 gives a null gradient */
+        err = MB_ConSet(dest, 0);
+    }
+
+    eroChanged = dilChanged = 1;
+    for(i=1; i<=maxSize && err==MB_NO_ERR; i++) {
+        if (!eroChanged && !dilChanged) {
+            /* The gradient is constant, all the following residues are null */
+            if (dest!=NULL) {
+                err = MB_ConSet(dest, 0);
+            }
+            break;
+        }
+        err = RG_REPEAT(ero, wrk, 1, grid, 0, &eroChanged);
+        if (err==MB_NO_ERR) err = RG_REPEAT(dil, wrk, 1, grid, 1, &dilChanged);
+        /* Only the last size is needed without residues */
+        if (res==NULL && i<maxSize) {
+            continue;
+        }
+        if (err==MB_NO_ERR) err = MB_Sub(dil, ero, grad);
+        if (err==MB_NO_ERR) {
+            err = RG_FROM_GRADIENT(grad, (res==NULL) ? dest : cur, wrk, i, grid);
+        }
+        if (res!=NULL && err==MB_NO_ERR) {
+            err = MB_AccumulateResidue(NULL, cur, res, func, i, &volume);
+        }
+    }
+
+    MB_Destroy(ero);
+    MB_Destroy(dil);
+    MB_Destroy(grad);
+    MB_Destroy(cur);
+    MB_Destroy(wrk);
+    return err;
+}
+
+/*
+ * Computes the regularised gradient of size n of an image (white top-hat of
+ * size n of the gradient of size n, eroded by n-1).
+ * \param src the source image
+ * \param dest the destination image
+ * \param n the size of the regularised gradient
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_RegularisedGradient(MB_Image *src, MB_Image *dest, Uint32 n,
+                                  enum MB_grid_t grid)
+{
+    if (!MB_CHECK_SIZE_2(src, dest)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (src->depth!=dest->depth) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    return RG_SWEEP(src, dest, NULL, NULL, n, grid);
+}
+
+/*
+ * Computes the full regularised gradient of an image: the residual
+ * transform whose residues are the regularised gradients of sizes 1 to
+ * maxSize. The residues image receives the supremum of the residues and the
+ * associated function the size of the largest residue.
+ * \param src the source image
+ * \param res the residues image (same depth as src)
+ * \param func the associated function (8-bit or 32-bit)
+ * \param maxSize the largest size
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_FullRegularisedGradient(MB_Image *src, MB_Image *res,
+                                      MB_Image *func, Uint32 maxSize,
+                                      enum MB_grid_t grid)
+{
+    MB_errcode err;
+
+    if (!MB_CHECK_SIZE_3(src, res, func)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (src->depth!=res->depth || (func->depth!=8 && func->depth!=32)) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    err = MB_ConSet(res, 0);
+    if (err==MB_NO_ERR) {
+        err = MB_ConSet(func, 0);
+    }
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+    return RG_SWEEP(src, NULL, res, func, maxSize, grid);
+}
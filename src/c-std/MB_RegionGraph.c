@@ -0,0 +1,331 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+
+/* An edge of the region adjacency graph: the two labels, the number of
+ * pairs of neighbor pixels linking the regions and the relief along them */
+typedef struct {
+    Uint64 key;
+    Uint32 length;
+    PIX32 min;
+    PIX32 max;
+    Uint64 sum;
+} MB_RegionEdge;
+
+/* Hash table of the edges. The edges are stored using open addressing
+ * (linear probing) in a table whose size is a power of two */
+typedef struct {
+    MB_RegionEdge *edges;
+    /* Indicates if an entry is used */
+    PIX8 *used;
+    /* Size of the table minus one (mask applied to the hash) */
+    Uint32 mask;
+    /* Number of edges stored */
+    Uint32 count;
+} MB_RegionHash;
+
+/* Multiplicative hash of a pair of labels */
+#define RAG_HASH(key, mask) \
+    ((Uint32) ((((key)^((key)>>29))*0x9E3779B97F4A7C15ULL)>>32)&(mask))
+
+/*
+ * Allocates the hash table.
+ * \param hash the hash table
+ * \param size the number of entries (a power of two)
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode RAG_ALLOC(MB_RegionHash *hash, Uint32 size)
+{
+    hash->edges = (MB_RegionEdge *) MB_malloc(size*sizeof(MB_RegionEdge));
+    hash->used = (PIX8 *) MB_malloc(size*sizeof(PIX8));
+    if (hash->edges==NULL || hash->used==NULL) {
+        MB_free(hash->edges);
+        MB_free(hash->used);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    MB_memset(hash->used, 0, size*sizeof(PIX8));
+    hash->mask = size-1;
+    hash->count = 0;
+    return MB_NO_ERR;
+}
+
+/*
+ * Finds the entry of an edge in the hash table (a free entry if the edge
+ * is not stored yet).
+ * \param hash the hash table
+ * \param key the pair of labels
+ * \return the position of the entry
+ */
+static INLINE Uint32 RAG_FIND(MB_RegionHash *hash, Uint64 key)
+{
+    Uint32 pos = RAG_HASH(key, hash->mask);
+
+    while (hash->used[pos] && hash->edges[pos].key!=key) {
+        pos = (pos+1)&hash->mask;
+    }
+    return pos;
+}
+
+/*
+ * Doubles the size of the hash table.
+ * \param hash the hash table
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode RAG_GROW(MB_RegionHash *hash)
+{
+    MB_RegionHash bigger;
+    Uint32 i, pos;
+    MB_errcode err;
+
+    err = RAG_ALLOC(&bigger, 2*(hash->mask+1));
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+    for(i=0; i<=hash->mask; i++) {
+        if (hash->used[i]) {
+            pos = RAG_FIND(&bigger, hash->edges[i].key);
+            bigger.used[pos] = 1;
+            bigger.edges[pos] = hash->edges[i];
+        }
+    }
+    bigger.count = hash->count;
+    MB_free(hash->edges);
+    MB_free(hash->used);
+    *hash = bigger;
+    return MB_NO_ERR;
+}
+
+/*
+ * Adds a pair of neighbor pixels with different labels to the edges.
+ * \param hash the hash table
+ * \param a the label of the first pixel
+ * \param b the label of the second pixel
+ * \param v the relief value of the pair
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static INLINE MB_errcode RAG_ADD(MB_RegionHash *hash, PIX32 a, PIX32 b, PIX32 v)
+{
+    Uint64 key;
+    Uint32 pos;
+    MB_RegionEdge *edge;
+    MB_errcode err;
+
+    key = (a<b) ? ((((Uint64) a)<<32)|b) : ((((Uint64) b)<<32)|a);
+    pos = RAG_FIND(hash, key);
+    edge = hash->edges+pos;
+    if (hash->used[pos]) {
+        edge->length++;
+        edge->min = (v<edge->min) ? v : edge->min;
+        edge->max = (v>edge->max) ? v : edge->max;
+        edge->sum += v;
+        return MB_NO_ERR;
+    }
+    /* The table is kept at most half full */
+    if (2*(hash->count+1)>hash->mask+1) {
+        err = RAG_GROW(hash);
+        if (err!=MB_NO_ERR) {
+            return err;
+        }
+        pos = RAG_FIND(hash, key);
+        edge = hash->edges+pos;
+    }
+    hash->used[pos] = 1;
+    hash->count++;
+    edge->key = key;
+    edge->length = 1;
+    edge->min = v;
+    edge->max = v;
+    edge->sum = v;
+    return MB_NO_ERR;
+}
+
+/* Comparison of two edges by their pair of labels (for qsort) */
+static int RAG_COMPARE(const void *e1, const void *e2)
+{
+    Uint64 k1 = ((const MB_RegionEdge *) e1)->key;
+    Uint64 k2 = ((const MB_RegionEdge *) e2)->key;
+
+    return (k1<k2) ? -1 : ((k1>k2) ? 1 : 0);
+}
+
+/*
+ * Reads a line of the relief image.
+ * \param relief the relief image (NULL if none)
+ * \param y the line
+ * \param width the width of the images
+ * \param vals the values of the line
+ */
+static INLINE void RAG_RELIEF_LINE(MB_Image *relief, Uint32 y, Uint32 width,
+                                   PIX32 *vals)
+{
+    Uint32 x;
+    PIX8 *p8;
+
+    if (relief==NULL) {
+        MB_memset(vals, 0, width*sizeof(PIX32));
+    } else if (relief->depth==8) {
+        p8 = (PIX8 *) (relief->plines[y]);
+        for(x=0; x<width; x++) {
+            vals[x] = (PIX32) p8[x];
+        }
+    } else {
+        MB_memcpy(vals, relief->plines[y], width*sizeof(PIX32));
+    }
+}
+
+/*
+ * Extracts the region adjacency graph of a label image in a single scan.
+ * Two regions (sets of pixels with the same label) are linked by an edge
+ * when some of their pixels are neighbors. Each edge gives the number of
+ * pairs of neighbor pixels linking the two regions (the length of their
+ * boundary) and the minimum, maximum and sum of the relief along this
+ * boundary, the relief of a pair being the maximum of the relief values of
+ * its two pixels.
+ *
+ * The edges are sorted by their labels. Each edge is written as five
+ * values in pout (smaller label, greater label, length, minimum, maximum)
+ * and the sum of the relief in pout64. Only the edges fitting in the
+ * buffers are written but the number of edges is always returned.
+ * \param label the label image (32-bit)
+ * \param relief the relief image (8-bit or 32-bit, can be NULL)
+ * \param grid the grid used (either square or hexagonal)
+ * \param pout the buffer receiving the edges
+ * \param len_out the size of pout
+ * \param pout64 the buffer receiving the sums of the relief
+ * \param len_out64 the size of pout64
+ * \param pNbedges pointer receiving the number of edges
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_RegionGraph(MB_Image *label, MB_Image *relief,
+                          enum MB_grid_t grid,
+                          Uint32 *pout, Uint32 len_out,
+                          Uint64 *pout64, Uint32 len_out64,
+                          Uint32 *pNbedges)
+{
+    Uint32 W = label->width, H = label->height;
+    Uint32 x, y, i, j, dir, first, last, nbout;
+    Sint64 nx, ny;
+    PIX32 a, b, v, *plab, *prel, *pnext, *ptmp;
+    MB_RegionHash hash;
+    MB_RegionEdge *edges;
+    MB_errcode err;
+
+    if (label->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if (relief!=NULL) {
+        if (!MB_CHECK_SIZE_2(label, relief)) {
+            return MB_ERR_BAD_SIZE;
+        }
+        if (relief->depth!=8 && relief->depth!=32) {
+            return MB_ERR_BAD_DEPTH;
+        }
+    }
+
+    /* Half of the directions (toward the right and the next line) give */
+    /* each pair of neighbor pixels once */
+    if (grid==MB_SQUARE_GRID) {
+        first = 3;
+        last = 6;
+    } else {
+        first = 2;
+        last = 4;
+    }
+
+    prel = (PIX32 *) MB_malloc(W*sizeof(PIX32));
+    pnext = (PIX32 *) MB_malloc(W*sizeof(PIX32));
+    err = (prel==NULL || pnext==NULL) ? MB_ERR_CANT_ALLOCATE_MEMORY :
+                                        RAG_ALLOC(&hash, 1024);
+    if (err!=MB_NO_ERR) {
+        MB_free(prel);
+        MB_free(pnext);
+        return err;
+    }
+
+    RAG_RELIEF_LINE(relief, 0, W, pnext);
+    for(y=0; y<H && err==MB_NO_ERR; y++) {
+        ptmp = prel;
+        prel = pnext;
+        pnext = ptmp;
+        if (y+1<H) {
+            RAG_RELIEF_LINE(relief, y+1, W, pnext);
+        }
+        plab = (PIX32 *) (label->plines[y]);
+        for(x=0; x<W && err==MB_NO_ERR; x++) {
+            a = plab[x];
+            for(dir=first; dir<=last; dir++) {
+                if (grid==MB_SQUARE_GRID) {
+                    nx = ((Sint64) x) + sqNbDir[dir][0];
+                    ny = ((Sint64) y) + sqNbDir[dir][1];
+                } else {
+                    nx = ((Sint64) x) + hxNbDir[y&1][dir][0];
+                    ny = ((Sint64) y) + hxNbDir[y&1][dir][1];
+                }
+                if (nx<0 || nx>=(Sint64) W || ny>=(Sint64) H) {
+                    continue;
+                }
+                b = ((PIX32 *) (label->plines[ny]))[nx];
+                if (a!=b) {
+                    v = (ny==(Sint64) y) ? prel[nx] : pnext[nx];
+                    v = (prel[x]>v) ? prel[x] : v;
+                    err = RAG_ADD(&hash, a, b, v);
+                }
+            }
+        }
+    }
+    MB_free(prel);
+    MB_free(pnext);
+    if (err!=MB_NO_ERR) {
+        MB_free(hash.edges);
+        MB_free(hash.used);
+        return err;
+    }
+
+    /* The used entries are packed at the start of the table and sorted */
+    edges = hash.edges;
+    for(i=0, j=0; i<=hash.mask; i++) {
+        if (hash.used[i]) {
+            edges[j++] = edges[i];
+        }
+    }
+    qsort(edges, hash.count, sizeof(MB_RegionEdge), RAG_COMPARE);
+
+    nbout = (hash.count<len_out/5) ? hash.count : len_out/5;
+    nbout = (nbout<len_out64) ? nbout : len_out64;
+    for(i=0; i<nbout; i++) {
+        pout[5*i] = (Uint32) (edges[i].key>>32);
+        pout[5*i+1] = (Uint32) (edges[i].key&0xffffffff);
+        pout[5*i+2] = edges[i].length;
+        pout[5*i+3] = edges[i].min;
+        pout[5*i+4] = edges[i].max;
+        pout64[i] = edges[i].sum;
+    }
+    *pNbedges = hash.count;
+
+    MB_free(hash.edges);
+    MB_free(hash.used);
+    return MB_NO_ERR;
+}
@@ -0,0 +1,261 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+
+/* Hash table used by the sparse remapping. The keys are stored using open
+ * addressing (linear probing) in a table whose size is a power of two */
+typedef struct {
+    /* The keys and their associated values */
+    Uint32 *keys;
+    Uint32 *values;
+    /* Indicates if an entry is used */
+    PIX8 *used;
+    /* Size of the table minus one (mask applied to the hash) */
+    Uint32 mask;
+} MB_RemapHash;
+
+/* Multiplicative hash of a key */
+#define REMAP_HASH(key, mask) (((key)*2654435761U)&(mask))
+
+/*
+ * Finds the value associated to a key in the hash table.
+ * \param hash the hash table
+ * \param key the key looked for
+ * \param value pointer receiving the value when the key is found
+ * \return 1 if the key was found, 0 otherwise
+ */
+static INLINE int REMAP_FIND(MB_RemapHash *hash, Uint32 key, Uint32 *value)
+{
+    Uint32 pos = REMAP_HASH(key, hash->mask);
+
+    while (hash->used[pos]) {
+        if (hash->keys[pos]==key) {
+            *value = hash->values[pos];
+            return 1;
+        }
+        pos = (pos+1)&hash->mask;
+    }
+    return 0;
+}
+
+/*
+ * Writes the remapped values of a line into the destination image line.
+ * 32-bit values are saturated when written into an 8-bit image and any
+ * non zero value sets the pixel of a binary image.
+ * \param pout the destination image pixel line
+ * \param values the remapped values
+ * \param width the number of pixels in the line
+ * \param depth the depth of the destination image
+ */
+static INLINE void REMAP_WRITE_LINE(PLINE pout, PIX32 *values,
+                                    Uint32 width, Uint32 depth)
+{
+    Uint32 i,j;
+    MB_Vector1 reg;
+    MB_Vector1 *pout1;
+    PIX8 *pout8;
+
+    switch(depth) {
+    case 1:
+        pout1 = (MB_Vector1 *) pout;
+        for(i=0; i<width; i+=MB_vec1_size, pout1++) {
+            reg = 0;
+            for(j=0; j<MB_vec1_size; j++) {
+                if (values[i+j]) {
+                    reg |= ((MB_Vector1) 1L)<<j;
+                }
+            }
+            *pout1 = reg;
+        }
+        break;
+    case 8:
+        pout8 = (PIX8 *) pout;
+        for(i=0; i<width; i++) {
+            pout8[i] = values[i]>255 ? 255 : (PIX8) values[i];
+        }
+        break;
+    default:
+        MB_memcpy(pout, values, width*sizeof(PIX32));
+        break;
+    }
+}
+
+/*
+ * Verifies that the source and destination images can be remapped.
+ * \param src the source image
+ * \param dest the destination image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode MB_RemapCheck(MB_Image *src, MB_Image *dest)
+{
+    if (!MB_CHECK_SIZE_2(src, dest)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (src->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    return MB_NO_ERR;
+}
+
+/*
+ * Remaps the values of a 32-bit image using a dense table indexed by the
+ * pixel values. The values outside the table are replaced by 'defval'
+ * or kept when 'keep' is not zero.
+ * The result is put into a 32-bit, 8-bit (saturated values) or binary
+ * (non zero values) image.
+ * \param src the 32-bit source image
+ * \param dest the destination image
+ * \param plut the table giving the new value of each pixel value
+ * \param nb_lut the number of values in the table
+ * \param defval the value used for the pixel values outside the table
+ * \param keep if not zero, the pixel values outside the table are kept
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_Remap(MB_Image *src, MB_Image *dest, Uint32 *plut,
+                    Uint32 nb_lut, Uint32 defval, Uint32 keep)
+{
+    Uint32 i,j;
+    MB_errcode err;
+    PIX32 *values, *pin;
+
+    err = MB_RemapCheck(src, dest);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+
+    values = (PIX32 *) MB_malloc(src->width*sizeof(PIX32));
+    if (values==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    for(i=0; i<src->height; i++) {
+        pin = (PIX32 *) (src->plines[i]);
+        for(j=0; j<src->width; j++) {
+            if (pin[j]<nb_lut) {
+                values[j] = plut[pin[j]];
+            } else {
+                values[j] = keep ? pin[j] : defval;
+            }
+        }
+        REMAP_WRITE_LINE(dest->plines[i], values, src->width, dest->depth);
+    }
+
+    MB_free(values);
+    return MB_NO_ERR;
+}
+
+/*
+ * Remaps the values of a 32-bit image using a sparse table given as a list
+ * of keys (pixel values) and their associated values. The keys are hashed
+ * so that huge label spaces can be remapped. The pixel values which are not
+ * keys are replaced by 'defval' or kept when 'keep' is not zero. When a key
+ * appears several times, its last value is used.
+ * The result is put into a 32-bit, 8-bit (saturated values) or binary
+ * (non zero values) image.
+ * \param src the 32-bit source image
+ * \param dest the destination image
+ * \param pkeys the keys
+ * \param nb_keys the number of keys
+ * \param pmapped the values associated to the keys
+ * \param nb_mapped the number of values (must be equal to nb_keys)
+ * \param defval the value used for the pixel values which are not keys
+ * \param keep if not zero, the pixel values which are not keys are kept
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_RemapSparse(MB_Image *src, MB_Image *dest,
+                          Uint32 *pkeys, Uint32 nb_keys,
+                          Uint32 *pmapped, Uint32 nb_mapped,
+                          Uint32 defval, Uint32 keep)
+{
+    Uint32 i,j,pos,size;
+    MB_errcode err;
+    MB_RemapHash hash;
+    PIX32 *values, *pin;
+    PIX32 last_key, last_value;
+
+    err = MB_RemapCheck(src, dest);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+    if (nb_keys!=nb_mapped || nb_keys>0x40000000) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+
+    /* The hash table is at most half full */
+    size = 16;
+    while (size<2*nb_keys) {
+        size = size*2;
+    }
+    hash.mask = size-1;
+    hash.keys = (Uint32 *) MB_malloc(size*sizeof(Uint32));
+    hash.values = (Uint32 *) MB_malloc(size*sizeof(Uint32));
+    hash.used = (PIX8 *) MB_malloc(size*sizeof(PIX8));
+    values = (PIX32 *) MB_malloc(src->width*sizeof(PIX32));
+    if (hash.keys==NULL || hash.values==NULL || hash.used==NULL || values==NULL) {
+        MB_free(hash.keys);
+        MB_free(hash.values);
+        MB_free(hash.used);
+        MB_free(values);
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    MB_memset(hash.used, 0, size*sizeof(PIX8));
+    for(i=0; i<nb_keys; i++) {
+        pos = REMAP_HASH(pkeys[i], hash.mask);
+        while (hash.used[pos] && hash.keys[pos]!=pkeys[i]) {
+            pos = (pos+1)&hash.mask;
+        }
+        hash.used[pos] = 1;
+        hash.keys[pos] = pkeys[i];
+        hash.values[pos] = pmapped[i];
+    }
+
+    /* Neighbor pixels often share the same value, the last result is */
+    /* kept to avoid looking for it again */
+    last_key = ((PIX32 *) (src->plines[0]))[0];
+    if (!REMAP_FIND(&hash, last_key, &last_value)) {
+        last_value = keep ? last_key : defval;
+    }
+    for(i=0; i<src->height; i++) {
+        pin = (PIX32 *) (src->plines[i]);
+        for(j=0; j<src->width; j++) {
+            if (pin[j]!=last_key) {
+                last_key = pin[j];
+                if (!REMAP_FIND(&hash, last_key, &last_value)) {
+                    last_value = keep ? last_key : defval;
+                }
+            }
+            values[j] = last_value;
+        }
+        REMAP_WRITE_LINE(dest->plines[i], values, src->width, dest->depth);
+    }
+
+    MB_free(hash.keys);
+    MB_free(hash.values);
+    MB_free(hash.used);
+    MB_free(values);
+    return MB_NO_ERR;
+}
@@ -0,0 +1,225 @@
+/*
+ * Copyright (c) <2009>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+
+/*
+ * Sets the associated function of a pixel to size if it is greater than
+ * its current value.
+ * \param func the associated function image
+ * \param pfunc pointer on the line of the associated function
+ * \param x position of the pixel inside the line
+ * \param size the size written
+ */
+static INLINE void SET_FUNC(MB_Image *func, PLINE pfunc, Uint32 x, Uint32 size)
+{
+    if (func->depth==8) {
+        if (((PIX8 *) pfunc)[x]<size) ((PIX8 *) pfunc)[x] = (PIX8) size;
+    } else {
+        if (((PIX32 *) pfunc)[x]<size) ((PIX32 *) pfunc)[x] = size;
+    }
+}
+
+/*
+ * Accumulates the residue of a line of binary images.
+ * \param pprev pointer on the line of the previous primitive (NULL when
+ * the current primitive is the residue)
+ * \param pcur pointer on the line of the current primitive
+ * \param pres pointer on the line of the residues image
+ * \param pfunc pointer on the line of the associated function
+ * \param func the associated function image
+ * \param bytes number of bytes inside the line
+ * \param size the size associated with the current primitive
+ * \param volume pointer to the volume of the current primitive
+ */
+static INLINE void RESIDUE_LINE_1(PLINE pprev, PLINE pcur, PLINE pres, PLINE pfunc,
+                                  MB_Image *func, Uint32 bytes, Uint32 size,
+                                  Uint64 *volume)
+{
+    Uint32 i, j, x;
+    MB_Vector1 *prev = (MB_Vector1 *) pprev;
+    MB_Vector1 *cur = (MB_Vector1 *) pcur;
+    MB_Vector1 *res = (MB_Vector1 *) pres;
+    MB_Vector1 r;
+
+    for(i=0, x=0; i<bytes; i+=sizeof(MB_Vector1), cur++, res++, x+=MB_vec1_size) {
+        MB_vec1_acc(*volume, *cur);
+        if (prev) {
+            r = (*prev) & (~(*cur));
+            prev++;
+        } else {
+            r = *cur;
+        }
+        /* A binary residue is always greater or equal to the residues */
+        /* image where it is not null */
+        *res |= r;
+        for(j=0; r!=0; j++, r>>=1) {
+            if (r&1) {
+                SET_FUNC(func, pfunc, x+j, size);
+            }
+        }
+    }
+}
+
+/*
+ * Accumulates the residue of a line of greyscale images.
+ * \param pprev pointer on the line of the previous primitive (NULL when
+ * the current primitive is the residue)
+ * \param pcur pointer on the line of the current primitive
+ * \param pres pointer on the line of the residues image
+ * \param pfunc pointer on the line of the associated function
+ * \param func the associated function image
+ * \param bytes number of bytes inside the line
+ * \param size the size associated with the current primitive
+ * \param volume pointer to the volume of the current primitive
+ */
+static INLINE void RESIDUE_LINE_8(PLINE pprev, PLINE pcur, PLINE pres, PLINE pfunc,
+                                  MB_Image *func, Uint32 bytes, Uint32 size,
+                                  Uint64 *volume)
+{
+    Uint32 i;
+    PIX8 *prev = (PIX8 *) pprev;
+    PIX8 *cur = (PIX8 *) pcur;
+    PIX8 *res = (PIX8 *) pres;
+    PIX8 r;
+
+    for(i=0; i<bytes; i++) {
+        *volume += cur[i];
+        if (prev) {
+            r = prev[i]>cur[i] ? prev[i]-cur[i] : 0;
+        } else {
+            r = cur[i];
+        }
+        if (r>0 && r>=res[i]) {
+            res[i] = r;
+            SET_FUNC(func, pfunc, i, size);
+        }
+    }
+}
+
+/*
+ * Accumulates the residue of a line of 32-bit images.
+ * \param pprev pointer on the line of the previous primitive (NULL when
+ * the current primitive is the residue)
+ * \param pcur pointer on the line of the current primitive
+ * \param pres pointer on the line of the residues image
+ * \param pfunc pointer on the line of the associated function
+ * \param func the associated function image
+ * \param bytes number of bytes inside the line
+ * \param size the size associated with the current primitive
+ * \param volume pointer to the volume of the current primitive
+ */
+static INLINE void RESIDUE_LINE_32(PLINE pprev, PLINE pcur, PLINE pres, PLINE pfunc,
+                                   MB_Image *func, Uint32 bytes, Uint32 size,
+                                   Uint64 *volume)
+{
+    Uint32 i;
+    PIX32 *prev = (PIX32 *) pprev;
+    PIX32 *cur = (PIX32 *) pcur;
+    PIX32 *res = (PIX32 *) pres;
+    PIX32 r;
+
+    for(i=0; i<bytes/4; i++) {
+        *volume += (Uint64) cur[i];
+        if (prev) {
+            r = prev[i]>cur[i] ? prev[i]-cur[i] : 0;
+        } else {
+            r = cur[i];
+        }
+        if (r>0 && r>=res[i]) {
+            res[i] = r;
+            SET_FUNC(func, pfunc, i, size);
+        }
+    }
+}
+
+/*
+ * Performs one step of a residual transformation. The residue is the
+ * difference between the previous and the current primitives (or the current
+ * primitive itself when there is no previous one). Where the residue is not
+ * null and greater or equal to the residues image, this image is updated with
+ * the residue and the associated function is set to size (if greater).
+ * The volume of the current primitive is computed in the same pass.
+ * \param prev the previous primitive (can be NULL)
+ * \param cur the current primitive
+ * \param res the residues image (supremum of the residues)
+ * \param func the associated function (8-bit or 32-bit)
+ * \param size the size associated with the current primitive
+ * \param pVolume pointer to the volume of the current primitive
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_AccumulateResidue(MB_Image *prev, MB_Image *cur, MB_Image *res,
+                                MB_Image *func, Uint32 size, Uint64 *pVolume)
+{
+    Uint32 i, bytes;
+    PLINE pprev;
+    Uint64 volume;
+
+    /* Verification over image size compatibility */
+    if (!MB_CHECK_SIZE_3(cur, res, func)) {
+        return MB_ERR_BAD_SIZE;
+    }
+    if (prev!=NULL && !MB_CHECK_SIZE_2(prev, cur)) {
+        return MB_ERR_BAD_SIZE;
+    }
+
+    /* Verification over depth */
+    if (cur->depth!=res->depth || (prev!=NULL && prev->depth!=cur->depth)) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if (func->depth!=8 && func->depth!=32) {
+        return MB_ERR_BAD_DEPTH;
+    }
+
+    bytes = MB_LINE_COUNT(cur);
+    volume = 0;
+
+    for(i=0; i<cur->height; i++) {
+        pprev = prev ? prev->plines[i] : NULL;
+        switch(cur->depth) {
+        case 1:
+            RESIDUE_LINE_1(pprev, cur->plines[i], res->plines[i], func->plines[i],
+                           func, bytes, size, &volume);
+            break;
+        case 8:
+            RESIDUE_LINE_8(pprev, cur->plines[i], res->plines[i], func->plines[i],
+                           func, bytes, size, &volume);
+            break;
+        case 32:
+            RESIDUE_LINE_32(pprev, cur->plines[i], res->plines[i], func->plines[i],
+                            func, bytes, size, &volume);
+            break;
+        default:
+            return MB_ERR_BAD_DEPTH;
+        }
+    }
+
+    *pVolume = volume;
+
+    return MB_NO_ERR;
+}
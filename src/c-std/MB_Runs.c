@@ -0,0 +1,675 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+
+/* The runs are stored in buffers of 32-bit integers, three values per run:
+ * the line of the run, the position of its first pixel and the position
+ * following its last pixel. The runs are sorted by line then by position
+ * and the runs of a line neither overlap nor touch each other. */
+#define RUN_Y(pruns, i) ((pruns)[3*(i)])
+#define RUN_XS(pruns, i) ((pruns)[3*(i)+1])
+#define RUN_XE(pruns, i) ((pruns)[3*(i)+2])
+
+/* Value used when the size of the image is not known */
+#define RUNS_NO_LIMIT 0xffffffff
+
+/*
+ * Verifies that a buffer holds valid runs: three values per run, sorted
+ * runs which neither overlap nor touch each other and which lie inside
+ * the image.
+ * \param pruns the runs
+ * \param len_runs the number of values in the buffer
+ * \param width the width of the image
+ * \param height the height of the image
+ * \return An error code (MB_NO_ERR if successful)
+ */
+static MB_errcode RUNS_CHECK(Uint32 *pruns, Uint32 len_runs,
+                             Uint32 width, Uint32 height)
+{
+    Uint32 i;
+
+    if ((len_runs%3)!=0) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    for(i=0; i<len_runs/3; i++) {
+        if (RUN_Y(pruns,i)>=height ||
+            RUN_XS(pruns,i)>=RUN_XE(pruns,i) || RUN_XE(pruns,i)>width) {
+            return MB_ERR_BAD_VALUE;
+        }
+        if (i>0) {
+            if (RUN_Y(pruns,i)<RUN_Y(pruns,i-1) ||
+                (RUN_Y(pruns,i)==RUN_Y(pruns,i-1) &&
+                 RUN_XS(pruns,i)<=RUN_XE(pruns,i-1))) {
+                return MB_ERR_BAD_VALUE;
+            }
+        }
+    }
+    return MB_NO_ERR;
+}
+
+/*
+ * Appends a run at the end of the output buffer. The run is merged with
+ * the last run of the buffer when they are on the same line and overlap or
+ * touch each other (the runs must be appended sorted by line and start).
+ * \param pout the output buffer
+ * \param len_out the number of values the output buffer can hold
+ * \param nb the number of runs already in the buffer (updated)
+ * \param y the line of the run
+ * \param xs the position of the first pixel of the run
+ * \param xe the position following the last pixel of the run
+ * \return 1 if the run was appended, 0 if the buffer is too small
+ */
+static INLINE int RUNS_PUSH(Uint32 *pout, Uint32 len_out, Uint32 *nb,
+                            Uint32 y, Uint32 xs, Uint32 xe)
+{
+    Uint32 last = *nb;
+
+    if (last>0 && RUN_Y(pout,last-1)==y && RUN_XE(pout,last-1)>=xs) {
+        if (xe>RUN_XE(pout,last-1)) {
+            RUN_XE(pout,last-1) = xe;
+        }
+        return 1;
+    }
+    if (3*last+3>len_out) {
+        return 0;
+    }
+    RUN_Y(pout,last) = y;
+    RUN_XS(pout,last) = xs;
+    RUN_XE(pout,last) = xe;
+    *nb = last+1;
+    return 1;
+}
+
+/****************************************
+ * Conversion with binary images        *
+ ****************************************/
+
+/*
+ * Counts the runs of set pixels inside a binary image.
+ * \param src the binary source image
+ * \param pNbruns the number of runs
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_RunsCount(MB_Image *src, Uint32 *pNbruns)
+{
+    Uint32 i,j;
+    Uint32 count = 0;
+    MB_Vector1 *pin;
+    MB_Vector1 starts, carry;
+
+    if (src->depth!=1) {
+        return MB_ERR_BAD_DEPTH;
+    }
+
+    for(i=0; i<src->height; i++) {
+        pin = (MB_Vector1 *) (src->plines[i]);
+        carry = 0;
+        for(j=0; j<src->width; j+=MB_vec1_size, pin++) {
+            /* Set pixels whose left neighbor is not set */
+            starts = (*pin) & (~(((*pin)<<1)|carry));
+            carry = (*pin)>>(MB_vec1_size-1);
+            while (starts) {
+                starts &= starts-1;
+                count++;
+            }
+        }
+    }
+
+    *pNbruns = count;
+    return MB_NO_ERR;
+}
+
+/*
+ * Extracts the runs of set pixels of a binary image.
+ * \param src the binary source image
+ * \param pout the buffer receiving the runs
+ * \param len_out the number of values the buffer can hold
+ * \param pNbruns the number of runs extracted
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_RunsExtract(MB_Image *src, Uint32 *pout, Uint32 len_out,
+                          Uint32 *pNbruns)
+{
+    Uint32 i,j,k;
+    Uint32 nb = 0, start = 0, inrun;
+    MB_Vector1 *pin;
+    MB_Vector1 reg;
+
+    if (src->depth!=1) {
+        return MB_ERR_BAD_DEPTH;
+    }
+
+    for(i=0; i<src->height; i++) {
+        pin = (MB_Vector1 *) (src->plines[i]);
+        inrun = 0;
+        for(j=0; j<src->width; j+=MB_vec1_size, pin++) {
+            reg = *pin;
+            /* Registers which do not start or end a run are skipped */
+            if ((inrun && reg==~((MB_Vector1) 0)) || (!inrun && reg==0)) {
+                continue;
+            }
+            for(k=0; k<MB_vec1_size; k++, reg>>=1) {
+                if ((reg&1)!=inrun) {
+                    if (inrun) {
+                        if (!RUNS_PUSH(pout, len_out, &nb, i, start, j+k)) {
+                            return MB_ERR_BAD_PARAMETER;
+                        }
+                    } else {
+                        start = j+k;
+                    }
+                    inrun = !inrun;
+                }
+            }
+        }
+        if (inrun) {
+            if (!RUNS_PUSH(pout, len_out, &nb, i, start, src->width)) {
+                return MB_ERR_BAD_PARAMETER;
+            }
+        }
+    }
+
+    *pNbruns = nb;
+    return MB_NO_ERR;
+}
+
+/*
+ * Draws runs inside an image. The pixels of the runs are set to the value
+ * associated to each run or, when no values are given, to the maximum value
+ * of the image depth. Values are saturated in a greyscale image and any non
+ * zero value sets the pixels of a binary image. The other pixels are left
+ * unchanged.
+ * \param dest the destination image
+ * \param pruns the runs
+ * \param len_runs the number of values in the runs buffer
+ * \param pvals the values of the runs (one per run) or an empty buffer
+ * \param len_vals the number of values
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_RunsDraw(MB_Image *dest, Uint32 *pruns, Uint32 len_runs,
+                       Uint32 *pvals, Uint32 len_vals)
+{
+    Uint32 i,x,xs,xe;
+    Uint32 val;
+    MB_errcode err;
+    MB_Vector1 mask;
+    MB_Vector1 *pout1;
+    PIX8 *pout8;
+    PIX32 *pout32;
+
+    err = RUNS_CHECK(pruns, len_runs, dest->width, dest->height);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+    if (len_vals!=0 && len_vals!=len_runs/3) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+
+    for(i=0; i<len_runs/3; i++) {
+        xs = RUN_XS(pruns,i);
+        xe = RUN_XE(pruns,i);
+        switch(dest->depth) {
+        case 1:
+            if (len_vals!=0 && pvals[i]==0) {
+                break;
+            }
+            pout1 = (MB_Vector1 *) (dest->plines[RUN_Y(pruns,i)]);
+            for(x=xs; x<xe; x=(x/MB_vec1_size+1)*MB_vec1_size) {
+                mask = ~((MB_Vector1) 0)<<(x%MB_vec1_size);
+                if (xe-(x/MB_vec1_size)*MB_vec1_size<MB_vec1_size) {
+                    mask &= ~(~((MB_Vector1) 0)<<(xe%MB_vec1_size));
+                }
+                pout1[x/MB_vec1_size] |= mask;
+            }
+            break;
+        case 8:
+            val = (len_vals==0) ? 255 : pvals[i];
+            pout8 = (PIX8 *) (dest->plines[RUN_Y(pruns,i)]);
+            MB_memset(pout8+xs, val>255 ? 255 : val, xe-xs);
+            break;
+        case 32:
+            val = (len_vals==0) ? 0xffffffff : pvals[i];
+            pout32 = (PIX32 *) (dest->plines[RUN_Y(pruns,i)]);
+            for(x=xs; x<xe; x++) {
+                pout32[x] = val;
+            }
+            break;
+        default:
+            return MB_ERR_BAD_DEPTH;
+        }
+    }
+
+    return MB_NO_ERR;
+}
+
+/****************************************
+ * Set operations                       *
+ ****************************************/
+
+/* Compares the positions of two runs (line first, then start) */
+#define RUNS_BEFORE(pruns1, i, pruns2, j) \
+    (RUN_Y(pruns1,i)<RUN_Y(pruns2,j) || \
+     (RUN_Y(pruns1,i)==RUN_Y(pruns2,j) && RUN_XS(pruns1,i)<RUN_XS(pruns2,j)))
+
+/*
+ * Computes the union, the intersection or the difference of two sets of
+ * runs. The output buffer must be able to hold as many runs as the two
+ * inputs together.
+ * \param pruns the runs of the first set
+ * \param len_runs the number of values in the first buffer
+ * \param pruns2 the runs of the second set
+ * \param len_runs2 the number of values in the second buffer
+ * \param op the operation performed
+ * \param pout the buffer receiving the resulting runs
+ * \param len_out the number of values the output buffer can hold
+ * \param pNbruns the number of resulting runs
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_RunsLogic(Uint32 *pruns, Uint32 len_runs,
+                        Uint32 *pruns2, Uint32 len_runs2,
+                        enum MB_runs_op_t op,
+                        Uint32 *pout, Uint32 len_out, Uint32 *pNbruns)
+{
+    Uint32 i = 0, j = 0, k;
+    Uint32 n1 = len_runs/3, n2 = len_runs2/3;
+    Uint32 nb = 0, xs, xe;
+    MB_errcode err;
+    int ok = 1;
+
+    err = RUNS_CHECK(pruns, len_runs, RUNS_NO_LIMIT, RUNS_NO_LIMIT);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+    err = RUNS_CHECK(pruns2, len_runs2, RUNS_NO_LIMIT, RUNS_NO_LIMIT);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+
+    switch(op) {
+    case MB_RUNS_UNION:
+        /* Merging the two sorted sets (the runs are joined when pushed) */
+        while (ok && (i<n1 || j<n2)) {
+            if (j>=n2 || (i<n1 && RUNS_BEFORE(pruns, i, pruns2, j))) {
+                ok = RUNS_PUSH(pout, len_out, &nb, RUN_Y(pruns,i),
+                               RUN_XS(pruns,i), RUN_XE(pruns,i));
+                i++;
+            } else {
+                ok = RUNS_PUSH(pout, len_out, &nb, RUN_Y(pruns2,j),
+                               RUN_XS(pruns2,j), RUN_XE(pruns2,j));
+                j++;
+            }
+        }
+        break;
+    case MB_RUNS_INTERSECTION:
+        while (ok && i<n1 && j<n2) {
+            if (RUN_Y(pruns,i)!=RUN_Y(pruns2,j)) {
+                if (RUN_Y(pruns,i)<RUN_Y(pruns2,j)) {
+                    i++;
+                } else {
+                    j++;
+                }
+                continue;
+            }
+            xs = RUN_XS(pruns,i)>RUN_XS(pruns2,j) ? RUN_XS(pruns,i) : RUN_XS(pruns2,j);
+            xe = RUN_XE(pruns,i)<RUN_XE(pruns2,j) ? RUN_XE(pruns,i) : RUN_XE(pruns2,j);
+            if (xs<xe) {
+                ok = RUNS_PUSH(pout, len_out, &nb, RUN_Y(pruns,i), xs, xe);
+            }
+            /* The run which ends first cannot meet another run */
+            if (RUN_XE(pruns,i)<RUN_XE(pruns2,j)) {
+                i++;
+            } else {
+                j++;
+            }
+        }
+        break;
+    case MB_RUNS_DIFFERENCE:
+        for(i=0; ok && i<n1; i++) {
+            xs = RUN_XS(pruns,i);
+            xe = RUN_XE(pruns,i);
+            /* Skipping the runs of the second set located before */
+            while (j<n2 && (RUN_Y(pruns2,j)<RUN_Y(pruns,i) ||
+                            (RUN_Y(pruns2,j)==RUN_Y(pruns,i) &&
+                             RUN_XE(pruns2,j)<=xs))) {
+                j++;
+            }
+            /* Removing the runs of the second set overlapping this run */
+            for(k=j; ok && k<n2 && RUN_Y(pruns2,k)==RUN_Y(pruns,i) &&
+                     RUN_XS(pruns2,k)<xe; k++) {
+                if (RUN_XS(pruns2,k)>xs) {
+                    ok = RUNS_PUSH(pout, len_out, &nb, RUN_Y(pruns,i),
+                                   xs, RUN_XS(pruns2,k));
+                }
+                if (RUN_XE(pruns2,k)>xs) {
+                    xs = RUN_XE(pruns2,k);
+                }
+            }
+            if (ok && xs<xe) {
+                ok = RUNS_PUSH(pout, len_out, &nb, RUN_Y(pruns,i), xs, xe);
+            }
+        }
+        break;
+    default:
+        return MB_ERR_BAD_PARAMETER;
+    }
+
+    if (!ok) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    *pNbruns = nb;
+    return MB_NO_ERR;
+}
+
+/*
+ * Computes the complement of a set of runs inside an image of the given
+ * size. The output buffer must be able to hold one more run per line
+ * than the input.
+ * \param pruns the runs
+ * \param len_runs the number of values in the runs buffer
+ * \param width the width of the image
+ * \param height the height of the image
+ * \param pout the buffer receiving the resulting runs
+ * \param len_out the number of values the output buffer can hold
+ * \param pNbruns the number of resulting runs
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_RunsNegate(Uint32 *pruns, Uint32 len_runs,
+                         Uint32 width, Uint32 height,
+                         Uint32 *pout, Uint32 len_out, Uint32 *pNbruns)
+{
+    Uint32 i = 0, y, x;
+    Uint32 nb = 0;
+    MB_errcode err;
+
+    err = RUNS_CHECK(pruns, len_runs, width, height);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+
+    for(y=0; y<height; y++) {
+        x = 0;
+        for(; i<len_runs/3 && RUN_Y(pruns,i)==y; i++) {
+            if (RUN_XS(pruns,i)>x) {
+                if (!RUNS_PUSH(pout, len_out, &nb, y, x, RUN_XS(pruns,i))) {
+                    return MB_ERR_BAD_PARAMETER;
+                }
+            }
+            x = RUN_XE(pruns,i);
+        }
+        if (x<width) {
+            if (!RUNS_PUSH(pout, len_out, &nb, y, x, width)) {
+                return MB_ERR_BAD_PARAMETER;
+            }
+        }
+    }
+
+    *pNbruns = nb;
+    return MB_NO_ERR;
+}
+
+/****************************************
+ * Geometric operations                 *
+ ****************************************/
+
+/*
+ * Translates a set of runs by a vector. The parts of the runs falling
+ * outside the image are lost. The output buffer must be able to hold as
+ * many runs as the input.
+ * \param pruns the runs
+ * \param len_runs the number of values in the runs buffer
+ * \param dx the horizontal displacement
+ * \param dy the vertical displacement
+ * \param width the width of the image
+ * \param height the height of the image
+ * \param pout the buffer receiving the resulting runs
+ * \param len_out the number of values the output buffer can hold
+ * \param pNbruns the number of resulting runs
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_RunsShift(Uint32 *pruns, Uint32 len_runs, Sint32 dx, Sint32 dy,
+                        Uint32 width, Uint32 height,
+                        Uint32 *pout, Uint32 len_out, Uint32 *pNbruns)
+{
+    Uint32 i;
+    Uint32 nb = 0;
+    Sint64 y, xs, xe;
+    MB_errcode err;
+
+    err = RUNS_CHECK(pruns, len_runs, width, height);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+
+    for(i=0; i<len_runs/3; i++) {
+        y = ((Sint64) RUN_Y(pruns,i))+dy;
+        xs = ((Sint64) RUN_XS(pruns,i))+dx;
+        xe = ((Sint64) RUN_XE(pruns,i))+dx;
+        if (xs<0) xs = 0;
+        if (xe>(Sint64) width) xe = width;
+        if (y<0 || y>=(Sint64) height || xs>=xe) {
+            continue;
+        }
+        if (!RUNS_PUSH(pout, len_out, &nb, (Uint32) y, (Uint32) xs, (Uint32) xe)) {
+            return MB_ERR_BAD_PARAMETER;
+        }
+    }
+
+    *pNbruns = nb;
+    return MB_NO_ERR;
+}
+
+/*
+ * Dilates a set of runs by the elementary hexagon or the 3x3 square of the
+ * grid. The pixels outside the image are considered empty. The output
+ * buffer must be able to hold three times as many runs as the input.
+ * \param pruns the runs
+ * \param len_runs the number of values in the runs buffer
+ * \param width the width of the image
+ * \param height the height of the image
+ * \param grid the grid used (either square or hexagonal)
+ * \param pout the buffer receiving the resulting runs
+ * \param len_out the number of values the output buffer can hold
+ * \param pNbruns the number of resulting runs
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_RunsDilate(Uint32 *pruns, Uint32 len_runs,
+                         Uint32 width, Uint32 height, enum MB_grid_t grid,
+                         Uint32 *pout, Uint32 len_out, Uint32 *pNbruns)
+{
+    Uint32 n = len_runs/3;
+    Uint32 lo = 0, nb = 0, t = 0;
+    Uint32 r, k, best, xs;
+    Uint32 cur[3], end[3], left[3], right[3];
+    MB_errcode err;
+
+    err = RUNS_CHECK(pruns, len_runs, width, height);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+
+    while (t<height) {
+        /* First run which can reach line t (located on line t-1 or after) */
+        while (lo<n && RUN_Y(pruns,lo)+1<t) {
+            lo++;
+        }
+        if (lo==n) {
+            break;
+        }
+        if (RUN_Y(pruns,lo)>t+1) {
+            t = RUN_Y(pruns,lo)-1;
+            continue;
+        }
+
+        /* Runs of the lines t-1, t and t+1 and how they are widened when */
+        /* reaching line t (the even lines are shifted to the left in */
+        /* hexagonal grid) */
+        r = lo;
+        for(k=0; k<3; k++) {
+            cur[k] = r;
+            if (t+k>=1) {
+                while (r<n && RUN_Y(pruns,r)==t+k-1) {
+                    r++;
+                }
+            }
+            end[k] = r;
+            left[k] = (k==1 || grid==MB_SQUARE_GRID || (t%2)==1) ? 1 : 0;
+            right[k] = (k==1 || grid==MB_SQUARE_GRID || (t%2)==0) ? 1 : 0;
+        }
+
+        /* Merging the widened runs of the three lines */
+        for(;;) {
+            best = 3;
+            for(k=0; k<3; k++) {
+                if (cur[k]<end[k] &&
+                    (best==3 || RUN_XS(pruns,cur[k])+left[best] <
+                                RUN_XS(pruns,cur[best])+left[k])) {
+                    best = k;
+                }
+            }
+            if (best==3) {
+                break;
+            }
+            xs = RUN_XS(pruns,cur[best]);
+            xs = (xs>=left[best]) ? xs-left[best] : 0;
+            if (!RUNS_PUSH(pout, len_out, &nb, t, xs,
+                           RUN_XE(pruns,cur[best])+right[best]>width ?
+                           width : RUN_XE(pruns,cur[best])+right[best])) {
+                return MB_ERR_BAD_PARAMETER;
+            }
+            cur[best]++;
+        }
+        t++;
+    }
+
+    *pNbruns = nb;
+    return MB_NO_ERR;
+}
+
+/****************************************
+ * Labelling                            *
+ ****************************************/
+
+/* Finds the first run of the connected component of a run */
+static INLINE Uint32 RUNS_FIND(Uint32 *parent, Uint32 i)
+{
+    Uint32 root = i, next;
+
+    while (parent[root]!=root) {
+        root = parent[root];
+    }
+    /* Path compression */
+    while (parent[i]!=root) {
+        next = parent[i];
+        parent[i] = root;
+        i = next;
+    }
+    return root;
+}
+
+/*
+ * Labels the connected components of a set of runs. Each run receives the
+ * label of its component, the components being numbered from 1 in the order
+ * of their first run. The output buffer must be able to hold one label
+ * per run.
+ * \param pruns the runs
+ * \param len_runs the number of values in the runs buffer
+ * \param grid the grid used (either square or hexagonal)
+ * \param pout the buffer receiving the labels of the runs
+ * \param len_out the number of values the output buffer can hold
+ * \param pNbobj the number of connected components
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_RunsLabel(Uint32 *pruns, Uint32 len_runs, enum MB_grid_t grid,
+                        Uint32 *pout, Uint32 len_out, Uint32 *pNbobj)
+{
+    Uint32 n = len_runs/3;
+    Uint32 i, j, pre, start, ri, rj, left, right;
+    Uint32 nb = 0;
+    Uint32 *parent;
+    MB_errcode err;
+
+    err = RUNS_CHECK(pruns, len_runs, RUNS_NO_LIMIT, RUNS_NO_LIMIT);
+    if (err!=MB_NO_ERR) {
+        return err;
+    }
+    if (len_out<n) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+
+    parent = (Uint32 *) MB_malloc(n*sizeof(Uint32)+1);
+    if (parent==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+    for(i=0; i<n; i++) {
+        parent[i] = i;
+    }
+
+    /* pre is the first run of the previous line, start the first run */
+    /* of the current line */
+    pre = 0;
+    start = 0;
+    for(i=0; i<n; i++) {
+        if (i>0 && RUN_Y(pruns,i)!=RUN_Y(pruns,i-1)) {
+            pre = start;
+            start = i;
+        }
+        if (start==0 || RUN_Y(pruns,pre)+1!=RUN_Y(pruns,i)) {
+            continue;
+        }
+        /* Neighbors in the previous line (the even lines are shifted */
+        /* to the left in hexagonal grid) */
+        left = (grid==MB_SQUARE_GRID || (RUN_Y(pruns,i)%2)==0) ? 1 : 0;
+        right = (grid==MB_SQUARE_GRID || (RUN_Y(pruns,i)%2)==1) ? 1 : 0;
+        for(j=pre; j<start; j++) {
+            if (RUN_XE(pruns,j)+left<=RUN_XS(pruns,i)) {
+                /* runs of the previous line located before */
+                pre = j+1;
+                continue;
+            }
+            if (RUN_XS(pruns,j)>=RUN_XE(pruns,i)+right) {
+                break;
+            }
+            ri = RUNS_FIND(parent, i);
+            rj = RUNS_FIND(parent, j);
+            /* The component is represented by its first run */
+            if (ri<rj) {
+                parent[rj] = ri;
+            } else if (rj<ri) {
+                parent[ri] = rj;
+            }
+        }
+    }
+
+    /* Numbering the components in the order of their first run */
+    for(i=0; i<n; i++) {
+        ri = RUNS_FIND(parent, i);
+        pout[i] = (ri==i) ? ++nb : pout[ri];
+    }
+
+    MB_free(parent);
+    *pNbobj = nb;
+    return MB_NO_ERR;
+}
@@ -0,0 +1,260 @@
+/*
+ * Copyright (c) <2009>, <Nicolas BEUCHER and ARMINES for the Centre de 
+ * Morphologie Mathématique(CMM), common research center to ARMINES and MINES 
+ * Paristech>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+
+/*
+ * Adds a squared value to a sum kept in two 64-bit words (the sum of the
+ * squared 32-bit values can exceed 64 bits).
+ * \param sumsq the sum (high word then low word)
+ * \param sq the squared value added
+ */
+static INLINE void ADD_SQ(Uint64 *sumsq, Uint64 sq)
+{
+    sumsq[1] += sq;
+    if (sumsq[1]<sq) {
+        sumsq[0]++;
+    }
+}
+
+/*
+ * Computes the histogram of a line of an 8-bit image restricted to the
+ * pixels set in the mask line.
+ * \param plines pointer on the source image pixel line
+ * \param plines_mask pointer on the mask image pixel line
+ * \param bytes number of bytes inside the line
+ * \param histo pointer to the histogram array
+ */
+static INLINE void STATS_LINE8(PLINE *plines, PLINE *plines_mask,
+                               Uint32 bytes, Uint64 *histo)
+{
+    Uint32 i,j;
+    MB_Vector1 mask_reg;
+
+    PIX8 *pin = (PIX8 *) (*plines);
+    MB_Vector1 *pmask;
+
+    if (plines_mask==NULL) {
+        for(i=0;i<bytes;i++,pin++){
+            histo[(*pin)]++;
+        }
+        return;
+    }
+
+    pmask = (MB_Vector1 *) (*plines_mask);
+    for(i=0;i<bytes;i+=MB_vec1_size,pmask++,pin+=MB_vec1_size){
+        mask_reg = *pmask;
+        if (mask_reg==MB_vec1_setzero) {
+            /* No pixel of the register is in the mask */
+            continue;
+        }
+        for(j=0;j<MB_vec1_size;j++,mask_reg=mask_reg>>1){
+            if (mask_reg&1) {
+                histo[pin[j]]++;
+            }
+        }
+    }
+}
+
+/*
+ * Computes the statistics of a line of a 32-bit image restricted to the
+ * pixels set in the mask line.
+ * \param plines pointer on the source image pixel line
+ * \param plines_mask pointer on the mask image pixel line
+ * \param bytes number of bytes inside the line
+ * \param count pointer to the number of pixels counted
+ * \param min pointer to the minimum value
+ * \param max pointer to the maximum value
+ * \param sum pointer to the sum of the values
+ * \param sumsq pointer to the sum of the squared values (high and low words)
+ */
+static INLINE void STATS_LINE32(PLINE *plines, PLINE *plines_mask, Uint32 bytes,
+                                Uint64 *count, PIX32 *min, PIX32 *max,
+                                Uint64 *sum, Uint64 *sumsq)
+{
+    Uint32 i,j;
+    MB_Vector1 mask_reg;
+    PIX32 pix, lmin, lmax;
+    Uint64 lcount, lsum, sq;
+
+    PIX32 *pin = (PIX32 *) (*plines);
+    MB_Vector1 *pmask;
+
+    lmin = *min;
+    lmax = *max;
+    lcount = 0;
+    lsum = 0;
+
+    if (plines_mask==NULL) {
+        for(i=0;i<bytes;i+=4,pin++){
+            pix = *pin;
+            lmin = pix<lmin ? pix : lmin;
+            lmax = pix>lmax ? pix : lmax;
+            lsum += pix;
+            sq = ((Uint64) pix)*pix;
+            ADD_SQ(sumsq, sq);
+        }
+        lcount = bytes/4;
+    } else {
+        pmask = (MB_Vector1 *) (*plines_mask);
+        for(i=0;i<bytes;i+=4*MB_vec1_size,pmask++,pin+=MB_vec1_size){
+            mask_reg = *pmask;
+            if (mask_reg==MB_vec1_setzero) {
+                /* No pixel of the register is in the mask */
+                continue;
+            }
+            for(j=0;j<MB_vec1_size;j++,mask_reg=mask_reg>>1){
+                if (mask_reg&1) {
+                    pix = pin[j];
+                    lmin = pix<lmin ? pix : lmin;
+                    lmax = pix>lmax ? pix : lmax;
+                    lsum += pix;
+                    sq = ((Uint64) pix)*pix;
+                    ADD_SQ(sumsq, sq);
+                    lcount++;
+                }
+            }
+        }
+    }
+
+    *min = lmin;
+    *max = lmax;
+    *count += lcount;
+    *sum += lsum;
+}
+
+/*
+ * Computes in a single pass the statistics of an image, i.e. the number
+ * of pixels, their minimum, maximum, sum and sum of squares. When the
+ * image is an 8-bit image, its histogram can also be computed.
+ * The computation can be restricted to the pixels set in a binary mask.
+ * When no pixel is taken into account, the minimum and maximum are 0.
+ * \param src source image (8-bit or 32-bit)
+ * \param mask binary mask image (NULL to take all the pixels)
+ * \param pCount pointer to the number of pixels counted
+ * \param min pointer to the minimum value
+ * \param max pointer to the maximum value
+ * \param pSum pointer to the sum of the values
+ * \param pSumSqHi pointer to the high 64 bits of the sum of the squared values
+ * \param pSumSqLo pointer to the low 64 bits of the sum of the squared values
+ * \param phisto pointer to the histogram array (size 256) or NULL. It is
+ * filled only for 8-bit images (and reset otherwise).
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_Stats(MB_Image *src, MB_Image *mask,
+                    Uint64 *pCount, Uint32 *min, Uint32 *max,
+                    Uint64 *pSum, Uint64 *pSumSqHi, Uint64 *pSumSqLo,
+                    Uint32 *phisto)
+{
+    Uint32 i;
+    PLINE *plines, *plines_mask;
+    Uint32 bytes;
+    Uint64 histo[256];
+    Uint64 count, sum, sq;
+    Uint64 sumsq[2];
+    PIX32 lmin, lmax;
+
+    /* Verification over the mask */
+    if (mask!=NULL) {
+        if (!MB_CHECK_SIZE_2(src, mask)) {
+            return MB_ERR_BAD_SIZE;
+        }
+        if (mask->depth!=1) {
+            return MB_ERR_BAD_DEPTH;
+        }
+    }
+
+    /* Setting up line pointers */
+    plines = src->plines;
+    plines_mask = (mask==NULL) ? NULL : mask->plines;
+    bytes = MB_LINE_COUNT(src);
+
+    count = 0;
+    sum = 0;
+    sumsq[0] = 0;
+    sumsq[1] = 0;
+    for(i = 0; i<256; i++) {
+        histo[i] = 0;
+    }
+
+    switch(src->depth) {
+
+    case 8:
+        /* The statistics are derived from the histogram */
+        for(i=0; i<src->height; i++, plines++) {
+            STATS_LINE8(plines, plines_mask, bytes, histo);
+            if (plines_mask!=NULL) plines_mask++;
+        }
+        lmin = 255;
+        lmax = 0;
+        for(i=0; i<256; i++) {
+            if (histo[i]!=0) {
+                lmin = i<lmin ? i : lmin;
+                lmax = i;
+                count += histo[i];
+                sum += histo[i]*i;
+                sq = histo[i]*i*i;
+                ADD_SQ(sumsq, sq);
+            }
+        }
+        break;
+
+    case 32:
+        lmin = 0xffffffff;
+        lmax = 0;
+        for(i=0; i<src->height; i++, plines++) {
+            STATS_LINE32(plines, plines_mask, bytes, &count, &lmin, &lmax, &sum, sumsq);
+            if (plines_mask!=NULL) plines_mask++;
+        }
+        break;
+
+    default:
+        /* Binary images are not handled */
+        return MB_ERR_BAD_DEPTH;
+        break;
+    }
+
+    if (count==0) {
+        lmin = 0;
+        lmax = 0;
+    }
+
+    *pCount = count;
+    *min = lmin;
+    *max = lmax;
+    *pSum = sum;
+    *pSumSqHi = sumsq[0];
+    *pSumSqLo = sumsq[1];
+    if (phisto!=NULL) {
+        for(i=0; i<256; i++) {
+            phisto[i] = (Uint32) histo[i];
+        }
+    }
+
+    return MB_NO_ERR;
+}
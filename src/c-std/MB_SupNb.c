@@ -27,9 +27,9 @@
  */
 #include "mambaApi_loc.h"
 
-extern MB_errcode MB_SupNbb(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge);
-extern MB_errcode MB_SupNb8(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge);
-extern MB_errcode MB_SupNb32(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge);
+extern MB_errcode MB_SupNbb(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge, Uint32 *pFirst, Uint32 *pLast);
+extern MB_errcode MB_SupNb8(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge, Uint32 *pFirst, Uint32 *pLast);
+extern MB_errcode MB_SupNb32(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge, Uint32 *pFirst, Uint32 *pLast);
 
 /****************************************/
 /* Main function                        */
@@ -47,20 +47,33 @@ extern MB_errcode MB_SupNb32(MB_Image *src, MB_Image *srcdest, Uint32 neighbors,
  * \param neighbors the neighbors to take into account
  * \param grid the grid used (either square or hexagonal)
  * \param edge the kind of edge to use (behavior for pixel near edge depends on it)
+ * \param pFirst first line of srcdest modified by the operation
+ * \param pLast last line of srcdest modified by the operation (pFirst is
+ * greater than pLast when srcdest is unchanged). The range of modified lines
+ * is not returned when pFirst or pLast is NULL.
  *
  * \return An error code (MB_NO_ERR if successful)
  */
-MB_errcode MB_SupNb(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge)
+MB_errcode MB_SupNb(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge,
+                    Uint32 *pFirst, Uint32 *pLast)
 {
+    Uint32 first, last;
+
+    /* The range of modified lines is optional */
+    if (pFirst==NULL || pLast==NULL) {
+        pFirst = &first;
+        pLast = &last;
+    }
+
     switch(srcdest->depth) {
     case 1:
-        return MB_SupNbb(src, srcdest, neighbors, grid, edge);
+        return MB_SupNbb(src, srcdest, neighbors, grid, edge, pFirst, pLast);
         break;
     case 8:
-        return MB_SupNb8(src, srcdest, neighbors, grid, edge);
+        return MB_SupNb8(src, srcdest, neighbors, grid, edge, pFirst, pLast);
         break;
     case 32:
-        return MB_SupNb32(src, srcdest, neighbors, grid, edge);
+        return MB_SupNb32(src, srcdest, neighbors, grid, edge, pFirst, pLast);
         break;
     default:
         break;
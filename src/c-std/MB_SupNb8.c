@@ -38,6 +38,7 @@
 #define VEC_TYPE MB_Vector8
 #define VEC_LOAD(pointer) MB_vec8_load(pointer)
 #define VEC_STORE(pointer, value) MB_vec8_store(pointer,value)
+#define VEC_DIFFER(vec1, vec2) MB_vec8_differ(vec1,vec2)
 
 #define COMP_NO_SHIFT(cond,inout,in)                                        \
 {                                                                           \
@@ -73,6 +74,7 @@
 #undef VEC_TYPE
 #undef VEC_LOAD
 #undef VEC_STORE
+#undef VEC_DIFFER
 #undef COMP_NO_SHIFT
 #undef COMP_SHIFT_LEFT
 #undef COMP_SHIFT_RIGHT
@@ -112,10 +114,14 @@
  * \param neighbors the neighbors to take into account
  * \param grid the grid used (either square or hexagonal)
  * \param edge the kind of edge to use (behavior for pixel near edge depends on it)
+ * \param pFirst first line of srcdest modified by the operation
+ * \param pLast last line of srcdest modified by the operation (pFirst is
+ * greater than pLast when srcdest is unchanged)
  *
  * \return An error code (MB_NO_ERR if successful)
  */
-MB_errcode MB_SupNb8(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge)
+MB_errcode MB_SupNb8(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge,
+                     Uint32 *pFirst, Uint32 *pLast)
 {
     Uint32 bytes_in;
     MB_Image *temp;
@@ -165,6 +171,10 @@ MB_errcode MB_SupNb8(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB
     plines_inout = srcdest->plines;
     bytes_in = MB_LINE_COUNT(src);
 
+    /* No line modified yet */
+    *pFirst = srcdest->height;
+    *pLast = 0;
+
     /* Calling the corresponding function */
     if (grid==MB_SQUARE_GRID) {
         if ((neighbors&MB_NEIGHBOR_ALL_SQUARE)==0) {
@@ -172,14 +182,14 @@ MB_errcode MB_SupNb8(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB
             return MB_NO_ERR;
         }
         MB_comp_neighbors_square(plines_inout, plines_in, bytes_in, temp->height,
-                                 neighbors, edge_val);
+                                 neighbors, edge_val, pFirst, pLast);
     } else {
         if ((neighbors&MB_NEIGHBOR_ALL_HEXAGONAL)==0) {
             /* No neighbors to take into account */
             return MB_NO_ERR;
         }
         MB_comp_neighbors_hexagonal(plines_inout, plines_in, bytes_in, temp->height,
-                                    neighbors, edge_val);
+                                    neighbors, edge_val, pFirst, pLast);
     }
 
     /* Destroying the temporary image if one was created */
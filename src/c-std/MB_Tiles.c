@@ -0,0 +1,275 @@
+/*
+ * Copyright (c) <2014>, <Nicolas BEUCHER>
+ *
+ * Permission is hereby granted, free of charge, to any person
+ * obtaining a copy of this software and associated documentation files
+ * (the "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish, 
+ * distribute, sublicense, and/or sell copies of the Software, and to permit 
+ * persons to whom the Software is furnished to do so, subject to the following 
+ * conditions: The above copyright notice and this permission notice shall be 
+ * included in all copies or substantial portions of the Software.
+ *
+ * Except as contained in this notice, the names of the above copyright 
+ * holders shall not be used in advertising or otherwise to promote the sale, 
+ * use or other dealings in this Software without their prior written 
+ * authorization.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+#include "mambaApi_loc.h"
+#include "mambaApi_vector.h"
+
+/* The positions of the tiles are given as pairs of 32-bit integers (x, y)
+ * which are interpreted as signed values so that the tiles can partially
+ * lie outside the image. */
+#define TILE_X(ppos, i) ((Sint32) (ppos)[2*(i)])
+#define TILE_Y(ppos, i) ((Sint32) (ppos)[2*(i)+1])
+
+/*
+ * Reads the values of consecutive pixels of a line.
+ * \param src the image
+ * \param y the line read
+ * \param x the position of the first pixel read
+ * \param values the array receiving the values
+ * \param nb the number of values read
+ */
+static INLINE void TILE_READ(MB_Image *src, Uint32 y, Uint32 x,
+                             PIX32 *values, Uint32 nb)
+{
+    Uint32 i;
+    MB_Vector1 *pin1;
+    PIX8 *pin8;
+    PIX32 *pin32;
+
+    switch(src->depth) {
+    case 1:
+        pin1 = (MB_Vector1 *) (src->plines[y]);
+        for(i=x; i<x+nb; i++) {
+            values[i-x] = (PIX32) ((pin1[i/MB_vec1_size]>>(i%MB_vec1_size))&1);
+        }
+        break;
+    case 8:
+        pin8 = (PIX8 *) (src->plines[y]);
+        for(i=0; i<nb; i++) {
+            values[i] = (PIX32) pin8[x+i];
+        }
+        break;
+    default:
+        pin32 = (PIX32 *) (src->plines[y]);
+        MB_memcpy(values, pin32+x, nb*sizeof(PIX32));
+        break;
+    }
+}
+
+/*
+ * Writes the values of consecutive pixels of a line.
+ * \param dest the image
+ * \param y the line written
+ * \param x the position of the first pixel written
+ * \param values the values written
+ * \param nb the number of values written
+ */
+static INLINE void TILE_WRITE(MB_Image *dest, Uint32 y, Uint32 x,
+                              PIX32 *values, Uint32 nb)
+{
+    Uint32 i;
+    MB_Vector1 *pout1;
+    PIX8 *pout8;
+    PIX32 *pout32;
+
+    switch(dest->depth) {
+    case 1:
+        pout1 = (MB_Vector1 *) (dest->plines[y]);
+        for(i=x; i<x+nb; i++) {
+            if (values[i-x]) {
+                pout1[i/MB_vec1_size] |= ((MB_Vector1) 1L)<<(i%MB_vec1_size);
+            } else {
+                pout1[i/MB_vec1_size] &= ~(((MB_Vector1) 1L)<<(i%MB_vec1_size));
+            }
+        }
+        break;
+    case 8:
+        pout8 = (PIX8 *) (dest->plines[y]);
+        for(i=0; i<nb; i++) {
+            pout8[x+i] = (PIX8) values[i];
+        }
+        break;
+    default:
+        pout32 = (PIX32 *) (dest->plines[y]);
+        MB_memcpy(pout32+x, values, nb*sizeof(PIX32));
+        break;
+    }
+}
+
+/*
+ * Clips a tile so that it lies inside the image.
+ * \param im the image
+ * \param x the horizontal position of the tile
+ * \param y the vertical position of the tile
+ * \param w the width of the tile
+ * \param h the height of the tile
+ * \param pdx the first column of the tile inside the image
+ * \param pdy the first line of the tile inside the image
+ * \param pw the number of columns inside the image
+ * \param ph the number of lines inside the image
+ */
+static void TILE_CLIP(MB_Image *im, Sint32 x, Sint32 y, Uint32 w, Uint32 h,
+                      Uint32 *pdx, Uint32 *pdy, Uint32 *pw, Uint32 *ph)
+{
+    Sint64 x0, y0, x1, y1;
+
+    x0 = (x<0) ? 0 : x;
+    y0 = (y<0) ? 0 : y;
+    x1 = ((Sint64) x)+w;
+    y1 = ((Sint64) y)+h;
+    if (x1>(Sint64) im->width) x1 = im->width;
+    if (y1>(Sint64) im->height) y1 = im->height;
+    *pdx = (Uint32) (x0-x);
+    *pdy = (Uint32) (y0-y);
+    *pw = (x1>x0) ? (Uint32) (x1-x0) : 0;
+    *ph = (y1>y0) ? (Uint32) (y1-y0) : 0;
+}
+
+/*
+ * Copies tiles of the same size from the source image into the destination
+ * image. The parts of the tiles falling outside one of the images are not
+ * copied.
+ * \param src the source image
+ * \param dest the destination image
+ * \param psrcpos the positions of the tiles inside the source image
+ * \param len_srcpos the number of values in the source positions buffer
+ * \param pdestpos the positions of the tiles inside the destination image
+ * \param len_destpos the number of values in the destination positions buffer
+ * \param w the width of the tiles
+ * \param h the height of the tiles
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_TilesCopy(MB_Image *src, MB_Image *dest,
+                        Uint32 *psrcpos, Uint32 len_srcpos,
+                        Uint32 *pdestpos, Uint32 len_destpos,
+                        Uint32 w, Uint32 h)
+{
+    Uint32 i, j;
+    Uint32 sdx, sdy, sw, sh, ddx, ddy, dw, dh;
+    Uint32 dx, dy, cw, ch;
+    PIX32 *values;
+
+    if (src->depth!=dest->depth) {
+        return MB_ERR_BAD_DEPTH;
+    }
+    if ((len_srcpos%2)!=0 || len_srcpos!=len_destpos) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+
+    values = (PIX32 *) MB_malloc(w*sizeof(PIX32)+1);
+    if (values==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    for(i=0; i<len_srcpos/2; i++) {
+        /* Part of the tile inside both images */
+        TILE_CLIP(src, TILE_X(psrcpos,i), TILE_Y(psrcpos,i), w, h,
+                  &sdx, &sdy, &sw, &sh);
+        TILE_CLIP(dest, TILE_X(pdestpos,i), TILE_Y(pdestpos,i), w, h,
+                  &ddx, &ddy, &dw, &dh);
+        dx = (sdx>ddx) ? sdx : ddx;
+        dy = (sdy>ddy) ? sdy : ddy;
+        cw = ((sdx+sw<ddx+dw) ? sdx+sw : ddx+dw);
+        ch = ((sdy+sh<ddy+dh) ? sdy+sh : ddy+dh);
+        if (cw<=dx || ch<=dy) {
+            continue;
+        }
+        for(j=dy; j<ch; j++) {
+            TILE_READ(src, TILE_Y(psrcpos,i)+j, TILE_X(psrcpos,i)+dx,
+                      values, cw-dx);
+            TILE_WRITE(dest, TILE_Y(pdestpos,i)+j, TILE_X(pdestpos,i)+dx,
+                       values, cw-dx);
+        }
+    }
+
+    MB_free(values);
+    return MB_NO_ERR;
+}
+
+/*
+ * Reduces the pixels of each tile of an image to a single value (the
+ * maximum, the minimum, the sum or the number of non zero pixels). The
+ * parts of the tiles falling outside the image are ignored; the result is
+ * 0 for a tile entirely outside the image.
+ * \param src the image
+ * \param ppos the positions of the tiles
+ * \param len_pos the number of values in the positions buffer
+ * \param w the width of the tiles
+ * \param h the height of the tiles
+ * \param op the reduction (same as the 3D projections)
+ * \param pout64 the buffer receiving the value of each tile
+ * \param len_out64 the number of values the output buffer can hold
+ * \return An error code (MB_NO_ERR if successful)
+ */
+MB_errcode MB_TilesReduce(MB_Image *src, Uint32 *ppos, Uint32 len_pos,
+                          Uint32 w, Uint32 h, enum MB3D_projection_t op,
+                          Uint64 *pout64, Uint32 len_out64)
+{
+    Uint32 i, j, k;
+    Uint32 dx, dy, cw, ch;
+    Uint64 acc;
+    PIX32 *values;
+
+    if ((len_pos%2)!=0 || len_out64<len_pos/2) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+    if (op!=MB3D_PROJ_MAX && op!=MB3D_PROJ_MIN &&
+        op!=MB3D_PROJ_SUM && op!=MB3D_PROJ_COUNT) {
+        return MB_ERR_BAD_PARAMETER;
+    }
+
+    values = (PIX32 *) MB_malloc(w*sizeof(PIX32)+1);
+    if (values==NULL) {
+        return MB_ERR_CANT_ALLOCATE_MEMORY;
+    }
+
+    for(i=0; i<len_pos/2; i++) {
+        TILE_CLIP(src, TILE_X(ppos,i), TILE_Y(ppos,i), w, h, &dx, &dy, &cw, &ch);
+        if (cw==0 || ch==0) {
+            pout64[i] = 0;
+            continue;
+        }
+        acc = (op==MB3D_PROJ_MIN) ? 0xffffffff : 0;
+        for(j=dy; j<dy+ch; j++) {
+            TILE_READ(src, TILE_Y(ppos,i)+j, TILE_X(ppos,i)+dx, values, cw);
+            switch(op) {
+            case MB3D_PROJ_MAX:
+                for(k=0; k<cw; k++) {
+                    if (values[k]>acc) acc = values[k];
+                }
+                break;
+            case MB3D_PROJ_MIN:
+                for(k=0; k<cw; k++) {
+                    if (values[k]<acc) acc = values[k];
+                }
+                break;
+            case MB3D_PROJ_SUM:
+                for(k=0; k<cw; k++) {
+                    acc += values[k];
+                }
+                break;
+            default:
+                for(k=0; k<cw; k++) {
+                    acc += (values[k]!=0);
+                }
+                break;
+            }
+        }
+        pout64[i] = acc;
+    }
+
+    MB_free(values);
+    return MB_NO_ERR;
+}
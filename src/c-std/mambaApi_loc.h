@@ -141,6 +141,7 @@ typedef struct {
 /* Label handling */
 PIX32 MB_find_correct_label(MB_Label_struct *labels, PIX32 inlabel, PIX32 lblow, PIX32 lbhigh);
 PIX32 MB_find_above_label(MB_Label_struct *labels, PIX32 inlabel);
+void MB_join_labels(MB_Label_struct *labels, PIX32 label1, PIX32 label2);
 void MB_TidyLabel(PLINE *plines_out,
                   Uint32 bytes, Uint32 nb_lines,
                   PIX32 lblow, PIX32 lbhigh,
@@ -153,7 +154,15 @@ void MB3D_TidyLabel(MB3D_Image *dest,
 typedef void (LABELGRIDFUNC) (PLINE *plines_out, PLINE *plines_in,
                               Uint32 bytes_in, Uint32 nb_lines,
                               MB_Label_struct *labels);
+typedef Uint32 (LABELRUNSFUNC) (PLINE *plines_in, Uint32 bytes_in, Uint32 nb_lines);
+typedef void (LABELJOINFUNC) (PLINE *plines_out, PLINE *plines_in, Uint32 index,
+                              Uint32 bytes_in, enum MB_grid_t grid,
+                              MB_Label_struct *labels);
 
+/* Labelling by strips */
+MB_errcode MB_LabelStrips(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh,
+                          Uint32 *pNbobj, enum MB_grid_t grid,
+                          LABELGRIDFUNC *fn, LABELRUNSFUNC *runs, LABELJOINFUNC *join);
 
 /* Definitions for the hierarchical queues :
  * Each pixel is tagged with one of these values in the MSByte of the 
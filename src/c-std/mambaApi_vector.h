@@ -59,6 +59,9 @@
 #define MB_vec1_set(value) (value)
 #define MB_vec1_setzero 0
 
+/* Comparison */
+#define MB_vec1_differ(vec1, vec2) ((vec1)!=(vec2))
+
 /* Arithmetic operations */
 #define MB_vec1_and(vec1, vec2) ((vec1)&(vec2))
 #define MB_vec1_or(vec1, vec2) ((vec1)|(vec2))
@@ -105,6 +108,7 @@ typedef __m128i MB_Vector8;
 
 /* Comparison */
 #define MB_vec8_cmpeq(vec1, vec2) _mm_cmpeq_epi8(vec1,vec2)
+#define MB_vec8_differ(vec1, vec2) (_mm_movemask_epi8(_mm_cmpeq_epi8(vec1,vec2))!=0xFFFF)
 
 /* Arithmetic operations */
 #define MB_vec8_and(vec1, vec2) _mm_and_si128(vec1,vec2)
@@ -233,6 +233,21 @@ MB_ConMul(MB_Image *src, Uint32 value, MB_Image *dest);
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB_ConDiv(MB_Image *src, Uint32 value, MB_Image *dest);
+/**
+ * Computes the affine function (num*x+offset)/den of the pixels of an image
+ * in a single pass. The result is truncated or rounded to the nearest value
+ * and saturated between 0 and the maximum value of the destination image.
+ * \param src the source image (8-bit or 32-bit)
+ * \param dest the destination image (8-bit or 32-bit)
+ * \param num the numerator of the multiplier (absolute value below 2^30)
+ * \param offset the numerator of the offset (absolute value below 2^61)
+ * \param den the common denominator (between 1 and 2^30)
+ * \param nearest 0 to truncate the result, 1 to round it to the nearest value
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_ConAffine(MB_Image *src, MB_Image *dest, Sint64 num, Sint64 offset,
+             Uint32 den, Uint32 nearest);
 /**
  * Fills an image with a specific value.
  * \param dest the image
@@ -251,6 +266,53 @@ MB_ConSet(MB_Image *dest, Uint32 value);
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB_Volume(MB_Image *src, Uint64 *pVolume);
+/**
+ * Performs one step of a residual transformation. The residue (difference
+ * between the previous and the current primitives, or the current primitive
+ * itself if prev is NULL) updates the residues image where it is not null
+ * and greater or equal to it, and the associated function is set to size at
+ * these pixels. The volume of the current primitive is also computed.
+ * \param prev the previous primitive (can be NULL)
+ * \param cur the current primitive
+ * \param res the residues image
+ * \param func the associated function image (8-bit or 32-bit)
+ * \param size the size associated with the current primitive
+ * \param pVolume pointer to the volume of the current primitive
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_AccumulateResidue(MB_Image *prev, MB_Image *cur, MB_Image *res,
+                     MB_Image *func, Uint32 size, Uint64 *pVolume);
+/**
+ * Computes the regularised gradient of size n of the source image: the
+ * white top-hat of size n of the morphological gradient of size n, eroded by
+ * n-1 (elementary hexagon or square of the grid). The erosion and the
+ * dilation of the gradient are computed in a single sweep over the sizes.
+ * \param src source image
+ * \param dest destination image
+ * \param n the size of the regularised gradient
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_RegularisedGradient(MB_Image *src, MB_Image *dest, Uint32 n,
+                       enum MB_grid_t grid);
+/**
+ * Computes the full regularised gradient of the source image: the residual
+ * transform whose residues are the regularised gradients of sizes 1 to
+ * maxSize. The erosion and the dilation of size i are obtained from those of
+ * size i-1 and the residues are accumulated in place (see
+ * MB_AccumulateResidue).
+ * \param src source image
+ * \param res the residues image (same depth as src)
+ * \param func the associated function image (8-bit or 32-bit)
+ * \param maxSize the largest size
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_FullRegularisedGradient(MB_Image *src, MB_Image *res, MB_Image *func,
+                           Uint32 maxSize, enum MB_grid_t grid);
 /**
  * Verifies that the image is not empty (all pixels to 0).
  * \param src the source image 
@@ -269,6 +331,181 @@ MB_Check(MB_Image *src, Uint32 *isEmpty);
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB_Lookup(MB_Image *src, MB_Image *dest, Uint32 *ptab);
+/**
+ * Remaps the values of a 32-bit image using a dense table indexed by the
+ * pixel values. The result is put into a 32-bit, 8-bit (saturated values)
+ * or binary (non zero values) image.
+ * \param src the 32-bit source image
+ * \param dest the destination image
+ * \param plut the table giving the new value of each pixel value
+ * \param nb_lut the number of values in the table
+ * \param defval the value used for the pixel values outside the table
+ * \param keep if not zero, the pixel values outside the table are kept
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_Remap(MB_Image *src, MB_Image *dest, Uint32 *plut, Uint32 nb_lut,
+         Uint32 defval, Uint32 keep);
+/**
+ * Remaps the values of a 32-bit image using a sparse table given as keys
+ * (pixel values) and their associated values, looked up in a hash table.
+ * The result is put into a 32-bit, 8-bit (saturated values) or binary
+ * (non zero values) image.
+ * \param src the 32-bit source image
+ * \param dest the destination image
+ * \param pkeys the keys
+ * \param nb_keys the number of keys
+ * \param pmapped the values associated to the keys
+ * \param nb_mapped the number of values (must be equal to nb_keys)
+ * \param defval the value used for the pixel values which are not keys
+ * \param keep if not zero, the pixel values which are not keys are kept
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_RemapSparse(MB_Image *src, MB_Image *dest, Uint32 *pkeys, Uint32 nb_keys,
+               Uint32 *pmapped, Uint32 nb_mapped, Uint32 defval, Uint32 keep);
+/**
+ * Counts the runs (sequences of set pixels inside a line) of a binary image.
+ * \param src the binary source image
+ * \param pNbruns the number of runs
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_RunsCount(MB_Image *src, Uint32 *pNbruns);
+/**
+ * Extracts the runs of a binary image. Each run is stored as three values:
+ * its line, the position of its first pixel and the position following
+ * its last pixel.
+ * \param src the binary source image
+ * \param pout the buffer receiving the runs
+ * \param len_out the number of values the buffer can hold
+ * \param pNbruns the number of runs extracted
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_RunsExtract(MB_Image *src, Uint32 *pout, Uint32 len_out, Uint32 *pNbruns);
+/**
+ * Draws runs inside an image using the value of each run (or the maximum
+ * value of the image depth when no values are given).
+ * \param dest the destination image
+ * \param pruns the runs
+ * \param len_runs the number of values in the runs buffer
+ * \param pvals the values of the runs (one per run) or an empty buffer
+ * \param len_vals the number of values
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_RunsDraw(MB_Image *dest, Uint32 *pruns, Uint32 len_runs,
+            Uint32 *pvals, Uint32 len_vals);
+/**
+ * Computes the union, the intersection or the difference of two sets of runs.
+ * \param pruns the runs of the first set
+ * \param len_runs the number of values in the first buffer
+ * \param pruns2 the runs of the second set
+ * \param len_runs2 the number of values in the second buffer
+ * \param op the operation performed
+ * \param pout the buffer receiving the resulting runs
+ * \param len_out the number of values the output buffer can hold
+ * \param pNbruns the number of resulting runs
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_RunsLogic(Uint32 *pruns, Uint32 len_runs, Uint32 *pruns2, Uint32 len_runs2,
+             enum MB_runs_op_t op, Uint32 *pout, Uint32 len_out,
+             Uint32 *pNbruns);
+/**
+ * Computes the complement of a set of runs inside an image.
+ * \param pruns the runs
+ * \param len_runs the number of values in the runs buffer
+ * \param width the width of the image
+ * \param height the height of the image
+ * \param pout the buffer receiving the resulting runs
+ * \param len_out the number of values the output buffer can hold
+ * \param pNbruns the number of resulting runs
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_RunsNegate(Uint32 *pruns, Uint32 len_runs, Uint32 width, Uint32 height,
+              Uint32 *pout, Uint32 len_out, Uint32 *pNbruns);
+/**
+ * Translates a set of runs by a vector inside an image.
+ * \param pruns the runs
+ * \param len_runs the number of values in the runs buffer
+ * \param dx the horizontal displacement
+ * \param dy the vertical displacement
+ * \param width the width of the image
+ * \param height the height of the image
+ * \param pout the buffer receiving the resulting runs
+ * \param len_out the number of values the output buffer can hold
+ * \param pNbruns the number of resulting runs
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_RunsShift(Uint32 *pruns, Uint32 len_runs, Sint32 dx, Sint32 dy,
+             Uint32 width, Uint32 height,
+             Uint32 *pout, Uint32 len_out, Uint32 *pNbruns);
+/**
+ * Dilates a set of runs by the elementary hexagon or square of the grid
+ * (the pixels outside the image are considered empty).
+ * \param pruns the runs
+ * \param len_runs the number of values in the runs buffer
+ * \param width the width of the image
+ * \param height the height of the image
+ * \param grid the grid used (either square or hexagonal)
+ * \param pout the buffer receiving the resulting runs
+ * \param len_out the number of values the output buffer can hold
+ * \param pNbruns the number of resulting runs
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_RunsDilate(Uint32 *pruns, Uint32 len_runs, Uint32 width, Uint32 height,
+              enum MB_grid_t grid, Uint32 *pout, Uint32 len_out,
+              Uint32 *pNbruns);
+/**
+ * Labels the connected components of a set of runs (one label per run).
+ * \param pruns the runs
+ * \param len_runs the number of values in the runs buffer
+ * \param grid the grid used (either square or hexagonal)
+ * \param pout the buffer receiving the labels of the runs
+ * \param len_out the number of values the output buffer can hold
+ * \param pNbobj the number of connected components
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_RunsLabel(Uint32 *pruns, Uint32 len_runs, enum MB_grid_t grid,
+             Uint32 *pout, Uint32 len_out, Uint32 *pNbobj);
+/**
+ * Copies tiles of the same size from an image into another image of the same
+ * depth. The positions of the tiles are given as pairs (x, y) of signed values.
+ * \param src the source image
+ * \param dest the destination image
+ * \param psrcpos the positions of the tiles inside the source image
+ * \param len_srcpos the number of values in the source positions buffer
+ * \param pdestpos the positions of the tiles inside the destination image
+ * \param len_destpos the number of values in the destination positions buffer
+ * \param w the width of the tiles
+ * \param h the height of the tiles
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_TilesCopy(MB_Image *src, MB_Image *dest, Uint32 *psrcpos, Uint32 len_srcpos,
+             Uint32 *pdestpos, Uint32 len_destpos, Uint32 w, Uint32 h);
+/**
+ * Reduces each tile of an image to a single value (maximum, minimum, sum or
+ * number of non zero pixels).
+ * \param src the image
+ * \param ppos the positions of the tiles (pairs of signed values)
+ * \param len_pos the number of values in the positions buffer
+ * \param w the width of the tiles
+ * \param h the height of the tiles
+ * \param op the reduction (same as the 3D projections)
+ * \param pout64 the buffer receiving the value of each tile
+ * \param len_out64 the number of values the output buffer can hold
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_TilesReduce(MB_Image *src, Uint32 *ppos, Uint32 len_pos, Uint32 w, Uint32 h,
+               enum MB3D_projection_t op, Uint64 *pout64, Uint32 len_out64);
 /**
  * Computes the histogram of an image.
  * The histogram is an array with a minimal size of 256.
@@ -278,6 +515,91 @@ MB_Lookup(MB_Image *src, MB_Image *dest, Uint32 *ptab);
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB_Histo(MB_Image *src, Uint32 *phisto);
+/**
+ * Computes in a single pass the statistics of an image (number of pixels,
+ * minimum, maximum, sum and sum of squares of the values) restricted to
+ * the pixels set in a binary mask.
+ * \param src source image (8-bit or 32-bit)
+ * \param mask binary mask image (NULL to take all the pixels)
+ * \param pCount pointer to the number of pixels counted
+ * \param min pointer to the minimum value
+ * \param max pointer to the maximum value
+ * \param pSum pointer to the sum of the values
+ * \param pSumSqHi pointer to the high 64 bits of the sum of the squared values
+ * \param pSumSqLo pointer to the low 64 bits of the sum of the squared values
+ * \param phisto pointer to the histogram array (8-bit images only) or NULL
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_Stats(MB_Image *src, MB_Image *mask,
+         Uint64 *pCount, Uint32 *min, Uint32 *max,
+         Uint64 *pSum, Uint64 *pSumSqHi, Uint64 *pSumSqLo,
+         Uint32 *phisto);
+/**
+ * Draws lines inside the image. Pixels outside the image are ignored.
+ * \param dest the image
+ * \param pcoords the lines (x1,y1,x2,y2 for each line)
+ * \param nb_coords the number of values inside pcoords
+ * \param pvalues the lines values (a single value or one per line)
+ * \param nb_values the number of values inside pvalues
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_DrawLines(MB_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+             Uint32 *pvalues, Uint32 nb_values);
+/**
+ * Draws a polyline (successive points linked by lines) inside the image.
+ * Pixels outside the image are ignored.
+ * \param dest the image
+ * \param pcoords the points of the polyline (x0,y0,x1,y1,...)
+ * \param nb_coords the number of values inside pcoords
+ * \param value the pixels value
+ * \param closed 1 if the last point must be linked to the first one
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_DrawPolyline(MB_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+                Uint32 value, Uint32 closed);
+/**
+ * Draws a filled polygon inside the image. Pixels outside the image are
+ * ignored.
+ * \param dest the image
+ * \param pcoords the vertices of the polygon (x0,y0,x1,y1,...)
+ * \param nb_coords the number of values inside pcoords
+ * \param value the pixels value
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_DrawFillPolygon(MB_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+                   Uint32 value);
+/**
+ * Draws boxes (empty or filled rectangles) inside the image. Pixels outside
+ * the image are ignored.
+ * \param dest the image
+ * \param pcoords the opposite corners of the boxes (x1,y1,x2,y2 for each box)
+ * \param nb_coords the number of values inside pcoords
+ * \param pvalues the boxes values (a single value or one per box)
+ * \param nb_values the number of values inside pvalues
+ * \param filled 1 if the boxes must be filled
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_DrawBoxes(MB_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+             Uint32 *pvalues, Uint32 nb_values, Uint32 filled);
+/**
+ * Draws circles (empty or filled) inside the image. Pixels outside the
+ * image are ignored.
+ * \param dest the image
+ * \param pcoords the circles (x,y,radius for each circle)
+ * \param nb_coords the number of values inside pcoords
+ * \param pvalues the circles values (a single value or one per circle)
+ * \param nb_values the number of values inside pvalues
+ * \param filled 1 if the circles must be filled
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_DrawCircles(MB_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+               Uint32 *pvalues, Uint32 nb_values, Uint32 filled);
 /**
  * Performs a comparaison between a source image and a given base image.
  * \param src the source image 
@@ -365,6 +687,38 @@ MB_CopyBytePlane(MB_Image *src, MB_Image *dest, Uint32 plane);
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB_Label(MB_Image *src, MB_Image *dest, Uint32 lblow, Uint32 lbhigh, Uint32 *pNbobj, enum MB_grid_t grid);
+/**
+ * Extracts the minima of an image. With h greater than 1, the pixels whose
+ * value is lower than the minimum of their connected component plus h are
+ * also extracted (as a threshold of the difference between the dual
+ * reconstruction of src by src+h and src). The result is computed in a single
+ * pass with a union-find on the sorted pixels.
+ *
+ * \param src the source image (binary, 8-bit or 32-bit)
+ * \param dest the binary result or the 32-bit image where the minima are labelled
+ * \param h the height of the minima
+ * \param pNbobj the number of minima found
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_Minima(MB_Image *src, MB_Image *dest, Uint32 h, Uint32 *pNbobj, enum MB_grid_t grid);
+/**
+ * Extracts the maxima of an image. With h greater than 1, the pixels whose
+ * value is greater than the maximum of their connected component minus h are
+ * also extracted (as a threshold of the difference between src and its
+ * reconstruction by src-h). The result is computed in a single pass with a
+ * union-find on the sorted pixels.
+ *
+ * \param src the source image (binary, 8-bit or 32-bit)
+ * \param dest the binary result or the 32-bit image where the maxima are labelled
+ * \param h the height of the maxima
+ * \param pNbobj the number of maxima found
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_Maxima(MB_Image *src, MB_Image *dest, Uint32 h, Uint32 *pNbobj, enum MB_grid_t grid);
 /**
  * Computes for each pixel the distance to the edge of the set in which the
  * pixel is found.
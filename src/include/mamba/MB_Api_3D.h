@@ -135,6 +135,78 @@ MB3D_Label(MB3D_Image *src, MB3D_Image *dest,
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB3D_Distanceb(MB3D_Image *src, MB3D_Image *dest, enum MB3D_grid_t grid, enum MB_edgemode_t edge);
+/**
+ * Draws lines inside the 3D image. Pixels outside the image are ignored.
+ * \param dest the 3D image
+ * \param pcoords the lines (x1,y1,z1,x2,y2,z2 for each line)
+ * \param nb_coords the number of values inside pcoords
+ * \param pvalues the lines values (a single value or one per line)
+ * \param nb_values the number of values inside pvalues
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_DrawLines(MB3D_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+               Uint32 *pvalues, Uint32 nb_values);
+/**
+ * Draws filled cubes inside the 3D image. Pixels outside the image are
+ * ignored.
+ * \param dest the 3D image
+ * \param pcoords the opposite corners of the cubes (x1,y1,z1,x2,y2,z2 for each cube)
+ * \param nb_coords the number of values inside pcoords
+ * \param pvalues the cubes values (a single value or one per cube)
+ * \param nb_values the number of values inside pvalues
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_DrawCubes(MB3D_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+               Uint32 *pvalues, Uint32 nb_values);
+/**
+ * Extracts an orthogonal slice of a 3D image into a 2D image (written in its
+ * upper left corner). The slice size is (length,height) for axis 0 (X),
+ * (width,length) for axis 1 (Y) and (width,height) for axis 2 (Z).
+ * \param src the 3D source image
+ * \param axis the axis orthogonal to the slice (0 for X, 1 for Y, 2 for Z)
+ * \param index the position of the slice along the axis
+ * \param dest the 2D destination image (same depth or 8-bit)
+ * \param plane the byte plane extracted when converting 32-bit values into
+ * 8-bit values (0 to 3) or 4 to downscale the values using maxval
+ * \param maxval the maximum value used to downscale 32-bit values
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_ExtractSlice(MB3D_Image *src, Uint32 axis, Uint32 index,
+                  MB_Image *dest, Uint32 plane, Uint32 maxval);
+/**
+ * Projects a 3D image along an axis into a 2D image (written in its upper
+ * left corner) by reducing the values met along the axis. The projection
+ * size is (length,height) for axis 0 (X), (width,length) for axis 1 (Y)
+ * and (width,height) for axis 2 (Z).
+ * \param src the 3D source image
+ * \param axis the projection axis (0 for X, 1 for Y, 2 for Z)
+ * \param op the reduction (maximum, minimum, sum or count of non-zero values)
+ * \param dest the 2D destination image (same depth for maximum and minimum,
+ * 32-bit for sum and count)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Project(MB3D_Image *src, Uint32 axis, enum MB3D_projection_t op, MB_Image *dest);
+/**
+ * Computes the volume (sum of all the pixel values) of a 3D image.
+ * \param src the 3D image
+ * \param pVolume the computed volume
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Volume(MB3D_Image *src, Uint64 *pVolume);
+/**
+ * Computes the range (minimum and maximum pixel values) of a 3D image.
+ * \param src the 3D image
+ * \param min the minimum value
+ * \param max the maximum value
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB3D_Range(MB3D_Image *src, Uint32 *min, Uint32 *max);
 
 #ifdef __cplusplus
 }
@@ -84,6 +84,27 @@ MB_HierarDualBld(MB_Image *mask, MB_Image *srcdest, enum MB_grid_t grid);
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB_Watershed(MB_Image *src, MB_Image *marker, Uint32 max_level, enum MB_grid_t grid);
+/**
+ * Performs a watershed segmentation of the image using the labelled marker
+ * image and splits, in the same call, the result into the labels of the
+ * catchment basins and the watershed line.
+ *
+ * The 32-bit marker image receives the labels only (the isLine byte of
+ * MB_Watershed is reset). A binary line image receives the watershed line.
+ * A line image of the same depth as the segmented image receives the valued
+ * watershed (the pixels of the line keep their value in the segmented image,
+ * the others are set to 0).
+ *
+ * \param src the greyscale or 32-bit image to segment
+ * \param marker the labelled marker image in which the labels will be put
+ * \param line the watershed line image (binary or same depth as src) or NULL
+ * \param max_level the maximum level reach by the water
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_MarkerWatershed(MB_Image *src, MB_Image *marker, MB_Image *line,
+                   Uint32 max_level, enum MB_grid_t grid);
 /**
  * Performs a watershed segmentation of the image using the marker image
  * as a starting point for the flooding. The function returns the catchment 
@@ -48,11 +48,16 @@ extern "C" {
  * \param neighbors the neighbors to take into account
  * \param grid the grid used (either square or hexagonal)
  * \param edge the kind of edge to use (behavior for pixel near edge depends on it)
+ * \param pFirst first line of srcdest modified by the operation (can be
+ * NULL)
+ * \param pLast last line of srcdest modified by the operation (pFirst is
+ * greater than pLast when srcdest is unchanged, can be NULL). The range of
+ * modified lines is only returned when both pointers are given.
  *
  * \return An error code (NO_ERR if successful)
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
-MB_InfNb(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge);
+MB_InfNb(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge, Uint32 *pFirst, Uint32 *pLast);
 /**
  * Looks for the minimum between two image pixels (a central pixel and its 
  * far neighbor in the other image)
@@ -83,11 +88,16 @@ MB_InfFarNb(MB_Image *src, MB_Image *srcdest, Uint32 nbrnum, Uint32 count, enum
  * \param neighbors the neighbors to take into account
  * \param grid the grid used (either square or hexagonal)
  * \param edge the kind of edge to use (behavior for pixel near edge depends on it)
+ * \param pFirst first line of srcdest modified by the operation (can be
+ * NULL)
+ * \param pLast last line of srcdest modified by the operation (pFirst is
+ * greater than pLast when srcdest is unchanged, can be NULL). The range of
+ * modified lines is only returned when both pointers are given.
  *
  * \return An error code (NO_ERR if successful)
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
-MB_SupNb(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge);
+MB_SupNb(MB_Image *src, MB_Image *srcdest, Uint32 neighbors, enum MB_grid_t grid, enum MB_edgemode_t edge, Uint32 *pFirst, Uint32 *pLast);
 /**
  * Looks for the maximum between two image pixels (a central pixel and its 
  * far neighbor in the other image)
@@ -235,6 +245,153 @@ MB_SupVector(MB_Image *src, MB_Image *srcdest, Sint32 dx, Sint32 dy, enum MB_edg
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB_BinHitOrMiss(MB_Image *src, MB_Image *dest, Uint32 es0, Uint32 es1, enum MB_grid_t grid, enum MB_edgemode_t edge);
+/**
+ * Performs a sequence of thinnings of a binary image. Each step of the
+ * sequence removes the pixels matching the hit-or-miss pattern given by a
+ * pair of structuring elements (coded as in MB_BinHitOrMiss). The sequence
+ * is repeated nb_cycles times or until idempotence when nb_cycles is 0.
+ * Only the pixels whose neighborhood changed since the previous
+ * application of a step are examined again.
+ *
+ * \param srcdest the binary image
+ * \param pses the structuring elements (es0 and es1 for each step)
+ * \param nb_ses the number of values inside pses
+ * \param nb_cycles the number of times the sequence is applied (0 until idempotence)
+ * \param grid grid configuration
+ * \param edge the kind of edge to use
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_BinThinSequence(MB_Image *srcdest, Uint32 *pses, Uint32 nb_ses, Uint32 nb_cycles, enum MB_grid_t grid, enum MB_edgemode_t edge);
+/**
+ * Performs a sequence of thickenings of a binary image. Each step of the
+ * sequence adds the pixels matching the hit-or-miss pattern given by a
+ * pair of structuring elements (coded as in MB_BinHitOrMiss). The sequence
+ * is repeated nb_cycles times or until idempotence when nb_cycles is 0.
+ * Only the pixels whose neighborhood changed since the previous
+ * application of a step are examined again.
+ *
+ * \param srcdest the binary image
+ * \param pses the structuring elements (es0 and es1 for each step)
+ * \param nb_ses the number of values inside pses
+ * \param nb_cycles the number of times the sequence is applied (0 until idempotence)
+ * \param grid grid configuration
+ * \param edge the kind of edge to use
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_BinThickSequence(MB_Image *srcdest, Uint32 *pses, Uint32 nb_ses, Uint32 nb_cycles, enum MB_grid_t grid, enum MB_edgemode_t edge);
+/**
+ * Computes, for each pixel of a binary image, the configuration code of its
+ * neighbors (sum of 2^(d-1) for each direction d where the neighbor is true)
+ * and maps it through a lookup table. With a table of 64 (hexagonal grid) or
+ * 256 (square grid) values, the table is used for the pixels set to true and
+ * the other pixels are set to 0. With a table of 128 or 512 values, the center
+ * pixel adds 64 or 256 to the code. A binary destination is set to true where
+ * the table value is not 0.
+ *
+ * \param src the binary source image
+ * \param dest the destination image (binary, 8-bit or 32-bit, must be different of src)
+ * \param ptable the lookup table
+ * \param nb_values the number of values inside ptable
+ * \param grid grid configuration
+ * \param edge the kind of edge to use
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_BinNeighborLookup(MB_Image *src, MB_Image *dest, Uint32 *ptable, Uint32 nb_values, enum MB_grid_t grid, enum MB_edgemode_t edge);
+/**
+ * Computes the supremum of the openings by segments of the grid directions.
+ * Each segment is given as a pair (direction, size); an opening of size n in
+ * direction d is an erosion by n steps in direction d followed by a dilation
+ * by n steps in the opposite direction. The lines of pixels along each
+ * direction are filtered with a constant cost per pixel whatever the size.
+ *
+ * \param src source image
+ * \param dest destination image
+ * \param psegs the segments (pairs direction, size)
+ * \param len_segs the number of values inside psegs
+ * \param grid the grid used (either square or hexagonal)
+ * \param edge the kind of edge used by the erosions (the dilations use an empty edge)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_SupLinearOpen(MB_Image *src, MB_Image *dest, Uint32 *psegs, Uint32 len_segs, enum MB_grid_t grid, enum MB_edgemode_t edge);
+/**
+ * Computes the infimum of the closings by segments of the grid directions
+ * (dual of MB_SupLinearOpen). With an empty edge, the closings are made
+ * extensive by taking their supremum with the source image.
+ *
+ * \param src source image
+ * \param dest destination image
+ * \param psegs the segments (pairs direction, size)
+ * \param len_segs the number of values inside psegs
+ * \param grid the grid used (either square or hexagonal)
+ * \param edge the kind of edge used by the erosions (the dilations use an empty edge)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_InfLinearClose(MB_Image *src, MB_Image *dest, Uint32 *psegs, Uint32 len_segs, enum MB_grid_t grid, enum MB_edgemode_t edge);
+/**
+ * Geodesic reconstruction of the cells of a partition (connected sets of
+ * pixels with the same value) by markers: each cell takes the maximum value
+ * of the markers inside it. Each cell is flooded once.
+ *
+ * \param src the partition image (8-bit or 32-bit)
+ * \param srcdest the markers image, receiving the result (same depth)
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_CellsBuild(MB_Image *src, MB_Image *srcdest, enum MB_grid_t grid);
+/**
+ * Graph dilation of a partition: the cells are the nodes of a graph linking
+ * the adjacent cells and, at each of the n steps, each cell takes the
+ * maximum of its value and of the values of its adjacent cells. The graph
+ * is extracted from the image in a single scan.
+ *
+ * \param src the partition image (8-bit or 32-bit)
+ * \param dest the resulting partition image (same depth)
+ * \param n the size of the dilation
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_PartitionDilate(MB_Image *src, MB_Image *dest, Uint32 n, enum MB_grid_t grid);
+/**
+ * Graph erosion of a partition (dual of MB_PartitionDilate, the cells take
+ * the minimum of the values).
+ *
+ * \param src the partition image (8-bit or 32-bit)
+ * \param dest the resulting partition image (same depth)
+ * \param n the size of the erosion
+ * \param grid the grid used (either square or hexagonal)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_PartitionErode(MB_Image *src, MB_Image *dest, Uint32 n, enum MB_grid_t grid);
+/**
+ * Extracts the region adjacency graph of a label image in a single scan.
+ * Each edge links two labels whose pixels are neighbors and gives the
+ * length of their boundary (number of pairs of neighbor pixels) and the
+ * minimum, maximum and sum of the relief along this boundary (the relief
+ * of a pair being the maximum of the relief values of its pixels). The
+ * edges are sorted by labels and written as five values in pout (smaller
+ * label, greater label, length, minimum, maximum) and the sums in pout64.
+ * Only the edges fitting in the buffers are written.
+ *
+ * \param label the label image (32-bit)
+ * \param relief the relief image (8-bit or 32-bit, can be NULL)
+ * \param grid the grid used (either square or hexagonal)
+ * \param pout the buffer receiving the edges
+ * \param len_out the size of pout
+ * \param pout64 the buffer receiving the sums of the relief
+ * \param len_out64 the size of pout64
+ * \param pNbedges the number of edges of the graph
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_RegionGraph(MB_Image *label, MB_Image *relief, enum MB_grid_t grid, Uint32 *pout, Uint32 len_out, Uint64 *pout64, Uint32 len_out64, Uint32 *pNbedges);
 
 #ifdef __cplusplus
 }
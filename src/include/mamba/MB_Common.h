@@ -162,6 +162,28 @@ enum MB3D_grid_t {
     MB3D_FCC_GRID = 1025
 };
 
+/** Possible reductions for 3D projections: */
+enum MB3D_projection_t {
+    /** Maximum of the values */
+    MB3D_PROJ_MAX = 0,
+    /** Minimum of the values */
+    MB3D_PROJ_MIN = 1,
+    /** Sum of the values */
+    MB3D_PROJ_SUM = 2,
+    /** Number of non-zero values */
+    MB3D_PROJ_COUNT = 3
+};
+
+/** Possible set operations on runs: */
+enum MB_runs_op_t {
+    /** Union of the runs */
+    MB_RUNS_UNION = 0,
+    /** Intersection of the runs */
+    MB_RUNS_INTERSECTION = 1,
+    /** Runs of the first set minus the runs of the second */
+    MB_RUNS_DIFFERENCE = 2
+};
+
 /** Neighbors encoding: */
 enum MB_Neighbors_code_t {
     MB_NEIGHBOR_0 = 0x0001,
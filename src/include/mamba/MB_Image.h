@@ -148,6 +148,29 @@ MB_PutPixel(MB_Image *dest, Uint32 pixVal, Uint32 x, Uint32 y);
  */
 extern MB_API_ENTRY MB_errcode MB_API_CALL
 MB_GetPixel(MB_Image *src, Uint32 *pixVal, Uint32 x, Uint32 y);
+/**
+ * Puts the pixels values inside the image at the given positions. No pixel
+ * is modified if one of the positions is outside the image.
+ * \param dest the image
+ * \param pcoords the positions of the pixels (x0,y0,x1,y1,...)
+ * \param nb_coords the number of values inside pcoords
+ * \param pvalues the pixels values (a single value or one per pixel)
+ * \param nb_values the number of values inside pvalues
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_PutPixels(MB_Image *dest, Sint32 *pcoords, Uint32 nb_coords,
+             Uint32 *pvalues, Uint32 nb_values);
+/**
+ * Gets the pixels values inside the image at the given positions.
+ * \param src the image
+ * \param ppoints the positions of the pixels (x0,y0,x1,y1,...)
+ * \param nb_points the number of values inside ppoints
+ * \param ppixels the returned pixels values (nb_points/2 values)
+ * \return An error code (NO_ERR if successful)
+ */
+extern MB_API_ENTRY MB_errcode MB_API_CALL
+MB_GetPixels(MB_Image *src, Sint32 *ppoints, Uint32 nb_points, Uint32 *ppixels);
 
 /**
  * Creates a 3D image container. 3D images are just a list of 2D images
@@ -29,4 +29,7 @@ from .hierarchies import *
 from .partitions import *
 from .extrema import *
 from .labellings import *
+from .rle import *
+from .batch import *
+from .adjacency import *
 
@@ -0,0 +1,109 @@
+"""
+Region adjacency graphs.
+
+This module extracts the region adjacency graph of a label image (the
+output of label, of a partition operator or of watershedSegment) in a
+single scan of the image. The regions are the sets of pixels sharing the
+same label and two regions are linked by an edge when some of their pixels
+are neighbors. Each edge carries the length of the boundary between the two
+regions and the minimum, maximum and mean value of a relief image (a
+gradient for instance) along this boundary, which is what hierarchical
+segmentation and region merging algorithms need.
+"""
+
+import array
+import mamba
+import mamba.core as core
+import mamba.utils as utils
+
+class regionGraphMb:
+    """
+    Defines the region adjacency graph of a label image.
+
+    The edges are sorted by labels and stored in arrays with one entry per
+    edge: 'sources' and 'targets' hold the labels of the two regions (the
+    smaller one first), 'lengths' the number of pairs of neighbor pixels
+    linking them, 'minima', 'maxima' and 'means' the minimum, maximum and
+    mean value of the relief along their boundary (the relief of a pair of
+    pixels being the maximum of their values).
+    """
+
+    def __init__(self):
+        """
+        Constructor for an empty region adjacency graph.
+        """
+        self.sources = array.array('I')
+        self.targets = array.array('I')
+        self.lengths = array.array('I')
+        self.minima = array.array('I')
+        self.maxima = array.array('I')
+        self.means = array.array('d')
+
+    def __repr__(self):
+        return "regionGraphMb with %d edges" % (self.getEdgeCount())
+
+    def __len__(self):
+        return len(self.sources)
+
+    def getEdgeCount(self):
+        """
+        Returns the number of edges of the graph.
+        """
+        return len(self.sources)
+
+    def getEdges(self):
+        """
+        Returns the edges of the graph as a list of tuples (source, target,
+        length, minimum, maximum, mean).
+        """
+        return list(zip(self.sources, self.targets, self.lengths,
+                        self.minima, self.maxima, self.means))
+
+    def _store(self, edges, sums, nb):
+        # Stores the 'nb' first edges of buffers 'edges' and 'sums'
+        self.sources = edges[0:5*nb:5]
+        self.targets = edges[1:5*nb:5]
+        self.lengths = edges[2:5*nb:5]
+        self.minima = edges[3:5*nb:5]
+        self.maxima = edges[4:5*nb:5]
+        self.means = array.array('d', [float(sums[i])/self.lengths[i]
+                                       for i in range(nb)])
+
+def regionGraph(imLabel, imRelief=None, grid=mamba.DEFAULT_GRID,
+                watershed=False):
+    """
+    Extracts the region adjacency graph of the 32-bit label image 'imLabel'
+    and returns it as a regionGraphMb. Every label (0 included) defines a
+    region.
+
+    The relief along the boundaries is read in the greyscale or 32-bit image
+    'imRelief' (same size as 'imLabel'). When 'imRelief' is None, the
+    minima, maxima and means of the edges are 0.
+
+    When 'watershed' is True, 'imLabel' is the result of watershedSegment
+    and its last byte plane (the watershed line) is ignored.
+
+    The graph is computed according to the 'grid' (HEXAGONAL is 6-Neighbors
+    and SQUARE is 8-Neighbors).
+    """
+    if watershed:
+        imWrk = mamba.imageMb(imLabel)
+        imZero = mamba.imageMb(imLabel, 8)
+        mamba.copy(imLabel, imWrk)
+        imZero.reset()
+        mamba.copyBytePlane(imZero, 3, imWrk)
+        imLabel = imWrk
+    mbRelief = None if imRelief is None else imRelief.mbIm
+    nb = 256
+    while True:
+        edges = array.array('I', [0])*(5*nb)
+        sums = utils.createBuffer64(nb)
+        err, count = core.MB_RegionGraph(imLabel.mbIm, mbRelief, grid.id,
+                                         edges, sums)
+        mamba.raiseExceptionOnError(err)
+        if count<=nb:
+            break
+        nb = count
+    graph = regionGraphMb()
+    graph._store(edges, sums, count)
+    return graph
@@ -86,7 +86,7 @@ def div(imIn1, imIn2, imOut):
 
     Greyscale or 32-bit images can be used. You can mix formats in the divide operation.
     However you must ensure that the output image is as deep as 'imIn1'.
-    
+    
     In order to avoid errors due to divisions by zero, each time a pixel in 'imIn2' is equal
     to zero, the result is set to the maximum value corresponding to the depth of the image. 
     """
@@ -286,27 +286,33 @@ def mulRealConst(imIn, v, imOut, nearest=False, precision=2):
     If not (default), the result is simply truncated.
     """
     
-    if imIn.getDepth()==1 or imOut.getDepth()==1:
-        mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
-    imWrk1 = mamba.imageMb(imIn, 32)
-    imWrk2 = mamba.imageMb(imIn, 1)
     precVal = (10 ** precision)
     v1 = int(v * precVal)
-    if imIn.getDepth()==8:
-        imWrk1.reset()
-        mamba.copyBytePlane(imIn, 0, imWrk1)
-    else:
-        mamba.copy(imIn, imWrk1)
-    mulConst(imWrk1, v1, imWrk1)
-    if nearest:
-        adjVal = int(5 * (10 ** (precision - 1)))
-        addConst(imWrk1, adjVal , imWrk1)
-    divConst(imWrk1, precVal, imWrk1)
-    if imOut.getDepth()==8:
-        mamba.threshold(imWrk1, imWrk2, 255, mamba.computeMaxRange(imWrk1)[1])
-        mamba.copyBytePlane(imWrk1, 0, imOut)
-        imWrk2.convert(8)
-        mamba.logic(imOut, imWrk2, imOut, "sup")
-    else:
-        mamba.copy(imWrk1, imOut)
+    err = core.MB_ConAffine(imIn.mbIm, imOut.mbIm, v1, 0, precVal, int(nearest))
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+
+def affineConst(imIn, a, b, imOut, nearest=False, precision=2):
+    """
+    Computes the affine function of 'imIn' pixel values with the real
+    constants 'a' and 'b' and puts the result in 'imOut'. The operation can
+    be sum up in the following formula:
+    
+    imOut = a * imIn + b
+    
+    'imIn' and 'imOut' can be 8-bit or 32-bit images. The result is saturated
+    (limited to 0 and to the maximum value of 'imOut'). 'precision' indicates
+    the number of decimal digits taken into account for the constants 'a' and
+    'b' (default is 2). If 'nearest' is true, the result is rounded to the
+    nearest integer value. If not (default), the result is truncated.
+    
+    This function can be used to stretch the contrast of an image or to
+    normalize its values in a single pass.
+    """
+    
+    precVal = (10 ** precision)
+    err = core.MB_ConAffine(imIn.mbIm, imOut.mbIm, int(round(a * precVal)),
+                            int(round(b * precVal)), precVal, int(nearest))
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
 
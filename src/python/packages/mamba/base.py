@@ -101,6 +101,10 @@ class imageMb:
         # Properties
         self.displayId = ''
         self.gd = None
+        # Write version and measures cached for this version
+        self.cacheable = True
+        self._version = 0
+        self._cache = {}
             
         # We analyze the arguments given to the constructor
         if len(args)==0:
@@ -201,6 +205,7 @@ class imageMb:
         next_mbIm = utils.load(path, size=(self.mbIm.width,self.mbIm.height), rgb2l=rgbfilter)
         err = core.MB_Convert(next_mbIm, self.mbIm)
         raiseExceptionOnError(err)
+        self._written()
         self.setName(os.path.split(path)[1])
         
     def save(self, path, palette=None):
@@ -252,8 +257,7 @@ class imageMb:
         # Loading the data
         err = core.MB_Load(self.mbIm,data,len(data))
         raiseExceptionOnError(err)
-        if self.displayId != '':
-            self.gd.updateWindow(self.displayId)
+        self.update()
         
     def extractRaw(self):
         """
@@ -292,15 +296,48 @@ class imageMb:
 
         del self.mbIm
         self.mbIm = next_mbIm
-        if self.displayId != '':
-            self.gd.updateWindow(self.displayId)
+        self.update()
+        
+    ### Write version and cached measures ######################################
+    def _written(self):
+        # The image content has changed: the cached measures are obsolete
+        self._version = self._version + 1
+        self._cache = {}
+        
+    def getVersion(self):
+        """
+        Returns the write version of the image, i.e. the number of times it
+        has been modified. Every operator writing in the image increments it
+        (through the update method).
+        """
+        return self._version
+        
+    def getCachedMeasure(self, key, computeFunc):
+        """
+        Returns the measure 'key' of the image (volume, range, ...). The
+        measure is computed by calling 'computeFunc' the first time and kept
+        until the image is modified, so that repeated queries between two
+        writes cost nothing.
+        
+        Caching is disabled when attribute 'cacheable' is False (images
+        written without calling update, like the slices of a 3D image).
+        """
+        if not self.cacheable:
+            return computeFunc()
+        if key not in self._cache:
+            self._cache[key] = computeFunc()
+        return self._cache[key]
         
     ### Display methods ########################################################
     def update(self):
         """
-        Called when the display associated to the image must be updated 
-        (the image has changed).
+        Called when the image has changed. The write version of the image is
+        incremented (see getVersion) and the associated display is updated.
+        
+        If you modify the image directly through the core functions, call
+        this method afterwards.
         """
+        self._written()
         if self.displayId != '':
             self.gd.updateWindow(self.displayId)
             
@@ -365,6 +402,7 @@ class imageMb:
         """
         err = core.MB_PutPixel(self.mbIm, value, position[0], position[1])
         raiseExceptionOnError(err)
+        self._written()
         
     def getPixel(self, position):
         """
@@ -376,3 +414,34 @@ class imageMb:
         raiseExceptionOnError(err)
         return value
 
+    def setPixels(self, xs, ys, values):
+        """
+        Sets the pixels at positions given by the sequences 'xs' and 'ys' 
+        (x and y coordinates) with 'values'. 'values' can be a single value
+        used for all the pixels or a sequence holding a value for each pixel.
+        
+        If one of the positions is outside the image, an exception is raised
+        and no pixel is modified.
+        """
+        if len(xs)!=len(ys):
+            raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+        coords = [c for position in zip(xs, ys) for c in position]
+        if not hasattr(values, '__len__'):
+            values = [values]
+        err = core.MB_PutPixels(self.mbIm, coords, list(values))
+        raiseExceptionOnError(err)
+        self.update()
+        
+    def getPixels(self, xs, ys):
+        """
+        Gets the values of the pixels at positions given by the sequences 'xs'
+        and 'ys' (x and y coordinates).
+        Returns a list holding the value of each pixel.
+        """
+        if len(xs)!=len(ys):
+            raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+        coords = [c for position in zip(xs, ys) for c in position]
+        err, values = core.MB_GetPixels(self.mbIm, coords)
+        raiseExceptionOnError(err)
+        return values
+
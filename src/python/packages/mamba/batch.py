@@ -0,0 +1,198 @@
+"""
+Batches of small images.
+
+This module defines a container packing many small images (patches) of the
+same size inside a single Mamba image, separated by guard bands. Any
+operator applied to the packed image processes all the patches in one call,
+which avoids the cost of handling each small image separately (and the
+rounding of the image width to a multiple of 64 for each of them). The
+measures of each patch are computed in one call and returned as arrays.
+
+The guard bands isolate the patches: when they are filled with the edge
+value of an operator (see setGuards), an operator whose extent does not
+exceed the guard width gives on each patch the result it would give on the
+patch alone. The patches are placed on even lines so that the hexagonal
+grid is the same for all of them.
+"""
+
+import array
+import math
+import mamba
+import mamba.core as core
+import mamba.utils as utils
+
+def _positions(positions):
+    # Converts a sequence of (x,y) tuples into a buffer of signed integers
+    pos = array.array('i')
+    for p in positions:
+        pos.extend((p[0], p[1]))
+    return pos
+
+class patchBatchMb:
+    """
+    Defines a batch of patches of the same size and depth packed inside a
+    single image, available in attribute 'image'.
+    """
+
+    def __init__(self, *args):
+        """
+        Constructor for a batch of patches (initially empty).
+
+        The constructor accepts the following arguments:
+            * patchBatchMb(nb, width, height): will create a batch of 'nb'
+              greyscale patches of size 'width'x'height'.
+            * patchBatchMb(nb, width, height, depth): same with the
+              specified 'depth'.
+            * patchBatchMb(nb, width, height, depth, guard): same with guard
+              bands of width 'guard' (1 by default).
+            * patchBatchMb(batch): will create a batch with the same layout
+              and depth as 'batch'.
+            * patchBatchMb(batch, depth): will create a batch with the same
+              layout as 'batch' and the specified 'depth'.
+        """
+        if isinstance(args[0], patchBatchMb):
+            batch = args[0]
+            self.nb = batch.nb
+            self.width, self.height = batch.width, batch.height
+            self.guard = batch.guard
+            self.slots = batch.slots
+            if len(args)>1:
+                depth = args[1]
+            else:
+                depth = batch.getDepth()
+            self.image = mamba.imageMb(batch.image, depth)
+        else:
+            self.nb, self.width, self.height = args[0], args[1], args[2]
+            depth = args[3] if len(args)>3 else 8
+            self.guard = args[4] if len(args)>4 else 1
+            # Patches are placed on a grid with guard bands around them,
+            # their first line being even
+            columns = max(1, int(math.ceil(math.sqrt(self.nb))))
+            rows = max(1, (self.nb+columns-1)//columns)
+            pitchX = self.width + self.guard
+            pitchY = self.height + self.guard
+            pitchY = pitchY + (pitchY%2)
+            firstY = self.guard + (self.guard%2)
+            self.slots = array.array('i')
+            for i in range(self.nb):
+                self.slots.extend((self.guard + (i%columns)*pitchX,
+                                   firstY + (i//columns)*pitchY))
+            self.image = mamba.imageMb(self.guard + columns*pitchX,
+                                       firstY + rows*pitchY, depth)
+        self._work = None
+
+    def __len__(self):
+        return self.nb
+
+    def getPatchSize(self):
+        """
+        Returns the size (a tuple width and height) of the patches.
+        """
+        return (self.width, self.height)
+
+    def getDepth(self):
+        """
+        Returns the depth of the patches.
+        """
+        return self.image.getDepth()
+
+    def getPosition(self, i):
+        """
+        Returns the position (tuple x,y) of patch 'i' inside the packed image.
+        """
+        return (self.slots[2*i], self.slots[2*i+1])
+
+    def load(self, imIn, positions):
+        """
+        Fills the batch with the patches of 'imIn' located at 'positions'
+        (a sequence of tuples x,y giving the upper left corner of each patch,
+        possibly outside 'imIn'). The guard bands and the parts of the
+        patches outside 'imIn' are set to 0.
+        """
+        pos = _positions(positions)
+        if len(pos)!=len(self.slots):
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+        self.image.reset()
+        err = core.MB_TilesCopy(imIn.mbIm, self.image.mbIm, pos, self.slots,
+                                self.width, self.height)
+        mamba.raiseExceptionOnError(err)
+        self.image.update()
+
+    def store(self, imOut, positions):
+        """
+        Copies the patches of the batch inside 'imOut' at 'positions' (see
+        load). The parts of the patches outside 'imOut' are lost.
+        """
+        pos = _positions(positions)
+        if len(pos)!=len(self.slots):
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+        err = core.MB_TilesCopy(self.image.mbIm, imOut.mbIm, self.slots, pos,
+                                self.width, self.height)
+        mamba.raiseExceptionOnError(err)
+        imOut.update()
+
+    def getPatch(self, i, imOut):
+        """
+        Copies patch 'i' in the upper left corner of 'imOut'.
+        """
+        err = core.MB_TilesCopy(self.image.mbIm, imOut.mbIm,
+                                self.slots[2*i:2*i+2], array.array('i', [0,0]),
+                                self.width, self.height)
+        mamba.raiseExceptionOnError(err)
+        imOut.update()
+
+    def setPatch(self, i, imIn):
+        """
+        Replaces patch 'i' by the upper left corner of 'imIn'.
+        """
+        err = core.MB_TilesCopy(imIn.mbIm, self.image.mbIm,
+                                array.array('i', [0,0]), self.slots[2*i:2*i+2],
+                                self.width, self.height)
+        mamba.raiseExceptionOnError(err)
+        self.image.update()
+
+    def setGuards(self, edge):
+        """
+        Fills the guard bands with the value corresponding to 'edge' (0 for
+        EMPTY, the maximum value of the depth for FILLED). Call this method
+        before an operator using this edge value.
+        """
+        if self._work is None:
+            self._work = mamba.imageMb(self.image)
+        if edge==mamba.FILLED:
+            self._work.fill(mamba.computeMaxRange(self.image)[1])
+        else:
+            self._work.reset()
+        err = core.MB_TilesCopy(self.image.mbIm, self._work.mbIm, self.slots,
+                                self.slots, self.width, self.height)
+        mamba.raiseExceptionOnError(err)
+        mamba.copy(self._work, self.image)
+
+    def _reduce(self, op):
+        # Reduces each patch to a single value
+        values = utils.createBuffer64(self.nb)
+        err = core.MB_TilesReduce(self.image.mbIm, self.slots, self.width,
+                                  self.height, op, values)
+        mamba.raiseExceptionOnError(err)
+        return values
+
+    def computeVolume(self):
+        """
+        Returns an array with the volume (sum of the pixel values) of each
+        patch.
+        """
+        return self._reduce(core.MB3D_PROJ_SUM)
+
+    def computeArea(self):
+        """
+        Returns an array with the number of non zero pixels of each patch.
+        """
+        return self._reduce(core.MB3D_PROJ_COUNT)
+
+    def computeRange(self):
+        """
+        Returns two arrays with the minimum and the maximum pixel values of
+        each patch.
+        """
+        return (self._reduce(core.MB3D_PROJ_MIN),
+                self._reduce(core.MB3D_PROJ_MAX))
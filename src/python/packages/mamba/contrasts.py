@@ -6,6 +6,7 @@ operators such as gradient, top-hat transform, ....
 """
 
 import mamba
+import mamba.core as core
 
 # Contributors: Serge BEUCHER, Nicolas BEUCHER
 
@@ -101,9 +102,7 @@ def regularisedGradient(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     This operation is only valid for omnidirectional structuring elements.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    gradient(imIn, imWrk, n, se=se)
-    whiteTopHat(imWrk, imWrk, n, se=se)
-    mamba.erode(imWrk, imOut, n-1, se=se)
+    err = core.MB_RegularisedGradient(imIn.mbIm, imOut.mbIm, n, grid.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
     
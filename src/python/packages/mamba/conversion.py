@@ -5,6 +5,7 @@ This module regroups various functions/operators to perform conversions
 based on image depth. It allows to transfer data from an image depth to another.
 """
 
+import array
 import mamba
 import mamba.core as core
 
@@ -80,3 +81,67 @@ def lookup(imIn, imOut, lutable):
     mamba.raiseExceptionOnError(err)
     imOut.update()
 
+def _remapDefault(default):
+    # Returns the default value and the keep flag expected by the core
+    # remapping functions.
+    if default is None:
+        return (0, 1)
+    return (default, 0)
+
+def _remapBuffer(values):
+    # Returns 'values' unchanged if it is a buffer (array('I'), NumPy array,
+    # ...) and converted into an array of 32-bit integers otherwise.
+    if isinstance(values, array.array):
+        return values
+    try:
+        memoryview(values)
+    except TypeError:
+        return array.array('I', list(values))
+    return values
+
+def remap(imIn, imOut, table, default=None):
+    """
+    Remaps the values of the 32-bit image 'imIn' using 'table' and puts the
+    result in 'imOut' (32-bit, greyscale or binary image). Values written in
+    a greyscale image are saturated (limited to 255) and any non zero value
+    sets the pixel of a binary image.
+    
+    'table' gives the new value of each pixel value (the first one
+    corresponding to 0). It is preferably a buffer of 32-bit integers
+    (array('I') or NumPy uint32 array), which is used without copy, but
+    any sequence of integers is accepted. 'table' can also be a dictionary
+    associating pixel values to their new values (see remapSparse).
+    
+    Pixel values outside the table are replaced by 'default' or kept
+    unchanged if 'default' is None.
+    """
+    if isinstance(table, dict):
+        remapSparse(imIn, imOut, list(table.keys()), list(table.values()),
+                    default)
+        return
+    table = _remapBuffer(table)
+    defval, keep = _remapDefault(default)
+    err = core.MB_Remap(imIn.mbIm, imOut.mbIm, table, defval, keep)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+
+def remapSparse(imIn, imOut, keys, values, default=None):
+    """
+    Remaps the values of the 32-bit image 'imIn' and puts the result in
+    'imOut' (32-bit, greyscale or binary image) like remap does, but using a
+    sparse table: the pixel values found in 'keys' are replaced by the
+    corresponding values in 'values'. The keys are hashed so that this
+    function is suited to huge label spaces.
+    
+    'keys' and 'values' are buffers of 32-bit integers (array('I') or NumPy
+    uint32 arrays) or sequences of integers of the same length. Pixel values
+    which are not keys are replaced by 'default' or kept unchanged if
+    'default' is None.
+    """
+    keys = _remapBuffer(keys)
+    values = _remapBuffer(values)
+    defval, keep = _remapDefault(default)
+    err = core.MB_RemapSparse(imIn.mbIm, imOut.mbIm, keys, values, defval, keep)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+
@@ -7,161 +7,152 @@ pixel information.
 """
 
 import mamba
+import mamba.core as core
 
 ### DRAW FUNCTIONS ###
 
+def _values(values):
+    # Returns the list of values expected by the core drawing functions
+    # from a single value or a sequence of values.
+    if hasattr(values, '__len__'):
+        return list(values)
+    return [values]
+
+def _flatten(shapes):
+    # Returns the flat list of coordinates of a sequence of shapes.
+    return [c for shape in shapes for c in shape]
+
+def drawLines(imOut, lines, values):
+    """
+    Draws the lines found in the sequence 'lines' in 'imOut'. Each line is a
+    tuple containing 4 values (starting and ending points (x1,y1,x2,y2)).
+    'values' is either a single value used for all the lines or a sequence
+    holding a value for each line.
+    
+    This function uses the Bresenham algorithm. Pixels outside the image are
+    ignored.
+    """
+    err = core.MB_DrawLines(imOut.mbIm, _flatten(lines), _values(values))
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+
 def drawLine(imOut, line, value):
     """
     Draws a line in 'imOut' using the tuple 'line' containing 4 values (starting
     and ending points (x1,y1,x2,y2)) using 'value' to set the pixels.
     
-    This function uses the Bresenham algorithm.
+    This function uses the Bresenham algorithm. Pixels outside the image are
+    ignored.
     """
-    x1,y1,x2,y2 = line
-    steep = (abs(y2-y1) > abs(x2-x1))
-    if steep:
-        prov = x1
-        x1 = y1
-        y1 = prov
-        prov = x2
-        x2 = y2
-        y2 = prov
-    if x1>x2:
-        prov = x1
-        x1 = x2
-        x2 = prov
-        prov = y1
-        y1 = y2
-        y2 = prov
-    deltax = x2-x1
-    deltay = abs(y2-y1)
-    error = deltax//2
-    y = y1
-    if y1<y2:
-        ystep = 1 
-    else:
-        ystep = -1
-    for x in range(x1,x2+1):
-        if steep:
-            imOut.fastSetPixel(value, (y,x))
-        else:
-            imOut.fastSetPixel(value, (x,y))
-        error -= deltay
-        if error<0:
-            y += ystep
-            error += deltax
-    # Updates the image.
+    drawLines(imOut, [line], value)
+
+def drawPolyline(imOut, points, value, closed=False):
+    """
+    Draws in 'imOut' the lines linking the successive points (x,y) found in
+    the sequence 'points' using 'value' to set the pixels. If 'closed' is
+    True, the last point is linked to the first one.
+    
+    Pixels outside the image are ignored.
+    """
+    err = core.MB_DrawPolyline(imOut.mbIm, _flatten(points), value, int(closed))
+    mamba.raiseExceptionOnError(err)
     imOut.update()
+
+def drawFillPolygon(imOut, points, value):
+    """
+    Draws in 'imOut' the filled polygon whose vertices (x,y) are found in the
+    sequence 'points' using 'value' to set the pixels.
+    
+    The inside of the polygon is determined using the even-odd rule. Pixels
+    outside the image are ignored.
+    """
+    err = core.MB_DrawFillPolygon(imOut.mbIm, _flatten(points), value)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+
+def drawBoxes(imOut, squares, values):
+    """
+    Draws the boxes (empty squares) found in the sequence 'squares' in
+    'imOut'. Each box is a tuple containing 4 values (upper left and down
+    right corners (x1,y1,x2,y2)). 'values' is either a single value used for
+    all the boxes or a sequence holding a value for each box.
     
+    Pixels outside the image are ignored.
+    """
+    err = core.MB_DrawBoxes(imOut.mbIm, _flatten(squares), _values(values), 0)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+
 def drawBox(imOut, square, value):
     """
     Draws a box (empty square) in 'imOut' using the tuple 'square' containing 4
     values (upper left and down right corners (x1,y1,x2,y2)) using 'value' to
-    set the pixels.
+    set the pixels. Pixels outside the image are ignored.
     """
-    x1,y1,x2,y2 = square
-    if x1>x2:
-        prov = x1
-        x1 = x2
-        x2 = prov
-    if y1>y2:
-        prov = y1
-        y1 = y2
-        y2 = prov
-    for x in range(x1,x2+1):
-        imOut.fastSetPixel(value, (x,y1))
-        imOut.fastSetPixel(value, (x,y2))
-    for y in range(y1,y2+1):
-        imOut.fastSetPixel(value, (x1,y))
-        imOut.fastSetPixel(value, (x2,y))
+    drawBoxes(imOut, [square], value)
+
+def drawSquares(imOut, squares, values):
+    """
+    Draws the squares found in the sequence 'squares' in 'imOut'. Each square
+    is a tuple containing 4 values (upper left and down right corners
+    (x1,y1,x2,y2)). 'values' is either a single value used for all the
+    squares or a sequence holding a value for each square.
+    
+    Pixels outside the image are ignored.
+    """
+    err = core.MB_DrawBoxes(imOut.mbIm, _flatten(squares), _values(values), 1)
+    mamba.raiseExceptionOnError(err)
     imOut.update()
 
 def drawSquare(imOut, square, value):
     """
     Draws a square in 'imOut' using the tuple 'square' containing 4 values (upper
     left and down right corners (x1,y1,x2,y2)) using 'value' to set the pixels.
+    Pixels outside the image are ignored.
     """
-    x1,y1,x2,y2 = square
-    if x1>x2:
-        prov = x1
-        x1 = x2
-        x2 = prov
-    if y1>y2:
-        prov = y1
-        y1 = y2
-        y2 = prov
-    for x in range(x1,x2+1): 
-        for y in range(y1,y2+1):
-            imOut.fastSetPixel(value, (x,y))
-    imOut.update()
+    drawSquares(imOut, [square], value)
+
+def drawCircles(imOut, circles, values):
+    """
+    Draws the circles found in the sequence 'circles' in 'imOut'. Each circle
+    is a tuple containing 3 values (center and radius (x,y,r)). 'values' is
+    either a single value used for all the circles or a sequence holding a
+    value for each circle.
     
+    Pixels outside the image are ignored.
+    """
+    err = core.MB_DrawCircles(imOut.mbIm, _flatten(circles), _values(values), 0)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+
 def drawCircle(imOut, circle, value):
     """
     Draws a circle in 'imOut' using the tuple 'circle' containing 3 values
-    (center and radius (x,y,r)) using 'value' to set the pixels.
-    """
-    x0 = circle[0]
-    y0 = circle[1]
-    radius = circle[2]
-    f = 1-radius
-    ddF_x = 1
-    ddF_y = -2*radius
-    x = 0
-    y = radius
-    imOut.fastSetPixel(value, (x0, y0 + radius))
-    imOut.fastSetPixel(value, (x0, y0 - radius))
-    imOut.fastSetPixel(value, (x0 + radius, y0))
-    imOut.fastSetPixel(value, (x0 - radius, y0))
-    while x<y:
-        if f>=0: 
-            y -= 1
-            ddF_y += 2
-            f += ddF_y
-        x += 1
-        ddF_x += 2
-        f += ddF_x
-        imOut.fastSetPixel(value, (x0 + x, y0 + y))
-        imOut.fastSetPixel(value, (x0 - x, y0 + y))
-        imOut.fastSetPixel(value, (x0 + x, y0 - y))
-        imOut.fastSetPixel(value, (x0 - x, y0 - y))
-        imOut.fastSetPixel(value, (x0 + y, y0 + x))
-        imOut.fastSetPixel(value, (x0 - y, y0 + x))
-        imOut.fastSetPixel(value, (x0 + y, y0 - x))
-        imOut.fastSetPixel(value, (x0 - y, y0 - x))
-    imOut.update()
+    (center and radius (x,y,r)) using 'value' to set the pixels. Pixels
+    outside the image are ignored.
+    """
+    drawCircles(imOut, [circle], value)
+
+def drawFillCircles(imOut, circles, values):
+    """
+    Draws the filled circles found in the sequence 'circles' in 'imOut'. Each
+    circle is a tuple containing 3 values (center and radius (x,y,r)).
+    'values' is either a single value used for all the circles or a sequence
+    holding a value for each circle.
     
+    Pixels outside the image are ignored.
+    """
+    err = core.MB_DrawCircles(imOut.mbIm, _flatten(circles), _values(values), 1)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+
 def drawFillCircle(imOut, circle, value):
     """
     Draws a filled circle in 'imOut' using the tuple 'circle' containing 3
     values (center and radius (x,y,r)) using 'value' to set the pixels.
+    Pixels outside the image are ignored.
     """
-    x0 = circle[0]
-    y0 = circle[1]
-    radius = circle[2]
-    f = 1-radius
-    ddF_x = 1
-    ddF_y = -2*radius
-    x = 0
-    y = radius
-    for i in range(-radius,radius+1):
-        imOut.fastSetPixel(value, (x0+i, y0))
-    while x<y:
-        if f>=0: 
-            y -= 1
-            ddF_y += 2
-            f += ddF_y
-        x += 1
-        ddF_x += 2
-        f += ddF_x        
-        for i in range(-x,x+1):
-            imOut.fastSetPixel(value, (x0+i, y0 + y))
-        for i in range(-x,x+1):
-            imOut.fastSetPixel(value, (x0+i, y0 - y))
-        for i in range(-y,y+1):
-            imOut.fastSetPixel(value, (x0+i, y0 + x))
-        for i in range(-y,y+1):
-            imOut.fastSetPixel(value, (x0+i, y0 - x))    
-    imOut.update()
+    drawFillCircles(imOut, [circle], value)
 
 ### EXTRACT PIXEL VALUES FUNCTIONS ###
 
@@ -170,9 +161,9 @@ def getIntensityAlongLine(imOut, line):
     Returns in a list the intensity profile along a line in 'imOut' using the
     tuple 'line' containing 4 values (starting and ending points (x1,y1,x2,y2)).
     
-    This function uses the Bresenham algorithm.
+    This function uses the Bresenham algorithm. Contrary to the drawing
+    functions, a line leaving the image raises an error.
     """
-    profile = []
     x1,y1,x2,y2 = line
     steep = (abs(y2-y1) > abs(x2-x1))
     if steep:
@@ -197,15 +188,20 @@ def getIntensityAlongLine(imOut, line):
         ystep = 1 
     else:
         ystep = -1
+    xs = []
+    ys = []
     for x in range(x1,x2+1):
         if steep:
-            profile.append(imOut.getPixel((y,x)))
+            xs.append(y)
+            ys.append(x)
         else:
-            profile.append(imOut.getPixel((x,y)))
+            xs.append(x)
+            ys.append(y)
         error -= deltay
         if error<0:
             y += ystep
             error += deltax
+    profile = imOut.getPixels(xs, ys)
     # The profile must be returned in the expected order
     x1,y1,x2,y2 = line
     if x==y1 or x==x1:
@@ -239,10 +239,15 @@ def infNeighbor(imIn, imInout, nb, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     
     'nb' contains the coding of all the selected neighbor points. See the User Manual
     for details.
+    
+    Returns the range (first, last) of the lines of 'imInout' modified by the
+    operation, computed in the same pass (first is greater than last when
+    'imInout' is unchanged).
     """
-    err = core.MB_InfNb(imIn.mbIm, imInout.mbIm, nb, grid.id, edge.id)
+    err, first, last = core.MB_InfNb(imIn.mbIm, imInout.mbIm, nb, grid.id, edge.id)
     mamba.raiseExceptionOnError(err)
     imInout.update()
+    return (first, last)
     
 def supNeighbor(imIn, imInout, nb, grid=mamba.DEFAULT_GRID, edge=mamba.EMPTY):
     """
@@ -262,10 +267,15 @@ def supNeighbor(imIn, imInout, nb, grid=mamba.DEFAULT_GRID, edge=mamba.EMPTY):
     
     'nb' contains the coding of all the selected neighbor points. See the User Manual
     for details.
+    
+    Returns the range (first, last) of the lines of 'imInout' modified by the
+    operation, computed in the same pass (first is greater than last when
+    'imInout' is unchanged).
     """
-    err = core.MB_SupNb(imIn.mbIm, imInout.mbIm, nb, grid.id, edge.id)
+    err, first, last = core.MB_SupNb(imIn.mbIm, imInout.mbIm, nb, grid.id, edge.id)
     mamba.raiseExceptionOnError(err)
     imInout.update()
+    return (first, last)
 
 def infVector(imIn, imInout, vector, edge=mamba.FILLED):
     """
@@ -323,7 +333,10 @@ def dilate(imIn, imOut, n=1, se=DEFAULT_SE, edge=mamba.EMPTY):
         mamba.copy(imOut, imWrk)
         if not se.hasZero():
             imOut.reset()
-        supNeighbor(imWrk, imOut, dirs, grid=se.getGrid(), edge=edge)
+        first, last = supNeighbor(imWrk, imOut, dirs, grid=se.getGrid(), edge=edge)
+        if se.hasZero() and first > last:
+            # Idempotence is reached, the next steps would not change imOut
+            break
     
 def doublePointDilate(imIn, imOut, d, n, grid=mamba.DEFAULT_GRID, edge=mamba.EMPTY):
     """
@@ -350,7 +363,9 @@ def linearDilate(imIn, imOut, d, n=1, grid=mamba.DEFAULT_GRID, edge=mamba.EMPTY)
     mamba.copy(imIn, imOut)
     # Basically its only calling the supNeighbor function in the direction d
     for i in range(n):
-        supNeighbor(imOut, imOut, 1<<d, edge=edge, grid=grid)
+        first, last = supNeighbor(imOut, imOut, 1<<d, edge=edge, grid=grid)
+        if first > last:
+            break
     
 def erode(imIn, imOut, n=1, se=DEFAULT_SE, edge=mamba.FILLED):
     """
@@ -370,7 +385,10 @@ def erode(imIn, imOut, n=1, se=DEFAULT_SE, edge=mamba.FILLED):
         mamba.copy(imOut, imWrk)
         if not se.hasZero():
             imOut.fill(mamba.computeMaxRange(imIn)[1])
-        infNeighbor(imWrk, imOut, dirs, grid=se.getGrid(), edge=edge)
+        first, last = infNeighbor(imWrk, imOut, dirs, grid=se.getGrid(), edge=edge)
+        if se.hasZero() and first > last:
+            # Idempotence is reached, the next steps would not change imOut
+            break
     
 def doublePointErode(imIn, imOut, d, n, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     """
@@ -395,7 +413,9 @@ def linearErode( imIn, imOut, d, n=1, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED
     mamba.copy(imIn, imOut)
     # Basically its only calling the infNeighbor function in the direction d
     for i in range(n):
-        infNeighbor(imOut, imOut, 1<<d, grid=grid, edge=edge)
+        first, last = infNeighbor(imOut, imOut, 1<<d, grid=grid, edge=edge)
+        if first > last:
+            break
 
 # The following operations are defined on hexagonal grid only    
 def conjugateHexagonalErode(imIn, imOut, size, edge=mamba.FILLED):
@@ -8,50 +8,45 @@ function. New operators linked to the notion of dynamics are also provided.
 # Contributor: Serge BEUCHER
 
 import mamba
+import mamba.core as core
 
 def minima(imIn, imOut, h=1, grid=mamba.DEFAULT_GRID):
     """
-    Computes the minima of 'imIn' using a dual build operation and puts the 
-    result in 'imOut'. When 'h' is equal to 1 (default value), the operator
-    provides the minima of 'imIn'.
+    Computes the minima of 'imIn' and puts the result in 'imOut'. When 'h' is
+    equal to 1 (default value), the operator provides the minima of 'imIn'.
+    Otherwise, the result is the same as the one of a dual build of 'imIn' by
+    'imIn' + 'h' (the pixels flooded by the dual build are extracted).
     
-    Grid used by the dual build operation can be specified by 'grid'.
+    Grid used to define the connected components can be specified by 'grid'.
     
-    Only works with 8-bit or 32-bit images as input. 'imOut' must be binary.
+    Works with binary, 8-bit or 32-bit images as input. 'imOut' can be binary
+    or 32-bit. In this last case, the minima are labelled. The function
+    returns the number of minima.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if imIn.getDepth() == 8:
-        mamba.addConst(imIn, h, imWrk)
-        mamba.hierarDualBuild(imIn, imWrk, grid=grid)
-        mamba.sub(imWrk, imIn, imWrk)
-    else:
-        mamba.ceilingAddConst(imIn, h, imWrk)
-        mamba.dualBuild(imIn, imWrk, grid=grid)
-        mamba.floorSub(imWrk, imIn, imWrk)
-    mamba.threshold(imWrk, imOut, 1, mamba.computeMaxRange(imIn)[1])
+    err, nb = core.MB_Minima(imIn.mbIm, imOut.mbIm, h, grid.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+    return nb
 
 def maxima(imIn, imOut, h=1, grid=mamba.DEFAULT_GRID):
     """
-    Computes the maxima of 'imIn' using a build operation and puts the result in
-    'imOut'. When 'h' is equal to 1 (default value), the operator provides the
-    maxima of 'imIn'.
+    Computes the maxima of 'imIn' and puts the result in 'imOut'. When 'h' is
+    equal to 1 (default value), the operator provides the maxima of 'imIn'.
+    Otherwise, the result is the same as the one of a build of 'imIn' by
+    'imIn' - 'h' (the pixels lowered by the build are extracted).
     
-    Grid used by the build operation can be specified by 'grid'.
+    Grid used to define the connected components can be specified by 'grid'.
     
-    Only works with with 8-bit or 32-bit images as input. 'imOut' must be binary.
+    Works with binary, 8-bit or 32-bit images as input. 'imOut' can be binary
+    or 32-bit. In this last case, the maxima are labelled. The function
+    returns the number of maxima.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if imIn.getDepth() == 8:
-        mamba.subConst(imIn, h, imWrk)
-        mamba.hierarBuild(imIn, imWrk, grid=grid)
-        mamba.sub(imIn, imWrk, imWrk)
-    else:
-        mamba.floorSubConst(imIn, h, imWrk)
-        mamba.build(imIn, imWrk, grid=grid)
-        mamba.floorSub(imIn, imWrk, imWrk)
-    mamba.threshold(imWrk, imOut, 1, mamba.computeMaxRange(imIn)[1])
+    err, nb = core.MB_Maxima(imIn.mbIm, imOut.mbIm, h, grid.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+    return nb
 
 def minDynamics(imIn, imOut, h, grid=mamba.DEFAULT_GRID):
     """
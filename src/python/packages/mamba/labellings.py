@@ -5,6 +5,7 @@ They use the label operator now available for sets and for grey images.
 
 # Contributor: Serge BEUCHER
 
+import array
 import mamba
 import mamba.core as core
   
@@ -48,15 +49,15 @@ def measureLabelling(imIn, imMeasure, imOut):
     imWrk5 = mamba.imageMb(imIn, 8)
     imWrk6 = mamba.imageMb(imIn, 32)
     
-    # Output image is emptied.
-    imOut.reset()
     # Labelling the initial image.
     if imIn.getDepth() == 1:
-        nbParticles = mamba.label(imIn, imWrk1)
+        nbParticles = mamba.label(imIn, imWrk6)
     else:
-        nbParticles = partitionLabel(imIn, imWrk1)
-    # Defining output LUTs.
-    outLuts = [[0 for i in range(256)] for i in range(4)]
+        nbParticles = partitionLabel(imIn, imWrk6)
+    mamba.copy(imWrk6, imWrk1)
+    # Table giving the measure of each label.
+    measures = array.array('I', [0]) * (mamba.computeRange(imWrk6)[1] + 1)
+    offset = 0
     # Converting the imMeasure image to 8-bit.
     mamba.convert(imMeasure, imWrk4)
     while nbParticles > 0:
@@ -69,29 +70,17 @@ def measureLabelling(imIn, imMeasure, imOut):
         mamba.logic(imWrk3, imWrk4, imWrk5, "inf")
         # The histogram is computed.
         histo = mamba.getHistogram(imWrk5)
-        # The same operation is performed for the 255 particles. 
-        for i in range(1, 256):
-            # The number of points in each particle is obtained from the histogram.
-            value = histo[i]
-            j = 3
-            # This value is splitted in powers of 256 and stored in the four 
-            # output LUTs.
-            while j >= 0:
-                n = 2 ** (8 * j)
-                outLuts[j][i] = value // n
-                value = value % n
-                j -= 1
-        # Each LUT is used to label each byte plane of a temporary image with the
-        # corresponding value.
-        for i in range(4):
-            mamba.lookup(imWrk3, imWrk5, outLuts[i])
-            mamba.copyBytePlane(imWrk5, i, imWrk6)
-        # The intermediary result is accumulated in the final image.
-        mamba.logic(imOut, imWrk6, imOut, "sup")
+        # The number of points in each of the 255 particles is obtained
+        # from the histogram.
+        for i in range(1, min(256, len(measures) - offset)):
+            measures[offset + i] = histo[i]
         # 255 is subtracted from the initial labelled image in order to process
         # the next 255 particles.
         mamba.floorSubConst(imWrk1, 255, imWrk1)
         nbParticles -= 255
+        offset += 255
+    # Each particle is labelled with its measure in a single pass.
+    mamba.remap(imWrk6, imOut, measures, 0)
  
 def areaLabelling(imIn, imOut):
     """
@@ -18,7 +18,12 @@ def computeVolume(imIn):
     The computed integer value is returned by the function.
     
     'imIn' can be a 1-bit, 8-bit or 32-bit image.
+    
+    The volume is cached until 'imIn' is modified.
     """
+    return imIn.getCachedMeasure("volume", lambda: _volume(imIn))
+
+def _volume(imIn):
     err, volume = core.MB_Volume(imIn.mbIm)
     mamba.raiseExceptionOnError(err)
     return volume
@@ -29,6 +34,9 @@ def computeMaxRange(imIn):
     depth of image 'imIn'. The values are returned in a tuple holding the 
     minimum and the maximum.
     """
+    return imIn.getCachedMeasure("maxrange", lambda: _maxRange(imIn))
+
+def _maxRange(imIn):
     err, min, max = core.MB_depthRange(imIn.mbIm)
     mamba.raiseExceptionOnError(err)
     return (min, max)
@@ -37,7 +45,12 @@ def computeRange(imIn):
     """
     Computes the range, i.e. the minimum and maximum values, of image 'imIn'.
     The values are returned in a tuple holding the minimum and the maximum.
+    
+    The range is cached until 'imIn' is modified.
     """
+    return imIn.getCachedMeasure("range", lambda: _range(imIn))
+
+def _range(imIn):
     err, min, max = core.MB_Range(imIn.mbIm)
     mamba.raiseExceptionOnError(err)
     return (min, max)
@@ -126,24 +139,27 @@ def computeConnectivityNumber(imIn, grid=mamba.DEFAULT_GRID):
     
     if imIn.getDepth() != 1:
         mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+    # Each pixel set to true contributes to the connectivity number by -1, 0
+    # or 1 according to the configuration of its neighbors. The positive and
+    # negative contributions are each computed in a single pass.
     imWrk  = mamba.imageMb(imIn)
-    if grid == mamba.HEXAGONAL:
-        dse = mamba.doubleStructuringElement([1,6],[0],mamba.HEXAGONAL)
-        mamba.hitOrMiss(imIn, imWrk, dse)
-        n = mamba.computeVolume(imWrk)
-        dse = mamba.doubleStructuringElement([1],[0,2],mamba.HEXAGONAL)
-        mamba.hitOrMiss(imIn, imWrk, dse)
-        n = n - mamba.computeVolume(imWrk)
-    else:
-        dse = mamba.doubleStructuringElement([3,4,5],[0],mamba.SQUARE)
-        mamba.hitOrMiss(imIn, imWrk, dse)
-        n = mamba.computeVolume(imWrk)
-        dse = mamba.doubleStructuringElement([4],[0,3,5],mamba.SQUARE)
-        mamba.hitOrMiss(imIn, imWrk, dse)
-        n = n - mamba.computeVolume(imWrk)
-        dse = mamba.doubleStructuringElement([3,5],[0,4],mamba.SQUARE)
-        mamba.hitOrMiss(imIn, imWrk, dse)
-        n = n + mamba.computeVolume(imWrk)
+    nb = mamba.gridNeighbors(grid)
+    pos = []
+    neg = []
+    for code in range(2**nb):
+        n = [0]+[(code>>(d-1))&1 for d in range(1, nb+1)]
+        if grid == mamba.HEXAGONAL:
+            c = int(n[1]==0 and n[6]==0) - int(n[1]==0 and n[2]==1)
+        else:
+            c = (int(n[3]==0 and n[4]==0 and n[5]==0)
+                 - int(n[4]==0 and n[3]==1 and n[5]==1)
+                 + int(n[3]==0 and n[5]==0 and n[4]==1))
+        pos.append(int(c>0))
+        neg.append(int(c<0))
+    mamba.neighborLookup(imIn, imWrk, pos, grid=grid)
+    n = mamba.computeVolume(imWrk)
+    mamba.neighborLookup(imIn, imWrk, neg, grid=grid)
+    n = n - mamba.computeVolume(imWrk)
     return n
 
 def computeComponentsNumber(imIn, grid=mamba.DEFAULT_GRID):
@@ -167,3 +183,83 @@ def computeFeretDiameters(imIn, scale=(1.0, 1.0)):
     s = mamba.extractFrame(imIn, 1)
     return (scale[0]*(s[2]-s[0]), scale[1]*(s[3]-s[1]))
 
+def granulometry(imIn, sizes, family="hexagon", grid=mamba.DEFAULT_GRID):
+    """
+    Computes the granulometry of image 'imIn' by openings of increasing sizes
+    given in 'sizes' and returns its pattern spectrum in a list. The k-th value
+    of the spectrum is the volume removed between the opening of size
+    'sizes[k-1]' and the opening of size 'sizes[k]' (the first value is the
+    volume removed by the first opening from 'imIn').
+    
+    'sizes' must be increasing. 'family' gives the structuring elements used
+    by the openings:
+        "hexagon" and "square": large hexagons or squares. Each erosion is
+        obtained from the previous one (binary images use their distance
+        function instead).
+        "dodecagon": large dodecagons.
+        "linear": supremum of linear openings in all the directions of 'grid'
+        (see supOpen).
+        "area": area openings, only for binary images (the connected
+        components are defined on the default grid). The area of each
+        component is computed once.
+    """
+    
+    if family not in ("hexagon", "square", "dodecagon", "linear", "area"):
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+    prev = -1
+    for size in sizes:
+        if size <= prev:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_VALUE)
+        prev = size
+    binary = imIn.getDepth() == 1
+    imWrk1 = mamba.imageMb(imIn)
+    imWrk2 = mamba.imageMb(imIn)
+    if family == "hexagon":
+        erosion = mamba.largeHexagonalErode
+        dilation = mamba.largeHexagonalDilate
+    elif family == "square":
+        erosion = mamba.largeSquareErode
+        dilation = mamba.largeSquareDilate
+    if family == "area":
+        if not binary:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+        imMeasure = mamba.imageMb(imIn, 32)
+        mamba.areaLabelling(imIn, imMeasure)
+        maxMeasure = mamba.computeRange(imMeasure)[1]
+    elif binary and (family == "hexagon" or family == "square"):
+        # The erosions are obtained by thresholding the distance function
+        imMeasure = mamba.imageMb(imIn, 32)
+        if family == "hexagon":
+            mamba.computeDistance(imIn, imMeasure, grid=mamba.HEXAGONAL, edge=mamba.FILLED)
+        else:
+            mamba.computeDistance(imIn, imMeasure, grid=mamba.SQUARE, edge=mamba.FILLED)
+        maxMeasure = mamba.computeRange(imMeasure)[1]
+    else:
+        mamba.copy(imIn, imWrk1)
+    
+    spectrum = []
+    eroded = 0
+    v1 = computeVolume(imIn)
+    for size in sizes:
+        if size == 0:
+            v2 = v1
+        else:
+            if family == "area":
+                mamba.threshold(imMeasure, imWrk2, size, max(size, maxMeasure))
+            elif family == "dodecagon":
+                mamba.largeDodecagonalErode(imIn, imWrk2, size)
+                mamba.largeDodecagonalDilate(imWrk2, imWrk2, size)
+            elif family == "linear":
+                mamba.supOpen(imIn, imWrk2, size, grid=grid)
+            else:
+                if binary:
+                    mamba.threshold(imMeasure, imWrk1, size+1, max(size+1, maxMeasure))
+                else:
+                    # The previous erosion is eroded by the size difference
+                    erosion(imWrk1, imWrk1, size-eroded)
+                    eroded = size
+                dilation(imWrk1, imWrk2, size)
+            v2 = computeVolume(imWrk2)
+        spectrum.append(v1 - v2)
+        v1 = v2
+    return spectrum
@@ -43,7 +43,12 @@ def checkEmptiness(imIn):
     Returns True if so, False otherwise.
     
     'imIn' can be a 1-bit, 8-bit or 32-bit image.
+    
+    The result is cached until 'imIn' is modified.
     """
+    return imIn.getCachedMeasure("empty", lambda: _emptiness(imIn))
+
+def _emptiness(imIn):
     err, isEmpty = core.MB_Check(imIn.mbIm)
     mamba.raiseExceptionOnError(err)
     return bool(isEmpty)
@@ -55,7 +60,13 @@ def extractFrame(imIn, threshold):
     all the pixels whose value is greater or equal to 'threshold'.
     
     'imIn' can be a 8-bit or 32-bit image.
+    
+    The frame is cached (for each threshold) until 'imIn' is modified.
     """
+    return imIn.getCachedMeasure(("frame", threshold),
+                                 lambda: _frame(imIn, threshold))
+
+def _frame(imIn, threshold):
     err, x1, y1, x2, y2 = core.MB_Frame(imIn.mbIm, threshold)
     mamba.raiseExceptionOnError(err)
     return (x1, y1, x2, y2)
@@ -10,7 +10,9 @@ erodil and geodesy).
 
 # Contributors: Serge BEUCHER, Nicolas, BEUCHER, Michel BILODEAU
 
+import array
 import mamba
+import mamba.core as core
 
 def opening(imIn, imOut, n=1, se=mamba.DEFAULT_SE, edge=mamba.FILLED):
     """
@@ -63,6 +65,49 @@ def buildClose(imIn, imOut, n=1, se=mamba.DEFAULT_SE):
     mamba.dilate(imIn, imOut, n, se=se)
     mamba.dualBuild(imWrk, imOut, grid=se.getGrid())
 
+def _linearSegments(segments):
+    # Converts a list of (direction, size) into a buffer for the C core
+    segs = array.array('I')
+    for (d, n) in segments:
+        segs.extend((d, n))
+    return segs
+
+# Below this size, the iterated neighbor operators are faster than the line
+# filters of the core
+_LINEAR_CORE_SIZE = 8
+
+def _iteratedLinearFilter(imIn, imOut, segments, grid, edge, closing):
+    # Supremum of openings (or infimum of closings) computed with the
+    # iterated linear erosions and dilations
+    imWrk1 = mamba.imageMb(imIn)
+    imWrk2 = mamba.imageMb(imIn)
+    if closing:
+        imWrk1.fill(mamba.computeMaxRange(imIn)[1])
+    else:
+        imWrk1.reset()
+    for (d, n) in segments:
+        td = mamba.transposeDirection(d, grid=grid)
+        if closing:
+            mamba.linearDilate(imIn, imWrk2, d, n, grid=grid)
+            mamba.linearErode(imWrk2, imWrk2, td, n, edge=edge, grid=grid)
+            mamba.logic(imWrk1, imWrk2, imWrk1, "inf")
+        else:
+            mamba.linearErode(imIn, imWrk2, d, n, edge=edge, grid=grid)
+            mamba.linearDilate(imWrk2, imWrk2, td, n, grid=grid)
+            mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
+    if closing and edge==mamba.EMPTY:
+        mamba.logic(imWrk1, imIn, imWrk1, "sup")
+    mamba.copy(imWrk1, imOut)
+
+def _supOpenSegments(n, grid):
+    # Segments of the supremum of openings and infimum of closings: three
+    # directions on the hexagonal grid, four on the square grid (the sizes
+    # in oblique directions being reduced)
+    if grid == mamba.SQUARE:
+        size = int((1.4142 * n + 1)/2)
+        return [(2, size), (4, size), (1, n), (3, n)]
+    return [(1, n), (3, n), (5, n)]
+
 def linearOpen(imIn, imOut, dir, n, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     """
     Performs an opening by a segment of size 'n' in direction 'dir'.
@@ -70,8 +115,7 @@ def linearOpen(imIn, imOut, dir, n, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     'edge' is set to 'FILLED' by default. 
     """
     
-    mamba.linearErode(imIn, imOut, dir, n, edge=edge, grid=grid)
-    mamba.linearDilate(imOut, imOut, mamba.transposeDirection(dir, grid=grid), n, grid=grid)
+    supLinearOpen(imIn, imOut, [(dir, n)], grid=grid, edge=edge)
     
 def linearClose(imIn, imOut, dir, n, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     """
@@ -80,14 +124,44 @@ def linearClose(imIn, imOut, dir, n, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED)
     If 'edge' is set to 'EMPTY', the operation must be modified to remain extensive.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if edge==mamba.EMPTY:
-        mamba.copy(imIn, imWrk)
-    mamba.linearDilate(imIn, imOut, dir, n, grid=grid)
-    mamba.linearErode(imOut, imOut, mamba.transposeDirection(dir, grid=grid), n, edge=edge, grid=grid)
-    if edge==mamba.EMPTY:
-        mamba.logic(imOut, imWrk, imOut, "sup")
+    infLinearClose(imIn, imOut, [(dir, n)], grid=grid, edge=edge)
    
+def supLinearOpen(imIn, imOut, segments, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
+    """
+    Performs the supremum of the openings by the segments given in 'segments',
+    a list of tuples (direction, size), and puts the result in 'imOut'. The
+    openings by long segments are computed in a single pass with a constant
+    cost per pixel whatever their size.
+    
+    'edge' is set to 'FILLED' by default (it is used by the erosions).
+    """
+    
+    if segments and max([n for (d, n) in segments]) < _LINEAR_CORE_SIZE:
+        _iteratedLinearFilter(imIn, imOut, segments, grid, edge, False)
+        return
+    err = core.MB_SupLinearOpen(imIn.mbIm, imOut.mbIm, _linearSegments(segments),
+                                grid.id, edge.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+    
+def infLinearClose(imIn, imOut, segments, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
+    """
+    Performs the infimum of the closings by the segments given in 'segments',
+    a list of tuples (direction, size), and puts the result in 'imOut' (see
+    supLinearOpen).
+    
+    'edge' is set to 'FILLED' by default. With an 'EMPTY' edge, the closings
+    are modified to remain extensive.
+    """
+    
+    if segments and max([n for (d, n) in segments]) < _LINEAR_CORE_SIZE:
+        _iteratedLinearFilter(imIn, imOut, segments, grid, edge, True)
+        return
+    err = core.MB_InfLinearClose(imIn.mbIm, imOut.mbIm, _linearSegments(segments),
+                                 grid.id, edge.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+    
 def supOpen(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     """
     Performs the supremum of directional openings. A white particle is preserved
@@ -101,22 +175,8 @@ def supOpen(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     similar to the horizontal and vertical size.    
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk1.reset()
-    if grid == mamba.SQUARE:
-        size = int((1.4142 * n + 1)/2)
-        linearOpen(imIn, imWrk2, 2, size, edge=mamba.EMPTY, grid=grid)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
-        linearOpen(imIn, imWrk2, 4, size, edge=mamba.EMPTY, grid=grid)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
-        d = 4
-    else:
-        d = 6
-    for i in range(1, d, 2):
-        linearOpen(imIn, imWrk2, i, n, edge=mamba.EMPTY, grid=grid)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "sup")
-    mamba.copy(imWrk1, imOut)
+    supLinearOpen(imIn, imOut, _supOpenSegments(n, grid), grid=grid,
+                  edge=mamba.EMPTY)
     
 def infClose(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     """
@@ -131,21 +191,6 @@ def infClose(imIn, imOut, n, grid=mamba.DEFAULT_GRID):
     similar to the horizontal and vertical size.    
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk1.fill(mamba.computeMaxRange(imIn)[1])
-    if grid == mamba.SQUARE:
-        size = int((1.4142 * n + 1)/2)
-        linearClose(imIn, imWrk2, 2, size, grid=grid)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "inf")
-        linearClose(imIn, imWrk2, 4, size, grid=grid)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "inf")
-        d = 4
-    else:
-        d = 6
-    for i in range(1, d, 2):
-        linearClose(imIn, imWrk2, i, n, grid=grid)
-        mamba.logic(imWrk1, imWrk2, imWrk1, "inf")
-    mamba.copy(imWrk1, imOut)
+    infLinearClose(imIn, imOut, _supOpenSegments(n, grid), grid=grid)
     
 
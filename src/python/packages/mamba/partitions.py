@@ -15,6 +15,7 @@ need to explicitly define this graph structure from the partition.
 # Contributor: Serge BEUCHER
 
 import mamba
+import mamba.core as core
 
 def cellsErode(imIn, imOut, n=1, se=mamba.DEFAULT_SE, edge=mamba.FILLED):
     """
@@ -169,29 +170,14 @@ def cellsBuild(imIn, imInOut, grid=mamba.DEFAULT_GRID):
     The result is stored in 'imInOut'.
     The images can be 8-bit or 32-bit images.
     'grid' can be set to HEXAGONAL or SQUARE.
+    
+    Each cell is flooded once: a marked cell takes the maximum value of its
+    marker.
     """
     
-    imWrk1 = mamba.imageMb(imIn)
-    imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 1)
-    vol = 0
-    prec_vol = -1
-    dirs = mamba.getDirections(grid)[1:]
-    while (prec_vol!=vol):
-        prec_vol = vol
-        for d in dirs:
-            ed = 1<<d
-            mamba.copy(imIn, imWrk1)
-            mamba.copy(imIn, imWrk2)
-            mamba.supNeighbor(imWrk1, imWrk1, ed, grid=grid)
-            mamba.infNeighbor(imWrk2, imWrk2, ed, grid=grid)
-            mamba.generateSupMask(imWrk2, imWrk1, imWrk3, False)
-            mamba.convertByMask(imWrk3, imWrk1, 0, mamba.computeMaxRange(imIn)[1])
-            mamba.linearDilate(imInOut, imWrk2, d, 1, grid=grid)
-            mamba.logic(imWrk2, imWrk1, imWrk2, "inf")
-            v = mamba.buildNeighbor(imWrk1, imWrk2, d, grid=grid)
-            mamba.logic(imWrk2, imInOut, imInOut, "sup")
-        vol = mamba.computeVolume(imInOut)
+    err = core.MB_CellsBuild(imIn.mbIm, imInOut.mbIm, grid.id)
+    mamba.raiseExceptionOnError(err)
+    imInOut.update()
 
 def cellsExtract(imIn, imMarkers, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -223,16 +209,14 @@ def partitionErode(imIn, imOut, n=1, grid=mamba.DEFAULT_GRID):
     by 'n'. The corresponding partition image of the resulting eroded graph is
     put in 'imOut'.
     'grid' can be set to HEXAGONAL or SQUARE.
+    
+    The graph of the adjacent cells is extracted once and the erosion is
+    performed on this graph.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.negate(imIn, imWrk)
-    mamba.copy(imWrk, imOut)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    for i in range(n):
-        mamba.dilate(imOut, imOut, se=se)
-        cellsBuild(imWrk, imOut, grid=grid)
-    mamba.negate(imOut, imOut)
+    err = core.MB_PartitionErode(imIn.mbIm, imOut.mbIm, n, grid.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
 
 def partitionDilate(imIn, imOut, n=1, grid=mamba.DEFAULT_GRID):
     """
@@ -240,13 +224,12 @@ def partitionDilate(imIn, imOut, n=1, grid=mamba.DEFAULT_GRID):
     by 'n'. The corresponding partition image of the resulting dilated graph is
     put in 'imOut'.
     'grid' can be set to HEXAGONAL or SQUARE.
+    
+    The graph of the adjacent cells is extracted once and the dilation is
+    performed on this graph.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.copy(imIn, imOut)
-    mamba.copy(imIn, imWrk)
-    se = mamba.structuringElement(mamba.getDirections(grid), grid)
-    for i in range(n):
-        mamba.dilate(imOut, imOut, se=se)
-        cellsBuild(imWrk, imOut, grid=grid)
+    err = core.MB_PartitionDilate(imIn.mbIm, imOut.mbIm, n, grid.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
 
@@ -12,20 +12,30 @@ These residues are defined on binary and greytone images.
 # Contributor: Serge BEUCHER
 
 import mamba
+import mamba.core as core
 
-def _generateMask_(imIn1, imIn2, imOut):
-    #This procedure is used internally by the residues operators. It computes
-    #a mask indicating the points in the image where 'imIn1' is greater or equal
-    #to 'imIn2' with 'imIn1' strictly positive.
-    #Depth of 'imOut' is 1.
+def accumulateResidue(imIn1, imIn2, imOut1, imOut2, size):
+    """
+    Performs one step of a residual transformation. The residue is the
+    difference between the previous primitive 'imIn1' and the current
+    primitive 'imIn2' ('imIn2' itself is the residue when 'imIn1' is None).
+    
+    Where the residue is not null and greater or equal to 'imOut1', 'imOut1'
+    takes the residue value and the associated function 'imOut2' takes value
+    'size' (if greater). The volume of 'imIn2' is computed in the same pass
+    and returned by the function.
     
-    imWrk = mamba.imageMb(imOut)
-    mamba.generateSupMask(imIn1, imIn2, imOut, False)
-    if imIn1.getDepth()==1:
-        mamba.negate(imIn1, imWrk)
+    'imIn1', 'imIn2' and 'imOut1' must have the same depth, 'imOut2' is a
+    32-bit or greyscale image.
+    """
+    if imIn1 is None:
+        err, volume = core.MB_AccumulateResidue(None, imIn2.mbIm, imOut1.mbIm, imOut2.mbIm, size)
     else:
-        mamba.threshold(imIn1, imWrk, 0, 0)
-    mamba.diff(imOut, imWrk, imOut)
+        err, volume = core.MB_AccumulateResidue(imIn1.mbIm, imIn2.mbIm, imOut1.mbIm, imOut2.mbIm, size)
+    mamba.raiseExceptionOnError(err)
+    imOut1.update()
+    imOut2.update()
+    return volume
 
 def binaryUltimateErosion(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     """
@@ -66,10 +76,8 @@ def ultimateErosion(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     The edge is always set to 'FILLED'.
     """
 
-    maskIm = mamba.imageMb(imIn, 1)
     imWrk1 = mamba.imageMb(imIn)
     imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
     se = mamba.structuringElement(mamba.getDirections(grid), grid)
     i = 0
     mamba.copy(imIn, imWrk1)
@@ -82,11 +90,7 @@ def ultimateErosion(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
         v1 = v2
         mamba.erode(imWrk1, imWrk2, se=se)
         mamba.build(imWrk1, imWrk2, grid=grid)
-        mamba.sub(imWrk1, imWrk2, imWrk2)
-        _generateMask_(imWrk2, imOut1, maskIm)
-        mamba.convertByMask(maskIm, imWrk3, 0, i)
-        mamba.logic(imOut1, imWrk2, imOut1, "sup")
-        mamba.logic(imOut2, imWrk3, imOut2, "sup")
+        accumulateResidue(imWrk1, imWrk2, imOut1, imOut2, i)
         mamba.erode(imWrk1, imWrk1, se=se)
         v2 = mamba.computeVolume(imWrk1)
 
@@ -127,10 +131,8 @@ def skeletonByOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     The edge is always set to 'FILLED'.
     """
 
-    maskIm = mamba.imageMb(imIn, 1)
     imWrk1 = mamba.imageMb(imIn)
     imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
     se = mamba.structuringElement(mamba.getDirections(grid), grid)
     i = 0
     mamba.copy(imIn, imWrk1)
@@ -142,11 +144,7 @@ def skeletonByOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
         i += 1
         v1 = v2
         mamba.opening(imWrk1, imWrk2, se=se)
-        mamba.sub(imWrk1, imWrk2, imWrk2)
-        _generateMask_(imWrk2, imOut1, maskIm)
-        mamba.convertByMask(maskIm, imWrk3, 0, i)
-        mamba.logic(imOut1, imWrk2, imOut1, "sup")
-        mamba.logic(imOut2, imWrk3, imOut2, "sup")
+        accumulateResidue(imWrk1, imWrk2, imOut1, imOut2, i)
         mamba.erode(imWrk1, imWrk1, se=se)
         v2 = mamba.computeVolume(imWrk1)
 
@@ -161,10 +159,8 @@ def ultimateOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     Depth of 'imOut1' is the same as 'imIn', depth of 'imOut2' is 32. 
     """
 
-    maskIm = mamba.imageMb(imIn, 1)
     imWrk1 = mamba.imageMb(imIn)
     imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
     imWrk4 = mamba.imageMb(imIn)
     se = mamba.structuringElement(mamba.getDirections(grid), grid)
     i = 0
@@ -183,13 +179,10 @@ def ultimateOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
         v1 = v2
         mamba.erode(imWrk4, imWrk4, se=se)
         dilation(imWrk4, imWrk2, i)
-        mamba.sub(imWrk1, imWrk2, imWrk1)
-        _generateMask_(imWrk1, imOut1, maskIm)
-        mamba.convertByMask(maskIm, imWrk3, 0, i)
-        mamba.logic(imOut1, imWrk1, imOut1, "sup")
-        mamba.logic(imOut2, imWrk3, imOut2, "sup")
+        accumulateResidue(imWrk1, imWrk2, imOut1, imOut2, i)
         v2 = mamba.computeVolume(imWrk4)
-        mamba.copy(imWrk2, imWrk1)
+        # The current opening becomes the previous one
+        imWrk1, imWrk2 = imWrk2, imWrk1
         
 def ultimateIsotropicOpening(imIn, imOut1, imOut2, step =1, grid=mamba.DEFAULT_GRID):
     """
@@ -202,10 +195,8 @@ def ultimateIsotropicOpening(imIn, imOut1, imOut2, step =1, grid=mamba.DEFAULT_G
     Depth of 'imOut1' is the same as 'imIn', depth of 'imOut2' is 32. 
     """
 
-    maskIm = mamba.imageMb(imIn, 1)
     imWrk1 = mamba.imageMb(imIn)
     imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
     i = 0
     mamba.copy(imIn, imWrk1)
     v2 = mamba.computeVolume(imWrk1)
@@ -224,12 +215,8 @@ def ultimateIsotropicOpening(imIn, imOut1, imOut2, step =1, grid=mamba.DEFAULT_G
         iso_erosion(imWrk1, imWrk2, i)
         v2 = mamba.computeVolume(imWrk2)
         iso_dilation(imWrk2, imWrk2, i)
-        mamba.sub(imWrk1, imWrk2, imWrk1)
-        _generateMask_(imWrk1, imOut1, maskIm)
-        mamba.convertByMask(maskIm, imWrk3, 0, i)
-        mamba.logic(imOut1, imWrk1, imOut1, "sup")
-        mamba.logic(imOut2, imWrk3, imOut2, "sup")
-        mamba.copy(imWrk2, imWrk1)
+        accumulateResidue(imWrk1, imWrk2, imOut1, imOut2, i)
+        imWrk1, imWrk2 = imWrk2, imWrk1
 
 def ultimateBuildOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     """
@@ -241,10 +228,8 @@ def ultimateBuildOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     Depth of 'imOut1' is the same as 'imIn', depth of 'imOut2' is 32. 
     """
 
-    maskIm = mamba.imageMb(imIn, 1)
     imWrk1 = mamba.imageMb(imIn)
     imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
     imWrk4 = mamba.imageMb(imIn)
     se = mamba.structuringElement(mamba.getDirections(grid), grid)
     i = 0
@@ -260,13 +245,9 @@ def ultimateBuildOpening(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
         mamba.erode(imWrk4, imWrk4, se=se)
         mamba.copy(imWrk4, imWrk2)
         mamba.hierarBuild(imWrk1, imWrk2, grid=mamba.DEFAULT_GRID)
-        mamba.sub(imWrk1, imWrk2, imWrk1)
-        _generateMask_(imWrk1, imOut1, maskIm)
-        mamba.convertByMask(maskIm, imWrk3, 0, i)
-        mamba.logic(imOut1, imWrk1, imOut1, "sup")
-        mamba.logic(imOut2, imWrk3, imOut2, "sup")
+        accumulateResidue(imWrk1, imWrk2, imOut1, imOut2, i)
         v2 = mamba.computeVolume(imWrk4)
-        mamba.copy(imWrk2, imWrk1)
+        imWrk1, imWrk2 = imWrk2, imWrk1
          
 def _initialQuasiDist_(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     """
@@ -274,10 +255,8 @@ def _initialQuasiDist_(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     quasi-distance is not lipchitzian (see MM documentation for details).
     """
     
-    maskIm = mamba.imageMb(imIn, 1)
     imWrk1 = mamba.imageMb(imIn)
     imWrk2 = mamba.imageMb(imIn)
-    imWrk3 = mamba.imageMb(imIn, 32)
     se = mamba.structuringElement(mamba.getDirections(grid), grid)
     i = 0
     mamba.copy(imIn, imWrk1)
@@ -289,13 +268,8 @@ def _initialQuasiDist_(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
         i += 1
         v1 = v2
         mamba.erode(imWrk1, imWrk2, se=se)
-        mamba.sub(imWrk1, imWrk2, imWrk1)
-        _generateMask_(imWrk1, imOut1, maskIm)
-        mamba.convertByMask(maskIm, imWrk3, 0, i)
-        mamba.logic(imOut1, imWrk1, imOut1, "sup")
-        mamba.logic(imOut2, imWrk3, imOut2, "sup")
-        mamba.copy(imWrk2, imWrk1)
-        v2 = mamba.computeVolume(imWrk1)
+        v2 = accumulateResidue(imWrk1, imWrk2, imOut1, imOut2, i)
+        imWrk1, imWrk2 = imWrk2, imWrk1
        
 def quasiDistance(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID):
     """
@@ -340,16 +314,14 @@ def fullRegularisedGradient(imIn, imOut1, imOut2, grid=mamba.DEFAULT_GRID, maxSi
     value, the residue is most of the time equal to 0.
     
     Warning! 'imOut2' is a greyscale image (depth equal to 8).
+    
+    All the sizes are computed in a single sweep, the erosion and dilation of
+    size i being obtained from those of size i-1.
     """
 
-    imWrk = mamba.imageMb(imIn)
-    maskIm = mamba.imageMb(imIn, 1) 
-    imOut1.reset()
-    imOut2.reset()
-    for i in range(1, maxSize + 1):
-        mamba.regularisedGradient(imIn, imWrk, i, grid=grid)
-        _generateMask_(imWrk, imOut1, maskIm)
-        mamba.logic(imOut1, imWrk, imOut1, "sup")
-        mamba.convertByMask(maskIm, imWrk, 0, i)
-        mamba.logic(imOut2, imWrk, imOut2, "sup")
+    err = core.MB_FullRegularisedGradient(imIn.mbIm, imOut1.mbIm, imOut2.mbIm,
+                                          maxSize, grid.id)
+    mamba.raiseExceptionOnError(err)
+    imOut1.update()
+    imOut2.update()
  
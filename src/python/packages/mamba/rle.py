@@ -0,0 +1,271 @@
+"""
+Run-length encoded binary images.
+
+This module defines sparse binary images stored as lists of runs (sequences
+of set pixels inside a line) and the operators working directly on these
+runs: set operations, translation, dilation and erosion by the elementary
+hexagon or square, labelling and area measure. The cost of these operators
+depends on the number of runs instead of the size of the image, which makes
+them well suited to very large and sparse images.
+
+Run-length encoded images are converted to and from binary images with
+rleEncode and rleDecode.
+"""
+
+import array
+import mamba
+import mamba.core as core
+
+_rle_index = 1
+
+def _buffer(n):
+    # Returns a buffer of n 32-bit integers receiving the results
+    return array.array('I', [0])*n
+
+def _checkSize(rleIn1, rleIn2):
+    # Raises an exception if the two images have different sizes
+    if rleIn1.getSize()!=rleIn2.getSize():
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
+
+class rleImageMb:
+    """
+    Defines the run-length encoded binary image class.
+
+    The runs are stored in 'runs', an array of 32-bit integers holding three
+    values per run: its line, the position of its first pixel and the
+    position following its last pixel. The runs are sorted by line then by
+    position and the runs of a line neither overlap nor touch each other.
+    """
+
+    def __init__(self, *args):
+        """
+        Constructor for a run-length encoded image object (initially empty).
+
+        The constructor accepts the following arguments:
+            * rleImageMb(): will create an image of size 256x256.
+            * rleImageMb(im): will create an image using the same size as
+              'im' (a run-length encoded image or an imageMb).
+            * rleImageMb(width, height): will create an image with size
+              'width'x'height'.
+        """
+        global _rle_index
+
+        if len(args)==0:
+            self.width, self.height = 256, 256
+        elif len(args)==1:
+            self.width, self.height = args[0].getSize()
+        else:
+            self.width, self.height = args[0], args[1]
+        self.runs = array.array('I')
+        self.name = "RLE image "+str(_rle_index)
+        _rle_index = _rle_index + 1
+
+    def __repr__(self):
+        return "rleImageMb(%d,%d) with %d runs" % (self.width, self.height,
+                                                  self.getRunCount())
+
+    def getSize(self):
+        """
+        Returns the size (a tuple width and height) of the image.
+        """
+        return (self.width, self.height)
+
+    def getRunCount(self):
+        """
+        Returns the number of runs of the image.
+        """
+        return len(self.runs)//3
+
+    def getRuns(self):
+        """
+        Returns the runs of the image as a list of tuples (line, first pixel
+        position, position following the last pixel).
+        """
+        return [tuple(self.runs[i:i+3]) for i in range(0, len(self.runs), 3)]
+
+    def reset(self):
+        """
+        Empties the image.
+        """
+        self.runs = array.array('I')
+
+    def _store(self, runs, nb):
+        # Stores the 'nb' first runs of buffer 'runs'
+        del runs[3*nb:]
+        self.runs = runs
+
+def rleEncode(imIn, rleOut):
+    """
+    Encodes the binary image 'imIn' into the run-length encoded image
+    'rleOut', which takes the size of 'imIn'.
+    """
+    err, nb = core.MB_RunsCount(imIn.mbIm)
+    mamba.raiseExceptionOnError(err)
+    runs = _buffer(3*nb)
+    err, nb = core.MB_RunsExtract(imIn.mbIm, runs)
+    mamba.raiseExceptionOnError(err)
+    rleOut.width, rleOut.height = imIn.getSize()
+    rleOut._store(runs, nb)
+
+def rleDecode(rleIn, imOut):
+    """
+    Decodes the run-length encoded image 'rleIn' into the binary image 'imOut'
+    of same size.
+    """
+    _checkSize(rleIn, imOut)
+    imOut.reset()
+    err = core.MB_RunsDraw(imOut.mbIm, rleIn.runs, array.array('I'))
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+
+def rleLogic(rleIn1, rleIn2, rleOut, log):
+    """
+    Performs a set operation between the run-length encoded images 'rleIn1'
+    and 'rleIn2' and puts the result in 'rleOut'. The allowed operations in
+    'log' are:
+
+    "or" (or "sup") for the union, "and" (or "inf") for the intersection and
+    "diff" for the pixels of 'rleIn1' which are not in 'rleIn2'.
+
+    The three images must have the same size.
+    """
+    _checkSize(rleIn1, rleIn2)
+    _checkSize(rleIn1, rleOut)
+    if log=="or" or log=="sup":
+        op = core.MB_RUNS_UNION
+    elif log=="and" or log=="inf":
+        op = core.MB_RUNS_INTERSECTION
+    elif log=="diff":
+        op = core.MB_RUNS_DIFFERENCE
+    else:
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+    runs = _buffer(len(rleIn1.runs)+len(rleIn2.runs))
+    err, nb = core.MB_RunsLogic(rleIn1.runs, rleIn2.runs, op, runs)
+    mamba.raiseExceptionOnError(err)
+    rleOut._store(runs, nb)
+
+def rleNegate(rleIn, rleOut):
+    """
+    Puts the complement of the run-length encoded image 'rleIn' in 'rleOut'
+    (images of same size).
+    """
+    _checkSize(rleIn, rleOut)
+    runs = _buffer(len(rleIn.runs)+3*rleIn.height)
+    err, nb = core.MB_RunsNegate(rleIn.runs, rleIn.width, rleIn.height, runs)
+    mamba.raiseExceptionOnError(err)
+    rleOut._store(runs, nb)
+
+def rleShift(rleIn, rleOut, vector):
+    """
+    Shifts the run-length encoded image 'rleIn' by 'vector' (tuple with
+    dx,dy) and puts the result in 'rleOut' (images of same size). The
+    emptied space is left empty.
+    """
+    _checkSize(rleIn, rleOut)
+    runs = _buffer(len(rleIn.runs))
+    err, nb = core.MB_RunsShift(rleIn.runs, vector[0], vector[1],
+                                rleIn.width, rleIn.height, runs)
+    mamba.raiseExceptionOnError(err)
+    rleOut._store(runs, nb)
+
+def _frameRuns(width, height):
+    # Returns the runs of the pixels touching the edge of an image
+    runs = array.array('I', [0, 0, width])
+    for y in range(1, height-1):
+        runs.extend((y, 0, 1, y, width-1, width))
+    if height>1:
+        runs.extend((height-1, 0, width))
+    return runs
+
+def _rleGrid(se):
+    # Returns the grid of 'se', which must be the elementary hexagon or square
+    if se==mamba.HEXAGON or se==mamba.SQUARE3X3:
+        return se.getGrid()
+    mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+
+def _rleDilate(runs, width, height, grid, edge):
+    # Performs an elementary dilation of the runs
+    out = _buffer(3*len(runs))
+    err, nb = core.MB_RunsDilate(runs, width, height, grid.id, out)
+    mamba.raiseExceptionOnError(err)
+    del out[3*nb:]
+    if edge==mamba.FILLED:
+        frame = _frameRuns(width, height)
+        runs = _buffer(len(out)+len(frame))
+        err, nb = core.MB_RunsLogic(out, frame, core.MB_RUNS_UNION, runs)
+        mamba.raiseExceptionOnError(err)
+        del runs[3*nb:]
+        out = runs
+    return out
+
+def _rleNegate(runs, width, height):
+    # Returns the complement of the runs
+    out = _buffer(len(runs)+3*height)
+    err, nb = core.MB_RunsNegate(runs, width, height, out)
+    mamba.raiseExceptionOnError(err)
+    del out[3*nb:]
+    return out
+
+def rleDilate(rleIn, rleOut, n=1, se=mamba.DEFAULT_SE, edge=mamba.EMPTY):
+    """
+    Dilates the run-length encoded image 'rleIn' by the structuring element
+    'se' of size 'n' and puts the result in 'rleOut' (images of same size).
+    'se' must be HEXAGON or SQUARE3X3 (the default structuring element when
+    it is one of them).
+
+    'edge' is set to EMPTY by default.
+    """
+    _checkSize(rleIn, rleOut)
+    grid = _rleGrid(se)
+    runs = rleIn.runs
+    for i in range(n):
+        runs = _rleDilate(runs, rleIn.width, rleIn.height, grid, edge)
+    rleOut.runs = array.array('I', runs)
+
+def rleErode(rleIn, rleOut, n=1, se=mamba.DEFAULT_SE, edge=mamba.FILLED):
+    """
+    Erodes the run-length encoded image 'rleIn' by the structuring element
+    'se' of size 'n' and puts the result in 'rleOut' (images of same size).
+    'se' must be HEXAGON or SQUARE3X3 (the default structuring element when
+    it is one of them).
+
+    The erosion is computed as the complement of the dilation of the
+    complement. 'edge' is set to FILLED by default.
+    """
+    _checkSize(rleIn, rleOut)
+    grid = _rleGrid(se)
+    if edge==mamba.FILLED:
+        edgeNeg = mamba.EMPTY
+    else:
+        edgeNeg = mamba.FILLED
+    runs = _rleNegate(rleIn.runs, rleIn.width, rleIn.height)
+    for i in range(n):
+        runs = _rleDilate(runs, rleIn.width, rleIn.height, grid, edgeNeg)
+    rleOut.runs = _rleNegate(runs, rleIn.width, rleIn.height)
+
+def rleLabel(rleIn, imOut, grid=mamba.DEFAULT_GRID):
+    """
+    Labels the connected components of the run-length encoded image 'rleIn'
+    and puts the result in the 32-bit image 'imOut' of same size. The
+    components are numbered from 1 in the order of their first pixel (line
+    by line). Returns the number of connected components found.
+
+    The labelling will be performed according to the 'grid' (HEXAGONAL is
+    6-Neighbors and SQUARE is 8-Neighbors).
+    """
+    _checkSize(rleIn, imOut)
+    labels = _buffer(rleIn.getRunCount())
+    err, nbobj = core.MB_RunsLabel(rleIn.runs, grid.id, labels)
+    mamba.raiseExceptionOnError(err)
+    imOut.reset()
+    err = core.MB_RunsDraw(imOut.mbIm, rleIn.runs, labels)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+    return nbobj
+
+def rleComputeArea(rleIn):
+    """
+    Computes the area (number of pixels) of the run-length encoded image
+    'rleIn'.
+    """
+    return sum(rleIn.runs[2::3]) - sum(rleIn.runs[1::3])
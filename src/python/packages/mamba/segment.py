@@ -73,6 +73,43 @@ def basinSegment(imIn, imMarker, grid=mamba.DEFAULT_GRID, max_level=0):
     mamba.raiseExceptionOnError(err)
     imMarker.update()
 
+def markerWatershed(imIn, imMarkers, imLabel, imLine=None,
+                    grid=mamba.DEFAULT_GRID, max_level=0):
+    """
+    Segments image 'imIn' (greyscale or 32-bit) using the watershed algorithm
+    and returns, from a single flooding, the catchment basins and the
+    watershed line.
+    
+    'imMarkers' is either a binary image (its connected components are
+    labelled first) or a 32-bit image already holding the labels of the
+    markers. The labels of the catchment basins are put in 32-bit image
+    'imLabel' (which can be 'imMarkers' itself when it is a 32-bit image).
+    Contrary to watershedSegment, the last byte plane of 'imLabel' does not
+    hold the watershed line.
+    
+    If 'imLine' is given, the watershed line is put into it. When 'imLine' is
+    a binary image, it receives the watershed line. When it has the same
+    depth as 'imIn', it receives the valued watershed (the pixels of the line
+    keep their value in 'imIn', the other pixels are set to 0). 'imLine' can
+    be 'imIn' itself.
+    
+    'grid' and 'max_level' have the same meaning as in watershedSegment.
+    """
+    
+    if imMarkers.getDepth()==1:
+        label(imMarkers, imLabel, grid=grid)
+    elif imMarkers is not imLabel:
+        mamba.copy(imMarkers, imLabel)
+    if imLine is None:
+        mbLine = None
+    else:
+        mbLine = imLine.mbIm
+    err = core.MB_MarkerWatershed(imIn.mbIm, imLabel.mbIm, mbLine, max_level, grid.id)
+    mamba.raiseExceptionOnError(err)
+    imLabel.update()
+    if imLine is not None:
+        imLine.update()
+
 def markerControlledWatershed(imIn, imMarkers, imOut, grid=mamba.DEFAULT_GRID):
     """
     Marker-controlled watershed transform of greytone image 'imIn'. The binary
@@ -81,11 +118,7 @@ def markerControlledWatershed(imIn, imMarkers, imOut, grid=mamba.DEFAULT_GRID):
     """
     
     im_mark = mamba.imageMb(imIn, 32)
-    imWrk = mamba.imageMb(imIn)
-    label(imMarkers, im_mark, grid=grid)
-    watershedSegment(imIn, im_mark, grid=grid)
-    mamba.copyBytePlane(im_mark, 3, imWrk)
-    mamba.logic(imWrk, imIn, imOut, 'inf')
+    markerWatershed(imIn, imMarkers, im_mark, imOut, grid=grid)
 
 def valuedWatershed(imIn, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -10,39 +10,71 @@ as mean and median inside an image.
 import mamba
 import mamba.core as core
 
-def getHistogram(imIn):
+def _stats(imIn, imMask):
+    # Returns the statistics computed by MB_Stats over the pixels of 'imIn'
+    # that are set in 'imMask' (all the pixels when 'imMask' is None).
+    if imMask is None:
+        mbMask = None
+    else:
+        mbMask = imMask.mbIm
+    histo = 256*[0]
+    err, count, mi, ma, s, s2hi, s2lo, histo = core.MB_Stats(imIn.mbIm, mbMask, histo)
+    mamba.raiseExceptionOnError(err)
+    return (count, mi, ma, s, (s2hi<<64)|s2lo, histo)
+
+def computeStatistics(imIn, imMask=None):
+    """
+    Computes in a single pass the statistics of the pixels of image 'imIn'
+    (greyscale or 32-bit) that are set in the binary image 'imMask' (all the
+    pixels when 'imMask' is not given).
+    
+    Returns a tuple holding the number of pixels, their minimum, maximum,
+    sum and sum of squares (exact integers). The minimum and maximum are 0 when
+    no pixel is counted.
+    """
+    return _stats(imIn, imMask)[:5]
+
+def getHistogram(imIn, imMask=None):
     """
     Returns a list holding the histogram of the greyscale image 'imIn' (0 to 255).
+    
+    If 'imMask' is given, only the pixels set in this binary image are
+    counted.
     """
-    histo = 256*[0]
-    err, histo = core.MB_Histo(imIn.mbIm,histo)
-    mamba.raiseExceptionOnError(err)
-    return histo
+    if imMask is None:
+        histo = 256*[0]
+        err, histo = core.MB_Histo(imIn.mbIm,histo)
+        mamba.raiseExceptionOnError(err)
+        return histo
+    if imIn.getDepth()!=8:
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_DEPTH)
+    return _stats(imIn, imMask)[5]
 
-def getMean(imIn):
+def getMean(imIn, imMask=None):
     """
     Returns the average value (float) of the pixels of 'imIn' (which must be a
-    greyscale image).
-    """
+    greyscale or 32-bit image).
     
-    histo = mamba.getHistogram(imIn)
-    s = sum(histo)
-    t = 0
-    for i,v in enumerate(histo):
-        t = t + i*v
-    return float(t)/float(s)
+    If 'imMask' is given, only the pixels set in this binary image are
+    taken into account. At least one pixel must be taken into account.
+    """
+    count, mi, ma, s, s2 = computeStatistics(imIn, imMask)
+    if count==0:
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+    return float(s)/float(count)
 
-def getMedian(imIn):
+def getMedian(imIn, imMask=None):
     """
     Returns the median value of the pixels of 'imIn'.
 
     The median value is defined as the first pixel value for which at least
     half of the pixels are below it. 
     
-    'imIn' must be a greyscale image.
+    'imIn' must be a greyscale image. If 'imMask' is given, only the pixels
+    set in this binary image are taken into account.
     """
     
-    histo = mamba.getHistogram(imIn)
+    histo = getHistogram(imIn, imMask)
     s = sum(histo)
     t = 0
     for i,v in enumerate(histo):
@@ -51,16 +83,24 @@ def getMedian(imIn):
             break
     return i
 
-def getVariance(imIn):
+def getVariance(imIn, imMask=None):
     """
     Returns the pixels variance (estimator without bias) of image 'imIn' (which 
-    must be a greyscale image)..
+    must be a greyscale or 32-bit image).
+    
+    If 'imMask' is given, only the pixels set in this binary image are
+    taken into account. At least two pixels must be taken into account.
     """
     
-    mean = getMean(imIn)
-    histo = mamba.getHistogram(imIn)
-    s = sum(histo)
-    t = 0
-    for i,v in enumerate(histo):
-        t = t+v*(i-mean)*(i-mean)
-    return t/(s-1)
+    count, mi, ma, s, s2, histo = _stats(imIn, imMask)
+    if count<2:
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+    if imIn.getDepth()==8:
+        mean = float(s)/float(count)
+        t = 0
+        for i,v in enumerate(histo):
+            t = t+v*(i-mean)*(i-mean)
+        return t/(count-1)
+    # The sums are exact integers, the cancellation is exact before the
+    # conversion to float
+    return float(count*s2-s*s)/float(count*(count-1))
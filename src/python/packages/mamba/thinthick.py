@@ -125,6 +125,63 @@ def hitOrMiss(imIn, imOut, dse, edge=mamba.EMPTY):
     mamba.raiseExceptionOnError(err)
     imOut.update()
     
+def neighborLookup(imIn, imOut, table, grid=mamba.DEFAULT_GRID, edge=mamba.EMPTY):
+    """
+    Computes, for each pixel of binary image 'imIn', the configuration code of
+    its neighbors and replaces it by the corresponding value in 'table'. The
+    result is put in 'imOut' which can be a binary (pixels set to true where
+    the table value is not 0), 8-bit or 32-bit image.
+    
+    The code is the sum of 2**(d-1) for each direction d of 'grid' where the
+    neighbor is set to true. When 'table' contains 64 (hexagonal grid) or 256
+    (square grid) values, it is applied to the pixels set to true and the
+    other pixels are set to 0. When it contains 128 or 512 values, the value
+    of the center pixel is taken into account and adds 64 or 256 to the code.
+    For instance, a table containing the number of bits of each code gives
+    the number of neighbors of each pixel.
+    
+    Any combination of hit-or-miss patterns (see hitOrMissTable) can thus be
+    computed in a single pass.
+    
+    WARNING! 'imIn' and 'imOut' must be different images.
+    
+    'edge' value can be EMPTY or FILLED.
+    """
+    err = core.MB_BinNeighborLookup(imIn.mbIm, imOut.mbIm, table, grid.id, edge.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+    
+# Tables already computed by hitOrMissTable
+_hitOrMissTables = {}
+
+def hitOrMissTable(dseList):
+    """
+    Returns the table to use with neighborLookup to compute the union of the
+    hit-or-miss operations by the double structuring elements in 'dseList'.
+    The table contains 128 or 512 values (according to the grid of the double
+    structuring elements) set to 1 for the configurations matching at least
+    one of them.
+    """
+    
+    grid, ses = _encodeSequence(dseList)
+    nb = mamba.gridNeighbors(grid)
+    key = (nb,)+tuple(ses)
+    if key in _hitOrMissTables:
+        return list(_hitOrMissTables[key])
+    table = []
+    for code in range(2**(nb+1)):
+        # Directions are coded in the structuring elements with the center
+        # as bit 0
+        conf = ((code & (2**nb-1))<<1) | (code>>nb)
+        match = 0
+        for i in range(0, len(ses), 2):
+            if (conf & ses[i+1])==ses[i+1] and (conf & ses[i])==0:
+                match = 1
+                break
+        table.append(match)
+    _hitOrMissTables[key] = tuple(table)
+    return table
+    
 def thin(imIn, imOut, dse, edge=mamba.EMPTY):
     """
     Elementary thinning operator with 'dse' double structuring element.
@@ -151,6 +208,69 @@ def thick(imIn, imOut, dse):
     hitOrMiss(imIn, imWrk, dse, edge=mamba.EMPTY)
     mamba.logic(imIn, imWrk, imOut, "or") 
     
+def _encodeSequence(dseList):
+    # Returns the grid and the flat list of coded structuring elements of the
+    # double structuring elements in 'dseList'.
+    grid = dseList[0].getGrid()
+    ses = []
+    for dse in dseList:
+        if dse.getGrid()!=grid:
+            raise ValueError("Grid value mismatch")
+        ses.extend(dse.getCSE())
+    return grid, ses
+    
+def _rotations(dse, step=1, nb=0):
+    # Returns the list of the 'nb' successive rotations of 'dse' by 'step'
+    # (by default, the 6 or 8 rotations according to its grid).
+    if nb == 0:
+        nb = mamba.gridNeighbors(dse.getGrid())
+    dseList = []
+    for i in range(nb):
+        dseList.append(dse)
+        dse = dse.rotate(step)
+    return dseList
+    
+def thinSequence(imIn, imOut, dseList, cycles=0, edge=mamba.EMPTY):
+    """
+    Performs the thinnings of 'imIn' by the double structuring elements of
+    'dseList' one after the other (each thinning uses the result of the
+    previous one) and puts the result in 'imOut'. The whole sequence is
+    repeated 'cycles' times or until idempotence if 'cycles' is 0 (default).
+    
+    After the first steps, only the pixels whose neighborhood was modified
+    are examined again, which makes the thinnings to idempotence much faster
+    than repeated thin operations.
+    
+    All the double structuring elements must be defined on the same grid.
+    'imIn' and 'imOut' are binary images. 'edge' is set to EMPTY by default.
+    """
+    
+    grid, ses = _encodeSequence(dseList)
+    mamba.copy(imIn, imOut)
+    err = core.MB_BinThinSequence(imOut.mbIm, ses, cycles, grid.id, edge.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+    
+def thickSequence(imIn, imOut, dseList, cycles=0, edge=mamba.EMPTY):
+    """
+    Performs the thickenings of 'imIn' by the double structuring elements of
+    'dseList' one after the other (each thickening uses the result of the
+    previous one) and puts the result in 'imOut'. The whole sequence is
+    repeated 'cycles' times or until idempotence if 'cycles' is 0 (default).
+    
+    As for thinSequence, only the pixels whose neighborhood was modified are
+    examined again after the first steps.
+    
+    All the double structuring elements must be defined on the same grid.
+    'imIn' and 'imOut' are binary images. 'edge' is set to EMPTY by default.
+    """
+    
+    grid, ses = _encodeSequence(dseList)
+    mamba.copy(imIn, imOut)
+    err = core.MB_BinThickSequence(imOut.mbIm, ses, cycles, grid.id, edge.id)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
+    
 def rotatingThin(imIn, imOut, dse, edge=mamba.FILLED):
     """
     Performs a complete rotation of thinnings , the initial 'dse' double
@@ -164,20 +284,7 @@ def rotatingThin(imIn, imOut, dse, edge=mamba.FILLED):
     'edge' is set to FILLED by default (default value is EMPTY in simple thin).
     """
     
-    imWrk = mamba.imageMb(imIn)
-    if edge == mamba.FILLED:
-        mamba.negate(imIn, imOut)
-        for d in mamba.getDirections(dse.getGrid(), True):
-            hitOrMiss(imOut, imWrk, dse.flip(), edge=mamba.EMPTY)
-            mamba.logic(imWrk, imOut, imOut, "sup")
-            dse = dse.rotate()
-        mamba.negate(imOut, imOut)
-    else:
-        mamba.copy(imIn, imOut)
-        for d in mamba.getDirections(dse.getGrid(), True):
-            hitOrMiss(imOut, imWrk, dse, edge=mamba.EMPTY)
-            mamba.diff(imOut, imWrk, imOut)
-            dse = dse.rotate()
+    thinSequence(imIn, imOut, _rotations(dse), cycles=1, edge=edge)
 
 def rotatingThick(imIn, imOut, dse):
     """
@@ -192,12 +299,7 @@ def rotatingThick(imIn, imOut, dse):
     The edge is always set to EMPTY.
     """
     
-    imWrk = mamba.imageMb(imIn)
-    mamba.copy(imIn, imOut)
-    for d in mamba.getDirections(dse.getGrid(), True):
-        hitOrMiss(imOut, imWrk, dse, edge=mamba.EMPTY)
-        mamba.logic(imWrk, imOut, imOut, "sup")
-        dse = dse.rotate()
+    thickSequence(imIn, imOut, _rotations(dse), cycles=1)
 
 def infThin(imIn, imOut, dse, edge=mamba.EMPTY):
     """
@@ -249,27 +351,7 @@ def fullThin(imIn, imOut, dse, edge=mamba.EMPTY):
     'edge' is set to EMPTY by default.
     """
     
-    if edge == mamba.EMPTY:
-        imWrk = mamba.imageMb(imIn)
-        mamba.copy(imIn, imOut)
-        v1 = mamba.computeVolume(imOut)
-        v2 = 0
-        while v1 != v2:
-            v2 = v1
-            for i in range(mamba.gridNeighbors(dse.getGrid())):
-                hitOrMiss(imOut, imWrk, dse)
-                mamba.diff(imOut, imWrk, imOut)
-                dse = dse.rotate()
-            v1 = mamba.computeVolume(imOut)
-    else:
-        mamba.negate(imIn, imOut)
-        v1 = mamba.computeVolume(imOut)
-        v2 = 0
-        while v1 != v2:
-            v2 = v1
-            rotatingThick(imOut, imOut, dse.flip())
-            v1 = mamba.computeVolume(imOut)
-        mamba.negate(imOut, imOut)
+    thinSequence(imIn, imOut, _rotations(dse), edge=edge)
 
 def fullThick(imIn, imOut, dse):
     """
@@ -281,13 +363,7 @@ def fullThick(imIn, imOut, dse):
     The edge is always set to EMPTY.
     """
     
-    mamba.copy(imIn, imOut)
-    v1 = mamba.computeVolume(imOut)
-    v2 = 0
-    while v1 != v2:
-        v2 = v1
-        rotatingThick(imOut, imOut, dse)
-        v1 = mamba.computeVolume(imOut)
+    thickSequence(imIn, imOut, _rotations(dse))
 
 
 ################################################################################
@@ -443,10 +519,9 @@ def endPoints(imIn, imOut, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
     rotatingThin(imIn, imWrk1, dse2, edge=edge)
     # added to avoid blocking of the process in clipping
     mamba.diff(imIn, imWrk1, imOut)
-    for i in range(nb):
-        hitOrMiss(imWrk1, imWrk2, dse1, edge=edge)
-        mamba.logic(imOut, imWrk2, imOut, "sup")
-        dse1 = dse1.rotate(step)
+    neighborLookup(imWrk1, imWrk2, hitOrMissTable(_rotations(dse1, step, nb)),
+                   grid=grid, edge=edge)
+    mamba.logic(imOut, imWrk2, imOut, "sup")
 
 def multiplePoints(imIn, imOut, grid=mamba.DEFAULT_GRID):
     """
@@ -469,11 +544,11 @@ def multiplePoints(imIn, imOut, grid=mamba.DEFAULT_GRID):
         dse_list = [squareS1, squareS2]
         step = 2
         nb = 4
+    dseList = []
     for dse in dse_list:
-        for i in range(nb):
-            hitOrMiss(imIn, imWrk1, dse)
-            mamba.logic(imWrk1, imWrk2, imWrk2, "sup")
-            dse = dse.rotate(step)
+        dseList.extend(_rotations(dse, step, nb))
+    neighborLookup(imIn, imWrk1, hitOrMissTable(dseList), grid=grid)
+    mamba.logic(imWrk1, imWrk2, imWrk2, "sup")
     mamba.diff(imIn, imWrk2, imOut)
 
 def whiteClip(imIn, imOut, step=0, grid=mamba.DEFAULT_GRID, edge=mamba.FILLED):
@@ -555,10 +630,8 @@ def computeSKIZ(imIn, imOut, grid=mamba.DEFAULT_GRID):
     mamba.copy(imIn, imWrk)
     if grid == mamba.SQUARE:
         dse = squareS3
-        thick(imWrk, imWrk, dse)
-        thick(imWrk, imWrk, dse.rotate(2))
-        thick(imWrk, imWrk, dse.rotate(4))
-        thick(imWrk, imWrk, dse.rotate(6))
+        dseList = [dse, dse.rotate(2), dse.rotate(4), dse.rotate(6)]
+        thickSequence(imWrk, imWrk, dseList, cycles=1)
     thickM(imWrk, imWrk, grid=grid)
     blackClip(imWrk, imOut, grid=grid)
 
@@ -9,6 +9,7 @@ import mamba.core as core
 from .error import *
 
 import struct
+import array
 
 from PIL import Image
 
@@ -198,3 +199,19 @@ def convertToPILFormat(im_in):
     
     return pilim
 
+def createBuffer64(n):
+    """
+    Creates an array of 'n' unsigned 64-bit integers (set to 0) receiving
+    results from the C core.
+    
+    The array module of Python 2 has no 'Q' typecode, unsigned longs are
+    used instead. They have 64 bits except on Windows, where a ValueError is
+    raised.
+    """
+    try:
+        return array.array('Q', [0])*n
+    except ValueError:
+        buf = array.array('L', [0])*n
+        if buf.itemsize!=8:
+            raise ValueError("no array type of 64-bit integers available")
+        return buf
@@ -206,6 +206,29 @@ def mulRealConst3D(imIn, v, imOut, nearest=False, precision=2):
     for i in range(outl):
         mamba.mulRealConst(imIn[i], v, imOut[i], nearest, precision)
 
+def affineConst3D(imIn, a, b, imOut, nearest=False, precision=2):
+    """
+    Computes the affine function of 'imIn' pixel values with the real
+    constants 'a' and 'b' and puts the result in 'imOut'. The operation can
+    be sum up in the following formula:
+    
+    imOut = a * imIn + b
+    
+    'imIn' and 'imOut' can be 8-bit or 32-bit 3D images. The result is
+    saturated (limited to 0 and to the maximum value of 'imOut'). 'precision'
+    indicates the number of decimal digits taken into account for the
+    constants 'a' and 'b' (default is 2). If 'nearest' is true, the result is
+    rounded to the nearest integer value. If not (default), the result is
+    truncated.
+    """
+    outl = len(imOut)
+    inl = len(imIn)
+    if inl!=outl:
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
+    
+    for i in range(outl):
+        mamba.affineConst(imIn[i], a, b, imOut[i], nearest, precision)
+
 def negate3D(imIn, imOut):
     """
     Negates the 3D image 'imIn' and puts the result in 'imOut'.
@@ -132,6 +132,8 @@ class image3DMb:
         for position,im in enumerate(self.seq):
             err = core.MB3D_Stack(self.mb3DIm, im.mbIm, position)
             mamba.raiseExceptionOnError(err)
+            # The 3D operators write the slices without updating them
+            im.cacheable = False
             
     def _createSeq(self, w, h, d, l):
         # Creates the sequence according to the parameters
@@ -355,6 +357,7 @@ class image3DMb:
             seq.append(mamba.imageMb(self.width, self.height, depth, rgbfilter=self.rgbfilter))
             err = core.MB3D_Stack(mb3DIm, seq[-1].mbIm, i)
             mamba.raiseExceptionOnError(err)
+            seq[-1].cacheable = False
 
         err = core.MB3D_Convert(self.mb3DIm, mb3DIm)
         mamba.raiseExceptionOnError(err)
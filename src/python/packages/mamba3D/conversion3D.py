@@ -8,6 +8,7 @@ another.
 
 # Contributors : Nicolas BEUCHER
 
+import array
 import mamba3D as m3D
 import mamba
 import mamba.core as core
@@ -102,3 +103,37 @@ def lookup3D(imIn, imOut, lutable):
     for i in range(outl):
         mamba.lookup(imIn[i], imOut[i], lutable)
 
+def _remapBuffer(values):
+    # Returns 'values' unchanged if it is a buffer (array('I'), NumPy array,
+    # ...) and converted into an array of 32-bit integers otherwise.
+    if isinstance(values, array.array):
+        return values
+    try:
+        memoryview(values)
+    except TypeError:
+        return array.array('I', list(values))
+    return values
+
+def remap3D(imIn, imOut, table, default=None):
+    """
+    Remaps the values of the 32-bit 3D image 'imIn' using 'table' and puts
+    the result in 3D image 'imOut' (32-bit, greyscale or binary image).
+    
+    'table' and 'default' have the same meaning as in the remap function of
+    mamba (a dictionary selects the sparse remapping).
+    """
+    outl = len(imOut)
+    inl = len(imIn)
+    if inl!=outl:
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
+    
+    if isinstance(table, dict):
+        keys = array.array('I', list(table.keys()))
+        values = array.array('I', list(table.values()))
+        for i in range(outl):
+            mamba.remapSparse(imIn[i], imOut[i], keys, values, default)
+        return
+    table = _remapBuffer(table)
+    for i in range(outl):
+        mamba.remap(imIn[i], imOut[i], table, default)
+
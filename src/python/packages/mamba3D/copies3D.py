@@ -73,6 +73,30 @@ def cropCopy3D(imIn, posin, imOut, posout, size):
     nbPlanes = min(size[2], len(imIn) - posin[2], len(imOut) - posout[2])
     for i in range(nbPlanes):
         mamba.cropCopy(imIn[posin[2] + i], posin[0:2], imOut[posout[2] + i], posout[0:2], size[0:2])
+
+def extractSlice3D(imIn, axis, index, imOut, plane=4, maxval=0):
+    """
+    Extracts the slice of 3D image 'imIn' orthogonal to 'axis' ("X", "Y" or
+    "Z") at position 'index' along this axis and puts it in the upper left
+    corner of 2D image 'imOut'.
+    
+    The slice size is (length, height) for axis "X" (the horizontal position
+    in 'imOut' being the position in the sequence of 'imIn'), (width, length)
+    for axis "Y" and (width, height) for axis "Z". 'imOut' must be at least
+    as large as the slice.
+    
+    'imOut' can have the same depth as 'imIn' or be a greyscale image. Binary
+    values are converted to 0 and 255. For 32-bit values, 'plane' selects the
+    byte plane extracted (0 to 3) or, when set to 4, the values are downscaled
+    using 'maxval' as in the 3D conversion (give the maximum of 'imIn' to
+    obtain the same result).
+    """
+    axes = {"X": 0, "Y": 1, "Z": 2}
+    if axis not in axes:
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+    err = core.MB3D_ExtractSlice(imIn.mb3DIm, axes[axis], index, imOut.mbIm, plane, maxval)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
 	
 	
 	
@@ -8,6 +8,7 @@ operations on a 3D image. Measures include volume, range ...
 # Contributors : Nicolas BEUCHER
 
 import mamba
+import mamba.core as core
 
 def computeVolume3D(imIn):
     """
@@ -19,9 +20,8 @@ def computeVolume3D(imIn):
     Be aware that because this operator runs on 3D image, the returned value
     can be very high.
     """
-    vol = 0
-    for im2D in imIn:
-        vol += mamba.computeVolume(im2D)
+    err, vol = core.MB3D_Volume(imIn.mb3DIm)
+    mamba.raiseExceptionOnError(err)
     return vol
     
 def computeRange3D(imIn):
@@ -29,12 +29,8 @@ def computeRange3D(imIn):
     Computes the range, i.e. the minimum and maximum values, of 3D image 'imIn'.
     The values are returned in a tuple holding the minimum and the maximum.
     """
-    mav,miv = mamba.computeMaxRange(imIn[0])
-    
-    for im2D in imIn:
-        mi,ma = mamba.computeRange(im2D)
-        miv = min(mi,miv)
-        mav = max(ma,mav)
+    err, miv, mav = core.MB3D_Range(imIn.mb3DIm)
+    mamba.raiseExceptionOnError(err)
     return (miv,mav)
     
 def computeMaxRange3D(imIn):
@@ -45,3 +41,26 @@ def computeMaxRange3D(imIn):
     """
     return mamba.computeMaxRange(imIn[0])
 
+def project3D(imIn, imOut, axis="Z", operation="max"):
+    """
+    Projects 3D image 'imIn' along 'axis' ("X", "Y" or "Z") and puts the
+    result in the upper left corner of 2D image 'imOut'.
+    
+    'operation' gives how the values met along the axis are reduced: "max"
+    and "min" keep the maximum or the minimum value ('imOut' must have the
+    same depth as 'imIn'), "sum" adds the values and "count" gives the number
+    of non-zero values ('imOut' must be a 32-bit image).
+    
+    The projection size is (length, height) for axis "X" (the horizontal
+    position in 'imOut' being the position in the sequence of 'imIn'),
+    (width, length) for axis "Y" and (width, height) for axis "Z". 'imOut'
+    must be at least as large as the projection.
+    """
+    axes = {"X": 0, "Y": 1, "Z": 2}
+    operations = {"max": core.MB3D_PROJ_MAX, "min": core.MB3D_PROJ_MIN,
+                  "sum": core.MB3D_PROJ_SUM, "count": core.MB3D_PROJ_COUNT}
+    if axis not in axes or operation not in operations:
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+    err = core.MB3D_Project(imIn.mb3DIm, axes[axis], operations[operation], imOut.mbIm)
+    mamba.raiseExceptionOnError(err)
+    imOut.update()
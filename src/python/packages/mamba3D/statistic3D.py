@@ -9,43 +9,82 @@ as mean and median inside a 3D image.
 
 import mamba3D as m3D
 import mamba
+import mamba.core as core
 
-def getHistogram3D(imIn):
+def _slices(imIn, imMask):
+    # Returns the list of (slice, mask slice) couples of 3D images 'imIn'
+    # and 'imMask' (mask slices are None when 'imMask' is None).
+    if imMask is None:
+        return [(im2D, None) for im2D in imIn]
+    if imMask.getSize()!=imIn.getSize():
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_SIZE)
+    return [(imIn[i], imMask[i]) for i in range(len(imIn))]
+
+def computeStatistics3D(imIn, imMask=None):
+    """
+    Computes the statistics of the pixels of 3D image 'imIn' (greyscale or
+    32-bit) that are set in the binary 3D image 'imMask' (all the pixels
+    when 'imMask' is not given).
+    
+    Returns a tuple holding the number of pixels, their minimum, maximum,
+    sum and sum of squares (exact integers). The minimum and maximum are 0 when
+    no pixel is counted.
+    """
+    count = 0
+    mi = 0
+    ma = 0
+    s = 0
+    s2 = 0
+    for im2D, mask2D in _slices(imIn, imMask):
+        c, smi, sma, ss, ss2 = mamba.computeStatistics(im2D, mask2D)
+        if c!=0:
+            mi = smi if count==0 else min(mi, smi)
+            ma = sma if count==0 else max(ma, sma)
+            count += c
+            s += ss
+            s2 += ss2
+    return (count, mi, ma, s, s2)
+
+def getHistogram3D(imIn, imMask=None):
     """
     Returns a list holding the histogram of the greyscale 3D image 'imIn'
     (0 to 255).
+    
+    If 'imMask' is given, only the pixels set in this binary 3D image are
+    counted.
     """
     histo = 256*[0]
-    for im2D in imIn:
-        hist_im = mamba.getHistogram(im2D)
+    for im2D, mask2D in _slices(imIn, imMask):
+        hist_im = mamba.getHistogram(im2D, mask2D)
         for i in range(256):
             histo[i] += hist_im[i]
     return histo
 
-def getMean3D(imIn):
+def getMean3D(imIn, imMask=None):
     """
     Returns the average value (float) of the pixels of 'imIn' (which must be a
-    greyscale 3D image).
-    """
+    greyscale or 32-bit 3D image).
     
-    histo = getHistogram3D(imIn)
-    s = sum(histo)
-    t = 0
-    for i,v in enumerate(histo):
-        t = t + i*v
-    return float(t)/float(s)
+    If 'imMask' is given, only the pixels set in this binary 3D image are
+    taken into account. At least one pixel must be taken into account.
+    """
+    count, mi, ma, s, s2 = computeStatistics3D(imIn, imMask)
+    if count==0:
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+    return float(s)/float(count)
 
-def getMedian3D(imIn):
+def getMedian3D(imIn, imMask=None):
     """
     Returns the median value of the pixels of 'imIn'.
 
     The median value is defined as the first pixel value for which at least
     half of the pixels are below it. 
     
-    'imIn' must be a greyscale 3D image.
+    'imIn' must be a greyscale 3D image. If 'imMask' is given, only the
+    pixels set in this binary 3D image are taken into account.
     """
     
-    histo = getHistogram3D(imIn)
+    histo = getHistogram3D(imIn, imMask)
     s = sum(histo)
     t = 0
     for i,v in enumerate(histo):
@@ -54,16 +93,31 @@ def getMedian3D(imIn):
             break
     return i
 
-def getVariance3D(imIn):
+def getVariance3D(imIn, imMask=None):
     """
     Returns the pixels variance (estimator without bias) of 3D image 'imIn'
-    (which must be a greyscale image).
+    (which must be a greyscale or 32-bit image).
+    
+    If 'imMask' is given, only the pixels set in this binary 3D image are
+    taken into account. At least two pixels must be taken into account.
     """
     
-    mean = getMean3D(imIn)
-    histo = getHistogram3D(imIn)
-    s = sum(histo)
-    t = 0
-    for i,v in enumerate(histo):
-        t = t+v*(i-mean)*(i-mean)
-    return t/(s-1)
+    if imIn.getDepth()==8:
+        histo = getHistogram3D(imIn, imMask)
+        count = sum(histo)
+        if count<2:
+            mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+        s = 0
+        for i,v in enumerate(histo):
+            s = s + i*v
+        mean = float(s)/float(count)
+        t = 0
+        for i,v in enumerate(histo):
+            t = t+v*(i-mean)*(i-mean)
+        return t/(count-1)
+    count, mi, ma, s, s2 = computeStatistics3D(imIn, imMask)
+    if count<2:
+        mamba.raiseExceptionOnError(core.MB_ERR_BAD_PARAMETER)
+    # The sums are exact integers, the cancellation is exact before the
+    # conversion to float
+    return float(count*s2-s*s)/float(count*(count-1))
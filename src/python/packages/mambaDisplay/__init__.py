@@ -146,6 +146,17 @@ def setMinDisplay(size):
     constants._MINW = size[0]
     constants._MINH = size[1]
     
+def setRefreshRate(rate):
+    """
+    Sets the maximum number of times per second ('rate') a display window is
+    refreshed when its image is modified. Successive modifications occurring
+    in between are merged into a single refresh. This prevents the display
+    from slowing down the computations. A 'rate' of 0 refreshes the window
+    on every modification.
+    """
+    
+    constants._REFRESH_RATE = rate
+    
 def tidyDisplays():
     """
     Tidies the displayed images.
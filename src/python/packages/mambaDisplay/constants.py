@@ -7,3 +7,6 @@ _icon_max_size = 64
 _MAX = 512
 _MIN = 256
 
+# Maximum number of refreshes per second of a display window (0 means that
+# every update is displayed immediately)
+_REFRESH_RATE = 10
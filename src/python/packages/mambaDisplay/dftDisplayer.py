@@ -3,11 +3,13 @@ This module defines a displayer.
 """
 
 import weakref
+import time
 
 import mamba
 import mamba3D
 
 import mambaDisplay
+from . import constants
 from . import display2D
 from . import display3D
 
@@ -31,6 +33,9 @@ class DftDisplayer(mambaDisplay.Displayer):
     
     def __init__(self):
         self.windows = {}
+        # Time of the last refresh and pending refresh of each window
+        self.refreshed = {}
+        self.pending = {}
         self.root = tk.Tk()
         self.root.withdraw()
         self.screen_size = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
@@ -69,6 +74,7 @@ class DftDisplayer(mambaDisplay.Displayer):
         
     def showWindow(self, wKey, **options):
         # Displays the window identified by 'key'.
+        self._flushRefreshes()
         self.windows[wKey].show(**options)
         self.root.update()
         # Storing the standard geometry.
@@ -83,12 +89,58 @@ class DftDisplayer(mambaDisplay.Displayer):
             self.windows[wKey].freeze()
         elif ctrl=="UNFREEZE":
             self.windows[wKey].unfreeze()
+        self._flushRefreshes()
         self.root.update()
        
     def updateWindow(self, wKey):
         # Updates the window identified by 'wkey'.
-        self.windows[wKey].updateim()
+        # The refreshes are limited to constants._REFRESH_RATE per second, an
+        # update occurring too soon after the previous refresh is postponed
+        # using a Tk timer. Successive postponed updates are merged.
+        # As the Tk mainloop is not running, the timers only fire when the
+        # displayer processes the Tk events: the postponed refreshes are also
+        # performed by the next refresh of any window or call to showWindow
+        # and controlWindow.
+        if constants._REFRESH_RATE<=0:
+            self.windows[wKey].updateim()
+            self.root.update()
+            return
+        period = 1.0/constants._REFRESH_RATE
+        elapsed = time.time() - self.refreshed.get(wKey, 0.0)
+        if elapsed>=period:
+            self._cancelRefresh(wKey)
+            self._refresh(wKey)
+            self._flushRefreshes()
+        elif wKey not in self.pending:
+            delay = int(1000*(period-elapsed))+1
+            self.pending[wKey] = self.root.after(delay, self._postponedRefresh, wKey)
+        # Processing the events runs the timers that are due
         self.root.update()
+            
+    def _refresh(self, wKey):
+        # Refreshes the window identified by 'wkey'.
+        self.refreshed[wKey] = time.time()
+        self.windows[wKey].updateim()
+        
+    def _postponedRefresh(self, wKey):
+        # Timer callback performing a postponed refresh.
+        del(self.pending[wKey])
+        if wKey in self.windows:
+            self._refresh(wKey)
+            self.root.update_idletasks()
+            
+    def _flushRefreshes(self):
+        # Performs all the postponed refreshes immediately.
+        for wKey in list(self.pending.keys()):
+            self._cancelRefresh(wKey)
+            if wKey in self.windows:
+                self._refresh(wKey)
+            
+    def _cancelRefresh(self, wKey):
+        # Cancels the postponed refresh of the window identified by 'wkey'.
+        if wKey in self.pending:
+            self.root.after_cancel(self.pending[wKey])
+            del(self.pending[wKey])
        
     def hideWindow(self, wKey):
         # Hides the window identified by 'wkey'.
@@ -97,6 +149,8 @@ class DftDisplayer(mambaDisplay.Displayer):
 
     def destroyWindow(self, wKey):
         # Destroys the window identified by 'wkey'.
+        self._cancelRefresh(wKey)
+        self.refreshed.pop(wKey, None)
         self.windows[wKey].destroy()
         del(self.windows[wKey])
         
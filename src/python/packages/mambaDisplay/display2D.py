@@ -99,6 +99,8 @@ class Display2D(tk.Toplevel):
         self.mouse_y = 0
         self.std_geometry = ""
         self.palname = ""
+        self.volume = None
+        self.im8 = None
         
         # Context menu
         self.createContextMenu()
@@ -154,6 +156,7 @@ class Display2D(tk.Toplevel):
     def focusEvent(self, event):
         # The window is activated.
         self.updateim()
+        self.showVolume()
         
     def resizeEvent(self, event):
         # Handles the resizing of the display window.
@@ -182,6 +185,7 @@ class Display2D(tk.Toplevel):
         y = int((float(y)/self.dsize[1])*self.osize[1])
         v = str(self.im_ref().getPixel((x,y)))
         self.infos[2].set("At ("+str(x)+","+str(y)+") = "+v)
+        self.showVolume()
         
         if event.state&0x0100==0x0100 :
             if not self.dsize[0] <= self.csize[0]:
@@ -346,7 +350,7 @@ class Display2D(tk.Toplevel):
         # Pastes the image obtained in the clipboard.
         err = core.MB_Convert(self._im_to_paste, self.im_ref().mbIm)
         raiseExceptionOnError(err)
-        self.updateim()
+        self.im_ref().update()
         del(self._im_to_paste)
         self._im_to_paste = None
         
@@ -359,7 +363,12 @@ class Display2D(tk.Toplevel):
         self.dsize[0] = int(self.zoom*self.osize[0])
         self.dsize[1] = int(self.zoom*self.osize[1])
         self.canvas.config(scrollregion=(0,0,self.dsize[0]-1,self.dsize[1]-1))
-        self.drawImage()
+        if zoom!=oz and (zoom<1.0 or oz<1.0) and not self.frozen:
+            # The PIL/PILLOW image is downsampled for zooms below 1, it
+            # must be converted again at the new resolution.
+            self.updateim()
+        else:
+            self.drawImage()
         
         # For a zoom of only one, the scrollbar is removed.
         if self.dsize[0] <= self.csize[0]:
@@ -403,29 +412,70 @@ class Display2D(tk.Toplevel):
     def updateim(self):
         # Updates the display with the new contents of the mamba image.
         if self.im_ref() and self.state()=="normal" and not self.frozen:
-            if self.im_ref().getDepth()==32:
-                im = mamba.imageMb(self.im_ref(), 8)
-                if self.bplane==4:
-                    mamba.convert(self.im_ref(), im)
-                    self.infos[1].set("plane : all")
-                else:
-                    mamba.copyBytePlane(self.im_ref(),self.bplane,im)
-                    self.infos[1].set("plane : %d" % (self.bplane))
-                self.pilImage = utils.convertToPILFormat(im.mbIm)
-            else:
-                self.infos[1].set("")
-                self.pilImage = utils.convertToPILFormat(self.im_ref().mbIm)
+            self.pilImage = self.convertImage()
             if self.palname:
                 self.pilImage.putpalette(palette.getPalette(self.palname))
-            volume = mamba.computeVolume(self.im_ref())
-            self.infos[0].set("volume : "+str(volume))
+            # The volume is only computed when needed (see showVolume)
+            self.volume = None
+            self.infos[0].set("volume : -")
             self.icon = ImageTk.PhotoImage(self.pilImage.resize(self.icon_size, Image.NEAREST))
             self.tk.call('wm','iconphoto', self._w, self.icon)
             self.drawImage()
+            
+    def convertImage(self):
+        # Converts the mamba image into a greyscale PIL/PILLOW image. When the
+        # image is displayed with a zoom below 1, the image is downsampled
+        # before the conversion of its pixel values.
+        im = self.im_ref()
+        depth = im.getDepth()
+        if self.zoom<1.0:
+            size = (max(int(self.zoom*self.osize[0]),1),
+                    max(int(self.zoom*self.osize[1]),1))
+        else:
+            size = None
+        if depth==32:
+            data = im.extractRaw()
+            if self.bplane==4:
+                self.infos[1].set("plane : all")
+                mx = mamba.computeRange(im)[1]
+                pilim = Image.frombytes("F", self.osize, data, "raw", "F;32")
+                if size:
+                    pilim = pilim.resize(size, Image.NEAREST)
+                if mx>=256:
+                    pilim = pilim.point(lambda v: v*(255.0/mx))
+                pilim = pilim.convert("L")
+            else:
+                self.infos[1].set("plane : %d" % (self.bplane))
+                pilim = Image.frombytes("RGBA", self.osize, data)
+                if size:
+                    pilim = pilim.resize(size, Image.NEAREST)
+                pilim = pilim.getchannel(self.bplane)
+        else:
+            self.infos[1].set("")
+            if depth==1:
+                if self.im8==None:
+                    self.im8 = mamba.imageMb(im, 8)
+                mamba.convert(im, self.im8)
+                data = self.im8.extractRaw()
+            else:
+                data = im.extractRaw()
+            pilim = Image.frombytes("L", self.osize, data)
+            if size:
+                pilim = pilim.resize(size, Image.NEAREST)
+        return pilim
+        
+    def showVolume(self):
+        # Computes the volume of the image if it was not computed since the
+        # last update and displays it into the info bar.
+        if self.volume==None and self.im_ref():
+            self.volume = mamba.computeVolume(self.im_ref())
+            self.infos[0].set("volume : "+str(self.volume))
         
     def connect(self, im_ref):
         # "Connects" the window to a mamba image.
         self.im_ref = im_ref
+        # The binary conversion buffer belongs to the previous image.
+        self.im8 = None
         
         # Size of the image, canvas and display
         self.osize = list(self.im_ref().getSize())
@@ -258,7 +258,9 @@ class Display3D_Proj(tk.Frame):
         self.x = 0
         self.y = 0
         self.z = 0
-        self.raw = ""
+        self.ready = False
+        self.plane = 4
+        self.maxval = 0
         self.im_ref = None
         
     # Events handling ##########################################################
@@ -269,21 +271,21 @@ class Display3D_Proj(tk.Frame):
             if plane=="plane Z":
                 self.x = u
                 self.y = v
-                if self.raw:
+                if self.ready:
                     self.planez.drawTarget(self.x, self.y)
                     self.setImagePlaneY()
                     self.setImagePlaneX()
             elif plane=="plane Y":
                 self.x = u
                 self.z = v
-                if self.raw:
+                if self.ready:
                     self.planey.drawTarget(self.x, self.z)
                     self.setImagePlaneZ()
                     self.setImagePlaneX()
             elif plane=="plane X":
                 self.z = u
                 self.y = v
-                if self.raw:
+                if self.ready:
                     self.planex.drawTarget(self.z, self.y)
                     self.setImagePlaneY()
                     self.setImagePlaneZ()
@@ -303,35 +305,32 @@ class Display3D_Proj(tk.Frame):
         
     # Display methods ##########################################################
     
-    def setImagePlaneZ(self):
-        # Extracts the image for plane Z
-        start = self.z*self.W*self.H
-        stop = (self.z+1)*self.W*self.H
-        im = Image.frombytes("L", (self.W,self.H), self.raw[start:stop])
+    def getSlice(self, axis, index, imSlice, size):
+        # Extracts the slice along the given axis at position index from the
+        # 3D image and returns it as a PIL image
+        m3D.extractSlice3D(self.im_ref(), axis, index, imSlice,
+                           self.plane, self.maxval)
+        im = Image.frombytes("L", imSlice.getSize(), imSlice.extractRaw())
+        im = im.crop((0, 0, size[0], size[1]))
         if self.master.palname:
             im.putpalette(palette.getPalette(self.master.palname))
+        return im
+    
+    def setImagePlaneZ(self):
+        # Extracts the image for plane Z
+        im = self.getSlice("Z", self.z, self.slicez, (self.W,self.H))
         self.planez.display(im)
         self.planez.drawTarget(self.x, self.y)
         
     def setImagePlaneY(self):
         # Extracts the image for plane Y
-        data = b""
-        for i in range(self.L):
-            start = self.W*(self.y+self.H*i)
-            data += self.raw[start:start+self.W]
-        im = Image.frombytes("L", (self.W,self.L), data)
-        if self.master.palname:
-            im.putpalette(palette.getPalette(self.master.palname))
+        im = self.getSlice("Y", self.y, self.slicey, (self.W,self.L))
         self.planey.display(im)
         self.planey.drawTarget(self.x, self.z)
         
     def setImagePlaneX(self):
         # Extracts the image for plane X
-        im = Image.frombytes("L", (self.H,self.L), self.raw[self.x::self.W])
-        im = im.transpose(Image.FLIP_TOP_BOTTOM)
-        im = im.transpose(Image.ROTATE_270)
-        if self.master.palname:
-            im.putpalette(palette.getPalette(self.master.palname))
+        im = self.getSlice("X", self.x, self.slicex, (self.L,self.H))
         self.planex.display(im)
         self.planex.drawTarget(self.z, self.y)
     
@@ -341,6 +340,10 @@ class Display3D_Proj(tk.Frame):
         # Connection of the 3D image to the display
         self.im_ref = im_ref
         self.W, self.H, self.L = self.im_ref().getSize()
+        # 2D greyscale images receiving the extracted slices
+        self.slicez = mamba.imageMb(self.W, self.H, 8)
+        self.slicey = mamba.imageMb(self.W, self.L, 8)
+        self.slicex = mamba.imageMb(self.L, self.H, 8)
         imsize = [self.W, self.H, self.L]
         zoom = 1.0
         while imsize[0]<constants._MIN or imsize[1]<constants._MIN or imsize[2]<constants._MIN:
@@ -375,37 +378,21 @@ class Display3D_Proj(tk.Frame):
     def updateim(self):
         # Updates the display (perform a rendering)
         depth = self.im_ref().getDepth()
-        volume = 0
-        if depth==1:
-            # binary 3D image
-            self.planeLabel.config(text="")
-            im8 = mamba.imageMb(self.W, self.H, 8)
-            self.raw = b""
-            for im2D in self.im_ref():
-                mamba.convert(im2D, im8)
-                self.raw += im8.extractRaw()
-                volume += mamba.computeVolume(im2D)
-        elif depth==32:
+        self.plane = 4
+        self.maxval = 0
+        if depth==32:
             # 32-bit 3D image
             if self.master.bplane==4:
                 self.planeLabel.config(text="Plane : all")
-                im3D_8 = m3D.image3DMb(self.im_ref(), 8)
-                m3D.convert3D(self.im_ref(), im3D_8)
-                self.raw = im3D_8.extractRaw()
-                volume = m3D.computeVolume3D(self.im_ref())
+                self.maxval = m3D.computeRange3D(self.im_ref())[1]
             else:
                 self.planeLabel.config(text="Plane : %d" % (self.master.bplane))
-                im8 = mamba.imageMb(self.W, self.H, 8)
-                self.raw = b""
-                for im2D in self.im_ref():
-                    mamba.copyBytePlane(im2D, self.master.bplane, im8)
-                    self.raw += im8.extractRaw()
-                    volume += mamba.computeVolume(im2D)
+                self.plane = self.master.bplane
         else:
-            # Greyscale image
+            # Binary or greyscale image
             self.planeLabel.config(text="")
-            self.raw = self.im_ref().extractRaw()
-            volume = m3D.computeVolume3D(self.im_ref())
+        volume = m3D.computeVolume3D(self.im_ref())
+        self.ready = True
         self.setImagePlaneZ()
         self.setImagePlaneY()
         self.setImagePlaneX()
@@ -358,6 +358,10 @@ class _imageSegment(tk.Toplevel):
         self.imOut = imOut
         self.imWrk = mamba.imageMb(imIn, 8)
         mamba.convert(imIn, self.imWrk)
+        # The gradient does not change while markers are added, it is
+        # computed once
+        self.imGrad = mamba.imageMb(imIn)
+        mamba.gradient(imIn, self.imGrad)
         self.markers = []
         self.body()
         self.grab_set()
@@ -602,7 +606,6 @@ class _imageSegment(tk.Toplevel):
         # Updates the display with the new contents of the mamba image.
         self.imOut.reset()
         if self.markers:
-            im1 = mamba.imageMb(self.imIn)
             im2 = mamba.imageMb(self.imIn, 8)
             # Putting the markers
             for i,pixel in enumerate(self.markers):
@@ -611,9 +614,8 @@ class _imageSegment(tk.Toplevel):
                 else:
                     for pi in range(0,len(pixel)-2,2):
                         mamba.drawLine(self.imOut, pixel[pi:pi+4], i+1)
-            # Computing the gradient
-            mamba.gradient(self.imIn, im1)
-            mamba.watershedSegment(im1, self.imOut)
+            # Segmenting the gradient
+            mamba.watershedSegment(self.imGrad, self.imOut)
             mamba.copyBytePlane(self.imOut, 3, self.imWrk)
             mamba.convert(self.imIn, im2)
             mamba.subConst(im2, 2, im2)
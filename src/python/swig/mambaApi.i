@@ -33,6 +33,70 @@
 /* Inclusion inside the c file wrapper created by swig*/
 %{
 #include "mamba/mamba.h"
+
+/* Gets the contiguous buffer of integers of size 'itemsize' (with a format
+ * in 'formats') exported by 'obj', without copying its values. The arrays of
+ * Python 2 only export the old buffer interface, their typecode is checked
+ * instead of the format. Returns 0 if successful. */
+static int MB_GetIntBuffer(PyObject *obj, Py_buffer *view, int writable,
+                           Py_ssize_t itemsize, const char *formats)
+{
+    char fmt;
+    int flags = PyBUF_C_CONTIGUOUS|PyBUF_FORMAT;
+#if PY_MAJOR_VERSION < 3
+    PyObject *typecode, *size;
+    Py_ssize_t len;
+    void *buf;
+    int ok;
+#endif
+
+    if (writable) {
+        flags |= PyBUF_WRITABLE;
+    }
+    if (PyObject_GetBuffer(obj, view, flags)==0) {
+        /* Native or little-endian integers are accepted */
+        fmt = (view->format==NULL) ? 0 : view->format[0];
+        if (fmt=='@' || fmt=='=' || fmt=='<') {
+            fmt = view->format[1];
+        }
+        if (view->itemsize==itemsize && fmt!=0 && strchr(formats, fmt)!=NULL) {
+            return 0;
+        }
+        PyBuffer_Release(view);
+    }
+#if PY_MAJOR_VERSION < 3
+    else {
+        PyErr_Clear();
+        typecode = PyObject_GetAttrString(obj, "typecode");
+        size = PyObject_GetAttrString(obj, "itemsize");
+        ok = typecode!=NULL && size!=NULL && PyString_Check(typecode) &&
+             PyString_Size(typecode)==1 &&
+             strchr(formats, PyString_AsString(typecode)[0])!=NULL &&
+             PyInt_AsLong(size)==itemsize;
+        Py_XDECREF(typecode);
+        Py_XDECREF(size);
+        PyErr_Clear();
+        if (ok) {
+            if (writable) {
+                ok = PyObject_AsWriteBuffer(obj, &buf, &len)==0;
+            } else {
+                ok = PyObject_AsReadBuffer(obj, (const void **) &buf, &len)==0;
+            }
+            if (ok) {
+                view->obj = NULL;
+                view->buf = buf;
+                view->len = len;
+                view->itemsize = itemsize;
+                return 0;
+            }
+        }
+    }
+#endif
+    PyErr_Clear();
+    PyErr_Format(PyExc_TypeError, "expecting a buffer of %d-bit integers",
+                 (int) (8*itemsize));
+    return -1;
+}
 %}
 
 /* Typemaps definition */
@@ -80,6 +144,188 @@
     free((Uint32 *) $1);
 }
 
+%typemap(in) (Sint32 *pcoords, Uint32 nb_coords) {
+    int i, size;
+    
+    if (!PySequence_Check($input)) {
+        PyErr_SetString(PyExc_TypeError,"not a sequence");
+        return NULL;
+    }
+    size = PySequence_Size($input);
+    $1 = (Sint32 *) malloc((size+1)*sizeof(Sint32));
+    for (i = 0; i < size; i++) {
+        PyObject *o = PySequence_GetItem($input,i);
+        if (PyInt_Check(o)) {
+            $1[i] = (Sint32) PyInt_AsLong(o);
+            Py_DECREF(o);
+        } else {
+            PyErr_SetString(PyExc_TypeError,"sequence must contain integer");
+            Py_DECREF(o);
+            free($1);
+            return NULL;
+        }
+    }
+    $2 = (Uint32) size;
+}
+
+%typemap(freearg) (Sint32 *pcoords, Uint32 nb_coords) {
+    free((Sint32 *) $1);
+}
+
+%typemap(in) (Uint32 *pvalues, Uint32 nb_values) {
+    int i, size;
+    
+    if (!PySequence_Check($input)) {
+        PyErr_SetString(PyExc_TypeError,"not a sequence");
+        return NULL;
+    }
+    size = PySequence_Size($input);
+    $1 = (Uint32 *) malloc((size+1)*sizeof(Uint32));
+    for (i = 0; i < size; i++) {
+        PyObject *o = PySequence_GetItem($input,i);
+        if (PyInt_Check(o)) {
+            $1[i] = (Uint32) PyLong_AsUnsignedLongMask(o);
+            Py_DECREF(o);
+        } else {
+            PyErr_SetString(PyExc_TypeError,"sequence must contain integer");
+            Py_DECREF(o);
+            free($1);
+            return NULL;
+        }
+    }
+    $2 = (Uint32) size;
+}
+
+%typemap(freearg) (Uint32 *pvalues, Uint32 nb_values) {
+    free((Uint32 *) $1);
+}
+
+%apply (Uint32 *pvalues, Uint32 nb_values) {(Uint32 *pses, Uint32 nb_ses)};
+%apply (Uint32 *pvalues, Uint32 nb_values) {(Uint32 *ptable, Uint32 nb_values)};
+
+/* Contiguous buffers of 32-bit integers (array('I'), NumPy arrays, ...) are
+ * used directly, without copying their values */
+%typemap(arginit) (Uint32 *pbuffer, Uint32 nb_buffer) {
+    view$argnum.obj = NULL;
+}
+
+%typemap(in) (Uint32 *pbuffer, Uint32 nb_buffer) (Py_buffer view) {
+    if (MB_GetIntBuffer($input, &view, 0, 4, "IiLl")!=0) {
+        SWIG_fail;
+    }
+    $1 = (Uint32 *) view.buf;
+    $2 = (Uint32) (view.len/4);
+}
+
+%typemap(freearg) (Uint32 *pbuffer, Uint32 nb_buffer) {
+    PyBuffer_Release(&view$argnum);
+}
+
+%apply (Uint32 *pbuffer, Uint32 nb_buffer) {(Uint32 *plut, Uint32 nb_lut)};
+%apply (Uint32 *pbuffer, Uint32 nb_buffer) {(Uint32 *pkeys, Uint32 nb_keys)};
+%apply (Uint32 *pbuffer, Uint32 nb_buffer) {(Uint32 *pmapped, Uint32 nb_mapped)};
+%apply (Uint32 *pbuffer, Uint32 nb_buffer) {(Uint32 *pruns, Uint32 len_runs)};
+%apply (Uint32 *pbuffer, Uint32 nb_buffer) {(Uint32 *pruns2, Uint32 len_runs2)};
+%apply (Uint32 *pbuffer, Uint32 nb_buffer) {(Uint32 *pvals, Uint32 len_vals)};
+%apply (Uint32 *pbuffer, Uint32 nb_buffer) {(Uint32 *ppos, Uint32 len_pos)};
+%apply (Uint32 *pbuffer, Uint32 nb_buffer) {(Uint32 *psrcpos, Uint32 len_srcpos)};
+%apply (Uint32 *pbuffer, Uint32 nb_buffer) {(Uint32 *pdestpos, Uint32 len_destpos)};
+%apply (Uint32 *pbuffer, Uint32 nb_buffer) {(Uint32 *psegs, Uint32 len_segs)};
+
+/* Writable contiguous buffers of 32-bit integers receive the results */
+%typemap(arginit) (Uint32 *poutbuf, Uint32 nb_outbuf) {
+    view$argnum.obj = NULL;
+}
+
+%typemap(in) (Uint32 *poutbuf, Uint32 nb_outbuf) (Py_buffer view) {
+    if (MB_GetIntBuffer($input, &view, 1, 4, "IiLl")!=0) {
+        SWIG_fail;
+    }
+    $1 = (Uint32 *) view.buf;
+    $2 = (Uint32) (view.len/4);
+}
+
+%typemap(freearg) (Uint32 *poutbuf, Uint32 nb_outbuf) {
+    PyBuffer_Release(&view$argnum);
+}
+
+%apply (Uint32 *poutbuf, Uint32 nb_outbuf) {(Uint32 *pout, Uint32 len_out)};
+
+/* Writable contiguous buffers of 64-bit integers (array('Q'), ...) */
+%typemap(arginit) (Uint64 *pout64, Uint32 len_out64) {
+    view$argnum.obj = NULL;
+}
+
+%typemap(in) (Uint64 *pout64, Uint32 len_out64) (Py_buffer view) {
+    if (MB_GetIntBuffer($input, &view, 1, 8, "QqLl")!=0) {
+        SWIG_fail;
+    }
+    $1 = (Uint64 *) view.buf;
+    $2 = (Uint32) (view.len/8);
+}
+
+%typemap(freearg) (Uint64 *pout64, Uint32 len_out64) {
+    PyBuffer_Release(&view$argnum);
+}
+
+%typemap(in) (Sint32 *ppoints, Uint32 nb_points, Uint32 *ppixels) {
+    int i, size;
+    
+    if (!PySequence_Check($input)) {
+        PyErr_SetString(PyExc_TypeError,"not a sequence");
+        return NULL;
+    }
+    size = PySequence_Size($input);
+    $1 = (Sint32 *) malloc((size+1)*sizeof(Sint32));
+    for (i = 0; i < size; i++) {
+        PyObject *o = PySequence_GetItem($input,i);
+        if (PyInt_Check(o)) {
+            $1[i] = (Sint32) PyInt_AsLong(o);
+            Py_DECREF(o);
+        } else {
+            PyErr_SetString(PyExc_TypeError,"sequence must contain integer");
+            Py_DECREF(o);
+            free($1);
+            return NULL;
+        }
+    }
+    $2 = (Uint32) size;
+    $3 = (Uint32 *) malloc((size/2+1)*sizeof(Uint32));
+}
+
+%typemap(argout) (Sint32 *ppoints, Uint32 nb_points, Uint32 *ppixels) {
+    PyObject *o, *o2, *o3;
+    int i;
+    
+    o = PyList_New($2/2);
+    for(i=0;i<(int)($2/2);i++) {
+        PyList_SetItem(o,i,PyLong_FromUnsignedLong((unsigned long) $3[i]));
+    }
+    if ((!$result) || ($result == Py_None)) {
+        $result = o;
+    } else if (PyList_Check($result)) {
+        PyList_Append($result,o);
+        Py_DECREF(o);
+    } else {
+        if (!PyTuple_Check($result)) {
+            PyObject *o2 = $result;
+            $result = PyTuple_New(1);
+            PyTuple_SetItem($result,0,o2);
+        }
+        o3 = PyTuple_New(1);
+        PyTuple_SetItem(o3,0,o);
+        o2 = $result;
+        $result = PySequence_Concat(o2,o3);
+        Py_DECREF(o2);
+        Py_DECREF(o3);
+    }
+}
+
+%typemap(freearg) (Sint32 *ppoints, Uint32 nb_points, Uint32 *ppixels) {
+    free((Sint32 *) $1);
+    free((Uint32 *) $3);
+}
+
 %typemap(in,numinputs=0) (PIX8 **outdata, Uint32 *len) (PIX8 * temp, Uint32 len) {
     $1 = &temp;
     $2 = &len;
@@ -149,6 +395,10 @@
     }
     if ((!$result) || ($result == Py_None)) {
         $result = o;
+    } else if (PyList_Check($result)) {
+        /* Other output values were already appended to the result */
+        PyList_Append($result,o);
+        Py_DECREF(o);
     } else {
         if (!PyTuple_Check($result)) {
             PyObject *o2 = $result;
@@ -167,10 +417,15 @@
 %apply int *OUTPUT {Sint32 *px, Sint32 *py};
 %apply unsigned int *OUTPUT {Uint32 *min, Uint32 *max};
 %apply unsigned long long *OUTPUT {Uint64 *pVolume};
+%apply unsigned long long *OUTPUT {Uint64 *pCount, Uint64 *pSum};
+%apply unsigned long long *OUTPUT {Uint64 *pSumSqHi, Uint64 *pSumSqLo};
 %apply unsigned int *OUTPUT {Uint32 *isEmpty};
 %apply unsigned int *OUTPUT {Uint32 *pNbobj};
 %apply unsigned int *OUTPUT {Uint32 *pixVal};
 %apply unsigned int *OUTPUT {Uint32 *ulx, Uint32 *uly, Uint32 *brx, Uint32 *bry};
+%apply unsigned int *OUTPUT {Uint32 *pFirst, Uint32 *pLast};
+%apply unsigned int *OUTPUT {Uint32 *pNbruns};
+%apply unsigned int *OUTPUT {Uint32 *pNbedges};
 
 /* the functions and variables wrapped */
 %include "mamba/mamba.h"
@@ -0,0 +1,157 @@
+"""
+Test cases for the region adjacency graphs
+
+The graph of a 32-bit label image links the labels whose pixels are
+neighbors. Each edge gives the length of the boundary and the minimum,
+maximum and mean of a relief image along it.
+
+Python functions and classes:
+    regionGraph
+    regionGraphMb
+
+C functions:
+    MB_RegionGraph
+"""
+
+from mamba import *
+import unittest
+import random
+
+# Neighbors of the pixels in the square and hexagonal grids (for even and
+# odd lines)
+_SQ_NB = [(0,-1),(1,-1),(1,0),(1,1),(0,1),(-1,1),(-1,0),(-1,-1)]
+_HX_NB = [[(1,0),(0,1),(-1,1),(-1,0),(-1,-1),(0,-1)],
+          [(1,0),(1,1),(0,1),(-1,0),(0,-1),(1,-1)]]
+
+class TestAdjacency(unittest.TestCase):
+
+    def setUp(self):
+        self.im1_1 = imageMb(1)
+        self.im8_1 = imageMb(8)
+        self.im32_1 = imageMb(32)
+        self.im32_2 = imageMb(32)
+        self.im8s2_1 = imageMb(128,128,8)
+        self.im8p_1 = imageMb(64,24,8)
+        self.im32p_1 = imageMb(64,24,32)
+        self.im32p_2 = imageMb(64,24,32)
+
+    def tearDown(self):
+        del(self.im1_1)
+        del(self.im8_1)
+        del(self.im32_1)
+        del(self.im32_2)
+        del(self.im8s2_1)
+        del(self.im8p_1)
+        del(self.im32p_1)
+        del(self.im32p_2)
+
+    def _bruteGraph(self, imLabel, imRelief, grid):
+        # Computes the edges of the graph by scanning all the neighbors
+        (w,h) = imLabel.getSize()
+        edges = {}
+        for y in range(h):
+            for x in range(w):
+                a = imLabel.getPixel((x,y))
+                if grid==SQUARE:
+                    nbs = _SQ_NB
+                else:
+                    nbs = _HX_NB[y%2]
+                for (dx,dy) in nbs:
+                    (nx,ny) = (x+dx,y+dy)
+                    if nx<0 or nx>=w or ny<0 or ny>=h:
+                        continue
+                    b = imLabel.getPixel((nx,ny))
+                    if a<b:
+                        v = 0
+                        if imRelief:
+                            v = max(imRelief.getPixel((x,y)), imRelief.getPixel((nx,ny)))
+                        e = edges.setdefault((a,b), [0,v,v,0])
+                        e[0] += 1
+                        e[1] = min(e[1], v)
+                        e[2] = max(e[2], v)
+                        e[3] += v
+        return [(a,b,e[0],e[1],e[2],float(e[3])/e[0]) for ((a,b),e) in sorted(edges.items())]
+
+    def testDepthAcceptation(self):
+        """Tests that incorrect depth raises an exception"""
+        self.assertRaises(MambaError, regionGraph, self.im8_1)
+        self.assertRaises(MambaError, regionGraph, self.im1_1)
+        self.assertRaises(MambaError, regionGraph, self.im32_1, self.im1_1)
+
+    def testSizeCheck(self):
+        """Tests that different sizes raise an exception"""
+        self.assertRaises(MambaError, regionGraph, self.im32_1, self.im8s2_1)
+
+    def testComputation(self):
+        """Verifies the graph of a partition in four quadrants"""
+        (w,h) = self.im32_1.getSize()
+        self.im32_1.reset()
+        drawSquare(self.im32_1, (w//2,0,w-1,h//2-1), 1)
+        drawSquare(self.im32_1, (0,h//2,w//2-1,h-1), 2)
+        drawSquare(self.im32_1, (w//2,h//2,w-1,h-1), 3)
+        self.im8_1.fill(10)
+        self.im8_1.setPixel(50, (w//2,0))
+
+        graph = regionGraph(self.im32_1, self.im8_1, grid=SQUARE)
+        self.assertEqual(graph.getEdgeCount(), 6)
+        self.assertEqual(list(graph.sources), [0,0,0,1,1,2])
+        self.assertEqual(list(graph.targets), [1,2,3,2,3,3])
+        # 3 pairs per line along a boundary, 2 at the edge of the image and
+        # 1 near the corner of the quadrants
+        self.assertEqual(graph.lengths[0], 3*(h//2)-2)
+        self.assertEqual(graph.lengths[1], 3*(w//2)-2)
+        self.assertEqual(graph.lengths[2], 1)
+        self.assertEqual(graph.lengths[3], 1)
+        self.assertEqual((graph.minima[0],graph.maxima[0]), (10,50))
+        self.assertEqual((graph.minima[1],graph.maxima[1]), (10,10))
+        self.assertAlmostEqual(graph.means[0], float(10*graph.lengths[0]+80)/graph.lengths[0])
+
+        graph = regionGraph(self.im32_1)
+        self.assertEqual(graph.getEdgeCount(), 5)
+        self.assertEqual(graph.getEdges()[0][3:], (0,0,0.0))
+
+        self.im32_1.fill(7)
+        graph = regionGraph(self.im32_1, self.im8_1)
+        self.assertEqual(graph.getEdgeCount(), 0)
+        self.assertEqual(graph.getEdges(), [])
+
+    def testComputationRandom(self):
+        """Compares the graph of random labels with a complete scan"""
+        (w,h) = self.im32p_1.getSize()
+        for y in range(h):
+            for x in range(w):
+                if random.random()<0.2:
+                    v = random.choice([0,1,2,0xffffffff])
+                else:
+                    v = (x//8) + 10*(y//6)
+                self.im32p_1.setPixel(v, (x,y))
+                self.im8p_1.setPixel(random.randint(0,255), (x,y))
+                self.im32p_2.setPixel(random.randint(0,100000), (x,y))
+        for grid in (HEXAGONAL, SQUARE):
+            for relief in (self.im8p_1, self.im32p_2, None):
+                graph = regionGraph(self.im32p_1, relief, grid=grid)
+                self.assertEqual(graph.getEdges(), self._bruteGraph(self.im32p_1, relief, grid))
+
+    def testComputationLarge(self):
+        """Verifies a graph with many edges"""
+        (w,h) = self.im32p_1.getSize()
+        for y in range(h):
+            for x in range(w):
+                self.im32p_1.setPixel(random.randint(0,3000), (x,y))
+        graph = regionGraph(self.im32p_1, grid=HEXAGONAL)
+        self.assertGreater(graph.getEdgeCount(), 256)
+        self.assertEqual(graph.getEdges(), self._bruteGraph(self.im32p_1, None, HEXAGONAL))
+
+    def testComputationWatershed(self):
+        """Verifies that the watershed line is ignored"""
+        (w,h) = self.im32_1.getSize()
+        self.im8_1.reset()
+        drawLine(self.im8_1, (w//2,0,w//2,h-1), 200)
+        self.im32_1.reset()
+        self.im32_1.setPixel(1, (10,h//2))
+        self.im32_1.setPixel(2, (w-10,h//2))
+        watershedSegment(self.im8_1, self.im32_1)
+        graph = regionGraph(self.im32_1, self.im8_1, watershed=True)
+        self.assertEqual(list(graph.sources), [1])
+        self.assertEqual(list(graph.targets), [2])
+        self.assertEqual(graph.maxima[0], 200)
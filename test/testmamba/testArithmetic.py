@@ -8,6 +8,7 @@ Python function:
     floorSubConst
     floorSub
     mulRealConst
+    affineConst
 """
 
 from mamba import *
@@ -131,3 +132,33 @@ class TestArithmetic(unittest.TestCase):
         mulRealConst(self.im8_1, 1.3, self.im32_2)
         (x,y) = compare(self.im32_3, self.im32_2, self.im32_3)
         self.assertLess(x, 0)
+        
+    def testAffineConst(self):
+        """Tests the real value affine function for all depth combinations"""
+        (w,h) = self.im8_1.getSize()
+        
+        for i in range(w):
+            drawLine(self.im8_1, (i,0,i,h-1), i%256)
+            drawLine(self.im32_1, (i,0,i,h-1), 1000*i)
+        for (imIn, imOut) in [(self.im8_1, self.im8_2), (self.im8_1, self.im32_2),
+                              (self.im32_1, self.im8_2), (self.im32_1, self.im32_2)]:
+            maxOut = 255 if imOut.getDepth()==8 else 0xffffffff
+            for (a, b, nearest) in [(1.5, -20.25, False), (0.33, 7.5, True),
+                                    (-0.5, 300, False), (0.01, 0, True)]:
+                affineConst(imIn, a, b, imOut, nearest=nearest)
+                for i in range(0, w, 7):
+                    v = imIn.getPixel((i,0))
+                    n = int(round(a*100))*v + int(round(b*100))
+                    if nearest:
+                        n += 50
+                    exp = min(max(n//100, 0), maxOut)
+                    self.assertEqual(imOut.getPixel((i,h//2)), exp,
+                                     "%r %r %r %d" % (a, b, nearest, v))
+        
+        self.im32_1.fill(0xffffffff)
+        affineConst(self.im32_1, 2.0, 1.0, self.im32_2)
+        self.assertEqual(computeRange(self.im32_2), (0xffffffff, 0xffffffff))
+        self.assertRaises(MambaError, affineConst, self.im1_1, 1.0, 0.0, self.im8_2)
+        self.assertRaises(MambaError, affineConst, self.im8_1, 1.0, 0.0, self.im1_2)
+        self.assertRaises(MambaError, affineConst, self.im8_1, 1.0, 0.0, self.im8s2_2)
+        self.assertRaises(MambaError, affineConst, self.im8_1, 1.0e12, 0.0, self.im8_2)
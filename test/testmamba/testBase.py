@@ -11,6 +11,8 @@ Python function:
     imageMb.save
     imageMb.loadRaw
     imageMb.extractRaw
+    imageMb.getVersion
+    imageMb.getCachedMeasure
     setImageIndex
     getImageCounter
     
@@ -269,3 +271,36 @@ class TestCreate(unittest.TestCase):
             
             os.remove("test.bmp")
 
+    def testVersionAndCache(self):
+        """Verifies that the cached measures follow the image writes"""
+        im8 = imageMb(128,128,8)
+        im8_2 = imageMb(128,128,8)
+        v = im8.getVersion()
+        self.assertEqual(computeVolume(im8), 0)
+        self.assertTrue(checkEmptiness(im8))
+        self.assertEqual(im8.getVersion(), v)
+        
+        im8.fill(3)
+        self.assertGreater(im8.getVersion(), v)
+        self.assertEqual(computeVolume(im8), 3*128*128)
+        self.assertEqual(computeRange(im8), (3,3))
+        self.assertFalse(checkEmptiness(im8))
+        
+        v = im8.getVersion()
+        self.assertEqual(im8.getCachedMeasure("volume", lambda: -1), 3*128*128)
+        self.assertEqual(im8.getVersion(), v)
+        
+        im8_2.fill(5)
+        copy(im8_2, im8)
+        self.assertEqual(computeVolume(im8), 5*128*128)
+        im8.fastSetPixel(6, (10,10))
+        self.assertEqual(computeRange(im8), (5,6))
+        self.assertEqual(extractFrame(im8, 6), (10,10,10,10))
+        im8.loadRaw(128*128*b"\x01")
+        self.assertEqual(computeVolume(im8), 128*128)
+        self.assertEqual(extractFrame(im8, 6), (127,127,0,0))
+        im8.convert(32)
+        self.assertEqual(computeMaxRange(im8), (0,0xffffffff))
+        
+        im8.cacheable = False
+        self.assertEqual(im8.getCachedMeasure("volume", lambda: -1), -1)
@@ -0,0 +1,141 @@
+"""
+Test cases for the batches of small images
+
+A batch packs patches of the same size inside a single image, separated by
+guard bands, so that operators process all the patches in one call.
+
+Python functions and classes:
+    patchBatchMb
+
+C functions:
+    MB_TilesCopy
+    MB_TilesReduce
+"""
+
+from mamba import *
+import unittest
+import random
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.im8_1 = imageMb(8)
+        self.im8_2 = imageMb(8)
+        self.im8_3 = imageMb(8)
+        self.im8p_1 = imageMb(64,64,8)
+        self.im8p_2 = imageMb(64,64,8)
+        self.im8p_3 = imageMb(64,64,8)
+        self.im1p_1 = imageMb(64,64,1)
+        self.im32_1 = imageMb(32)
+        (w,h) = self.im8_1.getSize()
+        self.im8_1.reset()
+        for i in range(2000):
+            self.im8_1.setPixel(random.randint(1,255), (random.randint(0,w-1),random.randint(0,h-1)))
+        self.positions = [(random.randint(-20,w-40),random.randint(-20,h-40)) for i in range(20)]
+        # The first patch lies inside the image (it is cropped back in testLoadStore)
+        self.positions[0] = (random.randint(0,w-64),random.randint(0,h-64))
+
+    def tearDown(self):
+        del(self.im8_1)
+        del(self.im8_2)
+        del(self.im8_3)
+        del(self.im8p_1)
+        del(self.im8p_2)
+        del(self.im8p_3)
+        del(self.im1p_1)
+        del(self.im32_1)
+
+    def _crop(self, i, imOut):
+        # Extracts the patch i of im8_1 in imOut (0 outside im8_1)
+        (x,y) = self.positions[i]
+        imOut.reset()
+        cropCopy(self.im8_1, (max(x,0),max(y,0)), imOut, (max(-x,0),max(-y,0)),
+                 (64-max(-x,0),64-max(-y,0)))
+
+    def _assertSame(self, im1, im2):
+        (x,y) = compare(im1, im2, im2)
+        self.assertLess(x, 0)
+
+    def testLayout(self):
+        """Verifies the layout of the patches inside the packed image"""
+        batch = patchBatchMb(10, 30, 21, 8, 3)
+        self.assertEqual(len(batch), 10)
+        self.assertEqual(batch.getPatchSize(), (30,21))
+        self.assertEqual(batch.getDepth(), 8)
+        for i in range(10):
+            (x,y) = batch.getPosition(i)
+            self.assertGreaterEqual(x, 3)
+            self.assertGreaterEqual(y, 3)
+            self.assertEqual(y%2, 0)
+            for j in range(i):
+                (xj,yj) = batch.getPosition(j)
+                self.assertTrue(abs(x-xj)>=33 or abs(y-yj)>=24)
+        batch2 = patchBatchMb(batch, 32)
+        self.assertEqual(batch2.getDepth(), 32)
+        self.assertEqual(batch2.image.getSize(), batch.image.getSize())
+        self.assertEqual(batch2.getPosition(9), batch.getPosition(9))
+
+    def testParameterRange(self):
+        """Verifies that an incorrect parameter raises an exception"""
+        batch = patchBatchMb(3, 64, 64)
+        self.assertRaises(MambaError, batch.load, self.im8_1, [(0,0)])
+        self.assertRaises(MambaError, batch.load, self.im32_1, [(0,0)]*3)
+        self.assertRaises(MambaError, batch.store, self.im8_1, [(0,0)]*4)
+
+    def testLoadStore(self):
+        """Verifies the copy of the patches between an image and a batch"""
+        batch = patchBatchMb(len(self.positions), 64, 64)
+        batch.load(self.im8_1, self.positions)
+        for i in range(len(batch)):
+            self._crop(i, self.im8p_1)
+            batch.getPatch(i, self.im8p_2)
+            self._assertSame(self.im8p_1, self.im8p_2)
+
+        # Guard bands are empty
+        (x,y) = batch.getPosition(0)
+        self.assertEqual(batch.image.getPixel((x-1,y)), 0)
+
+        self.im8_2.reset()
+        batch.store(self.im8_2, self.positions[:1]*len(batch))
+        batch.getPatch(len(batch)-1, self.im8p_1)
+        self.im8_3.reset()
+        cropCopy(self.im8p_1, (0,0), self.im8_3, self.positions[0], (64,64))
+        self._assertSame(self.im8_2, self.im8_3)
+
+        self.im8p_1.fill(7)
+        batch.setPatch(2, self.im8p_1)
+        batch.getPatch(2, self.im8p_2)
+        self.assertEqual(computeRange(self.im8p_2), (7,7))
+
+    def testOperators(self):
+        """Verifies that operators give the result obtained on each patch"""
+        batch = patchBatchMb(len(self.positions), 64, 64, 8, 3)
+        batchOut = patchBatchMb(batch)
+        batch.load(self.im8_1, self.positions)
+        for (op, edge, se) in [(dilate, EMPTY, SQUARE3X3), (dilate, EMPTY, HEXAGON),
+                               (erode, FILLED, SQUARE3X3), (erode, FILLED, HEXAGON)]:
+            batch.setGuards(edge)
+            op(batch.image, batchOut.image, 3, se, edge)
+            for i in range(len(batch)):
+                self._crop(i, self.im8p_1)
+                op(self.im8p_1, self.im8p_2, 3, se, edge)
+                batchOut.getPatch(i, self.im8p_3)
+                self._assertSame(self.im8p_2, self.im8p_3)
+
+    def testMeasures(self):
+        """Verifies the measures computed on each patch"""
+        batch = patchBatchMb(len(self.positions), 64, 64)
+        batch.load(self.im8_1, self.positions)
+        volumes = batch.computeVolume()
+        (mins, maxs) = batch.computeRange()
+        batchBin = patchBatchMb(batch, 1)
+        threshold(batch.image, batchBin.image, 1, 255)
+        areas = batchBin.computeArea()
+        self.assertEqual(list(areas), list(batch.computeArea()))
+        self.assertEqual(len(volumes), len(batch))
+        for i in range(len(batch)):
+            self._crop(i, self.im8p_1)
+            self.assertEqual(volumes[i], computeVolume(self.im8p_1))
+            self.assertEqual((mins[i],maxs[i]), computeRange(self.im8p_1))
+            threshold(self.im8p_1, self.im1p_1, 1, 255)
+            self.assertEqual(areas[i], computeVolume(self.im1p_1))
@@ -10,6 +10,9 @@ Python functions and classes:
     supWhiteTopHat
     supBlackTopHat
     regularisedGradient
+
+C functions:
+    MB_RegularisedGradient
 """
 
 from mamba import *
@@ -183,3 +186,22 @@ class TestContrasts(unittest.TestCase):
                 else:
                     self.assertEqual(vol, 0, "m=%d : n=%d (vol %d)" % (m,n,vol))
 
+    def testRegularisedGradientComposed(self):
+        """Verifies the regularised gradient against the composed operators"""
+        (w,h) = self.im8_1.getSize()
+        for y in range(h):
+            for x in range(w):
+                self.im8_1.setPixel((x*y//5+random.randint(0,60))%200, (x,y))
+        for grid in (HEXAGONAL, SQUARE):
+            se = structuringElement(getDirections(grid), grid)
+            for n in range(6):
+                gradient(self.im8_1, self.im8_3, n, se=se)
+                whiteTopHat(self.im8_3, self.im8_3, n, se=se)
+                erode(self.im8_3, self.im8_3, n-1, se=se)
+                regularisedGradient(self.im8_1, self.im8_2, n, grid)
+                (x,y) = compare(self.im8_3, self.im8_2, self.im8_2)
+                self.assertLess(x, 0, "%s n=%d" % (grid, n))
+
+    def testRegularisedGradientDepthAcceptation(self):
+        """Tests that incorrect depth raises an exception in regularisedGradient"""
+        self.assertRaises(MambaError, regularisedGradient, self.im8_1, self.im32_1, 2)
@@ -7,7 +7,21 @@ Python functions and classes:
     drawSquare
     drawCircle
     drawFillCircle
+    drawLines
+    drawPolyline
+    drawFillPolygon
+    drawBoxes
+    drawSquares
+    drawCircles
+    drawFillCircles
     getIntensityAlongLine
+    
+C functions:
+    MB_DrawLines
+    MB_DrawPolyline
+    MB_DrawFillPolygon
+    MB_DrawBoxes
+    MB_DrawCircles
 """
 
 from mamba import *
@@ -154,3 +168,95 @@ class TestDraw(unittest.TestCase):
                 exp_intensity = list(range(h//2,h//2-size-1,-1))
             self.assertEqual(intensity, exp_intensity, "%d,%d : %s %s" %(el[0],el[1],repr(intensity),repr(exp_intensity)))
 
+    def testDrawMultipleShapes(self):
+        """Verifies that drawing many shapes in one call gives the same result"""
+        (w,h) = self.im8_1.getSize()
+        
+        for drawOne, drawMany, n in [(drawLine, drawLines, 4), (drawBox, drawBoxes, 4),
+                                     (drawSquare, drawSquares, 4), (drawCircle, drawCircles, 3),
+                                     (drawFillCircle, drawFillCircles, 3)]:
+            shapes = []
+            values = []
+            self.im8_1.reset()
+            for i in range(20):
+                if n==4:
+                    shape = tuple([random.randint(0,w-1) for j in range(4)])
+                else:
+                    shape = (random.randint(0,w-1), random.randint(0,h-1), random.randint(0,20))
+                shapes.append(shape)
+                values.append(random.randint(1,255))
+                drawOne(self.im8_1, shape, values[-1])
+            self.im8_2.reset()
+            drawMany(self.im8_2, shapes, values)
+            (x,y) = compare(self.im8_1, self.im8_2, self.im8_3)
+            self.assertLess(x, 0)
+            self.im8_1.reset()
+            for shape in shapes:
+                drawOne(self.im8_1, shape, 7)
+            drawMany(self.im8_2, shapes, 7)
+            (x,y) = compare(self.im8_1, self.im8_2, self.im8_3)
+            self.assertLess(x, 0)
+        self.assertRaises(MambaError, drawLines, self.im8_1, [(0,0,1,1)], [1,2])
+    
+    def testDrawClipping(self):
+        """Verifies that the pixels outside the image are ignored when drawing"""
+        (w,h) = self.im8_1.getSize()
+        
+        self.im8_1.reset()
+        drawSquare(self.im8_1, (-10,-10,9,9), 1)
+        self.assertEqual(computeVolume(self.im8_1), 100)
+        self.im8_1.reset()
+        drawLine(self.im8_1, (-10,5,w+10,5), 1)
+        self.assertEqual(computeVolume(self.im8_1), w)
+        self.im8_1.reset()
+        drawFillCircle(self.im8_1, (0,0,w*2), 1)
+        self.assertEqual(computeVolume(self.im8_1), w*h)
+        self.im8_1.reset()
+        drawCircles(self.im8_1, [(-100,-100,10), (w+50,h+50,20)], 1)
+        self.assertEqual(computeVolume(self.im8_1), 0)
+        self.assertRaises(MambaError, getIntensityAlongLine, self.im8_1, (-10,5,w+10,5))
+    
+    def testDrawPolyline(self):
+        """Tests the polyline drawing function"""
+        (w,h) = self.im8_1.getSize()
+        
+        points = [(10,10), (30,10), (30,30), (10,30)]
+        self.im8_1.reset()
+        drawPolyline(self.im8_1, points, 255)
+        self.im8_2.reset()
+        drawLine(self.im8_2, (10,10,30,10), 255)
+        drawLine(self.im8_2, (30,10,30,30), 255)
+        drawLine(self.im8_2, (30,30,10,30), 255)
+        (x,y) = compare(self.im8_1, self.im8_2, self.im8_3)
+        self.assertLess(x, 0)
+        self.im8_1.reset()
+        drawPolyline(self.im8_1, points, 255, closed=True)
+        self.im8_2.reset()
+        drawBox(self.im8_2, (10,10,30,30), 255)
+        (x,y) = compare(self.im8_1, self.im8_2, self.im8_3)
+        self.assertLess(x, 0)
+    
+    def testDrawFillPolygon(self):
+        """Tests the filled polygon drawing function"""
+        (w,h) = self.im1_1.getSize()
+        
+        self.im1_1.reset()
+        drawFillPolygon(self.im1_1, [(5,5), (40,5), (40,20), (5,20)], 1)
+        self.im1_2.reset()
+        drawSquare(self.im1_2, (5,5,40,20), 1)
+        (x,y) = compare(self.im1_1, self.im1_2, self.im1_3)
+        self.assertLess(x, 0)
+        
+        # triangle: the outline is included and the area is filled
+        self.im1_1.reset()
+        drawFillPolygon(self.im1_1, [(0,0), (20,0), (0,20)], 1)
+        self.assertEqual(computeVolume(self.im1_1), 21*22//2)
+        
+        # concave polygon (U shape) with even-odd rule
+        self.im1_1.reset()
+        drawFillPolygon(self.im1_1, [(0,0), (30,0), (30,30), (20,30), (20,10),
+                                     (10,10), (10,30), (0,30)], 1)
+        self.assertEqual(self.im1_1.getPixel((15,20)), 0)
+        self.assertEqual(self.im1_1.getPixel((5,20)), 1)
+        self.assertEqual(self.im1_1.getPixel((25,20)), 1)
+        self.assertEqual(self.im1_1.getPixel((15,5)), 1)
@@ -11,6 +11,10 @@ Python functions and classes:
     highMaxima
     maxPartialBuild
     minPartialBuild
+
+C functions:
+    MB_Minima
+    MB_Maxima
 """
 
 from mamba import *
@@ -102,6 +106,67 @@ class TestGeodesy(unittest.TestCase):
             (x,y) = compare(self.im1_1, self.im1_2, self.im1_3)
             self.assertLess(x, 0, "%d" %(i))
             
+    def testExtremaParameters(self):
+        """Verifies that extrema extraction handles bad parameters"""
+        self.assertRaises(MambaError, minima, self.im8_1, self.im8_2)
+        self.assertRaises(MambaError, maxima, self.im8_1, self.im8_2)
+        self.assertRaises(MambaError, minima, self.im1_1, self.im1_1)
+        im1 = imageMb(128, 128, 1)
+        self.assertRaises(MambaError, maxima, self.im8_1, im1)
+        
+    def testExtremaLabels(self):
+        """Verifies the labelling of the extrema and their number"""
+        (w,h) = self.im8_1.getSize()
+        self.im8_1.fill(100)
+        drawSquare(self.im8_1, (10,10,20,20), 20)
+        drawSquare(self.im8_1, (40,10,50,20), 30)
+        drawSquare(self.im8_1, (70,10,80,20), 200)
+        self.im8_1.setPixel(25, (60,60))
+        
+        n = minima(self.im8_1, self.im32_1)
+        self.assertEqual(n, 3)
+        self.assertEqual(self.im32_1.getPixel((10,10)), 1)
+        self.assertEqual(self.im32_1.getPixel((45,15)), 2)
+        self.assertEqual(self.im32_1.getPixel((60,60)), 3)
+        self.assertEqual(self.im32_1.getPixel((0,0)), 0)
+        self.assertEqual(computeVolume(self.im32_1), 121+2*121+3)
+        for grid in (HEXAGONAL, SQUARE):
+            n = minima(self.im8_1, self.im1_1, grid=grid)
+            self.assertEqual(n, 3)
+            label(self.im1_1, self.im32_2, grid=grid)
+            (x,y) = compare(self.im32_1, self.im32_2, self.im32_3)
+            self.assertLess(x, 0)
+        # the minima are only merged when the plateau at 100 is filled
+        self.assertEqual(minima(self.im8_1, self.im1_1, 80), 3)
+        self.assertEqual(computeVolume(self.im1_1), 2*121+1)
+        self.assertEqual(minima(self.im8_1, self.im1_1, 81), 1)
+        self.assertEqual(computeVolume(self.im1_1), w*h-121)
+        
+        n = maxima(self.im8_1, self.im32_1)
+        self.assertEqual(n, 1)
+        self.assertEqual(computeVolume(self.im32_1), 121)
+        self.assertEqual(maxima(self.im8_1, self.im1_1, 101), 1)
+        self.assertEqual(computeVolume(self.im1_1), w*h-2*121-1)
+        
+        # binary images
+        self.im1_2.reset()
+        drawSquare(self.im1_2, (10,10,20,20), 1)
+        drawSquare(self.im1_2, (40,10,50,20), 1)
+        self.assertEqual(maxima(self.im1_2, self.im1_1), 2)
+        (x,y) = compare(self.im1_1, self.im1_2, self.im1_3)
+        self.assertLess(x, 0)
+        self.assertEqual(minima(self.im1_2, self.im1_1), 1)
+        negate(self.im1_2, self.im1_2)
+        (x,y) = compare(self.im1_1, self.im1_2, self.im1_3)
+        self.assertLess(x, 0)
+        
+        # a flat image at the maximum value is not a minimum
+        self.im32_1.fill(0xffffffff)
+        self.assertEqual(minima(self.im32_1, self.im1_1), 0)
+        self.assertEqual(maxima(self.im32_1, self.im1_1), 1)
+        self.im32_1.reset()
+        self.assertEqual(maxima(self.im32_1, self.im1_1, 5), 0)
+            
     def _drawBaseImage(self, imOut):
         (w,h) = imOut.getSize()
         drawSquare(imOut, (0,0,w//4,h-1), 50)
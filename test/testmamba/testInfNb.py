@@ -847,3 +847,25 @@ class TestInfNb(unittest.TestCase):
             vol = computeVolume(self.im32_1)
             self.assertEqual(vol, 0)
 
+    def testChangedLines(self):
+        """Verifies the range of modified lines returned by the function"""
+        for grid in (HEXAGONAL, SQUARE):
+            for (im1, im2) in ((self.im1_1, self.im1_2),
+                               (self.im8_1, self.im8_2),
+                               (self.im32_1, self.im32_2)):
+                (w,h) = im1.getSize()
+                im1.fill(computeMaxRange(im1)[1])
+                im1.setPixel(0, (w//2,h//2))
+                copy(im1, im2)
+                (first, last) = infNeighbor(im1, im2, 1<<1, grid=grid)
+                self.assertEqual((first, last), (h//2+1, h//2+1))
+                (first, last) = infNeighbor(im1, im2, 0x1ff, grid=grid)
+                self.assertEqual((first, last), (h//2-1, h//2+1))
+                (first, last) = infNeighbor(im2, im2, 1, grid=grid)
+                self.assertGreater(first, last)
+                im1.fill(computeMaxRange(im1)[1])
+                im2.fill(computeMaxRange(im1)[1])
+                (first, last) = infNeighbor(im1, im2, 0x1ff, grid=grid, edge=FILLED)
+                self.assertGreater(first, last)
+                (first, last) = infNeighbor(im1, im2, 0x1ff, grid=grid, edge=EMPTY)
+                self.assertEqual((first, last), (0, h-1))
@@ -482,3 +482,24 @@ class TestLabel(unittest.TestCase):
         self.assertEqual(mi, 10)
         self.assertEqual(ma, 229)
 
+    def testComputationTallImage(self):
+        """Labelling objects crossing or separated along tall images"""
+        for d in [1,8,32]:
+            imIn = imageMb(64, 1024, d)
+            imOut = imageMb(64, 1024, 32)
+            for grid in [SQUARE, HEXAGONAL]:
+                imIn.reset()
+                for hi in range(1024):
+                    imIn.setPixel(1, (10,hi))
+                n = label(imIn, imOut, grid=grid)
+                self.assertEqual(n, 1)
+                self.assertEqual(imOut.getPixel((10,1023)), 1)
+                
+                imIn.reset()
+                for hi in range(0,1024,4):
+                    for wi in range(64):
+                        imIn.setPixel(1, (wi,hi))
+                n = label(imIn, imOut, grid=grid)
+                self.assertEqual(n, 256)
+                for hi in range(0,1024,4):
+                    self.assertEqual(imOut.getPixel((63,hi)), hi//4+1)
@@ -9,6 +9,7 @@ Python functions:
     computeConnectivityNumber
     computeComponentsNumber
     computeFeretDiameters
+    granulometry
 """
 
 from mamba import *
@@ -194,3 +195,47 @@ class TestMeasure(unittest.TestCase):
         self.assertEqual(diams[0], 70)
         self.assertEqual(diams[1], 70)
 
+    def testGranulometryParameterAcceptation(self):
+        """Verifies that the granulometry checks its parameters"""
+        self.assertRaises(MambaError, granulometry, self.im8_1, [1,2], "circle")
+        self.assertRaises(MambaError, granulometry, self.im8_1, [2,1])
+        self.assertRaises(MambaError, granulometry, self.im8_1, [1,1])
+        self.assertRaises(MambaError, granulometry, self.im8_1, [1,2], "area")
+
+    def testGranulometry(self):
+        """Verifies the pattern spectrum given by the granulometry"""
+        (w,h) = self.im8_1.getSize()
+        self.im8_1.reset()
+        # Squares of increasing sizes with distinct values
+        drawSquare(self.im8_1, (10,10,12,12), 10)
+        drawSquare(self.im8_1, (40,10,46,16), 20)
+        drawSquare(self.im8_1, (10,60,30,80), 30)
+        spectrum = granulometry(self.im8_1, [0,1,2,3,10,11], "square")
+        self.assertEqual(spectrum, [0, 0, 9*10, 0, 49*20, 441*30])
+        threshold(self.im8_1, self.im1_1, 1, 255)
+        spectrum = granulometry(self.im1_1, [1,3,10,11], "square")
+        self.assertEqual(spectrum, [0, 9, 49, 441])
+        spectrum = granulometry(self.im1_1, [10,49,50,441,442], "area")
+        self.assertEqual(spectrum, [9, 0, 49, 0, 441])
+        
+        # Comparison with the successive openings
+        for i in range(20):
+            x = random.randint(0,w-1)
+            y = random.randint(0,h-1)
+            drawSquare(self.im8_1, (x,y,x+random.randint(0,30),y+random.randint(0,30)), random.randint(0,255))
+        threshold(self.im8_1, self.im1_1, 1, 255)
+        sizes = [1,2,4,7]
+        for im in (self.im8_1, self.im1_1):
+            for family,erosion,dilation in [("hexagon",largeHexagonalErode,largeHexagonalDilate),
+                                            ("square",largeSquareErode,largeSquareDilate),
+                                            ("dodecagon",largeDodecagonalErode,largeDodecagonalDilate)]:
+                imWrk = imageMb(im)
+                v1 = computeVolume(im)
+                expected = []
+                for size in sizes:
+                    erosion(im, imWrk, size)
+                    dilation(imWrk, imWrk, size)
+                    v2 = computeVolume(imWrk)
+                    expected.append(v1-v2)
+                    v1 = v2
+                self.assertEqual(granulometry(im, sizes, family), expected, family)
@@ -11,6 +11,12 @@ Python functions and classes:
     buildClose
     supOpen
     infClose
+    supLinearOpen
+    infLinearClose
+
+C functions:
+    MB_SupLinearOpen
+    MB_InfLinearClose
 """
 
 from mamba import *
@@ -326,3 +332,53 @@ class TestOpenClose(unittest.TestCase):
             vol = computeVolume(self.im8_2)
             self.assertEqual(vol, 255*w*h, "for %d/%d : %d"%(n,dc,vol))
 
+    def _iteratedLinear(self, imIn, imOut, segments, grid, edge, closing):
+        # Reference result computed with the iterated linear operators
+        imWrk = imageMb(imIn)
+        if closing:
+            imOut.fill(computeMaxRange(imIn)[1])
+        else:
+            imOut.reset()
+        for (d, n) in segments:
+            td = transposeDirection(d, grid)
+            if closing:
+                linearDilate(imIn, imWrk, d, n, grid=grid)
+                linearErode(imWrk, imWrk, td, n, grid=grid, edge=edge)
+                logic(imOut, imWrk, imOut, "inf")
+            else:
+                linearErode(imIn, imWrk, d, n, grid=grid, edge=edge)
+                linearDilate(imWrk, imWrk, td, n, grid=grid)
+                logic(imOut, imWrk, imOut, "sup")
+        if closing and edge==EMPTY:
+            logic(imOut, imIn, imOut, "sup")
+
+    def testSupLinearOpenInfLinearClose(self):
+        """Verifies the fused linear openings and closings against the iterated operators"""
+        for (imIn, imOut, imRef) in ((self.im1_1, self.im1_2, self.im1_3),
+                                     (self.im8_1, self.im8_2, self.im8_3),
+                                     (self.im32_1, self.im32_2, self.im32_3)):
+            (w,h) = imIn.getSize()
+            vmax = computeMaxRange(imIn)[1]
+            imIn.reset()
+            for i in range(400):
+                imIn.setPixel(random.randint(0,vmax), (random.randint(0,w-1),random.randint(0,h-1)))
+            dilate(imIn, imIn, 2)
+            for grid in (HEXAGONAL, SQUARE):
+                dirs = getDirections(grid)[1:]
+                segments = [(d, random.randint(8,40)) for d in random.sample(dirs, 3)]
+                for edge in (EMPTY, FILLED):
+                    supLinearOpen(imIn, imOut, segments, grid, edge)
+                    self._iteratedLinear(imIn, imRef, segments, grid, edge, False)
+                    (x,y) = compare(imOut, imRef, imRef)
+                    self.assertLess(x, 0, "%s %s %s"%(grid, segments, edge))
+                    infLinearClose(imIn, imOut, segments, grid, edge)
+                    self._iteratedLinear(imIn, imRef, segments, grid, edge, True)
+                    (x,y) = compare(imOut, imRef, imRef)
+                    self.assertLess(x, 0, "%s %s %s"%(grid, segments, edge))
+
+    def testSupLinearOpenParameters(self):
+        """Verifies that incorrect segments raise an exception"""
+        self.assertRaises(MambaError, supLinearOpen, self.im8_1, self.im8_2, [], HEXAGONAL)
+        self.assertRaises(MambaError, supLinearOpen, self.im8_1, self.im8_2, [(7,10)], HEXAGONAL)
+        self.assertRaises(MambaError, infLinearClose, self.im8_1, self.im8_2, [(9,10)], SQUARE)
+        self.assertRaises(MambaError, supLinearOpen, self.im8_1, self.im32_2, [(1,10)], SQUARE)
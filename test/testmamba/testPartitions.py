@@ -16,6 +16,11 @@ Python functions and classes:
     cellsOpenByBuild
     partitionErode
     partitionDilate
+
+C functions:
+    MB_CellsBuild
+    MB_PartitionErode
+    MB_PartitionDilate
 """
 
 from mamba import *
@@ -283,3 +288,40 @@ class TestPartitions(unittest.TestCase):
         (x,y) = compare(self.im8_3, self.im8_2, self.im8_3)
         self.assertLess(x, 0)
 
+    def testCellsBuildDisconnectedCells(self):
+        """Verifies that cells with the same value but not connected are rebuilt separately"""
+        for (imIn, imInOut, imExp) in ((self.im8_1, self.im8_2, self.im8_3),
+                                       (self.im32_1, self.im32_2, self.im32_3)):
+            (w,h) = imIn.getSize()
+            imIn.reset()
+            drawSquare(imIn, (0,0,w//4-1,h-1), 20)
+            drawSquare(imIn, (3*w//4,0,w-1,h-1), 20)
+            imInOut.reset()
+            imInOut.setPixel(70000 if imIn.getDepth()==32 else 70, (w//8,h//2))
+            imInOut.setPixel(5, (w//8+1,h//2))
+            cellsBuild(imIn, imInOut, HEXAGONAL)
+            imExp.reset()
+            drawSquare(imExp, (0,0,w//4-1,h-1), 70000 if imIn.getDepth()==32 else 70)
+            (x,y) = compare(imExp, imInOut, imExp)
+            self.assertLess(x, 0)
+
+    def testPartitionDilateErodeStripes(self):
+        """Verifies the partitions (graph) operators of larger sizes on stripes"""
+        (w,h) = self.im32_1.getSize()
+        for i in range(8):
+            drawSquare(self.im32_1, (i*w//8,0,(i+1)*w//8-1,h-1), 1000*(i+1))
+        for grid in (HEXAGONAL, SQUARE):
+            for n in range(10):
+                partitionDilate(self.im32_1, self.im32_2, n, grid)
+                partitionErode(self.im32_1, self.im32_3, n, grid)
+                for i in range(8):
+                    p = (i*w//8, h//2)
+                    self.assertEqual(self.im32_2.getPixel(p), 1000*(min(i+n,7)+1))
+                    self.assertEqual(self.im32_3.getPixel(p), 1000*(max(i-n,0)+1))
+
+    def testPartitionDepthAcceptation(self):
+        """Tests that incorrect depths raise an exception in the cell operators"""
+        self.assertRaises(MambaError, cellsBuild, self.im8_1, self.im32_2)
+        self.assertRaises(MambaError, cellsBuild, self.im1_1, imageMb(1))
+        self.assertRaises(MambaError, partitionErode, self.im8_1, self.im32_2)
+        self.assertRaises(MambaError, partitionDilate, self.im32_1, self.im8_2)
@@ -7,10 +7,14 @@ a given value.
 Python functions:
     imageMb.getPixel
     imageMb.setPixel
+    imageMb.getPixels
+    imageMb.setPixels
     
 C functions:
     MB_GetPixel
     MB_PutPixel
+    MB_GetPixels
+    MB_PutPixels
 """
 
 from mamba import *
@@ -89,3 +93,33 @@ class TestPixel(unittest.TestCase):
                     self.im32.setPixel(vi, (wi,hi))
                     self.assertEqual(self.im32.getPixel((wi,hi)), vi)
 
+    def testPixelsParameterAcceptation(self):
+        """Tests that incoherent parameters produce an exception with pixels arrays"""
+        (w,h) = self.im8.getSize()
+        self.im8.reset()
+        self.assertRaises(MambaError, self.im8.setPixels, [0,w], [0,0], 1)
+        self.assertEqual(computeVolume(self.im8), 0)
+        self.assertRaises(MambaError, self.im8.setPixels, [0,1], [0], 1)
+        self.assertRaises(MambaError, self.im8.setPixels, [0,1], [0,0], [1,2,3])
+        self.assertRaises(MambaError, self.im8.getPixels, [0,1], [0,h])
+        self.assertRaises(MambaError, self.im8.getPixels, [-1], [0])
+
+    def testPixels(self):
+        """Tests the pixels arrays manipulation for all depths"""
+        (w,h) = self.im8.getSize()
+        for im,vmax in [(self.im1,1), (self.im8,255), (self.im32,0xffffffff)]:
+            im.reset()
+            xs = [random.randint(0,w-1) for i in range(100)]
+            ys = [random.randint(0,h-1) for i in range(100)]
+            vs = [random.randint(0,vmax) for i in range(100)]
+            im.setPixels(xs, ys, vs)
+            expected = {}
+            for x,y,v in zip(xs, ys, vs):
+                expected[(x,y)] = v
+            values = im.getPixels(xs, ys)
+            for x,y,v in zip(xs, ys, values):
+                self.assertEqual(v, expected[(x,y)])
+                self.assertEqual(v, im.getPixel((x,y)))
+            im.setPixels(xs, ys, vmax)
+            self.assertEqual(im.getPixels(xs, ys), 100*[vmax])
+            self.assertEqual(im.getPixels([], []), [])
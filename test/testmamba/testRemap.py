@@ -0,0 +1,126 @@
+"""
+Test cases for the 32-bit remapping functions
+
+The functions work only with 32-bit input images.
+
+The functions replace the values of the input 32-bit image according to a
+dense table (any length) or a sparse table (keys and values) and put the
+result in a 32-bit, 8-bit or binary output image.
+
+Python functions:
+    remap
+    remapSparse
+
+C functions:
+    MB_Remap
+    MB_RemapSparse
+"""
+
+from mamba import *
+import unittest
+import random
+import array
+
+class TestRemap(unittest.TestCase):
+
+    def setUp(self):
+        # Creating two images for each possible depth
+        self.im1_1 = imageMb(1)
+        self.im1_2 = imageMb(1)
+        self.im8_1 = imageMb(8)
+        self.im8_2 = imageMb(8)
+        self.im32_1 = imageMb(32)
+        self.im32_2 = imageMb(32)
+        self.im32_3 = imageMb(32)
+        self.im32s2_1 = imageMb(128,128,32)
+
+    def tearDown(self):
+        del(self.im1_1)
+        del(self.im1_2)
+        del(self.im8_1)
+        del(self.im8_2)
+        del(self.im32_1)
+        del(self.im32_2)
+        del(self.im32_3)
+        del(self.im32s2_1)
+
+    def testDepthAcceptation(self):
+        """Tests that incorrect depth raises an exception"""
+        self.assertRaises(MambaError, remap, self.im1_1, self.im32_2, [0])
+        self.assertRaises(MambaError, remap, self.im8_1, self.im32_2, [0])
+        self.assertRaises(MambaError, remapSparse, self.im8_1, self.im32_2, [0], [0])
+
+    def testSizeCheck(self):
+        """Tests that different sizes raise an exception"""
+        self.assertRaises(MambaError, remap, self.im32s2_1, self.im32_2, [0])
+        self.assertRaises(MambaError, remapSparse, self.im32s2_1, self.im32_2, [0], [0])
+
+    def testParameterRange(self):
+        """Verifies that an incorrect parameter raises an exception"""
+        self.assertRaises(MambaError, remapSparse, self.im32_1, self.im32_2, [0,1], [0])
+        self.assertRaises(TypeError, remap, self.im32_1, self.im32_2, array.array('H', [0]))
+
+    def testComputation(self):
+        """Verifies the dense remapping of a 32-bit image"""
+        (w,h) = self.im32_1.getSize()
+
+        self.im32_1.reset()
+        for hi in range(h):
+            self.im32_1.setPixel(hi+1, (hi%w,hi))
+        lut = array.array('I', [random.randint(0,0xffffffff) for i in range(h+1)])
+        remap(self.im32_1, self.im32_2, lut)
+        for hi in range(h):
+            self.assertEqual(self.im32_2.getPixel((hi%w,hi)), lut[hi+1])
+        self.assertEqual(self.im32_2.getPixel((w-1,0)), lut[0])
+
+        # values outside the table
+        self.im32_1.fill(0x80000000)
+        remap(self.im32_1, self.im32_2, [1,2,3])
+        self.assertEqual(computeRange(self.im32_2), (0x80000000,0x80000000))
+        remap(self.im32_1, self.im32_2, [1,2,3], 7)
+        self.assertEqual(computeRange(self.im32_2), (7,7))
+
+        # any sequence of integers is accepted
+        self.im32_1.fill(2)
+        remap(self.im32_1, self.im32_2, range(10,20))
+        self.assertEqual(computeRange(self.im32_2), (12,12))
+        remap(self.im32_1, self.im32_2, (3*i for i in range(5)))
+        self.assertEqual(computeRange(self.im32_2), (6,6))
+
+    def testComputationDepths(self):
+        """Verifies the remapping into greyscale and binary images"""
+        self.im32_1.reset()
+        self.im32_1.setPixel(1, (1,1))
+        self.im32_1.setPixel(2, (2,2))
+        self.im32_1.setPixel(1000, (3,3))
+        remap(self.im32_1, self.im8_1, [0,300,12])
+        self.assertEqual(self.im8_1.getPixel((1,1)), 255)
+        self.assertEqual(self.im8_1.getPixel((2,2)), 12)
+        self.assertEqual(self.im8_1.getPixel((3,3)), 255)
+        self.assertEqual(self.im8_1.getPixel((0,0)), 0)
+        remap(self.im32_1, self.im1_1, (0,0,1), 0)
+        self.im1_2.reset()
+        self.im1_2.setPixel(1, (2,2))
+        (x,y) = compare(self.im1_1, self.im1_2, self.im1_2)
+        self.assertLess(x, 0)
+
+    def testComputationSparse(self):
+        """Verifies the sparse remapping of a 32-bit image"""
+        (w,h) = self.im32_1.getSize()
+
+        keys = random.sample(range(1,0xffffffff), h)
+        values = [random.randint(0,0xffffffff) for k in keys]
+        self.im32_1.reset()
+        for hi in range(h):
+            self.im32_1.setPixel(keys[hi], (hi%w,hi))
+        remapSparse(self.im32_1, self.im32_2, keys, values, 5)
+        for hi in range(h):
+            self.assertEqual(self.im32_2.getPixel((hi%w,hi)), values[hi])
+        self.assertEqual(self.im32_2.getPixel((w-1,0)), 5)
+
+        remap(self.im32_1, self.im32_3, dict(zip(keys[:10], values[:10])))
+        for hi in range(h):
+            v = values[hi] if hi<10 else keys[hi]
+            self.assertEqual(self.im32_3.getPixel((hi%w,hi)), v)
+        self.assertEqual(self.im32_3.getPixel((w-1,0)), 0)
+
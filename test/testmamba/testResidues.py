@@ -12,6 +12,11 @@ Python functions:
     ultimateBuildOpening
     quasiDistance
     fullRegularisedGradient
+    accumulateResidue
+
+C functions:
+    MB_AccumulateResidue
+    MB_FullRegularisedGradient
 """
 
 from mamba import *
@@ -365,3 +370,72 @@ class TestResidues(unittest.TestCase):
             (x,y) = compare(self.im8_5, self.im8_4, self.im8_4)
             self.assertLess(x, 0)
 
+    def testFullRegularisedGradientComposed(self):
+        """Verifies the full regularised gradient against the regularised gradients of each size"""
+        (w,h) = self.im8_1.getSize()
+        for y in range(h):
+            for x in range(w):
+                self.im8_1.setPixel((x*y//5+random.randint(0,60))%200, (x,y))
+        for grid in (HEXAGONAL, SQUARE):
+            self.im8_3.reset()
+            self.im32_3.reset()
+            for n in range(1, 9):
+                regularisedGradient(self.im8_1, self.im8_5, n, grid)
+                accumulateResidue(None, self.im8_5, self.im8_3, self.im32_3, n)
+            fullRegularisedGradient(self.im8_1, self.im8_2, self.im32_2, grid, 8)
+            (x,y) = compare(self.im8_3, self.im8_2, self.im8_2)
+            self.assertLess(x, 0)
+            (x,y) = compare(self.im32_3, self.im32_2, self.im32_2)
+            self.assertLess(x, 0)
+        self.assertRaises(MambaError, fullRegularisedGradient, self.im8_1, self.im32_2, self.im8_4)
+        self.assertRaises(MambaError, fullRegularisedGradient, self.im8_1, self.im8_2, self.im1_1)
+
+    def testAccumulateResidueParameterAcceptation(self):
+        """Verifies that the residue accumulation checks its parameters"""
+        self.assertRaises(MambaError, accumulateResidue, self.im8_1, self.im8_2, self.im32_1, self.im32_2, 1)
+        self.assertRaises(MambaError, accumulateResidue, self.im8_1, self.im32_1, self.im8_2, self.im32_2, 1)
+        self.assertRaises(MambaError, accumulateResidue, self.im8_1, self.im8_2, self.im8_3, self.im1_1, 1)
+        self.assertRaises(MambaError, accumulateResidue, None, self.im8_2, self.im8_3, imageMb(128,128,32), 1)
+
+    def testAccumulateResidue(self):
+        """Verifies the residue accumulation against the equivalent operators"""
+        (w,h) = self.im8_1.getSize()
+        for depth, maxval in [(1,1),(8,255),(32,0xffffffff)]:
+            prev = imageMb(depth)
+            cur = imageMb(depth)
+            res1 = imageMb(depth)
+            res2 = imageMb(depth)
+            wrk = imageMb(depth)
+            mask = imageMb(1)
+            neg = imageMb(1)
+            self.im32_1.reset()
+            self.im32_2.reset()
+            res1.reset()
+            res2.reset()
+            for size in range(1, 6):
+                prev.reset()
+                cur.reset()
+                for i in range(20):
+                    x = random.randint(0,w-1)
+                    y = random.randint(0,h-1)
+                    v = random.randint(0,maxval)
+                    drawSquare(prev, (x,y,x+20,y+20), v)
+                    drawSquare(cur, (x,y,x+random.randint(0,20),y+random.randint(0,20)), random.randint(0,v))
+                logic(prev, cur, cur, "inf")
+                vol = accumulateResidue(prev, cur, res1, self.im32_1, size)
+                self.assertEqual(vol, computeVolume(cur))
+                # Same result with the elementary operators
+                sub(prev, cur, wrk)
+                generateSupMask(wrk, res2, mask, False)
+                if depth==1:
+                    negate(wrk, neg)
+                else:
+                    threshold(wrk, neg, 0, 0)
+                diff(mask, neg, mask)
+                convertByMask(mask, self.im32_3, 0, size)
+                logic(res2, wrk, res2, "sup")
+                logic(self.im32_2, self.im32_3, self.im32_2, "sup")
+                (x,y) = compare(res1, res2, wrk)
+                self.assertLess(x, 0, "depth %d size %d" % (depth, size))
+                (x,y) = compare(self.im32_1, self.im32_2, self.im32_3)
+                self.assertLess(x, 0, "depth %d size %d" % (depth, size))
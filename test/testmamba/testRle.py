@@ -0,0 +1,206 @@
+"""
+Test cases for the run-length encoded binary images
+
+The run-length encoded images store the runs of set pixels of a binary image
+and are converted to and from binary images. The operators work directly on
+the runs.
+
+Python functions and classes:
+    rleImageMb
+    rleEncode
+    rleDecode
+    rleLogic
+    rleNegate
+    rleShift
+    rleDilate
+    rleErode
+    rleLabel
+    rleComputeArea
+
+C functions:
+    MB_RunsCount
+    MB_RunsExtract
+    MB_RunsDraw
+    MB_RunsLogic
+    MB_RunsNegate
+    MB_RunsShift
+    MB_RunsDilate
+    MB_RunsLabel
+"""
+
+from mamba import *
+import unittest
+import random
+import array
+
+class TestRle(unittest.TestCase):
+
+    def setUp(self):
+        self.im1_1 = imageMb(1)
+        self.im1_2 = imageMb(1)
+        self.im1_3 = imageMb(1)
+        self.im1_4 = imageMb(1)
+        self.im8_1 = imageMb(8)
+        self.im32_1 = imageMb(32)
+        self.im32_2 = imageMb(32)
+        self.im1s2_1 = imageMb(128,128,1)
+        self.rle_1 = rleImageMb()
+        self.rle_2 = rleImageMb()
+        self.rle_3 = rleImageMb()
+        self.rles2_1 = rleImageMb(128,128)
+
+    def tearDown(self):
+        del(self.im1_1)
+        del(self.im1_2)
+        del(self.im1_3)
+        del(self.im1_4)
+        del(self.im8_1)
+        del(self.im32_1)
+        del(self.im32_2)
+        del(self.im1s2_1)
+        del(self.rle_1)
+        del(self.rle_2)
+        del(self.rle_3)
+        del(self.rles2_1)
+
+    def _drawRandom(self, im, nb):
+        # Draws random rectangles of various widths in a binary image
+        (w,h) = im.getSize()
+        im.reset()
+        for i in range(nb):
+            x = random.randint(0,w-1)
+            y = random.randint(0,h-1)
+            drawSquare(im, (x,y,min(w-1,x+random.randint(0,90)),min(h-1,y+random.randint(0,3))), 1)
+
+    def _assertSame(self, im1, im2):
+        (x,y) = compare(im1, im2, im2)
+        self.assertLess(x, 0)
+
+    def testDepthAcceptation(self):
+        """Tests that incorrect depth raises an exception"""
+        self.assertRaises(MambaError, rleEncode, self.im8_1, self.rle_1)
+        self.assertRaises(MambaError, rleEncode, self.im32_1, self.rle_1)
+
+    def testSizeCheck(self):
+        """Tests that different sizes raise an exception"""
+        self.assertRaises(MambaError, rleDecode, self.rles2_1, self.im1_1)
+        self.assertRaises(MambaError, rleLogic, self.rles2_1, self.rle_1, self.rle_2, "or")
+        self.assertRaises(MambaError, rleLogic, self.rle_1, self.rle_2, self.rles2_1, "or")
+        self.assertRaises(MambaError, rleNegate, self.rles2_1, self.rle_1)
+        self.assertRaises(MambaError, rleShift, self.rles2_1, self.rle_1, (1,1))
+        self.assertRaises(MambaError, rleDilate, self.rles2_1, self.rle_1)
+        self.assertRaises(MambaError, rleErode, self.rles2_1, self.rle_1)
+        self.assertRaises(MambaError, rleLabel, self.rles2_1, self.im32_1)
+
+    def testParameterRange(self):
+        """Verifies that an incorrect parameter raises an exception"""
+        self.assertRaises(MambaError, rleLogic, self.rle_1, self.rle_2, self.rle_3, "xor")
+        self.assertRaises(MambaError, rleDilate, self.rle_1, self.rle_2, 1, structuringElement([0,1,2], HEXAGONAL))
+        self.assertRaises(MambaError, rleErode, self.rle_1, self.rle_2, 1, TRIANGLE)
+        # Runs outside the image or not sorted
+        self.rle_1.runs = array.array('I', [0,10,300])
+        self.assertRaises(MambaError, rleDecode, self.rle_1, self.im1_1)
+        self.rle_1.runs = array.array('I', [1,10,20,0,0,5])
+        self.assertRaises(MambaError, rleNegate, self.rle_1, self.rle_2)
+
+    def testEncoding(self):
+        """Verifies the conversion between binary and run-length encoded images"""
+        (w,h) = self.im1_1.getSize()
+        self.im1_1.reset()
+        drawSquare(self.im1_1, (60,2,70,2), 1)
+        self.im1_1.setPixel(1, (0,3))
+        self.im1_1.setPixel(1, (w-1,3))
+        drawSquare(self.im1_1, (0,h-1,w-1,h-1), 1)
+        rleEncode(self.im1_1, self.rle_1)
+        self.assertEqual(self.rle_1.getRuns(), [(2,60,71),(3,0,1),(3,w-1,w),(h-1,0,w)])
+        self.assertEqual(rleComputeArea(self.rle_1), 11+2+w)
+
+        for i in range(5):
+            self._drawRandom(self.im1_1, 100)
+            rleEncode(self.im1_1, self.rle_1)
+            rleDecode(self.rle_1, self.im1_2)
+            self._assertSame(self.im1_1, self.im1_2)
+            self.assertEqual(rleComputeArea(self.rle_1), computeVolume(self.im1_1))
+
+        rleEncode(self.im1s2_1, self.rle_1)
+        self.assertEqual(self.rle_1.getSize(), (128,128))
+
+    def testLogic(self):
+        """Verifies the set operations on run-length encoded images"""
+        for i in range(5):
+            self._drawRandom(self.im1_1, 100)
+            self._drawRandom(self.im1_2, 100)
+            rleEncode(self.im1_1, self.rle_1)
+            rleEncode(self.im1_2, self.rle_2)
+            rleLogic(self.rle_1, self.rle_2, self.rle_3, "or")
+            rleDecode(self.rle_3, self.im1_3)
+            logic(self.im1_1, self.im1_2, self.im1_4, "or")
+            self._assertSame(self.im1_3, self.im1_4)
+            rleLogic(self.rle_1, self.rle_2, self.rle_3, "and")
+            rleDecode(self.rle_3, self.im1_3)
+            logic(self.im1_1, self.im1_2, self.im1_4, "and")
+            self._assertSame(self.im1_3, self.im1_4)
+            rleLogic(self.rle_1, self.rle_2, self.rle_3, "diff")
+            rleDecode(self.rle_3, self.im1_3)
+            diff(self.im1_1, self.im1_2, self.im1_4)
+            self._assertSame(self.im1_3, self.im1_4)
+            rleNegate(self.rle_1, self.rle_3)
+            rleDecode(self.rle_3, self.im1_3)
+            negate(self.im1_1, self.im1_4)
+            self._assertSame(self.im1_3, self.im1_4)
+
+    def testShift(self):
+        """Verifies the translation of run-length encoded images"""
+        self._drawRandom(self.im1_1, 100)
+        rleEncode(self.im1_1, self.rle_1)
+        for v in [(0,0),(3,-2),(-70,5),(65,1),(300,0)]:
+            rleShift(self.rle_1, self.rle_2, v)
+            rleDecode(self.rle_2, self.im1_2)
+            shiftVector(self.im1_1, self.im1_3, v, 0)
+            self._assertSame(self.im1_2, self.im1_3)
+
+    def testDilateErode(self):
+        """Verifies the dilation and erosion of run-length encoded images"""
+        for i in range(3):
+            self._drawRandom(self.im1_1, 150)
+            rleEncode(self.im1_1, self.rle_1)
+            for se in [HEXAGON, SQUARE3X3]:
+                for edge in [EMPTY, FILLED]:
+                    n = random.randint(1,3)
+                    rleDilate(self.rle_1, self.rle_2, n, se, edge)
+                    rleDecode(self.rle_2, self.im1_2)
+                    dilate(self.im1_1, self.im1_3, n, se, edge)
+                    self._assertSame(self.im1_2, self.im1_3)
+                    rleErode(self.rle_1, self.rle_2, n, se, edge)
+                    rleDecode(self.rle_2, self.im1_2)
+                    erode(self.im1_1, self.im1_3, n, se, edge)
+                    self._assertSame(self.im1_2, self.im1_3)
+
+    def testLabel(self):
+        """Verifies the labelling of run-length encoded images"""
+        self.im1_1.reset()
+        drawSquare(self.im1_1, (10,10,20,10), 1)
+        drawSquare(self.im1_1, (21,11,30,11), 1)
+        drawSquare(self.im1_1, (5,30,5,40), 1)
+        rleEncode(self.im1_1, self.rle_1)
+        n = rleLabel(self.rle_1, self.im32_1, SQUARE)
+        self.assertEqual(n, 2)
+        self.assertEqual(self.im32_1.getPixel((15,10)), 1)
+        self.assertEqual(self.im32_1.getPixel((25,11)), 1)
+        self.assertEqual(self.im32_1.getPixel((5,35)), 2)
+        self.assertEqual(self.im32_1.getPixel((0,0)), 0)
+
+        for grid in [HEXAGONAL, SQUARE]:
+            self._drawRandom(self.im1_1, 200)
+            rleEncode(self.im1_1, self.rle_1)
+            n = rleLabel(self.rle_1, self.im32_1, grid)
+            self.assertEqual(n, label(self.im1_1, self.im32_2, grid=grid))
+            self.assertEqual(computeRange(self.im32_1), (0,n))
+            # Each component keeps its label in both labellings
+            for i in range(1, n+1):
+                threshold(self.im32_1, self.im1_2, i, i)
+                self.im1_3.reset()
+                (x,y) = compare(self.im1_2, self.im1_3, self.im1_3)
+                v = self.im32_2.getPixel((x,y))
+                threshold(self.im32_2, self.im1_3, v, v)
+                self._assertSame(self.im1_2, self.im1_3)
@@ -3,6 +3,7 @@ Test cases for the segmentation (watershed based) functions found in the segment
 module of mamba package.
 
 Python functions and classes:
+    markerWatershed
     markerControlledWatershed
     valuedWatershed
     fastSKIZ
@@ -160,6 +161,58 @@ class TestSegment(unittest.TestCase):
         (x,y) = compare(self.im8_3, self.im8_2, self.im8_3)
         self.assertLess(x, 0)
         
+    def testMarkerWatershed(self):
+        """Verifies that the single flooding gives the labels and the lines of watershedSegment"""
+        (w,h) = self.im8_1.getSize()
+        
+        for imIn in [self.im8_1, self.im32_1]:
+            vmax = 255 if imIn.getDepth()==8 else 100000
+            imIn.reset()
+            for i in range(200):
+                drawFillCircle(imIn, (random.randint(0,w-1), random.randint(0,h-1),
+                                      random.randint(1,10)), random.randint(1,vmax))
+            self.im1_1.reset()
+            for i in range(10):
+                self.im1_1.setPixel(1, (random.randint(0,w-1), random.randint(0,h-1)))
+            nb = label(self.im1_1, self.im32_2)
+            watershedSegment(imIn, self.im32_2)
+            self.im8_2.reset()
+            copyBytePlane(self.im32_2, 3, self.im8_2)
+            threshold(self.im8_2, self.im1_2, 255, 255)
+            # The reference labels without the line byte plane
+            self.im8_2.reset()
+            copyBytePlane(self.im8_2, 3, self.im32_2)
+            
+            # Binary markers, binary line
+            markerWatershed(imIn, self.im1_1, self.im32_3, self.im1_3)
+            (x,y) = compare(self.im32_2, self.im32_3, self.im32_4)
+            self.assertLess(x, 0)
+            (x,y) = compare(self.im1_2, self.im1_3, self.im1_4)
+            self.assertLess(x, 0)
+            
+            # Labelled markers, valued line
+            imLine = imageMb(imIn)
+            imRef = imageMb(imIn)
+            label(self.im1_1, self.im32_3)
+            markerWatershed(imIn, self.im32_3, self.im32_3, imLine)
+            (x,y) = compare(self.im32_2, self.im32_3, self.im32_4)
+            self.assertLess(x, 0)
+            imRef.reset()
+            convertByMask(self.im1_2, imRef, 0, computeMaxRange(imRef)[1])
+            logic(imRef, imIn, imRef, "inf")
+            (x,y) = compare(imLine, imRef, imRef)
+            self.assertLess(x, 0)
+            
+            # No line
+            markerWatershed(imIn, self.im1_1, self.im32_3)
+            (x,y) = compare(self.im32_2, self.im32_3, self.im32_4)
+            self.assertLess(x, 0)
+        
+        self.assertRaises(MambaError, markerWatershed, self.im8_1, self.im1_1,
+                          self.im32_3, self.im32_4)
+        self.assertRaises(MambaError, markerWatershed, self.im8_1, self.im1_1,
+                          self.im32_3, imageMb(128,128,1))
+        
     def testValuedWatershed(self):
         """Verifies the minima controlled valued watershed computation"""
         (w,h) = self.im8_1.getSize()
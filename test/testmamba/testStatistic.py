@@ -3,9 +3,14 @@ Test cases for the statistical functions found in the statistic module of
 mamba package.
 
 Python functions and classes:
+    computeStatistics
+    getHistogram
     getMean
     getMedian
     getVariance
+    
+C functions:
+    MB_Stats
 """
 
 from mamba import *
@@ -91,3 +96,87 @@ class TestStatistic(unittest.TestCase):
             var = var/(w*h-1)
             self.assertEqual(getVariance(self.im8_1), var, "var %f %f" % (var,getVariance(self.im8_1)) )
 
+    def testComputeStatistics(self):
+        """Verifies the single pass statistics on greyscale and 32-bit images"""
+        (w,h) = self.im8_1.getSize()
+        
+        for im in [self.im8_1, self.im32_1]:
+            vmax = 255 if im.getDepth()==8 else 0xffffffff
+            l = []
+            for wi in range(w):
+                vi = random.randint(0,vmax)
+                drawLine(im, (wi,0,wi,h-1), vi)
+                l.append(vi)
+            count, mi, ma, s, s2 = computeStatistics(im)
+            self.assertEqual(count, w*h)
+            self.assertEqual(mi, min(l))
+            self.assertEqual(ma, max(l))
+            self.assertEqual(s, h*sum(l))
+            self.assertEqual(s2, h*sum([v*v for v in l]))
+            
+    def testComputeStatisticsMask(self):
+        """Verifies the statistics restricted to a binary mask"""
+        (w,h) = self.im8_1.getSize()
+        
+        self.im1_1.reset()
+        drawSquare(self.im1_1, (5,7,w//2,h//2), 1)
+        n = computeVolume(self.im1_1)
+        for im in [self.im8_1, self.im32_1]:
+            im.fill(1)
+            drawSquare(im, (5,7,w//2,h//2), 3)
+            im.setPixel(2, (5,7))
+            count, mi, ma, s, s2 = computeStatistics(im, self.im1_1)
+            self.assertEqual(count, n)
+            self.assertEqual(mi, 2)
+            self.assertEqual(ma, 3)
+            self.assertEqual(s, 3*n-1)
+            self.assertEqual(s2, 9*n-5)
+            self.assertEqual(getMean(im, self.im1_1), (3*n-1)/float(n))
+        histo = getHistogram(self.im8_1, self.im1_1)
+        self.assertEqual(histo[2], 1)
+        self.assertEqual(histo[3], n-1)
+        self.assertEqual(sum(histo), n)
+        self.assertEqual(getMedian(self.im8_1, self.im1_1), 3)
+        
+        self.im1_1.reset()
+        count, mi, ma, s, s2 = computeStatistics(self.im8_1, self.im1_1)
+        self.assertEqual((count, mi, ma, s, s2), (0, 0, 0, 0, 0.0))
+        
+    def testComputeStatisticsErrors(self):
+        """Verifies that incorrect depth or size raise an exception"""
+        self.assertRaises(MambaError, computeStatistics, self.im1_1)
+        self.assertRaises(MambaError, computeStatistics, self.im8_1, self.im8_2)
+        self.assertRaises(MambaError, computeStatistics, self.im8_1, imageMb(128,128,1))
+        self.assertRaises(MambaError, getHistogram, self.im32_1, self.im1_1)
+        
+    def testGetVariance32(self):
+        """Verifies the computation of the variance value of a 32-bit image"""
+        (w,h) = self.im32_1.getSize()
+        
+        l = []
+        for wi in range(w):
+            vi = random.randint(0,100000)
+            drawLine(self.im32_1, (wi,0,wi,h-1), vi)
+            l.append(vi)
+        mean = float(sum(l))/len(l)
+        var = h*sum([(v-mean)*(v-mean) for v in l])/(w*h-1)
+        self.assertAlmostEqual(getVariance(self.im32_1)/var, 1.0)
+        
+        # Large values close to each other (the float computation of the
+        # sums loses the variance)
+        l = [0xffffffff-(wi%2) for wi in range(w)]
+        for wi in range(w):
+            drawLine(self.im32_1, (wi,0,wi,h-1), l[wi])
+        n = w*h
+        s = h*sum(l)
+        s2 = h*sum([v*v for v in l])
+        self.assertEqual(getVariance(self.im32_1), (n*s2-s*s)/(n*(n-1)))
+        self.assertAlmostEqual(getVariance(self.im32_1), 0.25*n/(n-1))
+        
+        # At least two pixels are needed
+        self.im1_1.reset()
+        self.im1_1.setPixel(1, (3,4))
+        self.assertRaises(MambaError, getVariance, self.im32_1, self.im1_1)
+        self.assertRaises(MambaError, getVariance, self.im8_1, self.im1_1)
+        self.im1_1.reset()
+        self.assertRaises(MambaError, getMean, self.im32_1, self.im1_1)
@@ -853,3 +853,25 @@ class TestSupNb(unittest.TestCase):
             vol = computeVolume(self.im32_1)
             self.assertEqual(vol, w*h*0xffffffff)
 
+    def testChangedLines(self):
+        """Verifies the range of modified lines returned by the function"""
+        for grid in (HEXAGONAL, SQUARE):
+            for (im1, im2, v) in ((self.im1_1, self.im1_2, 1),
+                                  (self.im8_1, self.im8_2, 200),
+                                  (self.im32_1, self.im32_2, 70000)):
+                (w,h) = im1.getSize()
+                im1.reset()
+                im1.setPixel(v, (w//2,h//2))
+                copy(im1, im2)
+                (first, last) = supNeighbor(im1, im2, 1<<1, grid=grid)
+                self.assertEqual((first, last), (h//2+1, h//2+1))
+                (first, last) = supNeighbor(im1, im2, 0x1ff, grid=grid)
+                self.assertEqual((first, last), (h//2-1, h//2+1))
+                (first, last) = supNeighbor(im2, im2, 1, grid=grid)
+                self.assertGreater(first, last)
+                im1.reset()
+                im2.reset()
+                (first, last) = supNeighbor(im1, im2, 0x1ff, grid=grid)
+                self.assertGreater(first, last)
+                (first, last) = supNeighbor(im1, im2, 0x1ff, grid=grid, edge=FILLED)
+                self.assertEqual((first, last), (0, h-1))
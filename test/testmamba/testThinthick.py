@@ -4,6 +4,8 @@ module of mamba package.
 
 Python functions and classes:
     doubleStructuringElement
+    neighborLookup
+    hitOrMissTable
     thin
     thick
     rotatingThin
@@ -12,6 +14,8 @@ Python functions and classes:
     supThick
     fullThin
     fullThick
+    thinSequence
+    thickSequence
     thinL
     thinM
     thinD
@@ -30,6 +34,11 @@ Python functions and classes:
     rotatingGeodesicThin
     fullGeodesicThick
     fullGeodesicThin
+
+C functions:
+    MB_BinThinSequence
+    MB_BinThickSequence
+    MB_BinNeighborLookup
 """
 
 from mamba import *
@@ -101,6 +110,69 @@ class TestThinthick(unittest.TestCase):
         self.assertEqual(dse.getStructuringElement(0), se2)
         self.assertEqual(dse.getStructuringElement(1), se1)
         
+    def testNeighborLookup(self):
+        """Verifies the neighbor configuration lookup operator"""
+        (w,h) = self.im1_1.getSize()
+        
+        self.assertRaises(MambaError, neighborLookup, self.im8_1, self.im8_2,
+                          64*[0], grid=mamba.HEXAGONAL)
+        self.assertRaises(MambaError, neighborLookup, self.im1_1, self.im1_1,
+                          64*[0], grid=mamba.HEXAGONAL)
+        self.assertRaises(MambaError, neighborLookup, self.im1_1, self.im1_2,
+                          256*[0], grid=mamba.HEXAGONAL)
+        self.assertRaises(MambaError, neighborLookup, self.im1_1, self.im1_2,
+                          128*[0], grid=mamba.SQUARE)
+        
+        self.im1_1.reset()
+        for i in range(500):
+            self.im1_1.setPixel(1, (random.randint(0, w-1), random.randint(0, h-1)))
+        dilate(self.im1_1, self.im1_1)
+        for grid in (mamba.HEXAGONAL, mamba.SQUARE):
+            nb = gridNeighbors(grid)
+            # number of neighbors of the pixels set to true
+            table = [bin(code).count("1") for code in range(2**nb)]
+            self.im8_2.reset()
+            for d in getDirections(grid)[1:]:
+                dse = doubleStructuringElement([], [0,d], grid)
+                hitOrMiss(self.im1_1, self.im1_3, dse)
+                add(self.im8_2, self.im1_3, self.im8_2)
+            for im in (self.im8_1, self.im32_1):
+                neighborLookup(self.im1_1, im, table, grid=grid)
+                convert(im, self.im8_3) if im.getDepth()==32 else copy(im, self.im8_3)
+                (x,y) = compare(self.im8_2, self.im8_3, self.im8_3)
+                self.assertLess(x, 0)
+            
+            # with the center, all the pixels get a value
+            table = [code for code in range(2**(nb+1))]
+            neighborLookup(self.im1_1, self.im32_1, table, grid=grid, edge=FILLED)
+            self.assertEqual(self.im32_1.getPixel((0,h//2)) & (2**nb), 
+                             (2**nb)*self.im1_1.getPixel((0,h//2)))
+            self.im1_2.reset()
+            neighborLookup(self.im1_2, self.im32_1, table, grid=grid, edge=FILLED)
+            self.assertEqual(self.im32_1.getPixel((w//2,h//2)), 0)
+            self.assertEqual(self.im32_1.getPixel((0,0)),
+                             [57, 227][grid==mamba.SQUARE])
+        
+    def testHitOrMissTable(self):
+        """Verifies the hit-or-miss table used with the lookup operator"""
+        (w,h) = self.im1_1.getSize()
+        
+        self.im1_1.reset()
+        for i in range(2000):
+            self.im1_1.setPixel(1, (random.randint(0, w-1), random.randint(0, h-1)))
+        for grid in (mamba.HEXAGONAL, mamba.SQUARE):
+            dse1 = doubleStructuringElement([1,2], [0,4], grid)
+            dse2 = doubleStructuringElement([0], [3], grid)
+            table = hitOrMissTable([dse1, dse2])
+            self.assertEqual(len(table), 2**(gridNeighbors(grid)+1))
+            for edge in (EMPTY, FILLED):
+                neighborLookup(self.im1_1, self.im1_2, table, grid=grid, edge=edge)
+                hitOrMiss(self.im1_1, self.im1_3, dse1, edge=edge)
+                hitOrMiss(self.im1_1, self.im1_4, dse2, edge=edge)
+                logic(self.im1_3, self.im1_4, self.im1_3, "sup")
+                (x,y) = compare(self.im1_2, self.im1_3, self.im1_2)
+                self.assertLess(x, 0)
+        
     def testThin(self):
         """Verifies the thinning generic operator"""
         (w,h) = self.im1_1.getSize()
@@ -261,6 +333,64 @@ class TestThinthick(unittest.TestCase):
         (x,y) = compare(self.im1_2, self.im1_3, self.im1_2)
         self.assertLess(x, 0)
         
+    def testThinSequence(self):
+        """Verifies the sequential thinning operator"""
+        (w,h) = self.im1_1.getSize()
+        
+        dse1 = doubleStructuringElement([], [2,3,4], mamba.SQUARE)
+        dse2 = doubleStructuringElement([], [1,2,3], mamba.HEXAGONAL)
+        self.assertRaises(ValueError, thinSequence, self.im1_1, self.im1_2,
+                          [dse1, dse2])
+        self.assertRaises(MambaError, thinSequence, self.im8_1, self.im8_2,
+                          [dse1])
+        
+        for i in range(200):
+            self.im1_1.setPixel(1, (random.randint(0, w-1), random.randint(0, h-1)))
+        dilate(self.im1_1, self.im1_1, 2, se=SQUARE3X3)
+        for grid in (mamba.HEXAGONAL, mamba.SQUARE):
+            for edge in (EMPTY, FILLED):
+                dse = doubleStructuringElement([1,7], [0,3,4,5], grid)
+                dseList = [dse, dse.rotate(2), dse.flip()]
+                thinSequence(self.im1_1, self.im1_2, dseList, cycles=1, edge=edge)
+                copy(self.im1_1, self.im1_3)
+                for d in dseList:
+                    thin(self.im1_3, self.im1_3, d, edge=edge)
+                (x,y) = compare(self.im1_2, self.im1_3, self.im1_2)
+                self.assertLess(x, 0)
+                
+                thinSequence(self.im1_1, self.im1_2, dseList, edge=edge)
+                copy(self.im1_1, self.im1_3)
+                v = 0
+                while v!=computeVolume(self.im1_3):
+                    v = computeVolume(self.im1_3)
+                    for d in dseList:
+                        thin(self.im1_3, self.im1_3, d, edge=edge)
+                (x,y) = compare(self.im1_2, self.im1_3, self.im1_2)
+                self.assertLess(x, 0)
+        
+    def testThickSequence(self):
+        """Verifies the sequential thickening operator"""
+        (w,h) = self.im1_1.getSize()
+        
+        dse1 = doubleStructuringElement([], [3], mamba.SQUARE)
+        dse2 = doubleStructuringElement([], [3], mamba.HEXAGONAL)
+        self.assertRaises(ValueError, thickSequence, self.im1_1, self.im1_2,
+                          [dse1, dse2])
+        
+        self.im1_1.reset()
+        self.im1_1.setPixel(1, (w//2  ,h//2))
+        thickSequence(self.im1_1, self.im1_2, [dse1, dse1.rotate(4)], cycles=3)
+        self.im1_3.reset()
+        drawLine(self.im1_3, (w//2-3, h//2, w//2+3, h//2), 1)
+        (x,y) = compare(self.im1_2, self.im1_3, self.im1_2)
+        self.assertLess(x, 0)
+        
+        thickSequence(self.im1_1, self.im1_2, [dse1, dse1.rotate(4)])
+        self.im1_3.reset()
+        drawLine(self.im1_3, (0, h//2, w-1, h//2), 1)
+        (x,y) = compare(self.im1_2, self.im1_3, self.im1_2)
+        self.assertLess(x, 0)
+        
     def testThinL(self):
         """Verifes the thinning with a L double structuring element"""
         (w,h) = self.im1_1.getSize()
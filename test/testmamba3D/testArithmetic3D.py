@@ -12,6 +12,7 @@ Python functions:
     divConst3D
     mulConst3D
     mulRealConst3D
+    affineConst3D
     negate3D
     logic3D
     diff3D
@@ -72,6 +73,7 @@ class TestArithmetic3D(unittest.TestCase):
         self.assertRaises(MambaError,floorSubConst3D,self.im32_4,0,self.im32_3)
         self.assertRaises(MambaError,floorSub3D,self.im32_4,self.im32_2,self.im32_3)
         self.assertRaises(MambaError,mulRealConst3D,self.im32_1, 1.0, self.im32_4)
+        self.assertRaises(MambaError,affineConst3D,self.im32_1, 1.0, 0.0, self.im32_4)
     
     def testAdd3D(self):
         """Verifies the 3D addition operator"""
@@ -243,4 +245,23 @@ class TestArithmetic3D(unittest.TestCase):
         mulRealConst3D(self.im8_1, 1.3, self.im32_2)
         (x,y,z) = compare3D(self.im32_3, self.im32_2, self.im32_3)
         self.assertLess(x, 0)
+        
+    def testAffineConst3D(self):
+        """Tests the real value affine function"""
+        self.im8_1.fill(200)
+        self.im8_3.fill(90)
+        affineConst3D(self.im8_1, 0.5, -10, self.im8_2)
+        (x,y,z) = compare3D(self.im8_3, self.im8_2, self.im8_3)
+        self.assertLess(x, 0)
+        
+        self.im32_1.fill(1000)
+        self.im8_3.fill(255)
+        affineConst3D(self.im32_1, 0.25, 6.5, self.im8_2, nearest=True)
+        (x,y,z) = compare3D(self.im8_3, self.im8_2, self.im8_3)
+        self.assertLess(x, 0)
+        
+        self.im32_3.fill(257)
+        affineConst3D(self.im32_1, 0.25, 6.5, self.im32_2, nearest=True)
+        (x,y,z) = compare3D(self.im32_3, self.im32_2, self.im32_3)
+        self.assertLess(x, 0)
 
@@ -295,3 +295,15 @@ class TestBase3D(unittest.TestCase):
         im3D.setName("test %d" % (nb))
         self.assertEqual(im3D.getName(), "test %d" % (nb))
 
+    def testSliceCache(self):
+        """Verifies that the measures on the slices follow the 3D operators"""
+        im8_1 = image3DMb(64,64,64,8)
+        im8_2 = image3DMb(64,64,64,8)
+        im8_1.reset()
+        self.assertEqual(computeVolume(im8_1[10]), 0)
+        im8_2.fill(7)
+        copy3D(im8_2, im8_1)
+        self.assertEqual(computeVolume(im8_1[10]), 7*64*64)
+        im8_1.convert(32)
+        im8_1.setPixel(1000, (1,1,10))
+        self.assertEqual(computeRange(im8_1[10]), (7,1000))
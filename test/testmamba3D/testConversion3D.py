@@ -8,6 +8,7 @@ Python functions:
     threshold3D
     generateSupMask3D
     lookup3D
+    remap3D
 """
 
 from mamba import *
@@ -60,6 +61,7 @@ class TestConversion3D(unittest.TestCase):
         self.assertRaises(MambaError,generateSupMask3D,self.im8_1,self.im8_5,self.im1_3,False)
         self.assertRaises(MambaError,generateSupMask3D,self.im8_1,self.im8_2,self.im1_5,False)
         self.assertRaises(MambaError,lookup3D,self.im8_1,self.im1_5,256*[0])
+        self.assertRaises(MambaError,remap3D,self.im32_1,self.im32_5,[0])
         
     def testConvert3D_8_1(self):
         """Tests the 3D image greyscale/binary conversion function"""
@@ -187,3 +189,23 @@ class TestConversion3D(unittest.TestCase):
         (x,y,z) = compare3D(self.im8_3, self.im8_2, self.im8_3)
         self.assertLess(x, 0, "diff in (%d,%d,%d)"%(x,y,z))
 
+    def testRemap3D(self):
+        """Tests the remapping of 32-bit 3D images"""
+        (w,h,l) = self.im32_1.getSize()
+        
+        for i in range(l):
+            self.im32_1[i].fill(100000*i)
+            
+        self.im32_3.reset()
+        for i in range(l):
+            self.im32_3[i].fill(i)
+        remap3D(self.im32_1, self.im32_2, dict((100000*i,i) for i in range(l)))
+        (x,y,z) = compare3D(self.im32_3, self.im32_2, self.im32_3)
+        self.assertLess(x, 0, "diff in (%d,%d,%d)"%(x,y,z))
+        
+        self.im8_3.reset()
+        self.im8_3[0].fill(255)
+        self.im8_3[1].fill(7)
+        remap3D(self.im32_1, self.im8_2, [1000]+99999*[0]+[7], 0)
+        (x,y,z) = compare3D(self.im8_3, self.im8_2, self.im8_3)
+        self.assertLess(x, 0, "diff in (%d,%d,%d)"%(x,y,z))
@@ -7,6 +7,10 @@ Python functions:
     copyBitPlane3D
     copyBytePlane3D
     cropCopy3D
+    extractSlice3D
+
+C functions:
+    MB3D_ExtractSlice
 """
 
 from mamba import *
@@ -119,3 +123,78 @@ class TestConversion3D(unittest.TestCase):
             self.assertLess(x, 0)
             
             
+
+    def _randomFill(self, im, maxval):
+        # Fills 3D image im with random values (binary images use 0/1)
+        (w,h,l) = im.getSize()
+        for i in range(l):
+            for j in range(30):
+                x = random.randint(0,w-1)
+                y = random.randint(0,h-1)
+                v = random.randint(0,maxval)
+                im[i].setPixel(v, (x,y))
+                drawSquare(im[i], (x,y,x+random.randint(0,9),y+random.randint(0,9)), v)
+
+    def _checkSlice(self, imIn, axis, index, imOut, conv):
+        # Verifies the content of the extracted slice
+        (w,h,l) = imIn.getSize()
+        if axis=="X":
+            sw,sh = l,h
+            pos = lambda u,v: (index,v,u)
+        elif axis=="Y":
+            sw,sh = w,l
+            pos = lambda u,v: (u,index,v)
+        else:
+            sw,sh = w,h
+            pos = lambda u,v: (u,v,index)
+        xs = [u for v in range(sh) for u in range(sw)]
+        ys = [v for v in range(sh) for u in range(sw)]
+        values = imOut.getPixels(xs, ys)
+        for u,v,vo in zip(xs, ys, values):
+            vi = conv(imIn.getPixel(pos(u,v)))
+            self.assertEqual(vi, vo, "%s slice %d at %d,%d: %d!=%d" % (axis,index,u,v,vi,vo))
+
+    def testExtractSlice3DParameterAcceptation(self):
+        """Verifies that the slice extraction checks its parameters"""
+        imIn = image3DMb(64,32,20,8)
+        self.assertRaises(MambaError, extractSlice3D, imIn, "W", 0, imageMb(64,64,8))
+        self.assertRaises(MambaError, extractSlice3D, imIn, "Z", 20, imageMb(64,32,8))
+        self.assertRaises(MambaError, extractSlice3D, imIn, "X", 64, imageMb(64,32,8))
+        self.assertRaises(MambaError, extractSlice3D, imIn, "Y", 32, imageMb(64,32,8))
+        self.assertRaises(MambaError, extractSlice3D, imIn, "Y", 0, imageMb(64,16,8))
+        self.assertRaises(MambaError, extractSlice3D, imIn, "Z", 0, imageMb(64,32,1))
+        self.assertRaises(MambaError, extractSlice3D, imIn, "Z", 0, imageMb(64,32,32))
+        self.assertRaises(MambaError, extractSlice3D, image3DMb(64,32,20,32), "Z", 0, imageMb(64,32,8), 5)
+
+    def testExtractSlice3D(self):
+        """Tests the extraction of orthogonal slices of 3D images"""
+        im1 = image3DMb(64,32,20,1)
+        im8 = image3DMb(64,32,20,8)
+        im32 = image3DMb(64,32,20,32)
+        self._randomFill(im1, 1)
+        self._randomFill(im8, 255)
+        self._randomFill(im32, 0xffffffff)
+        maxval = computeRange3D(im32)[1]
+        imOut1 = imageMb(64,64,1)
+        imOut8 = imageMb(64,64,8)
+        imOut32 = imageMb(64,64,32)
+        for axis,index in [("X",0),("X",37),("Y",5),("Y",31),("Z",0),("Z",19)]:
+            extractSlice3D(im1, axis, index, imOut1)
+            self._checkSlice(im1, axis, index, imOut1, lambda v: v)
+            extractSlice3D(im1, axis, index, imOut8)
+            self._checkSlice(im1, axis, index, imOut8, lambda v: v*255)
+            extractSlice3D(im8, axis, index, imOut8)
+            self._checkSlice(im8, axis, index, imOut8, lambda v: v)
+            extractSlice3D(im32, axis, index, imOut32)
+            self._checkSlice(im32, axis, index, imOut32, lambda v: v)
+            extractSlice3D(im32, axis, index, imOut8, 2)
+            self._checkSlice(im32, axis, index, imOut8, lambda v: (v>>16)&0xff)
+
+        # Downscaling gives the same result as the 3D conversion
+        im8_2 = image3DMb(64,32,20,8)
+        convert3D(im32, im8_2)
+        for z in (0, 7, 19):
+            extractSlice3D(im32, "Z", z, imOut8, 4, maxval)
+            self._checkSlice(im8_2, "Z", z, imOut8, lambda v: v)
+            extractSlice3D(im32, "X", z, imOut8, 4, maxval)
+            self._checkSlice(im8_2, "X", z, imOut8, lambda v: v)
@@ -5,6 +5,8 @@ mamba3D package.
 Python functions:
     drawLine3D
     drawCube
+    drawLines3D
+    drawCubes
     getIntensityAlongLine3D
 """
 
@@ -157,3 +159,31 @@ class TestDraw3D(unittest.TestCase):
             else:
                 self.assertEqual(inte, list(range(z,z+e*m_abs_d+1)), "%s : %d" % (repr(d),m_abs_d))
 
+    def testDrawMultipleShapes3D(self):
+        """Verifies that drawing many 3D shapes in one call gives the same result"""
+        (w,h,l) = self.im8_1.getSize()
+        
+        for drawOne, drawMany in [(drawLine3D, drawLines3D), (drawCube, drawCubes)]:
+            shapes = []
+            self.im8_1.reset()
+            for i in range(10):
+                shape = (random.randint(0,w-1), random.randint(0,h-1), random.randint(0,l-1),
+                         random.randint(0,w-1), random.randint(0,h-1), random.randint(0,l-1))
+                shapes.append(shape)
+                drawOne(self.im8_1, shape, 255)
+            self.im8_2.reset()
+            drawMany(self.im8_2, shapes, 255)
+            vol1 = computeVolume3D(self.im8_1)
+            self.assertEqual(computeVolume3D(self.im8_2), vol1)
+            diff3D(self.im8_1, self.im8_2, self.im8_3)
+            self.assertEqual(computeVolume3D(self.im8_3), 0)
+        
+        self.im8_1.reset()
+        drawCube(self.im8_1, (-5,-5,-5,4,4,4), 1)
+        self.assertEqual(computeVolume3D(self.im8_1), 125)
+        self.im8_1.reset()
+        drawLine3D(self.im8_1, (-10,5,5,w+10,5,5), 1)
+        self.assertEqual(computeVolume3D(self.im8_1), w)
+        self.im8_1.reset()
+        drawLines3D(self.im8_1, [(-10,-10,-10,-1,-1,-1)], 1)
+        self.assertEqual(computeVolume3D(self.im8_1), 0)
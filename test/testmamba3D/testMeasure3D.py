@@ -6,6 +6,12 @@ Python functions:
     computeVolume3D
     computeRange3D
     computeMaxRange3D
+    project3D
+
+C functions:
+    MB3D_Volume
+    MB3D_Range
+    MB3D_Project
 """
 
 from mamba import *
@@ -79,3 +85,48 @@ class TestMiscellaneous3D(unittest.TestCase):
         self.assertEqual(mi, 0)
         self.assertEqual(ma, 0xffffffff)
         
+
+    def testProject3DParameterAcceptation(self):
+        """Verifies that the projection checks its parameters"""
+        imIn = image3DMb(64,32,10,8)
+        self.assertRaises(MambaError, project3D, imIn, imageMb(64,32,8), "W")
+        self.assertRaises(MambaError, project3D, imIn, imageMb(64,32,8), "Z", "mean")
+        self.assertRaises(MambaError, project3D, imIn, imageMb(64,8,8), "Y")
+        self.assertRaises(MambaError, project3D, imIn, imageMb(64,32,32), "Z", "max")
+        self.assertRaises(MambaError, project3D, imIn, imageMb(64,32,8), "Z", "sum")
+        self.assertRaises(MambaError, project3D, imIn, imageMb(64,32,8), "Z", "count")
+
+    def testProject3D(self):
+        """Tests the projections of 3D images along each axis"""
+        for d,maxval in [(1,1),(8,255),(32,0xffffff)]:
+            imIn = image3DMb(64,32,10,d)
+            for im2D in imIn:
+                for j in range(20):
+                    x = random.randint(0,63)
+                    y = random.randint(0,31)
+                    drawSquare(im2D, (x,y,x+random.randint(0,9),y+random.randint(0,9)), random.randint(0,maxval))
+            pixels = {}
+            for z in range(10):
+                xs = [x for y in range(32) for x in range(64)]
+                ys = [y for y in range(32) for x in range(64)]
+                for x,y,v in zip(xs, ys, imIn[z].getPixels(xs, ys)):
+                    pixels[(x,y,z)] = v
+            reduce = {"max": max, "min": min, "sum": sum,
+                      "count": lambda l: len([v for v in l if v!=0])}
+            for axis,sw,sh,pos,n in [("X",10,32,lambda u,v,i: (i,v,u),64),
+                                     ("Y",64,10,lambda u,v,i: (u,i,v),32),
+                                     ("Z",64,32,lambda u,v,i: (u,v,i),10)]:
+                for op in ["max","min","sum","count"]:
+                    if op in ("max","min"):
+                        imOut = imageMb(64,64,d)
+                    else:
+                        imOut = imageMb(64,64,32)
+                    project3D(imIn, imOut, axis, op)
+                    xs = [u for v in range(sh) for u in range(sw)]
+                    ys = [v for v in range(sh) for u in range(sw)]
+                    for u,v,vo in zip(xs, ys, imOut.getPixels(xs, ys)):
+                        exp = reduce[op]([pixels[pos(u,v,i)] for i in range(n)])
+                        self.assertEqual(vo, exp, "%d %s %s at %d,%d" % (d,axis,op,u,v))
+            vol = sum(pixels.values())
+            self.assertEqual(computeVolume3D(imIn), vol)
+            self.assertEqual(computeRange3D(imIn), (min(pixels.values()), max(pixels.values())))
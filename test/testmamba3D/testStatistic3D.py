@@ -3,6 +3,7 @@ Test cases for the statistic functions found in the statistic3D module of
 mamba3D package. 
 
 Python functions:
+    computeStatistics3D
     getHistogram3D
     getMean3D
     getMedian3D
@@ -122,3 +123,30 @@ class TestStatistic3D(unittest.TestCase):
             var = var/(l*w*h-1)
             self.assertEqual(getVariance3D(self.im8_1), var, "var %f %f" % (var,getVariance3D(self.im8_1)) )
 
+    def testComputeStatistics3D(self):
+        """Verifies the computation of statistics with a mask in 3D images"""
+        (w,h,l) = self.im8_1.getSize()
+        self._drawValueByPlane(self.im8_1)
+        self._drawValueByPlane(self.im32_1)
+        self.im1_1.reset()
+        for i in range(10,20):
+            self.im1_1[i].fill(1)
+        for im in [self.im8_1, self.im32_1]:
+            count, mi, ma, s, s2 = computeStatistics3D(im)
+            self.assertEqual(count, w*h*l)
+            self.assertEqual((mi, ma), (0, l-1))
+            self.assertEqual(s, w*h*sum(range(l)))
+            count, mi, ma, s, s2 = computeStatistics3D(im, self.im1_1)
+            self.assertEqual(count, w*h*10)
+            self.assertEqual((mi, ma), (10, 19))
+            self.assertEqual(s, w*h*sum(range(10,20)))
+            self.assertEqual(s2, w*h*sum([i*i for i in range(10,20)]))
+            self.assertEqual(getMean3D(im, self.im1_1), 14.5)
+        self.assertEqual(getMedian3D(self.im8_1, self.im1_1), 15)
+        self.assertRaises(MambaError, computeStatistics3D, self.im8_1, self.im1_5)
+        self.im1_1.reset()
+        self.im1_1[3].setPixel(1, (3,4))
+        self.assertRaises(MambaError, getVariance3D, self.im8_1, self.im1_1)
+        self.assertRaises(MambaError, getVariance3D, self.im32_1, self.im1_1)
+        self.im1_1.reset()
+        self.assertRaises(MambaError, getMean3D, self.im32_1, self.im1_1)
@@ -10,6 +10,7 @@ Python functions and method:
     imageMb.setName
     setShowImages
     getShowImages
+    setRefreshRate
 """
 
 from mamba import *
@@ -17,6 +18,7 @@ import mambaDisplay
 import unittest
 from PIL import Image
 import os
+import time
 
 class testDisplayer(mambaDisplay.Displayer):
 
@@ -187,4 +189,42 @@ class TestDisplay2D(unittest.TestCase):
         im2 = imageMb()
         self.assertEqual(testDisp.getStatsOnFun("addWindow"), 0)
         self.assertEqual(testDisp.getStatsOnFun("showWindow"), 0)
-        
+
+class TestDftDisplayer(unittest.TestCase):
+
+    def setUp(self):
+        # The default displayer needs a working Tk display
+        try:
+            from mambaDisplay import dftDisplayer
+            self.disp = dftDisplayer.DftDisplayer()
+        except Exception:
+            self.skipTest("Tk display not available")
+        mambaDisplay.setRefreshRate(10)
+
+    def tearDown(self):
+        self.disp.root.destroy()
+        mambaDisplay.setRefreshRate(10)
+
+    def testPostponedUpdate(self):
+        """Verifies that the last of two quick updates is displayed"""
+        im1 = imageMb(8)
+        im2 = imageMb(8)
+        key1 = self.disp.addWindow(im1)
+        key2 = self.disp.addWindow(im2)
+        self.disp.showWindow(key1)
+        self.disp.showWindow(key2)
+
+        im1.fill(10)
+        self.disp.updateWindow(key1)
+        im1.fill(200)
+        self.disp.updateWindow(key1)
+        self.disp.showWindow(key1)
+        self.assertEqual(self.disp.windows[key1].pilImage.getpixel((0,0)), 200)
+
+        im1.fill(30)
+        self.disp.updateWindow(key1)
+        im1.fill(40)
+        self.disp.updateWindow(key1)
+        time.sleep(0.2)
+        self.disp.updateWindow(key2)
+        self.assertEqual(self.disp.windows[key1].pilImage.getpixel((0,0)), 40)